@@ -0,0 +1,181 @@
+"""
+Micro-benchmark do parser de conteúdo programático.
+
+Compara o parser legado (três regex por linha e um dataclass por item) com
+`src.processors.markdown_parser` em programas sintéticos grandes, medindo o
+parse e o parse + preparação das linhas do insert em lote. Também confere
+que os dois produzem as mesmas colunas legadas.
+
+Uso:
+    python benchmarks/bench_markdown_parser.py [--materias 400] [--repeticoes 5]
+"""
+import argparse
+import random
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.database.base import linhas_conteudo  # noqa: E402
+from src.database.models import ConteudoProgramatico  # noqa: E402
+from src.processors.markdown_parser import parse_conteudo_programatico  # noqa: E402
+
+COLUNAS_LEGADAS = slice(0, 9)  # edital_id .. ordem
+
+
+def gerar_programa(materias: int, semente: int = 42) -> str:
+    """Markdown no formato devolvido pela LLM, com até 5 níveis de numeração."""
+    aleatorio = random.Random(semente)
+    estilos = ("{n}. {t}", "{n}) {t}", "{n} - {t}", "{n} {T}")
+    palavras = (
+        "concordância verbal", "regência nominal", "crase", "equações", "funções",
+        "princípios constitucionais", "atos administrativos", "licitações",
+        "redes de computadores", "estatística descritiva", "lógica proposicional",
+    )
+    linhas = ["# Conteúdo Programático", ""]
+
+    def _itens(prefixo: str, profundidade: int):
+        for i in range(1, aleatorio.randint(2, 4) + 1):
+            numero = f"{prefixo}.{i}" if prefixo else str(i)
+            texto = aleatorio.choice(palavras)
+            estilo = aleatorio.choice(estilos)
+            linhas.append(estilo.format(n=numero, t=texto, T=texto.capitalize()))
+            if aleatorio.random() < 0.2:
+                linhas.append(f"- {aleatorio.choice(palavras)}")
+            if profundidade < 5 and aleatorio.random() < 0.45:
+                _itens(numero, profundidade + 1)
+
+    for m in range(materias):
+        if m % 10 == 0:
+            linhas += [f"## Conhecimentos {'Básicos' if m % 20 == 0 else 'Específicos'}", ""]
+        linhas += [f"### Matéria {m}", ""]
+        _itens("", 1)
+        linhas += ["", "---", ""]
+
+    return "\n".join(linhas)
+
+
+def parse_legado(markdown_content: str, edital_id: str) -> List[ConteudoProgramatico]:
+    """Cópia do `_parse_conteudo_programatico` anterior (referência de desempenho)."""
+    lines = markdown_content.split('\n')
+    conteudos = []
+    current_section = None
+    current_materia = None
+    ordem = 0
+
+    for line in lines:
+        line = line.strip()
+
+        if line.startswith('## '):
+            current_section = line[3:].strip()
+            continue
+
+        if line.startswith('### '):
+            current_materia = line[4:].strip().upper()
+            continue
+
+        if not line or line.startswith('#') or line.startswith('---'):
+            continue
+
+        patterns = [
+            r'^(\d+(?:\.\d+)*)[.\)]\s+(.+)$',
+            r'^(\d+(?:\.\d+)*)\s*[-–—]\s*(.+)$',
+            r'^(\d+(?:\.\d+)*)\s+([A-ZÀ-Ú].+)$',
+        ]
+
+        matched = False
+        for pattern in patterns:
+            match = re.match(pattern, line)
+            if match:
+                numeracao, descricao = match.groups()
+                partes = numeracao.split('.')
+
+                conteudos.append(ConteudoProgramatico(
+                    edital_id=edital_id,
+                    secao=current_section,
+                    materia=current_materia,
+                    descricao=descricao.strip(),
+                    nivel_1=partes[0] if len(partes) >= 1 else None,
+                    nivel_2=partes[1] if len(partes) >= 2 else None,
+                    nivel_3=partes[2] if len(partes) >= 3 else None,
+                    nivel_4=partes[3] if len(partes) >= 4 else None,
+                    ordem=ordem
+                ))
+                ordem += 1
+                matched = True
+                break
+
+        if not matched and line:
+            clean_line = re.sub(r'^\s*[-•]\s*', '', line).strip()
+            if clean_line:
+                conteudos.append(ConteudoProgramatico(
+                    edital_id=edital_id,
+                    secao=current_section,
+                    materia=current_materia,
+                    descricao=clean_line,
+                    ordem=ordem
+                ))
+                ordem += 1
+
+    return conteudos
+
+
+def _medir(funcao, repeticoes: int) -> float:
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do parser de conteúdo programático")
+    parser.add_argument("--materias", type=int, default=400, help="Matérias no programa sintético")
+    parser.add_argument("--repeticoes", type=int, default=5, help="Execuções por medida (mediana)")
+    args = parser.parse_args()
+
+    markdown = gerar_programa(args.materias)
+    edital_id = "00000000-0000-0000-0000-000000000000"
+
+    legado = parse_legado(markdown, edital_id)
+    novo = parse_conteudo_programatico(markdown, edital_id)
+    linhas_legado = [linha[COLUNAS_LEGADAS] for linha in linhas_conteudo(legado)]
+    linhas_novo = [linha[COLUNAS_LEGADAS] for linha in novo.linhas()]
+    if linhas_legado != linhas_novo:
+        print("❌ Resultados divergentes entre o parser legado e o novo")
+        sys.exit(1)
+
+    profundidade = max(n for n in novo.nivel if n is not None)
+    print(
+        f"Programa sintético: {len(markdown) / 1024:.0f} KiB, {markdown.count(chr(10)) + 1} linhas, "
+        f"{len(novo)} itens, profundidade máxima {profundidade}\n"
+    )
+
+    medidas = {
+        "parse": (
+            lambda: parse_legado(markdown, edital_id),
+            lambda: parse_conteudo_programatico(markdown, edital_id),
+        ),
+        "parse + linhas do insert": (
+            lambda: list(linhas_conteudo(parse_legado(markdown, edital_id))),
+            lambda: list(parse_conteudo_programatico(markdown, edital_id).linhas()),
+        ),
+    }
+
+    print(f"{'medida':<26}{'legado':>12}{'novo':>12}{'itens/s (novo)':>18}{'ganho':>8}")
+    for nome, (f_legado, f_novo) in medidas.items():
+        t_legado = _medir(f_legado, args.repeticoes)
+        t_novo = _medir(f_novo, args.repeticoes)
+        print(
+            f"{nome:<26}{t_legado * 1000:>10.1f}ms{t_novo * 1000:>10.1f}ms"
+            f"{len(novo) / t_novo:>18,.0f}{t_legado / t_novo:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+"""
+Benchmark ponta a ponta do pipeline contra servidores locais.
+
+Sobe `FakeOpenRouter` e `FakePostgREST` (benchmarks/fake_servers.py), gera
+PDFs sintéticos e processa todos com o pipeline real (`criar_pipeline` sobre
+`EditalProcessor` com SupabaseManager e OpenRouterClient apontados para os
+servidores locais). Registra vazão e percentis da latência por edital e por
+etapa (spans de src/utils/metrics.py) em JSON e, com `--comparar`, falha se
+algum valor piorar além da tolerância em relação ao baseline.
+
+Com `--corpus` os PDFs vêm de um corpus gerado por
+benchmarks/corpus_sintetico.py e o FakeOpenRouter devolve as respostas
+esperadas de cada edital; o resultado confere as linhas de conteúdo
+gravadas com as do manifesto.
+
+Uso:
+    python benchmarks/bench_pipeline.py [--editais 24] [--paginas 20] [--cenario base]
+    python benchmarks/bench_pipeline.py --corpus corpus/ --cenario base
+    python benchmarks/bench_pipeline.py --saida resultados.json --comparar benchmarks/baseline.json
+    python benchmarks/bench_pipeline.py --salvar-baseline
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from corpus_sintetico import carregar_manifesto, responder_corpus  # noqa: E402
+from fake_servers import FakeOpenRouter, FakePostgREST  # noqa: E402
+from pdf_sintetico import gerar_pdf  # noqa: E402
+from src.utils.metrics import metricas, quantil  # noqa: E402
+
+BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+# Parâmetros dos servidores falsos por cenário
+# Sem empacotamento de metadados: mantém os cenários comparáveis com a
+# baseline, gravada com uma chamada por documento (o empacotamento é medido em "avisos")
+_SEM_LOTE = {"METADADOS_LOTE_MAX": "0"}
+
+CENARIOS = {
+    "base": {
+        "llm": {"latencia": 0.30, "jitter": 0.08},
+        "db": {"latencia": 0.005, "jitter": 0.002},
+        "ambiente": _SEM_LOTE,
+    },
+    "rate_limit": {
+        "llm": {"latencia": 0.30, "jitter": 0.08, "taxa_429": 0.2, "retry_after_ms": 100},
+        "db": {"latencia": 0.005, "jitter": 0.002},
+        "ambiente": _SEM_LOTE,
+    },
+    "cauda_longa": {
+        "llm": {"latencia": 0.30, "jitter": 0.40},
+        "db": {"latencia": 0.02, "jitter": 0.02},
+        "ambiente": _SEM_LOTE,
+    },
+    # Enxurrada de avisos curtos: metadados empacotados (src/processors/metadata_batcher.py)
+    "avisos": {
+        "llm": {"latencia": 0.30, "jitter": 0.08},
+        "db": {"latencia": 0.005, "jitter": 0.002},
+        "paginas": 3,
+        "ambiente": {"PIPELINE_LLM_WORKERS": "16"},
+    },
+}
+
+
+def _percentis(amostras: List[float]) -> Dict[str, float]:
+    ordenadas = sorted(amostras)
+    return {f"p{int(q * 100)}": round(quantil(ordenadas, q), 4) for q in (0.5, 0.95, 0.99)}
+
+
+def _nome_serie(rotulos: dict) -> str:
+    rotulos = dict(rotulos)
+    nome = rotulos.pop("etapa")
+    if rotulos:
+        nome += "[" + ",".join(f"{k}={v}" for k, v in sorted(rotulos.items())) + "]"
+    return nome
+
+
+async def _executar(pdfs: List[Path], db_url: str, llm_url: str) -> Dict:
+    os.environ.update({
+        "SUPABASE_URL": db_url,
+        "SUPABASE_KEY": "chave-local",
+        "OPENROUTER_BASE_URL": f"{llm_url}/api/v1",
+        "OPENROUTER_API_KEY": "chave-local",
+        # Nomes fixos: as séries por modelo não dependem do .env da máquina
+        "OPENROUTER_MODEL_PRIMARY": "bench/primario",
+        "OPENROUTER_MODELS_FALLBACK": "bench/fallback",
+    })
+
+    from main import EditalProcessor
+    from src.database.supabase_client import SupabaseManager
+    from src.pipeline.scheduler import criar_pipeline
+    from src.processors.llm_client import OpenRouterClient
+
+    latencias: List[float] = []
+
+    async def _ao_concluir(job):
+        if job.sucesso:
+            latencias.append(time.time() - job.inicio)
+
+    metricas.reiniciar()
+    processor = EditalProcessor(
+        db=SupabaseManager(),
+        llm_client=OpenRouterClient(cache_enabled=False)
+    )
+    pipeline = criar_pipeline(processor, on_concluido=_ao_concluir)
+    inicio = time.perf_counter()
+    try:
+        jobs = await pipeline.run([str(pdf) for pdf in pdfs])
+    finally:
+        pipeline.close()
+        await processor.close()
+    duracao = time.perf_counter() - inicio
+
+    etapas = {
+        _nome_serie(serie["rotulos"]): {
+            "n": serie["contagem"],
+            "p50": round(serie["p50"], 4),
+            "p95": round(serie["p95"], 4),
+            "p99": round(serie["p99"], 4),
+        }
+        for serie in metricas.para_dict()["sumarios"].get("etapa_segundos", [])
+    }
+    concluidos = [job for job in jobs if job.sucesso]
+    return {
+        "editais": len(jobs),
+        "concluidos": len(concluidos),
+        "duracao_segundos": round(duracao, 3),
+        "editais_por_segundo": round(len(concluidos) / duracao, 3),
+        "paginas_por_segundo": round(sum(job.total_paginas or 0 for job in concluidos) / duracao, 1),
+        "linhas_conteudo": int(metricas.contador("linhas_conteudo_total")),
+        "edital_segundos": _percentis(latencias),
+        "etapas": dict(sorted(etapas.items())),
+    }
+
+
+def rodar_cenario(nome: str, pdfs: List[Path], responder: Optional[Callable] = None) -> Dict:
+    config = CENARIOS[nome]
+    llm_config = dict(config["llm"], responder=responder) if responder else config["llm"]
+    anterior = {chave: os.environ.get(chave) for chave in config.get("ambiente", {})}
+    os.environ.update(config.get("ambiente", {}))
+    try:
+        with FakeOpenRouter(**llm_config) as llm, FakePostgREST(**config["db"]) as db:
+            resultado = asyncio.run(_executar(pdfs, db.url, llm.url))
+            resultado["requisicoes_llm"] = llm.requisicoes
+            resultado["respostas_429"] = llm.respostas_429
+            resultado["documentos_empacotados"] = llm.documentos_empacotados
+            resultado["requisicoes_db"] = db.requisicoes
+    finally:
+        for chave, valor in anterior.items():
+            if valor is None:
+                os.environ.pop(chave, None)
+            else:
+                os.environ[chave] = valor
+    return resultado
+
+
+# ==================== COMPARAÇÃO ====================
+
+def comparar(atual: Dict, baseline: Dict, tolerancia: float, folga: float) -> List[str]:
+    """
+    Regressões de `atual` em relação a `baseline`.
+
+    Vazão piora se cair mais que `tolerancia` (fração); latências (p50/p95 do
+    edital e p95 de cada etapa) pioram se subirem mais que `tolerancia` e
+    mais que `folga` segundos, para não acusar ruído em etapas rápidas.
+    """
+    regressoes = []
+    for cenario, base in baseline.get("cenarios", {}).items():
+        medido = atual.get("cenarios", {}).get(cenario)
+        if medido is None:
+            continue
+
+        if medido["concluidos"] < base["concluidos"]:
+            regressoes.append(f"{cenario}: {medido['concluidos']} concluídos (baseline {base['concluidos']})")
+
+        if medido["editais_por_segundo"] < base["editais_por_segundo"] * (1 - tolerancia):
+            regressoes.append(
+                f"{cenario}: vazão {medido['editais_por_segundo']:.3f} editais/s "
+                f"(baseline {base['editais_por_segundo']:.3f})"
+            )
+
+        latencias = [(f"edital {p}", base["edital_segundos"][p], medido["edital_segundos"][p]) for p in ("p50", "p95")]
+        latencias += [
+            (f"{etapa} p95", valores["p95"], medido["etapas"][etapa]["p95"])
+            for etapa, valores in base["etapas"].items()
+            if etapa in medido["etapas"]
+        ]
+        for nome, antes, depois in latencias:
+            if depois > antes * (1 + tolerancia) and depois - antes > folga:
+                regressoes.append(f"{cenario}: {nome} {depois:.3f}s (baseline {antes:.3f}s)")
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do pipeline com OpenRouter e PostgREST locais")
+    parser.add_argument("--editais", type=int, default=24, help="PDFs por cenário")
+    parser.add_argument("--paginas", type=int, default=20, help="Páginas por PDF (avisos: sempre 3)")
+    parser.add_argument(
+        "--cenario", action="append", choices=sorted(CENARIOS),
+        help="Cenário a executar (repetível; default: todos)"
+    )
+    parser.add_argument("--corpus", type=Path, help="Corpus de benchmarks/corpus_sintetico.py (ignora --editais/--paginas)")
+    parser.add_argument("--saida", type=Path, help="Grava os resultados em JSON")
+    parser.add_argument("--comparar", type=Path, help="Baseline JSON; sai com código 1 se houver regressão")
+    parser.add_argument("--tolerancia", type=float, default=0.25, help="Piora relativa aceita (default 0.25)")
+    parser.add_argument("--folga", type=float, default=0.05, help="Piora absoluta ignorada em latências (s)")
+    parser.add_argument("--salvar-baseline", action="store_true", help=f"Grava os resultados em {BASELINE.name}")
+    args = parser.parse_args()
+
+    resultados = {
+        "gerado_em": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "ambiente": {
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "parametros": {"editais": args.editais, "paginas": args.paginas},
+        "cenarios": {},
+    }
+
+    responder = None
+    linhas_esperadas = None
+    if args.corpus:
+        manifesto = carregar_manifesto(args.corpus)
+        arquivos = manifesto["arquivos"]
+        responder = responder_corpus(args.corpus)
+        # Duplicatas não geram linhas: o pipeline as reconhece pelo hash
+        linhas_esperadas = sum(a["linhas_conteudo"] for a in arquivos if "duplicata_de" not in a)
+        resultados["parametros"] = {"corpus": str(args.corpus), **manifesto["parametros"]}
+
+    with tempfile.TemporaryDirectory(prefix="bench-pipeline-") as tmp:
+        for nome in args.cenario or list(CENARIOS):
+            if args.corpus:
+                pdfs = [args.corpus / a["arquivo"] for a in arquivos]
+                print(f"▶ {nome}: {len(pdfs)} PDFs de {args.corpus}", flush=True)
+            else:
+                paginas = CENARIOS[nome].get("paginas", args.paginas)
+                pdfs = [
+                    gerar_pdf(Path(tmp) / f"{nome}-{i:03d}.pdf", paginas=paginas, semente=i)
+                    for i in range(args.editais)
+                ]
+                print(f"▶ {nome}: {args.editais} editais de {paginas} páginas", flush=True)
+            r = rodar_cenario(nome, pdfs, responder)
+            resultados["cenarios"][nome] = r
+            print(
+                f"  {r['concluidos']}/{r['editais']} em {r['duracao_segundos']:.2f}s | "
+                f"{r['editais_por_segundo']:.2f} editais/s | "
+                f"edital p50 {r['edital_segundos']['p50']:.2f}s p95 {r['edital_segundos']['p95']:.2f}s | "
+                f"LLM {r['requisicoes_llm']} req ({r['respostas_429']} x 429, "
+                f"{r['documentos_empacotados']} docs empacotados), DB {r['requisicoes_db']} req"
+            )
+            for etapa, v in r["etapas"].items():
+                print(f"    {etapa:<44} n={v['n']:<4} p50 {v['p50']:.3f}s  p95 {v['p95']:.3f}s  p99 {v['p99']:.3f}s")
+            if linhas_esperadas is not None and r["linhas_conteudo"] != linhas_esperadas:
+                print(f"  ⚠️  {r['linhas_conteudo']} linhas de conteúdo gravadas; o manifesto espera {linhas_esperadas}")
+
+    conteudo = json.dumps(resultados, ensure_ascii=False, indent=2) + "\n"
+    if args.saida:
+        args.saida.write_text(conteudo, encoding="utf-8")
+        print(f"\n📄 Resultados em {args.saida}")
+    if args.salvar_baseline:
+        BASELINE.write_text(conteudo, encoding="utf-8")
+        print(f"\n📌 Baseline gravado em {BASELINE}")
+
+    if args.comparar:
+        regressoes = comparar(
+            resultados, json.loads(args.comparar.read_text(encoding="utf-8")),
+            args.tolerancia, args.folga
+        )
+        if regressoes:
+            print(f"\n❌ {len(regressoes)} regressão(ões) em relação a {args.comparar}:")
+            for regressao in regressoes:
+                print(f"  {regressao}")
+            sys.exit(1)
+        print(f"\n✅ Sem regressões em relação a {args.comparar} (tolerância {args.tolerancia:.0%})")
+
+
+if __name__ == "__main__":
+    main()
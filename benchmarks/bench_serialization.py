@@ -0,0 +1,127 @@
+"""
+Benchmark da serialização dos inserts em lote e da memória dos modelos.
+
+Compara o caminho anterior (um dataclass com __dict__ por linha, um dict por
+linha montado à mão e `json` da biblioteca padrão a cada envio, como o httpx
+faz com `json=`) com o atual (ConteudoBatch -> `serializar_lotes`, com orjson
+se instalado, codificado uma vez e reaproveitado em retries).
+
+Uso:
+    python benchmarks/bench_serialization.py [--linhas 50000] [--batch-size 100]
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import field, fields, make_dataclass
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.database.models import COLUNAS_CONTEUDO, ConteudoBatch, ConteudoProgramatico  # noqa: E402
+from src.database.serialization import ENCODER, serializar_lotes  # noqa: E402
+from src.processors.markdown_parser import parse_conteudo_programatico  # noqa: E402
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from bench_markdown_parser import gerar_programa  # noqa: E402
+
+# Mesmo layout do modelo, sem __slots__ nem validação (como era antes)
+ConteudoLegado = make_dataclass(
+    "ConteudoLegado",
+    [(f.name, f.type, field(default=f.default)) for f in fields(ConteudoProgramatico)]
+)
+
+
+def _medir(funcao, repeticoes: int) -> float:
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos)
+
+
+def _memoria_retida(funcao) -> int:
+    """Bytes alocados que continuam vivos com o resultado de `funcao`."""
+    tracemalloc.start()
+    resultado = funcao()
+    retido, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del resultado
+    return retido
+
+
+def payloads_legado(objetos, batch_size: int):
+    """Caminho anterior: dict por linha + json.dumps a cada envio."""
+    payloads = []
+    for i in range(0, len(objetos), batch_size):
+        data = [
+            {
+                "edital_id": c.edital_id,
+                "secao": c.secao,
+                "materia": c.materia,
+                "descricao": c.descricao,
+                "nivel_1": c.nivel_1,
+                "nivel_2": c.nivel_2,
+                "nivel_3": c.nivel_3,
+                "nivel_4": c.nivel_4,
+                "ordem": c.ordem,
+                "numeracao": c.numeracao,
+                "nivel": c.nivel,
+                "ordem_pai": c.ordem_pai
+            }
+            for c in objetos[i:i + batch_size]
+        ]
+        payloads.append(json.dumps(data).encode("utf-8"))
+    return payloads
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de serialização dos inserts em lote")
+    parser.add_argument("--linhas", type=int, default=50000, help="Itens de conteúdo (aprox.)")
+    parser.add_argument("--batch-size", type=int, default=100, help="Linhas por payload")
+    parser.add_argument("--repeticoes", type=int, default=5, help="Execuções por medida (mediana)")
+    args = parser.parse_args()
+
+    markdown = gerar_programa(max(1, args.linhas // 35))
+    batch = parse_conteudo_programatico(markdown, "00000000-0000-0000-0000-000000000000")
+    linhas = list(batch.linhas())
+    legado = [ConteudoLegado(**dict(zip(COLUNAS_CONTEUDO, linha))) for linha in linhas]
+    n = len(linhas)
+
+    print(f"{n} linhas, lotes de {args.batch_size}, encoder atual: {ENCODER}\n")
+
+    # 1 envio e 1 envio + 1 retry por lote
+    t_legado = _medir(lambda: payloads_legado(legado, args.batch_size), args.repeticoes)
+    t_novo = _medir(lambda: serializar_lotes(batch.registros(), args.batch_size), args.repeticoes)
+    print(f"{'medida':<30}{'anterior':>12}{'atual':>12}{'ganho':>8}")
+    print(f"{'serialização (1 envio)':<30}{t_legado * 1000:>10.1f}ms{t_novo * 1000:>10.1f}ms{t_legado / t_novo:>7.1f}x")
+    print(
+        f"{'serialização (com 1 retry)':<30}{2 * t_legado * 1000:>10.1f}ms{t_novo * 1000:>10.1f}ms"
+        f"{2 * t_legado / t_novo:>7.1f}x"
+    )
+
+    # Memória das estruturas que mantêm as linhas de um edital em trânsito
+    # (os valores são compartilhados; mede-se só o custo dos contêineres)
+    def _objetos(classe):
+        return lambda: [classe(**dict(zip(COLUNAS_CONTEUDO, linha))) for linha in linhas]
+
+    def _colunas():
+        return ConteudoBatch(
+            batch.edital_id,
+            *([linha[i] for linha in linhas] for i in (1, 2, 3, 9, 10, 11))
+        )
+
+    print(f"\n{'memória retida':<30}{'bytes/linha':>12}")
+    for nome, funcao in (
+        ("dataclass com __dict__", _objetos(ConteudoLegado)),
+        ("dataclass com __slots__", _objetos(ConteudoProgramatico)),
+        ("ConteudoBatch (colunas)", _colunas),
+    ):
+        print(f"{nome:<30}{_memoria_retida(funcao) / n:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
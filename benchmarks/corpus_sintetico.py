@@ -0,0 +1,712 @@
+"""
+Corpus sintético de editais para testes de escala.
+
+Gera editais em PDF com o formato dos reais: cabeçalho e rodapé repetidos
+em todas as páginas, tabelas de cargos e de cronograma, seções de texto
+corrido e o Anexo I com o conteúdo programático aninhado no tamanho e na
+profundidade pedidos. Para cada PDF grava também as respostas esperadas da
+LLM (o JSON do prompt de metadados e o markdown da verticalização) e as
+contagens que o pipeline deve produzir.
+
+Retificações são textos consolidados do mesmo edital com mudanças
+controladas (data da prova adiada, vagas alteradas, tópicos incluídos,
+alterados ou suprimidos), listadas no manifesto. Duplicatas são cópias
+byte a byte, com o mesmo hash, para exercitar a deduplicação.
+
+Layout do diretório de saída:
+    manifesto.json          parâmetros e um registro por PDF
+    pdfs/<id>.pdf
+    esperado/<id>.json      metadados, markdown, contagens e mudanças
+
+A semente fixa o corpus inteiro: a mesma linha de comando gera os mesmos
+bytes. `responder_corpus` devolve as respostas esperadas ao FakeOpenRouter.
+
+Uso:
+    python benchmarks/corpus_sintetico.py corpus/ --editais 100 --paginas 40
+    python benchmarks/corpus_sintetico.py corpus/ --editais 10000 --paginas 1-20 \\
+        --retificacoes 0.2 --duplicatas 0.05 --processos 4
+    python benchmarks/corpus_sintetico.py corpus/ --editais 1 --paginas 1000 --topicos 3000 --profundidade 5
+"""
+import argparse
+import copy
+import hashlib
+import json
+import random
+import re
+import shutil
+import sys
+import textwrap
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from pdf_sintetico import conteudo_pagina, escrever_pdf  # noqa: E402
+
+ANO = 2026
+
+# Página A4 em pontos: corpo entre o cabeçalho e o rodapé
+LINHAS_POR_PAGINA = 60
+_TOPO, _ENTRELINHA, _MARGEM = 790, 12, 50
+_LARGURA_TEXTO = 105  # caracteres por linha de texto corrido
+
+_ORGAOS = (
+    "TRIBUNAL REGIONAL FEDERAL DA 9ª REGIÃO",
+    "TRIBUNAL DE JUSTIÇA DO ESTADO DO PARÁ",
+    "PREFEITURA MUNICIPAL DE SÃO JOSÉ DOS CAMPOS",
+    "SECRETARIA DE ESTADO DA FAZENDA DO PIAUÍ",
+    "AGÊNCIA NACIONAL DE TRANSPORTES AQUAVIÁRIOS",
+    "CÂMARA MUNICIPAL DE MACEIÓ",
+    "UNIVERSIDADE FEDERAL DO ACRE",
+    "INSTITUTO NACIONAL DO SEGURO SOCIAL",
+)
+_BANCAS = ("Cebraspe", "FGV Conhecimento", "Fundação Carlos Chagas", "Vunesp", "Instituto AOCP")
+
+_CARGOS = (
+    ("Analista Judiciário – Área Judiciária", "Superior", (9000, 14500)),
+    ("Analista Judiciário – Contabilidade", "Superior", (9000, 14500)),
+    ("Analista de Tecnologia da Informação", "Superior", (8500, 13500)),
+    ("Auditor Fiscal", "Superior", (14000, 22000)),
+    ("Técnico Judiciário – Área Administrativa", "Médio", (5500, 8600)),
+    ("Técnico em Informática", "Médio", (4500, 7000)),
+    ("Agente Administrativo", "Médio", (3200, 5200)),
+    ("Assistente Social", "Superior", (5800, 9000)),
+    ("Engenheiro Civil", "Superior", (9500, 15000)),
+    ("Oficial de Justiça Avaliador", "Superior", (9000, 14000)),
+)
+
+_MATERIAS_BASICAS = (
+    "Língua Portuguesa", "Raciocínio Lógico-Matemático", "Noções de Informática",
+    "Direito Constitucional", "Direito Administrativo", "Ética no Serviço Público",
+    "Legislação Específica", "Atualidades",
+)
+_MATERIAS_ESPECIFICAS = (
+    "Administração Pública", "Contabilidade Pública", "Arquivologia", "Direito Processual Civil",
+    "Direito Penal", "Gestão de Pessoas", "Engenharia de Software", "Banco de Dados",
+    "Auditoria Governamental", "Orçamento Público", "Estatística", "Direito Tributário",
+)
+
+_NUCLEOS = (
+    "Compreensão e interpretação de textos", "Ortografia oficial", "Acentuação gráfica",
+    "Emprego do sinal indicativo de crase", "Concordância verbal e nominal", "Regência verbal e nominal",
+    "Estruturas lógicas", "Lógica de argumentação", "Equivalências e implicações",
+    "Princípios fundamentais", "Direitos e garantias fundamentais", "Organização do Estado",
+    "Poder Executivo", "Poder Judiciário", "Controle de constitucionalidade",
+    "Atos administrativos", "Licitações e contratos", "Agentes públicos", "Improbidade administrativa",
+    "Processo administrativo", "Responsabilidade civil do Estado", "Planejamento estratégico",
+    "Gestão por competências", "Orçamento público", "Receita e despesa pública",
+    "Redes de computadores", "Segurança da informação", "Modelagem de dados", "Linguagem SQL",
+    "Governança de TI", "Estatística descritiva", "Probabilidade", "Teoria geral do processo",
+    "Crimes contra a administração pública", "Lançamento tributário", "Gestão documental",
+)
+_COMPLEMENTOS = (
+    "", ": conceitos e aplicações", ": aspectos gerais", " e suas espécies", ": princípios",
+    " na legislação vigente", ": classificação", " e jurisprudência dos tribunais superiores",
+    ": elementos e requisitos", " no âmbito federal",
+)
+
+_CLAUSULAS = (
+    "O concurso público será regido por este edital e executado pela banca {banca}.",
+    "A seleção para os cargos de que trata este edital compreenderá exame de habilidades e "
+    "conhecimentos, mediante aplicação de provas objetivas, de caráter eliminatório e classificatório.",
+    "As provas serão realizadas nas capitais dos estados e no Distrito Federal, observado o disposto "
+    "no subitem relativo às condições especiais de atendimento.",
+    "Havendo indisponibilidade de locais suficientes ou adequados, as provas poderão ser realizadas "
+    "em outras localidades, a critério da organizadora.",
+    "O candidato deverá comparecer ao local designado para a realização das provas com antecedência "
+    "mínima de uma hora do horário fixado para o seu início, munido de caneta esferográfica de tinta preta.",
+    "Das vagas destinadas a cada cargo, cinco por cento serão providas na forma da Lei nº 8.112/1990 e do "
+    "Decreto nº 9.508/2018, e vinte por cento serão reservadas aos candidatos negros.",
+    "O candidato que se declarar pessoa com deficiência concorrerá em igualdade de condições com os "
+    "demais candidatos, no que se refere ao conteúdo, à avaliação e aos critérios de aprovação.",
+    "Não será permitida, durante a realização das provas, a comunicação entre os candidatos nem a "
+    "utilização de máquinas calculadoras, livros, anotações, réguas de cálculo ou impressos.",
+    "O resultado final no concurso será homologado pelo órgão e publicado no Diário Oficial e no "
+    "endereço eletrônico da organizadora, não se admitindo recurso desse resultado.",
+    "O prazo de validade do concurso esgotar-se-á após dois anos, contados a partir da data de "
+    "publicação da homologação do resultado final, podendo ser prorrogado uma única vez.",
+    "Os casos omissos serão resolvidos pela organizadora em conjunto com a comissão do concurso.",
+    "É de inteira responsabilidade do candidato acompanhar a publicação de todos os atos, editais e "
+    "comunicados referentes a este concurso público.",
+)
+
+_EVENTOS = (
+    ("inscricao_inicio", "Início do período de inscrições"),
+    ("inscricao_fim", "Término do período de inscrições"),
+    ("pagamento", "Último dia para pagamento da taxa"),
+    ("locais", "Divulgação dos locais de prova"),
+    ("prova", "Aplicação das provas objetivas e discursivas"),
+    ("gabarito", "Divulgação dos gabaritos preliminares"),
+    ("resultado", "Resultado final"),
+)
+
+_DISCURSIVA = "Prova discursiva com uma questão e uma peça técnica, de até 30 linhas cada, valendo 20 pontos."
+
+_CHAVE = re.compile(r"EDITAL Nº (\d+)/(\d{4})(?: – (\d+)ª RETIFICAÇÃO)?")
+
+
+@dataclass
+class CargoSintetico:
+    nome: str
+    escolaridade: str
+    vagas: int
+    salario: float
+
+
+@dataclass
+class MateriaSintetica:
+    secao: str
+    nome: str
+    topicos: List[Tuple[str, str]]  # (numeração, texto)
+
+
+@dataclass
+class EditalSintetico:
+    id: str
+    numero: int
+    orgao: str
+    banca: str
+    cargos: List[CargoSintetico]
+    datas: Dict[str, date]
+    valor_inscricao: float
+    discursiva: bool
+    materias: List[MateriaSintetica]
+    paginas_alvo: int
+    semente: str
+    retificacao: int = 0
+    mudancas: List[dict] = field(default_factory=list)
+
+    @property
+    def chave(self) -> str:
+        """Identificador impresso no cabeçalho (ver `responder_corpus`)."""
+        return chave_edital(self.numero, ANO, self.retificacao)
+
+    @property
+    def titulo(self) -> str:
+        sufixo = f" – {self.retificacao}ª RETIFICAÇÃO" if self.retificacao else ""
+        return f"EDITAL Nº {self.numero}/{ANO}{sufixo}"
+
+
+def chave_edital(numero: int, ano: int, retificacao: int = 0) -> str:
+    return f"{numero}/{ano}" + (f"-R{retificacao}" if retificacao else "")
+
+
+def _reais(valor: float) -> str:
+    inteiro, centavos = f"{valor:.2f}".split(".")
+    return f"R$ {int(inteiro):,}".replace(",", ".") + f",{centavos}"
+
+
+def _data(d: date) -> str:
+    return d.strftime("%d/%m/%Y")
+
+
+# ==================== CONTEÚDO ====================
+
+def _numeracoes(aleatorio: random.Random, quantidade: int, profundidade: int) -> List[str]:
+    """
+    `quantidade` numerações válidas ("1", "1.1", "1.1.1", "2", ...) de até
+    `profundidade` níveis. Os primeiros itens descem até a profundidade
+    máxima, para que ela apareça sempre que houver itens suficientes.
+    """
+    caminho: List[int] = []
+    numeros = []
+    for i in range(quantidade):
+        sorteio = aleatorio.random()
+        if not caminho:
+            caminho = [1]
+        elif len(caminho) < profundidade and (i < profundidade or sorteio < 0.35):
+            caminho.append(1)
+        elif len(caminho) > 1 and sorteio > 0.7:
+            del caminho[len(caminho) - aleatorio.randint(1, len(caminho) - 1):]
+            caminho[-1] += 1
+        else:
+            caminho[-1] += 1
+        numeros.append(".".join(map(str, caminho)))
+    return numeros
+
+
+def _topico(aleatorio: random.Random) -> str:
+    return aleatorio.choice(_NUCLEOS) + aleatorio.choice(_COMPLEMENTOS)
+
+
+def gerar_edital(
+    indice: int,
+    semente: int = 0,
+    paginas: Tuple[int, int] = (20, 20),
+    cargos: int = 4,
+    materias: int = 8,
+    topicos: int = 120,
+    profundidade: int = 3,
+) -> EditalSintetico:
+    """Sorteia o conteúdo do edital `indice` (sem gravar nada)."""
+    if profundidade < 1 or topicos < materias or materias < 1:
+        raise ValueError("profundidade >= 1 e topicos >= materias >= 1")
+
+    rotulo = f"{semente}-{indice}"
+    aleatorio = random.Random(rotulo)
+
+    lista_cargos = [
+        CargoSintetico(
+            nome=nome,
+            escolaridade=escolaridade,
+            vagas=aleatorio.randint(1, 60),
+            salario=round(aleatorio.uniform(*faixa), 2),
+        )
+        for nome, escolaridade, faixa in aleatorio.sample(_CARGOS, min(cargos, len(_CARGOS)))
+    ]
+
+    inicio = date(ANO, 1, 5) + timedelta(days=aleatorio.randint(0, 240))
+    datas = {"inscricao_inicio": inicio}
+    datas["inscricao_fim"] = inicio + timedelta(days=aleatorio.randint(20, 30))
+    datas["pagamento"] = datas["inscricao_fim"] + timedelta(days=2)
+    datas["prova"] = datas["inscricao_fim"] + timedelta(days=aleatorio.randint(35, 60))
+    datas["locais"] = datas["prova"] - timedelta(days=7)
+    datas["gabarito"] = datas["prova"] + timedelta(days=2)
+    datas["resultado"] = datas["prova"] + timedelta(days=aleatorio.randint(45, 75))
+
+    # Metade (arredondada para cima) das matérias é de conhecimentos básicos
+    basicas = (materias + 1) // 2
+    nomes = aleatorio.sample(_MATERIAS_BASICAS, min(basicas, len(_MATERIAS_BASICAS)))
+    nomes += aleatorio.sample(_MATERIAS_ESPECIFICAS, min(materias - len(nomes), len(_MATERIAS_ESPECIFICAS)))
+    lista_materias = []
+    for m, nome in enumerate(nomes):
+        quantidade = topicos // len(nomes) + (1 if m < topicos % len(nomes) else 0)
+        lista_materias.append(MateriaSintetica(
+            secao="Conhecimentos Básicos" if m < basicas else "Conhecimentos Específicos",
+            nome=nome,
+            topicos=[(n, _topico(aleatorio)) for n in _numeracoes(aleatorio, quantidade, profundidade)],
+        ))
+
+    numero = indice + 1
+    return EditalSintetico(
+        id=f"edital-{numero:05d}",
+        numero=numero,
+        orgao=aleatorio.choice(_ORGAOS),
+        banca=aleatorio.choice(_BANCAS),
+        cargos=lista_cargos,
+        datas=datas,
+        valor_inscricao=aleatorio.choice((60.0, 85.0, 98.5, 110.0, 130.0, 150.0)),
+        discursiva=aleatorio.random() < 0.6,
+        materias=lista_materias,
+        paginas_alvo=aleatorio.randint(*paginas),
+        semente=rotulo,
+    )
+
+
+def retificar(edital: EditalSintetico, numero: int = 1, mudancas_topicos: int = 3) -> EditalSintetico:
+    """
+    Texto consolidado da `numero`ª retificação de `edital`.
+
+    Sempre adia a prova (e o resultado) e altera as vagas de um cargo; depois
+    aplica `mudancas_topicos` mudanças no conteúdo programático, sorteadas
+    entre alteração de texto, inclusão de item ao fim de uma matéria e
+    supressão de um item sem filhos. Cada mudança fica em `mudancas`.
+    """
+    aleatorio = random.Random(f"{edital.semente}-R{numero}")
+    novo = copy.deepcopy(edital)
+    novo.id = f"{edital.id.split('-ret')[0]}-ret{numero}"
+    novo.retificacao = numero
+    novo.semente = f"{edital.semente}-R{numero}"
+    novo.mudancas = []
+
+    adiamento = timedelta(days=aleatorio.randint(7, 21))
+    antes = novo.datas["prova"]
+    for evento in ("locais", "prova", "gabarito", "resultado"):
+        novo.datas[evento] += adiamento
+    novo.mudancas.append({"tipo": "data_prova", "antes": antes.isoformat(), "depois": novo.datas["prova"].isoformat()})
+
+    cargo = aleatorio.choice(novo.cargos)
+    vagas = cargo.vagas + aleatorio.choice((-1, 1)) * aleatorio.randint(1, max(1, cargo.vagas // 2))
+    novo.mudancas.append({"tipo": "vagas", "cargo": cargo.nome, "antes": cargo.vagas, "depois": max(1, vagas)})
+    cargo.vagas = max(1, vagas)
+
+    for _ in range(mudancas_topicos):
+        materia = aleatorio.choice(novo.materias)
+        tipo = aleatorio.choice(("topico_alterado", "topico_incluido", "topico_suprimido"))
+        numeros = [n for n, _ in materia.topicos]
+        # Itens sem filhos podem ser suprimidos sem deixar órfãos
+        folhas = [
+            i for i, n in enumerate(numeros)
+            if not (i + 1 < len(numeros) and numeros[i + 1].startswith(n + "."))
+        ]
+
+        if tipo == "topico_suprimido" and len(folhas) > 1:
+            i = aleatorio.choice(folhas)
+            numeracao, texto = materia.topicos.pop(i)
+            novo.mudancas.append({"tipo": tipo, "materia": materia.nome, "numeracao": numeracao, "antes": texto})
+        elif tipo == "topico_incluido":
+            proximo = max(int(n.split(".")[0]) for n in numeros) + 1 if numeros else 1
+            texto = _topico(aleatorio)
+            materia.topicos.append((str(proximo), texto))
+            novo.mudancas.append({"tipo": tipo, "materia": materia.nome, "numeracao": str(proximo), "depois": texto})
+        else:
+            i = aleatorio.randrange(len(materia.topicos))
+            numeracao, texto = materia.topicos[i]
+            novo_texto = _topico(aleatorio)
+            while novo_texto == texto:
+                novo_texto = _topico(aleatorio)
+            materia.topicos[i] = (numeracao, novo_texto)
+            novo.mudancas.append({
+                "tipo": "topico_alterado", "materia": materia.nome, "numeracao": numeracao,
+                "antes": texto, "depois": novo_texto,
+            })
+    return novo
+
+
+# ==================== RESPOSTAS ESPERADAS ====================
+
+def metadados_esperados(edital: EditalSintetico) -> dict:
+    """JSON que um modelo correto devolveria ao prompt de metadados."""
+    return {
+        "formato_prova": "mista" if edital.discursiva else "objetiva",
+        "data_prova": edital.datas["prova"].isoformat(),
+        "data_inscricao_inicio": edital.datas["inscricao_inicio"].isoformat(),
+        "data_inscricao_fim": edital.datas["inscricao_fim"].isoformat(),
+        "valor_inscricao": _reais(edital.valor_inscricao),
+        "detalhes_discursiva": _DISCURSIVA if edital.discursiva else "",
+        "cargos": [c.nome for c in edital.cargos],
+        "salarios": {c.nome: _reais(c.salario) for c in edital.cargos},
+    }
+
+
+def verticalizacao_esperada(edital: EditalSintetico) -> str:
+    """Markdown no formato pedido pelo prompt de verticalização."""
+    linhas = []
+    secao = None
+    for materia in edital.materias:
+        if materia.secao != secao:
+            secao = materia.secao
+            linhas += [f"## {secao}", ""]
+        linhas.append(f"### {materia.nome}")
+        for numeracao, texto in materia.topicos:
+            linhas.append(f"{numeracao}. {texto}" if "." not in numeracao else f"{numeracao} {texto}")
+        linhas.append("")
+    return "\n".join(linhas)
+
+
+# ==================== PDF ====================
+
+Linha = List[Tuple[float, str]]  # trechos (x, texto) de uma linha do corpo
+
+
+def _paragrafo(texto: str, recuo: float = 0) -> List[Linha]:
+    largura = _LARGURA_TEXTO - int(recuo / 5)
+    return [[(_MARGEM + recuo, parte)] for parte in textwrap.wrap(texto, largura)]
+
+
+def _tabela(colunas: List[Tuple[float, str]], linhas: List[List[str]]) -> List[Linha]:
+    cabecalho = [[(_MARGEM + x, titulo) for x, titulo in colunas]]
+    return cabecalho + [[(_MARGEM + x, valor) for (x, _), valor in zip(colunas, linha)] for linha in linhas]
+
+
+def _corpo(edital: EditalSintetico, aleatorio: random.Random) -> List[Linha]:
+    """Linhas do corpo, já com o texto de enchimento que leva às páginas alvo."""
+    inicio: List[Linha] = [[(_MARGEM, edital.titulo)], []]
+    inicio += _paragrafo(
+        f"O(A) {edital.orgao}, no uso de suas atribuições legais, torna pública a realização de concurso "
+        f"público para provimento de vagas e formação de cadastro de reserva, mediante as condições "
+        f"estabelecidas neste edital."
+    )
+    if edital.retificacao:
+        inicio += _paragrafo(
+            f"Este texto consolida as alterações promovidas pela {edital.retificacao}ª retificação, que "
+            f"substitui integralmente as disposições anteriores em contrário."
+        )
+
+    inicio += [[], [(_MARGEM, "1 DOS CARGOS")]]
+    inicio += _tabela(
+        [(0, "Cargo"), (250, "Escolaridade"), (330, "Vagas"), (380, "Remuneração")],
+        [[c.nome, c.escolaridade, str(c.vagas), _reais(c.salario)] for c in edital.cargos],
+    )
+    inicio += [[], [(_MARGEM, "2 DO CRONOGRAMA")]]
+    inicio += _tabela(
+        [(0, "Evento"), (330, "Data")],
+        [[descricao, _data(edital.datas[evento])] for evento, descricao in _EVENTOS],
+    )
+    inicio += [[], [(_MARGEM, "3 DAS INSCRIÇÕES")]]
+    inicio += _paragrafo(
+        f"3.1 As inscrições serão realizadas exclusivamente via internet, no período de "
+        f"{_data(edital.datas['inscricao_inicio'])} a {_data(edital.datas['inscricao_fim'])}."
+    )
+    inicio += _paragrafo(f"3.2 O valor da taxa de inscrição será de {_reais(edital.valor_inscricao)}.")
+    inicio += [[], [(_MARGEM, "4 DAS PROVAS")]]
+    inicio += _paragrafo(
+        f"4.1 As provas objetivas serão aplicadas em {_data(edital.datas['prova'])}, no turno da manhã."
+    )
+    if edital.discursiva:
+        inicio += _paragrafo(f"4.2 {_DISCURSIVA}")
+
+    anexo: List[Linha] = [[], [(_MARGEM, "ANEXO I – CONTEÚDO PROGRAMÁTICO")]]
+    secao = None
+    for materia in edital.materias:
+        if materia.secao != secao:
+            secao = materia.secao
+            anexo += [[], [(_MARGEM, secao.upper())]]
+        anexo += [[], [(_MARGEM, f"{materia.nome.upper()}:")]]
+        for numeracao, texto in materia.topicos:
+            anexo += _paragrafo(f"{numeracao} {texto}.", recuo=12 * numeracao.count("."))
+
+    # Disposições gerais completam as páginas que faltam até o alvo
+    enchimento: List[Linha] = [[], [(_MARGEM, "5 DAS DISPOSIÇÕES GERAIS")]]
+    faltam = edital.paginas_alvo * LINHAS_POR_PAGINA - len(inicio) - len(anexo) - len(enchimento)
+    item = 1
+    while faltam > 0:
+        clausula = aleatorio.choice(_CLAUSULAS).format(banca=edital.banca)
+        linhas = _paragrafo(f"5.{item} {clausula}")
+        enchimento += linhas[:faltam]
+        faltam -= len(linhas)
+        item += 1
+    if len(enchimento) == 2:
+        enchimento = []
+
+    return inicio + enchimento + anexo
+
+
+def escrever_edital(edital: EditalSintetico, caminho: Path) -> int:
+    """Grava o PDF do edital; devolve o número de páginas."""
+    corpo = _corpo(edital, random.Random(edital.semente + "-texto"))
+    total = max(1, -(-len(corpo) // LINHAS_POR_PAGINA))
+    cabecalho = f"{edital.orgao} – {edital.titulo}"
+    rodape = f"{edital.banca} – Concurso Público {ANO}"
+
+    def _conteudos():
+        for p in range(total):
+            textos = [(_MARGEM, 815, cabecalho)]
+            for i, linha in enumerate(corpo[p * LINHAS_POR_PAGINA:(p + 1) * LINHAS_POR_PAGINA]):
+                textos += [(x, _TOPO - i * _ENTRELINHA, texto) for x, texto in linha]
+            textos += [(_MARGEM, 25, rodape), (480, 25, f"Página {p + 1} de {total}")]
+            yield conteudo_pagina(textos)
+
+    escrever_pdf(caminho, _conteudos())
+    return total
+
+
+# ==================== CORPUS ====================
+
+def _registro(edital: EditalSintetico, destino: Path) -> dict:
+    """Grava PDF e respostas esperadas de um edital e devolve a entrada do manifesto."""
+    from src.processors.markdown_parser import parse_conteudo_programatico
+
+    caminho = destino / "pdfs" / f"{edital.id}.pdf"
+    paginas = escrever_edital(edital, caminho)
+    markdown = verticalizacao_esperada(edital)
+    esperado = {
+        "chave": edital.chave,
+        "metadados": metadados_esperados(edital),
+        "verticalizacao": markdown,
+        "mudancas": edital.mudancas,
+    }
+    (destino / "esperado" / f"{edital.id}.json").write_text(
+        json.dumps(esperado, ensure_ascii=False, indent=2), encoding="utf-8"
+    )
+    conteudo = caminho.read_bytes()
+    return {
+        "id": edital.id,
+        "arquivo": f"pdfs/{edital.id}.pdf",
+        "esperado": f"esperado/{edital.id}.json",
+        "chave": edital.chave,
+        "sha256": hashlib.sha256(conteudo).hexdigest(),
+        "bytes": len(conteudo),
+        "paginas": paginas,
+        "cargos": len(edital.cargos),
+        "topicos": sum(len(m.topicos) for m in edital.materias),
+        "linhas_conteudo": len(parse_conteudo_programatico(markdown, edital.id)),
+        "base": edital.id.rsplit("-ret", 1)[0] if edital.retificacao else None,
+        "retificacao": edital.retificacao,
+        "mudancas": len(edital.mudancas),
+    }
+
+
+def _gerar_indice(tarefa: Tuple[int, dict, Path]) -> List[dict]:
+    """Edital `indice` e suas retificações (executa em processo separado)."""
+    indice, parametros, destino = tarefa
+    aleatorio = random.Random(f"{parametros['semente']}-{indice}-corpus")
+    edital = gerar_edital(
+        indice,
+        semente=parametros["semente"],
+        paginas=parametros["paginas"],
+        cargos=parametros["cargos"],
+        materias=parametros["materias"],
+        topicos=parametros["topicos"],
+        profundidade=parametros["profundidade"],
+    )
+    registros = [_registro(edital, destino)]
+
+    retificacoes = int(parametros["retificacoes"]) + (aleatorio.random() < parametros["retificacoes"] % 1)
+    versao = edital
+    for numero in range(1, retificacoes + 1):
+        versao = retificar(versao, numero, parametros["mudancas_topicos"])
+        registros.append(_registro(versao, destino))
+
+    if aleatorio.random() < parametros["duplicatas"]:
+        original = registros[0]
+        copia = dict(original, id=f"{original['id']}-copia", arquivo=f"pdfs/{original['id']}-copia.pdf")
+        copia["duplicata_de"] = original["id"]
+        shutil.copyfile(destino / original["arquivo"], destino / copia["arquivo"])
+        registros.append(copia)
+    return registros
+
+
+def gerar_corpus(
+    destino: Path,
+    editais: int = 100,
+    paginas: Tuple[int, int] = (20, 20),
+    cargos: int = 4,
+    materias: int = 8,
+    topicos: int = 120,
+    profundidade: int = 3,
+    retificacoes: float = 0.0,
+    mudancas_topicos: int = 3,
+    duplicatas: float = 0.0,
+    semente: int = 0,
+    processos: int = 1,
+) -> dict:
+    """
+    Gera o corpus em `destino` e grava `manifesto.json`.
+
+    Args:
+        editais: Editais originais (retificações e duplicatas são somadas a eles)
+        paginas: Faixa (mínimo, máximo) de páginas por edital; o conteúdo fixo
+            pode exigir mais páginas que o mínimo
+        cargos: Linhas da tabela de cargos
+        materias: Matérias do Anexo I (metade de conhecimentos básicos)
+        topicos: Itens do conteúdo programático por edital
+        profundidade: Níveis máximos de numeração (1, 1.1, 1.1.1, ...)
+        retificacoes: Retificações por edital; a parte fracionária é a
+            probabilidade de uma a mais (0.2 → 20% dos editais com uma)
+        mudancas_topicos: Mudanças no conteúdo programático por retificação
+        duplicatas: Fração dos editais com uma cópia idêntica (mesmo hash)
+        semente: Semente do corpus
+        processos: Processos geradores em paralelo
+
+    Returns:
+        O manifesto
+    """
+    if paginas[0] < 1 or paginas[0] > paginas[1]:
+        raise ValueError("faixa de páginas inválida")
+    if not 0 <= duplicatas <= 1 or retificacoes < 0:
+        raise ValueError("duplicatas deve estar entre 0 e 1 e retificacoes >= 0")
+
+    # Valida os demais parâmetros antes de criar diretórios e processos
+    gerar_edital(0, semente, paginas, cargos, materias, topicos, profundidade)
+
+    destino = Path(destino)
+    (destino / "pdfs").mkdir(parents=True, exist_ok=True)
+    (destino / "esperado").mkdir(parents=True, exist_ok=True)
+
+    parametros = {
+        "editais": editais, "paginas": list(paginas), "cargos": cargos, "materias": materias,
+        "topicos": topicos, "profundidade": profundidade, "retificacoes": retificacoes,
+        "mudancas_topicos": mudancas_topicos, "duplicatas": duplicatas, "semente": semente,
+    }
+    tarefas = [(i, parametros, destino) for i in range(editais)]
+    if processos > 1:
+        with ProcessPoolExecutor(processos) as executor:
+            lotes = list(executor.map(_gerar_indice, tarefas, chunksize=max(1, editais // (processos * 8))))
+    else:
+        lotes = [_gerar_indice(tarefa) for tarefa in tarefas]
+
+    arquivos = [registro for lote in lotes for registro in lote]
+    manifesto = {
+        "gerado_em": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "parametros": parametros,
+        "totais": {
+            "arquivos": len(arquivos),
+            "retificacoes": sum(1 for a in arquivos if a["retificacao"] and "duplicata_de" not in a),
+            "duplicatas": sum(1 for a in arquivos if "duplicata_de" in a),
+            "paginas": sum(a["paginas"] for a in arquivos),
+            "bytes": sum(a["bytes"] for a in arquivos),
+        },
+        "arquivos": arquivos,
+    }
+    (destino / "manifesto.json").write_text(json.dumps(manifesto, ensure_ascii=False, indent=2), encoding="utf-8")
+    return manifesto
+
+
+def carregar_manifesto(diretorio: Path) -> dict:
+    return json.loads((Path(diretorio) / "manifesto.json").read_text(encoding="utf-8"))
+
+
+def responder_corpus(diretorio: Path) -> Callable[[List[dict]], str]:
+    """
+    Responder do FakeOpenRouter que devolve as respostas esperadas do corpus.
+
+    Identifica o edital pelo número (e retificação) impresso no cabeçalho,
+    que aparece no início do texto enviado nos dois prompts.
+    """
+    diretorio = Path(diretorio)
+    esperados: Dict[str, dict] = {}
+    for arquivo in carregar_manifesto(diretorio)["arquivos"]:
+        if arquivo["chave"] not in esperados:
+            esperados[arquivo["chave"]] = json.loads((diretorio / arquivo["esperado"]).read_text(encoding="utf-8"))
+
+    def _responder(mensagens: List[dict]) -> str:
+        sistema = next((m["content"] for m in mensagens if m["role"] == "system"), "")
+        usuario = next((m["content"] for m in mensagens if m["role"] == "user"), "")
+        encontrado = _CHAVE.search(usuario)
+        if not encontrado:
+            raise ValueError("prompt sem número de edital do corpus")
+        numero, ano, retificacao = encontrado.groups()
+        esperado = esperados[chave_edital(int(numero), int(ano), int(retificacao or 0))]
+        if "JSON" in sistema:
+            return json.dumps(esperado["metadados"], ensure_ascii=False)
+        return esperado["verticalizacao"]
+
+    return _responder
+
+
+def _faixa(valor: str) -> Tuple[int, int]:
+    minimo, _, maximo = valor.partition("-")
+    return int(minimo), int(maximo or minimo)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera um corpus sintético de editais em PDF")
+    parser.add_argument("destino", type=Path, help="Diretório de saída")
+    parser.add_argument("--editais", type=int, default=100, help="Editais originais (default 100)")
+    parser.add_argument("--paginas", type=_faixa, default=(20, 20), help="Páginas por edital: N ou MIN-MAX")
+    parser.add_argument("--cargos", type=int, default=4, help="Cargos por edital")
+    parser.add_argument("--materias", type=int, default=8, help="Matérias do conteúdo programático")
+    parser.add_argument("--topicos", type=int, default=120, help="Itens do conteúdo programático por edital")
+    parser.add_argument("--profundidade", type=int, default=3, help="Níveis máximos de numeração")
+    parser.add_argument("--retificacoes", type=float, default=0.0, help="Retificações por edital (0.2 = 20%% com uma)")
+    parser.add_argument("--mudancas-topicos", type=int, default=3, help="Mudanças no conteúdo por retificação")
+    parser.add_argument("--duplicatas", type=float, default=0.0, help="Fração de editais com cópia idêntica")
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--processos", type=int, default=1, help="Processos geradores em paralelo")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    try:
+        manifesto = gerar_corpus(
+            args.destino,
+            editais=args.editais,
+            paginas=args.paginas,
+            cargos=args.cargos,
+            materias=args.materias,
+            topicos=args.topicos,
+            profundidade=args.profundidade,
+            retificacoes=args.retificacoes,
+            mudancas_topicos=args.mudancas_topicos,
+            duplicatas=args.duplicatas,
+            semente=args.semente,
+            processos=args.processos,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+
+    totais = manifesto["totais"]
+    print(
+        f"✅ {totais['arquivos']} PDFs ({totais['retificacoes']} retificações, {totais['duplicatas']} duplicatas), "
+        f"{totais['paginas']} páginas, {totais['bytes'] / 2**20:.1f} MiB em {time.perf_counter() - inicio:.1f}s"
+    )
+    print(f"📄 Manifesto: {args.destino / 'manifesto.json'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,738 @@
+"""
+Servidores HTTP locais que imitam o OpenRouter e o PostgREST do Supabase.
+
+Permitem rodar o pipeline inteiro sem rede nem credenciais, com latência
+controlada e reprodutível (semente fixa):
+
+- `FakeOpenRouter`: endpoint `/api/v1/chat/completions` compatível com a API
+  da OpenAI, com latência + jitter, respostas em streaming (SSE) quando o
+  cliente pede `stream: true` e injeção de 429 com `retry-after-ms`.
+- `FakePostgREST`: tabelas em memória sob `/rest/v1/<tabela>` com o
+  subconjunto de filtros, `select`, `order`, `limit`, `Prefer` e
+  `Content-Range` usados pelo SupabaseManager.
+- `FakeRedis`: servidor RESP2 com os comandos usados pelo backend redis
+  do cache LLM (GET/SET com expiração, DEL, SCAN, PTTL, ...).
+
+Os servidores rodam em um thread com event loop próprio, para que o
+trabalho deles não concorra com o loop do pipeline medido.
+
+Uso:
+    with FakeOpenRouter(latencia=0.3) as llm, FakePostgREST() as db:
+        os.environ["OPENROUTER_BASE_URL"] = llm.url + "/api/v1"
+        os.environ["SUPABASE_URL"] = db.url
+"""
+import asyncio
+import json
+import operator
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit, parse_qsl
+
+MOTIVOS = {
+    200: "OK", 201: "Created", 204: "No Content", 400: "Bad Request",
+    404: "Not Found", 405: "Method Not Allowed", 429: "Too Many Requests",
+}
+
+
+@dataclass
+class Requisicao:
+    metodo: str
+    caminho: str
+    query: List[Tuple[str, str]]
+    headers: Dict[str, str]
+    corpo: bytes
+
+    def json(self):
+        return json.loads(self.corpo) if self.corpo else None
+
+
+@dataclass
+class Resposta:
+    status: int = 200
+    corpo: bytes = b""
+    headers: Dict[str, str] = field(default_factory=dict)
+    # Corpo em partes (Transfer-Encoding: chunked), para streaming
+    partes: Optional[AsyncIterator[bytes]] = None
+
+    @classmethod
+    def json(cls, dados, status: int = 200, **headers) -> "Resposta":
+        return cls(
+            status=status,
+            corpo=json.dumps(dados, ensure_ascii=False, default=str).encode("utf-8"),
+            headers={"Content-Type": "application/json", **headers}
+        )
+
+
+class ServidorTCP:
+    """Servidor asyncio em thread próprio; subclasses implementam `_conexao`."""
+
+    def __init__(self, host: str = "127.0.0.1", porta: int = 0):
+        self.host = host
+        self.porta = porta
+        self.requisicoes = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._servidor: Optional[asyncio.AbstractServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._conexoes: set = set()
+
+    async def _conexao(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        raise NotImplementedError
+
+    # ==================== CICLO DE VIDA ====================
+
+    def iniciar(self) -> "ServidorTCP":
+        """Sobe o servidor em um thread próprio e espera a porta ficar pronta."""
+        pronto = threading.Event()
+
+        def _rodar():
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            self._servidor = self._loop.run_until_complete(
+                asyncio.start_server(self._conexao, self.host, self.porta)
+            )
+            self.porta = self._servidor.sockets[0].getsockname()[1]
+            pronto.set()
+            self._loop.run_forever()
+
+            # wait_closed() espera as conexões keep-alive: fechá-las antes
+            self._servidor.close()
+            for writer in list(self._conexoes):
+                writer.close()
+            pendentes = asyncio.all_tasks(self._loop)
+            for tarefa in pendentes:
+                tarefa.cancel()
+            self._loop.run_until_complete(asyncio.gather(*pendentes, return_exceptions=True))
+            self._loop.run_until_complete(self._servidor.wait_closed())
+            self._loop.close()
+
+        self._thread = threading.Thread(target=_rodar, name=type(self).__name__, daemon=True)
+        self._thread.start()
+        pronto.wait()
+        return self
+
+    def parar(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop = None
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *exc):
+        self.parar()
+
+
+class ServidorHTTP(ServidorTCP):
+    """Servidor HTTP/1.1 mínimo (keep-alive, Content-Length e chunked)."""
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.porta}"
+
+    async def tratar(self, requisicao: Requisicao) -> Resposta:
+        raise NotImplementedError
+
+    # ==================== PROTOCOLO ====================
+
+    async def _conexao(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._conexoes.add(writer)
+        try:
+            while True:
+                linha = await reader.readline()
+                if not linha:
+                    break
+                metodo, alvo, _ = linha.decode("latin-1").split(" ", 2)
+
+                headers = {}
+                while True:
+                    cabecalho = await reader.readline()
+                    if cabecalho in (b"\r\n", b"\n", b""):
+                        break
+                    nome, _, valor = cabecalho.decode("latin-1").partition(":")
+                    headers[nome.strip().lower()] = valor.strip()
+
+                if "content-length" in headers:
+                    corpo = await reader.readexactly(int(headers["content-length"]))
+                elif headers.get("transfer-encoding", "").lower() == "chunked":
+                    corpo = await self._ler_chunked(reader)
+                else:
+                    corpo = b""
+
+                url = urlsplit(alvo)
+                self.requisicoes += 1
+                try:
+                    resposta = await self.tratar(Requisicao(
+                        metodo=metodo.upper(),
+                        caminho=url.path,
+                        query=parse_qsl(url.query, keep_blank_values=True),
+                        headers=headers,
+                        corpo=corpo
+                    ))
+                except Exception as e:
+                    resposta = Resposta.json({"message": str(e)}, status=400)
+                await self._escrever(writer, resposta)
+
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._conexoes.discard(writer)
+            writer.close()
+
+    @staticmethod
+    async def _ler_chunked(reader: asyncio.StreamReader) -> bytes:
+        partes = []
+        while True:
+            tamanho = int((await reader.readline()).split(b";")[0], 16)
+            if tamanho == 0:
+                await reader.readline()
+                return b"".join(partes)
+            partes.append(await reader.readexactly(tamanho))
+            await reader.readline()
+
+    @staticmethod
+    async def _escrever(writer: asyncio.StreamWriter, resposta: Resposta):
+        linhas = [f"HTTP/1.1 {resposta.status} {MOTIVOS.get(resposta.status, 'Unknown')}"]
+        headers = dict(resposta.headers)
+        if resposta.partes is None:
+            headers["Content-Length"] = str(len(resposta.corpo))
+        else:
+            headers["Transfer-Encoding"] = "chunked"
+        linhas += [f"{nome}: {valor}" for nome, valor in headers.items()]
+        writer.write(("\r\n".join(linhas) + "\r\n\r\n").encode("latin-1"))
+
+        if resposta.partes is None:
+            writer.write(resposta.corpo)
+        else:
+            async for parte in resposta.partes:
+                writer.write(f"{len(parte):x}\r\n".encode() + parte + b"\r\n")
+                await writer.drain()
+            writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+
+# ==================== OPENROUTER ====================
+
+# Documentos de uma chamada empacotada (build_metadata_batch_prompt)
+_DOCUMENTO_LOTE = re.compile(r"=== DOCUMENTO (\d+) ===\n(.*?)\n=== FIM DO DOCUMENTO \1 ===", re.DOTALL)
+
+def _resposta_padrao(mensagens: List[dict]) -> str:
+    """Metadados em JSON ou conteúdo verticalizado, conforme o system prompt."""
+    sistema = next((m["content"] for m in mensagens if m["role"] == "system"), "")
+    usuario = next((m["content"] for m in mensagens if m["role"] == "user"), "")
+    if "JSON" in sistema:
+        return json.dumps({
+            "cargos": ["Analista Judiciário", "Técnico Judiciário"],
+            "salarios": {"Analista Judiciário": 13994.78, "Técnico Judiciário": 8529.65},
+            "formato_prova": "mista",
+            "data_prova": "2026-03-15",
+            "data_inscricao_inicio": "2026-01-05",
+            "data_inscricao_fim": "2026-02-04",
+            "valor_inscricao": 130.0,
+            "detalhes_discursiva": None,
+        }, ensure_ascii=False)
+
+    from bench_markdown_parser import gerar_programa
+    return gerar_programa(materias=12, semente=len(usuario))
+
+
+class FakeOpenRouter(ServidorHTTP):
+    """Endpoint de chat compatível com a OpenAI com latência e 429 configuráveis."""
+
+    def __init__(
+        self,
+        latencia: float = 0.3,
+        jitter: float = 0.1,
+        taxa_429: float = 0.0,
+        retry_after_ms: int = 50,
+        intervalo_stream: float = 0.005,
+        partes_stream: int = 20,
+        responder: Callable[[List[dict]], str] = _resposta_padrao,
+        semente: int = 42,
+        sem_saida_estruturada: Iterable[str] = (),
+        **kwargs
+    ):
+        """
+        Args:
+            latencia: Tempo médio até a resposta (ou até o primeiro chunk), em segundos
+            jitter: Desvio padrão da latência (normal truncada em zero)
+            taxa_429: Fração das requisições respondidas com 429
+            retry_after_ms: Valor do header `retry-after-ms` nos 429
+            intervalo_stream: Intervalo entre chunks SSE com `stream: true`
+            partes_stream: Número de chunks em que a resposta é dividida
+            responder: Gera o conteúdo a partir das mensagens
+            semente: Semente do jitter e da injeção de 429
+            sem_saida_estruturada: Modelos que respondem 400 a `response_format`
+        """
+        super().__init__(**kwargs)
+        self.latencia = latencia
+        self.jitter = jitter
+        self.taxa_429 = taxa_429
+        self.retry_after_ms = retry_after_ms
+        self.intervalo_stream = intervalo_stream
+        self.partes_stream = partes_stream
+        self.responder = responder
+        self.aleatorio = random.Random(semente)
+        self.sem_saida_estruturada = set(sem_saida_estruturada)
+        self.respostas_429 = 0
+        self.documentos_empacotados = 0
+
+    async def tratar(self, requisicao: Requisicao) -> Resposta:
+        if not requisicao.caminho.endswith("/chat/completions"):
+            return Resposta.json({"error": {"message": "not found"}}, status=404)
+        if requisicao.metodo != "POST":
+            return Resposta.json({"error": {"message": "method not allowed"}}, status=405)
+
+        if self.aleatorio.random() < self.taxa_429:
+            self.respostas_429 += 1
+            return Resposta.json(
+                {"error": {"message": "Rate limit exceeded", "code": 429}},
+                status=429,
+                **{"retry-after-ms": str(self.retry_after_ms)}
+            )
+
+        dados = requisicao.json()
+        if "response_format" in dados and dados["model"] in self.sem_saida_estruturada:
+            return Resposta.json(
+                {"error": {"message": "response_format is not supported by this model", "code": 400}},
+                status=400
+            )
+        await asyncio.sleep(max(0.0, self.aleatorio.gauss(self.latencia, self.jitter)))
+
+        conteudo = self._responder(dados["messages"])
+        prompt_chars = sum(len(m.get("content") or "") for m in dados["messages"])
+        usage = {
+            "prompt_tokens": prompt_chars // 4,
+            "completion_tokens": len(conteudo) // 4,
+            "total_tokens": (prompt_chars + len(conteudo)) // 4,
+        }
+        base = {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "created": int(time.time()),
+            "model": dados["model"],
+        }
+
+        if dados.get("stream"):
+            return Resposta(
+                headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache"},
+                partes=self._stream(base, conteudo, usage)
+            )
+
+        return Resposta.json({
+            **base,
+            "object": "chat.completion",
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": conteudo},
+                "finish_reason": "stop",
+            }],
+            "usage": usage,
+        })
+
+    def _responder(self, mensagens: List[dict]) -> str:
+        """Chamadas empacotadas de metadados são respondidas documento a documento."""
+        usuario = next((m["content"] for m in mensagens if m["role"] == "user"), "")
+        documentos = _DOCUMENTO_LOTE.findall(usuario)
+        if not documentos:
+            return self.responder(mensagens)
+        itens = []
+        for numero, texto in documentos:
+            individual = [dict(m, content=texto) if m["role"] == "user" else m for m in mensagens]
+            itens.append({"documento": int(numero), **json.loads(self.responder(individual))})
+        self.documentos_empacotados += len(itens)
+        return json.dumps({"editais": itens}, ensure_ascii=False)
+
+    async def _stream(self, base: dict, conteudo: str, usage: dict) -> AsyncIterator[bytes]:
+        tamanho = max(1, -(-len(conteudo) // self.partes_stream))
+        for i in range(0, len(conteudo), tamanho):
+            evento = {
+                **base,
+                "object": "chat.completion.chunk",
+                "choices": [{"index": 0, "delta": {"content": conteudo[i:i + tamanho]}, "finish_reason": None}],
+            }
+            yield f"data: {json.dumps(evento, ensure_ascii=False)}\n\n".encode("utf-8")
+            await asyncio.sleep(self.intervalo_stream)
+
+        final = {
+            **base,
+            "object": "chat.completion.chunk",
+            "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+            "usage": usage,
+        }
+        yield f"data: {json.dumps(final)}\n\n".encode("utf-8")
+        yield b"data: [DONE]\n\n"
+
+
+# ==================== POSTGREST ====================
+
+def _valor(texto: str):
+    """Converte o valor de um filtro PostgREST para comparação."""
+    if texto == "null":
+        return None
+    if texto in ("true", "false"):
+        return texto == "true"
+    try:
+        return int(texto)
+    except ValueError:
+        try:
+            return float(texto)
+        except ValueError:
+            return texto
+
+
+def _ordem(comparar: Callable) -> Callable:
+    """Comparação de ordem como no SQL: NULL nunca satisfaz; texto compara como texto."""
+    def _comparar(a, b) -> bool:
+        if a is None or b is None:
+            return False
+        if isinstance(a, str) or isinstance(b, str):
+            a, b = str(a), str(b)
+        return comparar(a, b)
+    return _comparar
+
+
+def _chave_ordem(valor) -> tuple:
+    """Chave de `order`: NULL por último, números como números, o resto como texto."""
+    if valor is None:
+        return (True, 0, "")
+    if isinstance(valor, (int, float)) and not isinstance(valor, bool):
+        return (False, valor, "")
+    return (False, 0, str(valor))
+
+
+OPERADORES = {
+    "eq": operator.eq,
+    "neq": operator.ne,
+    "gt": _ordem(operator.gt),
+    "gte": _ordem(operator.ge),
+    "lt": _ordem(operator.lt),
+    "lte": _ordem(operator.le),
+    "is": operator.is_,
+}
+
+PARAMETROS_RESERVADOS = {"select", "order", "limit", "offset", "on_conflict", "or", "and"}
+
+
+class FakePostgREST(ServidorHTTP):
+    """
+    Subconjunto do PostgREST em memória.
+
+    Suporta GET/POST/PATCH/DELETE em `/rest/v1/<tabela>` com filtros
+    `eq`, `neq`, `gt`, `gte`, `lt`, `lte`, `is` e `in.(...)`, `select` de
+    colunas, `order`, `limit`, `Prefer: return=minimal|representation`,
+    `Prefer: count=exact` e `on_conflict` com `resolution=ignore-duplicates`.
+    Filtros compostos (`or=`) e embeddings de tabelas relacionadas são
+    ignorados. RPCs respondem 404, exceto as registradas em `rpcs`.
+    """
+
+    PADROES = {
+        "editais": {"status": "pendente", "custo_total_usd": 0},
+    }
+
+    def __init__(
+        self,
+        latencia: float = 0.005,
+        jitter: float = 0.002,
+        rpcs: Optional[Dict[str, Callable[[dict], object]]] = None,
+        semente: int = 7,
+        **kwargs
+    ):
+        """
+        Args:
+            latencia: Tempo médio de resposta por requisição, em segundos
+            jitter: Desvio padrão da latência
+            rpcs: Funções `/rpc/<nome>` (recebem o corpo JSON)
+        """
+        super().__init__(**kwargs)
+        self.latencia = latencia
+        self.jitter = jitter
+        self.rpcs = rpcs or {}
+        self.aleatorio = random.Random(semente)
+        self.tabelas: Dict[str, List[dict]] = {}
+
+    async def tratar(self, requisicao: Requisicao) -> Resposta:
+        if self.latencia:
+            await asyncio.sleep(max(0.0, self.aleatorio.gauss(self.latencia, self.jitter)))
+
+        prefixo = "/rest/v1/"
+        if not requisicao.caminho.startswith(prefixo):
+            return Resposta.json({"message": "not found"}, status=404)
+        recurso = requisicao.caminho[len(prefixo):]
+
+        if recurso.startswith("rpc/"):
+            funcao = self.rpcs.get(recurso[4:])
+            if funcao is None:
+                return Resposta.json({"message": f"function {recurso[4:]} not found"}, status=404)
+            return Resposta.json(funcao(requisicao.json() or {}))
+
+        tabela = self.tabelas.setdefault(recurso, [])
+        prefer = requisicao.headers.get("prefer", "")
+        metodo = requisicao.metodo
+
+        if metodo == "GET":
+            linhas = self._ordenar(self._filtrar(tabela, requisicao.query), requisicao.query)
+            total = len(linhas)
+            parametros = dict(requisicao.query)
+            inicio = int(parametros.get("offset", 0))
+            if "limit" in parametros:
+                linhas = linhas[inicio:inicio + int(parametros["limit"])]
+            else:
+                linhas = linhas[inicio:]
+            headers = {}
+            if "count=exact" in prefer:
+                fim = inicio + len(linhas) - 1
+                headers["Content-Range"] = f"{inicio}-{fim}/{total}" if linhas else f"*/{total}"
+            return Resposta.json(self._projetar(linhas, requisicao.query), **headers)
+
+        if metodo == "POST":
+            dados = requisicao.json()
+            registros = dados if isinstance(dados, list) else [dados]
+            chave = dict(requisicao.query).get("on_conflict")
+            inseridos = []
+            for registro in registros:
+                if chave and any(linha.get(chave) == registro.get(chave) for linha in tabela):
+                    if "ignore-duplicates" in prefer:
+                        continue
+                    return Resposta.json({"message": "duplicate key value"}, status=409)
+                linha = {**self.PADROES.get(recurso, {}), **registro}
+                linha.setdefault("id", str(uuid.uuid4()))
+                linha.setdefault("created_at", time.strftime("%Y-%m-%dT%H:%M:%S"))
+                tabela.append(linha)
+                inseridos.append(linha)
+            return self._representacao(inseridos, prefer, status=201)
+
+        if metodo == "PATCH":
+            dados = requisicao.json() or {}
+            alterados = self._filtrar(tabela, requisicao.query)
+            for linha in alterados:
+                linha.update(dados)
+            return self._representacao(alterados, prefer)
+
+        if metodo == "DELETE":
+            removidos = self._filtrar(tabela, requisicao.query)
+            ids = {id(linha) for linha in removidos}
+            tabela[:] = [linha for linha in tabela if id(linha) not in ids]
+            return self._representacao(removidos, prefer)
+
+        return Resposta.json({"message": "method not allowed"}, status=405)
+
+    @staticmethod
+    def _representacao(linhas: List[dict], prefer: str, status: int = 200) -> Resposta:
+        if "return=minimal" in prefer:
+            return Resposta(status=201 if status == 201 else 204)
+        return Resposta.json(linhas, status=status)
+
+    @staticmethod
+    def _filtrar(tabela: List[dict], query: List[Tuple[str, str]]) -> List[dict]:
+        condicoes = []
+        for coluna, expressao in query:
+            if coluna in PARAMETROS_RESERVADOS:
+                continue
+            operador, _, valor = expressao.partition(".")
+            negar = operador == "not"
+            if negar:
+                operador, _, valor = valor.partition(".")
+            if operador == "in":
+                valores = {_valor(v.strip().strip('"')) for v in valor.strip("()").split(",")}
+                teste = (lambda vs: lambda a: a in vs)(valores)
+            else:
+                comparar = OPERADORES[operador]
+                alvo = _valor(valor)
+                teste = (lambda f, b: lambda a: f(a, b))(comparar, alvo)
+            condicoes.append((coluna, teste, negar))
+
+        return [
+            linha for linha in tabela
+            if all(teste(linha.get(coluna)) != negar for coluna, teste, negar in condicoes)
+        ]
+
+    @staticmethod
+    def _ordenar(linhas: List[dict], query: List[Tuple[str, str]]) -> List[dict]:
+        ordem = dict(query).get("order")
+        if not ordem:
+            return linhas
+        for termo in reversed(ordem.split(",")):
+            coluna, _, direcao = termo.partition(".")
+            linhas = sorted(
+                linhas,
+                key=lambda linha: _chave_ordem(linha.get(coluna)),
+                reverse=direcao.startswith("desc")
+            )
+        return linhas
+
+    @staticmethod
+    def _projetar(linhas: List[dict], query: List[Tuple[str, str]]) -> List[dict]:
+        select = dict(query).get("select", "*")
+        if select.strip() == "*":
+            return linhas
+        colunas = [c.strip() for c in select.split(",") if "(" not in c]
+        return [{c: linha.get(c) for c in colunas} for linha in linhas]
+
+
+# ==================== REDIS ====================
+
+def _padrao_redis(padrao: str) -> "re.Pattern":
+    """Converte o glob do MATCH do Redis (* ? [..] e escapes com \\) em regex."""
+    partes = []
+    i = 0
+    while i < len(padrao):
+        c = padrao[i]
+        if c == "\\" and i + 1 < len(padrao):
+            partes.append(re.escape(padrao[i + 1]))
+            i += 2
+            continue
+        if c == "*":
+            partes.append(".*")
+        elif c == "?":
+            partes.append(".")
+        elif c == "[":
+            fim = padrao.find("]", i + 1)
+            if fim < 0:
+                partes.append(re.escape(c))
+            else:
+                partes.append(padrao[i:fim + 1])
+                i = fim
+        else:
+            partes.append(re.escape(c))
+        i += 1
+    return re.compile("".join(partes) + r"\Z", re.DOTALL)
+
+
+class FakeRedis(ServidorTCP):
+    """Servidor com protocolo Redis (RESP2) em memória, com latência opcional."""
+
+    def __init__(self, latencia: float = 0.0, senha: Optional[str] = None, **kwargs):
+        """
+        Args:
+            latencia: Atraso por comando, em segundos
+            senha: Se definida, exige AUTH antes dos demais comandos
+        """
+        super().__init__(**kwargs)
+        self.latencia = latencia
+        self.senha = senha
+        # db -> chave -> (valor, expira_em monotônico ou None)
+        self.bancos: Dict[int, Dict[bytes, Tuple[bytes, Optional[float]]]] = {}
+
+    @property
+    def url(self) -> str:
+        senha = f":{self.senha}@" if self.senha else ""
+        return f"redis://{senha}{self.host}:{self.porta}/0"
+
+    async def _conexao(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._conexoes.add(writer)
+        estado = {"db": 0, "autenticado": self.senha is None}
+        try:
+            while True:
+                comando = await self._ler_comando(reader)
+                if comando is None:
+                    break
+                self.requisicoes += 1
+                if self.latencia:
+                    await asyncio.sleep(self.latencia)
+                writer.write(self._codificar(self._executar(comando, estado)))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._conexoes.discard(writer)
+            writer.close()
+
+    @staticmethod
+    async def _ler_comando(reader: asyncio.StreamReader) -> Optional[List[bytes]]:
+        linha = await reader.readline()
+        if not linha:
+            return None
+        if not linha.startswith(b"*"):
+            return linha.split()  # comando inline (ex.: "PING" via telnet)
+        argumentos = []
+        for _ in range(int(linha[1:])):
+            tamanho = int((await reader.readline())[1:])
+            argumentos.append((await reader.readexactly(tamanho + 2))[:-2])
+        return argumentos
+
+    @classmethod
+    def _codificar(cls, valor) -> bytes:
+        if isinstance(valor, Exception):
+            return f"-ERR {valor}\r\n".encode()
+        if valor is None:
+            return b"$-1\r\n"
+        if isinstance(valor, bool) or valor == "OK":
+            return b"+OK\r\n"
+        if isinstance(valor, int):
+            return f":{valor}\r\n".encode()
+        if isinstance(valor, str):
+            valor = valor.encode()
+        if isinstance(valor, bytes):
+            return f"${len(valor)}\r\n".encode() + valor + b"\r\n"
+        return f"*{len(valor)}\r\n".encode() + b"".join(cls._codificar(v) for v in valor)
+
+    def _vivo(self, banco: dict, chave: bytes) -> Optional[Tuple[bytes, Optional[float]]]:
+        item = banco.get(chave)
+        if item is not None and item[1] is not None and item[1] <= time.monotonic():
+            del banco[chave]
+            return None
+        return item
+
+    def _executar(self, comando: List[bytes], estado: dict):
+        nome, args = comando[0].decode().upper(), comando[1:]
+        if nome == "AUTH":
+            if args and args[-1].decode() == self.senha:
+                estado["autenticado"] = True
+                return "OK"
+            return Exception("invalid password")
+        if not estado["autenticado"]:
+            return Exception("NOAUTH Authentication required.")
+
+        banco = self.bancos.setdefault(estado["db"], {})
+        if nome == "PING":
+            return "PONG" if not args else args[0]
+        if nome == "SELECT":
+            estado["db"] = int(args[0])
+            return "OK"
+        if nome == "GET":
+            item = self._vivo(banco, args[0])
+            return None if item is None else item[0]
+        if nome == "MGET":
+            return [None if (item := self._vivo(banco, c)) is None else item[0] for c in args]
+        if nome == "SET":
+            expira_em = None
+            opcoes = [a.decode().upper() for a in args[2:]]
+            for i, opcao in enumerate(opcoes):
+                if opcao in ("EX", "PX"):
+                    segundos = int(opcoes[i + 1]) / (1 if opcao == "EX" else 1000)
+                    expira_em = time.monotonic() + segundos
+            banco[args[0]] = (args[1], expira_em)
+            return "OK"
+        if nome == "DEL":
+            return sum(1 for c in args if self._vivo(banco, c) is not None and banco.pop(c, None) is not None)
+        if nome == "PTTL":
+            item = self._vivo(banco, args[0])
+            if item is None:
+                return -2
+            return -1 if item[1] is None else int((item[1] - time.monotonic()) * 1000)
+        if nome == "DBSIZE":
+            return len([c for c in list(banco) if self._vivo(banco, c) is not None])
+        if nome == "FLUSHDB":
+            banco.clear()
+            return "OK"
+        if nome == "SCAN":
+            cursor = int(args[0])
+            opcoes = {args[i].decode().upper(): args[i + 1] for i in range(1, len(args) - 1, 2)}
+            quantidade = int(opcoes.get("COUNT", b"10"))
+            padrao = _padrao_redis(opcoes["MATCH"].decode()) if "MATCH" in opcoes else None
+            chaves = sorted(banco)
+            pagina = chaves[cursor:cursor + quantidade]
+            proximo = cursor + quantidade if cursor + quantidade < len(chaves) else 0
+            encontradas = [
+                c for c in pagina
+                if self._vivo(banco, c) is not None and (padrao is None or padrao.match(c.decode()))
+            ]
+            return [str(proximo), encontradas]
+        return Exception(f"unknown command '{nome}'")
@@ -0,0 +1,86 @@
+"""
+Gerador mínimo de PDFs de texto para benchmarks (sem dependências).
+
+Escreve o PDF à mão (catálogo, árvore de páginas, fonte Helvetica com
+WinAnsiEncoding e um content stream por página), o suficiente para o PyPDF2
+extrair o texto, acentos incluídos. `gerar_pdf` produz um edital simples;
+benchmarks/corpus_sintetico.py monta editais completos sobre `escrever_pdf`.
+A semente torna cada arquivo (e portanto cada hash) distinto e reprodutível.
+"""
+import random
+from pathlib import Path
+from typing import Iterable, List, Tuple
+
+_ASSUNTOS = (
+    "Lingua Portuguesa: compreensao e interpretacao de textos",
+    "Direito Constitucional: direitos e garantias fundamentais",
+    "Direito Administrativo: atos administrativos e licitacoes",
+    "Raciocinio Logico: proposicoes e equivalencias",
+    "Nocoes de Informatica: redes de computadores e seguranca",
+    "Administracao Publica: gestao de processos e projetos",
+)
+
+
+def _escapar(texto: str) -> str:
+    return texto.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def conteudo_pagina(textos: Iterable[Tuple[float, float, str]], tamanho_fonte: int = 9) -> bytes:
+    """Content stream com cada texto na posição (x, y) em pontos, origem no canto inferior esquerdo."""
+    operadores = " ".join(f"1 0 0 1 {x:g} {y:g} Tm ({_escapar(texto)}) Tj" for x, y, texto in textos)
+    return f"BT /F1 {tamanho_fonte} Tf {operadores} ET".encode("cp1252", errors="replace")
+
+
+def _linhas_pagina(aleatorio: random.Random, pagina: int, linhas: int) -> List[str]:
+    texto = [f"EDITAL DE ABERTURA - PAGINA {pagina + 1}"]
+    for i in range(linhas - 1):
+        assunto = aleatorio.choice(_ASSUNTOS)
+        texto.append(f"{pagina + 1}.{i + 1} {assunto} (item {aleatorio.randint(1, 999)})")
+    return texto
+
+
+def escrever_pdf(caminho: Path, conteudos: Iterable[bytes]) -> Path:
+    """Grava em `caminho` um PDF A4 com uma página por content stream."""
+    objetos = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    }
+    kids = []
+    for p, stream in enumerate(conteudos):
+        pagina, conteudo = 4 + 2 * p, 5 + 2 * p
+        kids.append(f"{pagina} 0 R")
+        objetos[pagina] = (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {conteudo} 0 R >>"
+        ).encode()
+        objetos[conteudo] = f"<< /Length {len(stream)} >>\nstream\n".encode() + stream + b"\nendstream"
+    objetos[2] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>".encode()
+
+    saida = bytearray(b"%PDF-1.4\n")
+    posicoes = {}
+    for numero in sorted(objetos):
+        posicoes[numero] = len(saida)
+        saida += f"{numero} 0 obj\n".encode() + objetos[numero] + b"\nendobj\n"
+
+    inicio_xref = len(saida)
+    total = max(objetos) + 1
+    saida += f"xref\n0 {total}\n0000000000 65535 f \n".encode()
+    for numero in range(1, total):
+        saida += f"{posicoes[numero]:010d} 00000 n \n".encode()
+    saida += f"trailer\n<< /Size {total} /Root 1 0 R >>\nstartxref\n{inicio_xref}\n%%EOF\n".encode()
+
+    caminho = Path(caminho)
+    caminho.write_bytes(bytes(saida))
+    return caminho
+
+
+def gerar_pdf(caminho: Path, paginas: int = 20, linhas_por_pagina: int = 50, semente: int = 0) -> Path:
+    """Grava um PDF de `paginas` páginas de texto em `caminho`."""
+    aleatorio = random.Random(semente)
+
+    def _conteudos():
+        for p in range(paginas):
+            operadores = " ".join(f"({_escapar(l)}) '" for l in _linhas_pagina(aleatorio, p, linhas_por_pagina))
+            yield f"BT /F1 9 Tf 40 810 Td 14 TL {operadores} ET".encode("latin-1")
+
+    return escrever_pdf(caminho, _conteudos())
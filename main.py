@@ -1,133 +1,407 @@
+if __name__ == "__main__":
+    # Despacha para a CLI antes dos imports do pipeline: comandos leves
+    # (stats, cache, hash) não pagam o custo de asyncio e do pipeline, e os
+    # que processam editais importam este módulo sob demanda.
+    from src.cli import main as cli_main
+
+    raise SystemExit(cli_main())
+
 from pathlib import Path
 import time
 import json
 import asyncio
+from concurrent.futures import Executor
+from contextlib import nullcontext
 from datetime import datetime
-from typing import Optional, List
-
-from src.extractors.pdf_extractor import PDFExtractor
-from src.extractors.url_handler import URLHandler
-from src.processors.llm_client import OpenRouterClient
-from src.processors.prompt_templates import build_metadata_prompt, build_verticalization_prompt
-from src.database.supabase_client import SupabaseManager
-from src.database.models import Edital, Cargo, ConteudoProgramatico, StatusProcessamento
+from typing import Optional, List, Tuple, TYPE_CHECKING
+
+from src.processors.prompt_templates import (
+    METADATA_SYSTEM_PROMPT, build_metadata_prompt, build_metadata_reask_prompt, build_verticalization_prompt
+)
+from src.processors.markdown_parser import parse_conteudo_programatico
+from src.database.base import StorageBackend, get_storage_backend
+from src.database.models import Edital, Cargo, StatusProcessamento, EtapaProcessamento
 from src.utils.logger import logger
+from src.utils.metrics import metricas
 from src.utils.file_hash import compute_file_hash
+from src.pipeline.job import EditalJob
+from src.pipeline.scheduler import criar_pipeline
+
+# openai, httpx, PyPDF2 e pydantic só são importados no primeiro uso (partida rápida da CLI)
+if TYPE_CHECKING:
+    from src.extractors.url_handler import AsyncPDFDownloader
+    from src.processors.llm_client import OpenRouterClient
+    from src.processors.metadata_batcher import MetadataBatcher
 
 
 class EditalProcessor:
-    def __init__(self, db: SupabaseManager = None):
-        self.db = db or SupabaseManager()
-        self.llm_client = OpenRouterClient()
+    def __init__(
+        self,
+        db: StorageBackend = None,
+        perfil_dir: Optional[Path] = None,
+        llm_client: Optional["OpenRouterClient"] = None
+    ):
+        """
+        Args:
+            db: Backend de armazenamento (default: STORAGE_BACKEND)
+            perfil_dir: Se informado, `process` grava ali o perfil de CPU e
+                memória de cada etapa (ver src/utils/profiler.py)
+            llm_client: Cliente LLM (default: OpenRouterClient com cache)
+        """
+        self._db = db
+        self.perfil_dir = perfil_dir
+        self._llm_client = llm_client
+        self._metadata_batcher: Optional["MetadataBatcher"] = None
+        self._batcher_criado = False
+        self._downloader: Optional["AsyncPDFDownloader"] = None
+
+    @property
+    def db(self) -> StorageBackend:
+        """Backend de armazenamento, criado no primeiro acesso."""
+        if self._db is None:
+            self._db = get_storage_backend()
+        return self._db
+
+    @property
+    def llm_client(self) -> "OpenRouterClient":
+        """Cliente OpenRouter, criado no primeiro acesso."""
+        if self._llm_client is None:
+            from src.processors.llm_client import OpenRouterClient
+            self._llm_client = OpenRouterClient()
+        return self._llm_client
+
+    @property
+    def metadata_batcher(self) -> Optional["MetadataBatcher"]:
+        """Empacotador das chamadas de metadados de documentos curtos (None se desligado)."""
+        if not self._batcher_criado:
+            from src.processors.metadata_batcher import MetadataBatcher
+            self._metadata_batcher = MetadataBatcher.do_ambiente(self.llm_client)
+            self._batcher_criado = True
+        return self._metadata_batcher
+
+    @property
+    def downloader(self) -> "AsyncPDFDownloader":
+        """Downloader compartilhado (pool de conexões reutilizado entre editais)."""
+        if self._downloader is None:
+            from src.extractors.url_handler import AsyncPDFDownloader
+            self._downloader = AsyncPDFDownloader()
+        return self._downloader
+
+    async def close(self):
+        """Fecha conexões do banco, do downloader e da LLM."""
+        if self._downloader is not None:
+            await self._downloader.close()
+        if self._llm_client is not None:
+            await self._llm_client.close()
+        if self._db is not None:
+            await self._db.close()
 
     async def process(
         self,
         pdf_source: str,
         max_pages: Optional[int] = None,
     ) -> bool:
-        start_time = time.time()
+        """Processa um único edital executando as etapas em sequência."""
+        job = EditalJob(fonte=pdf_source, max_pages=max_pages)
 
-        # 1. Resolver fonte (local ou URL)
-        pdf_path = self._resolve_pdf_source(pdf_source)
-        if not pdf_path:
+        perfil = None
+        executor = None
+        if self.perfil_dir is not None:
+            from src.utils.profiler import PerfilEdital, ExecutorSincrono
+            perfil = PerfilEdital(job.nome)
+            executor = ExecutorSincrono()  # extração no próprio thread, visível ao cProfile
+
+        def etapa(nome: str):
+            return perfil.etapa(nome) if perfil else nullcontext()
+
+        try:
+            with etapa("hash"):
+                preparado = await self.preparar(job)
+            if not preparado:
+                return job.sucesso
+
+            try:
+                with etapa("extracao"):
+                    await self.extrair(job, executor)
+                with etapa("llm"):
+                    await self.chamar_llm(job)
+                with etapa("parse"):
+                    self.parsear(job)
+                with etapa("db"):
+                    await self.persistir(job)
+                return True
+            except Exception as e:
+                await self.falhar(job, e)
+                return False
+        finally:
+            if perfil is not None:
+                perfil.encerrar()
+                if perfil.etapas:
+                    destino = perfil.salvar(self.perfil_dir)
+                    logger.info(f"🔬 Perfil de {job.nome} gravado em {destino}")
+
+    # ==================== ETAPAS ====================
+
+    async def preparar(self, job: EditalJob) -> bool:
+        """
+        Etapa 1-3: resolve a fonte, calcula hash, verifica duplicata e cria o registro.
+
+        Returns:
+            False se o job deve parar aqui (duplicado ou falha ao resolver).
+        """
+        if job.retomado:
+            return await self._preparar_retomada(job)
+
+        # 1. Resolver fonte (local ou URL) e calcular hash
+        job.is_local = Path(job.fonte).exists()
+        fonte = await self._resolve_pdf_source(job.fonte)
+        if not fonte:
             logger.error("Não foi possível resolver a fonte do PDF")
             return False
+        job.pdf_path, job.hash_arquivo, job.nome_arquivo = fonte
+
+        # 2. Verificar duplicata
+        with metricas.span("db", operacao="edital_existe"):
+            edital_existente = await self.db.edital_existe(job.hash_arquivo)
 
-        # 2. Calcular hash e verificar duplicata
-        file_hash = compute_file_hash(pdf_path)
-        edital_existente = await self.db.edital_existe(file_hash)
+        if edital_existente and job.job_id and edital_existente["status"] != StatusProcessamento.CONCLUIDO.value:
+            # Job reivindicado após queda de outro worker: continuar do checkpoint
+            self._carregar_retomada(job, edital_existente)
+            return await self._preparar_retomada(job)
 
         if edital_existente:
             logger.info(
                 f"✅ Edital já processado (ID: {edital_existente['id']}, "
-                f"Hash: {file_hash[:8]}...)"
+                f"Hash: {job.hash_arquivo[:8]}...)"
             )
-            return True
+            job.duplicado = True
+            job.sucesso = True
+            return False
 
         # 3. Criar registro inicial no banco
         edital = Edital(
-            hash_arquivo=file_hash,
-            nome_arquivo=pdf_path.name,
-            url_origem=pdf_source if not Path(pdf_source).exists() else None,
-            tamanho_bytes=pdf_path.stat().st_size,
+            hash_arquivo=job.hash_arquivo,
+            nome_arquivo=job.nome_arquivo,
+            url_origem=None if job.is_local else job.fonte,
+            tamanho_bytes=job.pdf_path.stat().st_size,
         )
 
         try:
-            edital_id = await self.db.criar_edital(edital)
-            logger.info(f"Edital criado no banco: {edital_id}")
+            with metricas.span("db", operacao="criar_edital"):
+                job.edital_id = await self.db.criar_edital(edital)
+            logger.info(f"Edital criado no banco: {job.edital_id}")
         except Exception as e:
-            logger.error("Erro ao criar edital no banco", e)
+            logger.error(f"Erro ao criar edital no banco: {e}")
             return False
 
-        try:
-            # 4. Extrair texto
-            logger.log_extraction_start(pdf_path, "local" if Path(pdf_source).exists() else "url")
-            extractor = PDFExtractor(max_pages=max_pages)
-            text = extractor.extract_text(pdf_path)
-            metadata_basica = extractor.extract_metadata(pdf_path)
-
-            # Atualizar total de páginas
-            await self.db.atualizar_edital(edital_id, {
-                "total_paginas": metadata_basica["total_pages"],
-                "texto_extraido": text  # Armazenar texto completo
-            })
+        return True
 
-            extraction_time = time.time() - start_time
-            logger.log_extraction_complete(
-                metadata_basica["total_pages"],
-                len(text),
-                extraction_time
-            )
-
-            # 5 e 6. Processar com LLM em paralelo - Metadados e Verticalização
-            metadata_prompt = build_metadata_prompt(text[:15000])
-            vert_prompt = build_verticalization_prompt(text)
-
-            # Executar ambas chamadas LLM em paralelo
-            metadata_task = self.llm_client.process_with_fallback(
-                prompt=metadata_prompt,
-                system_prompt="Extraia informações precisas do edital em JSON válido."
-            )
-            vert_task = self.llm_client.process_with_fallback(
-                prompt=vert_prompt,
-                system_prompt="Estruture o conteúdo mantendo hierarquia original."
+    async def extrair(
+        self,
+        job: EditalJob,
+        executor: Optional[Executor] = None,
+        baixa_memoria: bool = False,
+        teto_memoria: Optional[int] = None
+    ):
+        """
+        Etapa 4: extrai texto (em thread ou no pool de processos informado).
+
+        `baixa_memoria` e `teto_memoria` selecionam a extração em streaming
+        (ver `extrair_pdf`).
+        """
+        if job.texto is not None:
+            return  # Retomada: texto já extraído em execução anterior
+
+        logger.log_extraction_start(job.pdf_path, "local" if job.is_local else "url")
+        inicio = time.time()
+
+        from src.extractors.pdf_extractor import extrair_pdf
+
+        loop = asyncio.get_running_loop()
+        with metricas.span("extracao"):
+            job.texto, job.total_paginas = await loop.run_in_executor(
+                executor, extrair_pdf, job.pdf_path, job.max_pages, baixa_memoria, teto_memoria
             )
+        metricas.incrementar("paginas_extraidas_total", job.total_paginas or 0)
+        metricas.incrementar("caracteres_extraidos_total", len(job.texto))
+
+        # Atualizar total de páginas
+        await self._checkpoint(job, EtapaProcessamento.EXTRAIDO, {
+            "total_paginas": job.total_paginas,
+            "texto_extraido": job.texto  # Armazenar texto completo
+        })
+
+        logger.log_extraction_complete(
+            job.total_paginas,
+            len(job.texto),
+            time.time() - inicio
+        )
 
-            (metadata_json, model_used_meta), (content_md, model_used_vert) = await asyncio.gather(
-                metadata_task, vert_task
-            )
+    async def chamar_llm(self, job: EditalJob):
+        """
+        Etapas 5-6: metadados e verticalização em paralelo.
+
+        Cada resposta é gravada assim que chega; na retomada, só as chamadas
+        sem resultado salvo são refeitas. Campos de metadados ausentes ou
+        inválidos são perguntados de novo isoladamente (`_completar_metadados`).
+        """
+        from src.processors.metadata_schema import esquema_json
+
+        async def _metadados():
+            batcher = self.metadata_batcher
+            if batcher is not None and batcher.aceita(job.texto):
+                # Documento curto: pode seguir junto com outros em uma só requisição
+                with metricas.span("llm", chamada="metadados"):
+                    job.metadata_json, job.modelo_metadata = await batcher.extrair(job.texto)
+            else:
+                metadata_prompt = build_metadata_prompt(job.texto[:15000])
+                with metricas.span("llm", chamada="metadados"):
+                    job.metadata_json, job.modelo_metadata = await self.llm_client.process_with_fallback(
+                        prompt=metadata_prompt,
+                        system_prompt=METADATA_SYSTEM_PROMPT,
+                        response_format=esquema_json()
+                    )
+                logger.log_llm_call(job.modelo_metadata, len(metadata_prompt), len(job.metadata_json))
+            await self._completar_metadados(job)
+            await self._checkpoint_llm(job, {"metadados_brutos": job.metadata_json})
+
+        async def _revisar_metadados():
+            # Retomada: resposta gravada antes da validação por campo
+            if await self._completar_metadados(job):
+                await self._checkpoint_llm(job, {"metadados_brutos": job.metadata_json})
+
+        async def _verticalizacao():
+            vert_prompt = build_verticalization_prompt(job.texto)
+            with metricas.span("llm", chamada="verticalizacao"):
+                job.conteudo_md, job.modelo_verticalizacao = await self.llm_client.process_with_fallback(
+                    prompt=vert_prompt,
+                    system_prompt="Estruture o conteúdo mantendo hierarquia original."
+                )
+            logger.log_llm_call(job.modelo_verticalizacao, len(vert_prompt), len(job.conteudo_md))
+            await self._checkpoint_llm(job, {
+                "conteudo_verticalizado_md": job.conteudo_md,
+                "modelo_usado": job.modelo_verticalizacao,
+            })
 
-            logger.log_llm_call(model_used_meta, len(metadata_prompt), len(metadata_json))
-            logger.log_llm_call(model_used_vert, len(vert_prompt), len(content_md))
+        # Executar as chamadas pendentes em paralelo
+        tarefas = []
+        if job.metadata_json is None:
+            tarefas.append(_metadados())
+        else:
+            tarefas.append(_revisar_metadados())
+        if job.conteudo_md is None:
+            tarefas.append(_verticalizacao())
+        await asyncio.gather(*tarefas)
+
+    async def _completar_metadados(self, job: EditalJob) -> bool:
+        """
+        Pergunta de novo, com um prompt curto, só os campos de metadados que
+        faltaram ou não passaram na validação (uma rodada).
+
+        Returns:
+            True se `job.metadata_json` foi substituído pelos metadados completados.
+        """
+        from src.processors.metadata_schema import esquema_json, interpretar_metadados
+
+        metadados, falhas, reparado = interpretar_metadados(job.metadata_json)
+        if reparado:
+            metricas.incrementar("metadados_json_reparado_total")
+        if not falhas:
+            return False
 
-            # 7. Parsear e salvar metadados
-            metadata_dict = self._parse_metadata_json(metadata_json)
-            await self.db.atualizar_edital(edital_id, {
+        metricas.incrementar("metadados_campos_falhos_total", len(falhas))
+        logger.warning(f"⚠️  {job.nome}: metadados sem {', '.join(falhas)}; perguntando só esses campos")
+        prompt = build_metadata_reask_prompt(job.texto, falhas)
+        try:
+            with metricas.span("llm", chamada="metadados_campos"):
+                resposta, modelo = await self.llm_client.process_with_fallback(
+                    prompt=prompt,
+                    system_prompt=METADATA_SYSTEM_PROMPT,
+                    response_format=esquema_json(list(falhas))
+                )
+        except Exception as e:
+            # Segue com os campos válidos; a retomada tenta de novo
+            logger.error(f"Erro ao completar metadados de {job.nome}: {e}")
+            return False
+        logger.log_llm_call(modelo, len(prompt), len(resposta))
+
+        complemento, restantes, _ = interpretar_metadados(resposta, falhas)
+        for campo in falhas:
+            if campo not in restantes:
+                metadados[campo] = complemento[campo]
+        if restantes:
+            logger.warning(f"⚠️  {job.nome}: metadados ainda sem {', '.join(restantes)}")
+        metricas.incrementar("metadados_campos_recuperados_total", len(falhas) - len(restantes))
+
+        job.metadata_json = json.dumps(metadados, ensure_ascii=False)
+        return True
+
+    async def _checkpoint_llm(self, job: EditalJob, dados: dict):
+        """Grava uma resposta da LLM; a etapa avança para verticalizado quando ambas existem."""
+        if job.metadata_json is not None and job.conteudo_md is not None:
+            etapa = EtapaProcessamento.VERTICALIZADO
+        elif job.metadata_json is not None:
+            etapa = EtapaProcessamento.METADADOS
+        else:
+            etapa = EtapaProcessamento.EXTRAIDO
+        await self._checkpoint(job, etapa, dados)
+
+    async def _checkpoint(self, job: EditalJob, etapa: EtapaProcessamento, dados: Optional[dict] = None):
+        """Registra a etapa concluída junto com os dados produzidos por ela."""
+        dados = dict(dados or {})
+        dados["etapa_concluida"] = etapa.value
+        dados["checkpoint_em"] = datetime.utcnow().isoformat()
+        with metricas.span("db", operacao="checkpoint"):
+            await self.db.atualizar_edital(job.edital_id, dados)
+
+    def parsear(self, job: EditalJob):
+        """Etapa 7: converte as respostas da LLM em metadados, cargos e conteúdo."""
+        with metricas.span("parse"):
+            job.metadata = self._parse_metadata_json(job.metadata_json)
+            job.cargos = self._parse_cargos(job.metadata, job.edital_id)
+            job.conteudos = parse_conteudo_programatico(job.conteudo_md, job.edital_id)
+        metricas.incrementar("linhas_conteudo_total", len(job.conteudos))
+
+    async def persistir(self, job: EditalJob):
+        """Etapas 8-10: salva metadados, cargos e conteúdo e finaliza o edital."""
+        metadata_dict = job.metadata
+        with metricas.span("db", operacao="atualizar_edital"):
+            await self.db.atualizar_edital(job.edital_id, {
                 "formato_prova": metadata_dict.get("formato_prova"),
                 "data_prova": metadata_dict.get("data_prova"),
                 "data_inscricao_inicio": metadata_dict.get("data_inscricao_inicio"),
                 "data_inscricao_fim": metadata_dict.get("data_inscricao_fim"),
                 "valor_inscricao": metadata_dict.get("valor_inscricao"),
                 "detalhes_discursiva": metadata_dict.get("detalhes_discursiva"),
-                "conteudo_verticalizado_md": content_md,
-                "modelo_usado": model_used_vert,
+                "conteudo_verticalizado_md": job.conteudo_md,
+                "modelo_usado": job.modelo_verticalizacao,
             })
 
-            # 8 e 9. Salvar cargos e conteúdo em paralelo
-            cargos = self._parse_cargos(metadata_dict, edital_id)
-            conteudos = self._parse_conteudo_programatico(content_md, edital_id)
+        # Na retomada, descartar linhas de uma gravação interrompida
+        if job.retomado:
+            with metricas.span("db", operacao="remover_linhas"):
+                await self.db.remover_linhas_edital(job.edital_id)
 
-            await asyncio.gather(
-                self.db.inserir_cargos(cargos),
-                self.db.inserir_conteudo_programatico(conteudos)
-            )
+        async def _medido(operacao: str, escrita):
+            with metricas.span("db", operacao=operacao):
+                return await escrita
 
-            logger.info(f"Inseridos {len(cargos)} cargos e {len(conteudos)} itens de conteúdo")
+        # Salvar cargos e conteúdo em paralelo
+        ok_cargos, ok_conteudo = await asyncio.gather(
+            _medido("inserir_cargos", self.db.inserir_cargos(job.cargos)),
+            _medido("inserir_conteudo", self.db.inserir_conteudo_programatico(job.conteudos))
+        )
+        if not (ok_cargos and ok_conteudo):
+            raise RuntimeError("Falha ao gravar cargos/conteúdo programático")
+
+        await self._checkpoint(job, EtapaProcessamento.LINHAS_GRAVADAS)
+        logger.info(f"Inseridos {len(job.cargos)} cargos e {len(job.conteudos)} itens de conteúdo")
 
-            # 10. Finalizar processamento
-            tempo_total = time.time() - start_time
+        # Finalizar processamento
+        tempo_total = time.time() - job.inicio
+        with metricas.span("db", operacao="finalizar"):
             await self.db.finalizar_processamento(
-                edital_id=edital_id,
+                edital_id=job.edital_id,
                 sucesso=True,
                 dados_extras={
                     "tempo_processamento_segundos": round(tempo_total, 2),
@@ -135,44 +409,97 @@ class EditalProcessor:
                 }
             )
 
-            logger.info(f"✅ PROCESSAMENTO CONCLUÍDO | ID: {edital_id} | Tempo: {tempo_total:.2f}s")
-            return True
+        job.sucesso = True
+        logger.info(f"✅ PROCESSAMENTO CONCLUÍDO | ID: {job.edital_id} | Tempo: {tempo_total:.2f}s")
 
-        except Exception as e:
-            # Marcar como erro no banco
+    async def falhar(self, job: EditalJob, erro: Exception):
+        """Marca o edital como erro no banco."""
+        job.erro = job.erro or str(erro)
+        if job.edital_id:
             await self.db.finalizar_processamento(
-                edital_id=edital_id,
+                edital_id=job.edital_id,
                 sucesso=False,
-                erro_mensagem=str(e)
+                erro_mensagem=str(erro)
             )
-            logger.error("Erro fatal no processamento", e)
-            return False
+        logger.error(f"Erro fatal no processamento: {erro}")
+
+    # ==================== RETOMADA ====================
+
+    def job_para_retomar(self, edital: dict, input_dir: Path = Path("input_pdfs")) -> EditalJob:
+        """Reconstrói o job de um edital interrompido a partir do registro no banco."""
+        fonte = edital.get("url_origem") or str(input_dir / edital["nome_arquivo"])
+        job = EditalJob(fonte=fonte)
+        self._carregar_retomada(job, edital)
+        return job
+
+    @staticmethod
+    def _carregar_retomada(job: EditalJob, edital: dict):
+        """Preenche o job com o que já foi salvo nos checkpoints do edital."""
+        job.edital_id = edital["id"]
+        job.hash_arquivo = edital["hash_arquivo"]
+        job.nome_arquivo = edital["nome_arquivo"]
+        job.is_local = not edital.get("url_origem")
+        job.retomado = True
+        job.texto = edital.get("texto_extraido")
+        job.total_paginas = edital.get("total_paginas")
+        job.metadata_json = edital.get("metadados_brutos")
+        job.conteudo_md = edital.get("conteudo_verticalizado_md")
+        job.modelo_verticalizacao = edital.get("modelo_usado")
+
+    async def _preparar_retomada(self, job: EditalJob) -> bool:
+        """Só precisa do arquivo se o texto ainda não foi extraído."""
+        logger.info(
+            f"🔁 Retomando {job.nome} (ID: {job.edital_id}, "
+            f"texto: {'sim' if job.texto is not None else 'não'}, "
+            f"metadados: {'sim' if job.metadata_json is not None else 'não'}, "
+            f"verticalização: {'sim' if job.conteudo_md is not None else 'não'})"
+        )
+        if job.texto is not None or job.pdf_path is not None:
+            return True
 
-    def _resolve_pdf_source(self, source: str) -> Optional[Path]:
-        """Resolve fonte local ou baixa de URL."""
+        fonte = await self._resolve_pdf_source(job.fonte)
+        if not fonte:
+            raise FileNotFoundError(f"Arquivo original não encontrado: {job.fonte}")
+
+        pdf_path, file_hash, _ = fonte
+        if file_hash != job.hash_arquivo:
+            raise ValueError(f"Hash de {pdf_path} não confere com o edital {job.edital_id}")
+        job.pdf_path = pdf_path
+        return True
+
+    async def _resolve_pdf_source(self, source: str) -> Optional[Tuple[Path, str, str]]:
+        """
+        Resolve fonte local ou baixa de URL.
+
+        Returns:
+            Tupla (caminho, hash SHA-256, nome do arquivo) ou None. Para URLs o
+            hash é calculado durante o download, sem reler o arquivo.
+        """
         path = Path(source)
         if path.exists():
-            return path
-
-        with URLHandler() as handler:
-            output_path = Path("temp") / "edital_baixado.pdf"
-            if handler.download_pdf(source, output_path):
-                return output_path
-        return None
+            with metricas.span("hash"):
+                file_hash = await asyncio.to_thread(compute_file_hash, path)
+            metricas.incrementar("bytes_lidos_total", path.stat().st_size, origem="local")
+            return path, file_hash, path.name
+
+        with metricas.span("download"):
+            resultado = await self.downloader.download(source)
+        if not resultado:
+            return None
+        metricas.incrementar(
+            "bytes_lidos_total", resultado.tamanho_bytes,
+            origem="url_304" if resultado.nao_modificado else "url"
+        )
+        return resultado.path, resultado.sha256, resultado.nome_arquivo
 
     def _parse_metadata_json(self, metadata_json: str) -> dict:
-        """Limpa e parseia JSON retornado pela LLM."""
-        import re
+        """Repara e valida o JSON de metadados; campos inválidos ficam vazios."""
+        from src.processors.metadata_schema import interpretar_metadados
 
-        # Remover markdown code blocks
-        cleaned = re.sub(r'^```(?:json)?\n?', '', metadata_json.strip())
-        cleaned = re.sub(r'\n?```$', '', cleaned)
-
-        try:
-            return json.loads(cleaned)
-        except json.JSONDecodeError:
-            logger.error(f"JSON inválido: {cleaned[:200]}")
-            return {}
+        metadados, falhas, _ = interpretar_metadados(metadata_json)
+        if falhas:
+            logger.error(f"Metadados inválidos ({', '.join(falhas)}): {metadata_json[:200]}")
+        return metadados
 
     def _parse_cargos(self, metadata_dict: dict, edital_id: str) -> List[Cargo]:
         """Converte metadados em lista de Cargo."""
@@ -186,103 +513,50 @@ class EditalProcessor:
             ))
         return cargos
 
-    def _parse_conteudo_programatico(
-        self,
-        markdown_content: str,
-        edital_id: str
-    ) -> List[ConteudoProgramatico]:
-        """Parseia markdown em estrutura hierárquica."""
-        import re
-
-        lines = markdown_content.split('\n')
-        conteudos = []
-        current_section = None
-        current_materia = None
-        ordem = 0
-
-        for line in lines:
-            line = line.strip()
-
-            if line.startswith('## '):
-                current_section = line[3:].strip()
-                continue
-
-            if line.startswith('### '):
-                current_materia = line[4:].strip().upper()
-                continue
-
-            if not line or line.startswith('#') or line.startswith('---'):
-                continue
-
-            # Parsear numeração hierárquica
-            patterns = [
-                r'^(\d+(?:\.\d+)*)[.\)]\s+(.+)$',
-                r'^(\d+(?:\.\d+)*)\s*[-–—]\s*(.+)$',
-                r'^(\d+(?:\.\d+)*)\s+([A-ZÀ-Ú].+)$',
-            ]
-
-            matched = False
-            for pattern in patterns:
-                match = re.match(pattern, line)
-                if match:
-                    numeracao, descricao = match.groups()
-                    partes = numeracao.split('.')
-
-                    conteudos.append(ConteudoProgramatico(
-                        edital_id=edital_id,
-                        secao=current_section,
-                        materia=current_materia,
-                        descricao=descricao.strip(),
-                        nivel_1=partes[0] if len(partes) >= 1 else None,
-                        nivel_2=partes[1] if len(partes) >= 2 else None,
-                        nivel_3=partes[2] if len(partes) >= 3 else None,
-                        nivel_4=partes[3] if len(partes) >= 4 else None,
-                        ordem=ordem
-                    ))
-                    ordem += 1
-                    matched = True
-                    break
-
-            # Se não houver numeração, adicionar como item simples
-            if not matched and line:
-                clean_line = re.sub(r'^\s*[-•]\s*', '', line).strip()
-                if clean_line:
-                    conteudos.append(ConteudoProgramatico(
-                        edital_id=edital_id,
-                        secao=current_section,
-                        materia=current_materia,
-                        descricao=clean_line,
-                        ordem=ordem
-                    ))
-                    ordem += 1
-
-        return conteudos
-
-
-async def process_pdf_with_info(processor: EditalProcessor, pdf_file: Path) -> dict:
-    """Processa um PDF e retorna informações do resultado."""
-    print(f"\n{'='*60}")
-    print(f"🔄 Processando: {pdf_file.name}")
-    print(f"{'='*60}\n")
-
-    success = await processor.process(
-        pdf_source=str(pdf_file),
-        max_pages=None  # Processar todas as páginas
-    )
 
-    return {
-        'arquivo': pdf_file.name,
-        'sucesso': success
-    }
+async def _imprimir_resultado(job: EditalJob):
+    """Mostra o resultado de cada edital assim que ele sai do pipeline."""
+    if job.duplicado:
+        print(f"⏭️  {job.nome}: já processado")
+    elif job.sucesso:
+        print(f"✅ {job.nome}: concluído em {time.time() - job.inicio:.2f}s")
+    else:
+        print(f"❌ {job.nome}: {job.erro or 'falha'}")
+
+
+def _exportar_metricas(mostrar_resumo: bool = True):
+    """Grava as métricas da execução (METRICS_PATH) e mostra os tempos por etapa."""
+    if mostrar_resumo:
+        print(f"\n⏱️  Tempos por etapa:")
+        for linha in metricas.resumo():
+            print(f"  {linha}")
+    try:
+        destino = metricas.exportar()
+        print(f"\n📏 Métricas gravadas em {destino}")
+    except OSError as e:
+        logger.error(f"Erro ao exportar métricas: {e}")
+
+
+def _pdfs_de_entrada(fontes: Optional[List[str]] = None) -> List[str]:
+    """Fontes informadas na linha de comando ou, se nenhuma, os PDFs de input_pdfs/."""
+    if fontes:
+        return list(fontes)
+    input_dir = Path("input_pdfs")
+    return [str(pdf) for pdf in input_dir.glob("*.pdf")] if input_dir.exists() else []
 
 
-async def main():
-    """Função principal com processamento paralelo de PDFs."""
-    processor = EditalProcessor()
+async def main(
+    fontes: Optional[List[str]] = None,
+    max_pages: Optional[int] = None,
+    perfil_dir: Optional[Path] = None
+):
+    """
+    Função principal com processamento paralelo de PDFs.
 
-    # Verificar se há PDFs no diretório input_pdfs
-    input_dir = Path("input_pdfs")
-    pdf_files = list(input_dir.glob("*.pdf")) if input_dir.exists() else []
+    Com `perfil_dir`, os editais são processados um por vez com perfil de
+    CPU/memória por etapa gravado nesse diretório.
+    """
+    pdf_files = _pdfs_de_entrada(fontes)
 
     if not pdf_files:
         print("❌ Nenhum PDF encontrado no diretório 'input_pdfs/'")
@@ -292,27 +566,28 @@ async def main():
         print("  await processor.process('https://exemplo.com/edital.pdf')")
         exit(1)
 
-    print(f"📂 Encontrados {len(pdf_files)} PDF(s) no diretório 'input_pdfs/'")
-    print(f"⚡ Processamento paralelo habilitado\n")
+    print(f"📂 {len(pdf_files)} PDF(s) para processar")
 
-    # Processar todos os PDFs em paralelo (máximo 3 simultâneos para não sobrecarregar)
-    max_concurrent = 3
-    resultados = []
+    processor = EditalProcessor(perfil_dir=perfil_dir)
 
-    for i in range(0, len(pdf_files), max_concurrent):
-        batch = pdf_files[i:i + max_concurrent]
-        batch_results = await asyncio.gather(
-            *[process_pdf_with_info(processor, pdf) for pdf in batch],
-            return_exceptions=True
-        )
+    if perfil_dir is not None:
+        print(f"🔬 Modo perfil: um edital por vez, relatórios em {perfil_dir}/\n")
+        resultados = []
+        for fonte in pdf_files:
+            sucesso = await processor.process(fonte, max_pages=max_pages)
+            resultados.append({'arquivo': Path(fonte).name, 'sucesso': sucesso})
+    else:
+        print(f"⚡ Pipeline por etapas habilitado\n")
 
-        # Processar resultados do batch
-        for result in batch_results:
-            if isinstance(result, Exception):
-                print(f"❌ Erro: {result}")
-                resultados.append({'arquivo': 'desconhecido', 'sucesso': False})
-            else:
-                resultados.append(result)
+        # Etapas com larguras independentes ligadas por filas limitadas
+        # (ajuste com PIPELINE_<ETAPA>_WORKERS, ex.: PIPELINE_LLM_WORKERS=8)
+        pipeline = criar_pipeline(processor, on_concluido=_imprimir_resultado)
+        try:
+            jobs = await pipeline.run(pdf_files, max_pages=max_pages)
+        finally:
+            pipeline.close()
+
+        resultados = [{'arquivo': job.nome, 'sucesso': job.sucesso} for job in jobs]
 
     # Mostrar resumo
     print(f"\n\n{'='*60}")
@@ -338,11 +613,76 @@ async def main():
         print(f"  Hits: {cache_stats['hits']}")
         print(f"  Misses: {cache_stats['misses']}")
         print(f"  Taxa de acerto: {cache_stats['hit_rate_percent']:.2f}%")
-        print(f"  Tamanho: {cache_stats['cache_size']} entradas\n")
+        print(f"  Tamanho: {cache_stats['cache_size']} entradas")
 
     # Fechar conexões
-    await processor.db.close()
+    await processor.close()
+    _exportar_metricas()
 
 
-if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+async def resume(incluir_erros: bool = False):
+    """Retoma editais interrompidos a partir do último checkpoint."""
+    processor = EditalProcessor()
+
+    editais = await processor.db.buscar_editais_incompletos(incluir_erros=incluir_erros)
+    if not editais:
+        print("✅ Nenhum edital incompleto para retomar")
+        await processor.close()
+        return
+
+    print(f"🔁 Retomando {len(editais)} edital(is) incompleto(s)\n")
+    for edital in editais:
+        print(f"  {edital['nome_arquivo']}: última etapa = {edital.get('etapa_concluida') or 'nenhuma'}")
+    print()
+
+    pipeline = criar_pipeline(processor, on_concluido=_imprimir_resultado)
+    try:
+        jobs = await pipeline.run(processor.job_para_retomar(e) for e in editais)
+    finally:
+        pipeline.close()
+
+    concluidos = sum(job.sucesso for job in jobs)
+    print(f"\n📊 Retomada: {concluidos}/{len(jobs)} concluídos")
+    await processor.close()
+    _exportar_metricas()
+
+
+async def enqueue(fontes: Optional[List[str]] = None):
+    """Enfileira PDFs (default: input_pdfs/) na fila compartilhada de jobs."""
+    from src.pipeline.worker import enfileirar_fontes
+
+    db = get_storage_backend()
+    pdf_files = _pdfs_de_entrada(fontes)
+    try:
+        inseridos = await enfileirar_fontes(db, pdf_files)
+    finally:
+        await db.close()
+    print(f"📥 {inseridos} novo(s) job(s) enfileirado(s) de {len(pdf_files)} PDF(s)")
+
+
+async def worker(drenar: bool = False, worker_id: Optional[str] = None):
+    """Consome a fila de jobs com lease (pode rodar em vários processos/máquinas)."""
+    from src.pipeline.worker import LeaseWorker
+
+    processor = EditalProcessor()
+    try:
+        jobs = await LeaseWorker(processor, worker_id=worker_id).run(drenar=drenar)
+    finally:
+        await processor.close()
+
+    concluidos = sum(job.sucesso for job in jobs)
+    print(f"\n📊 Worker: {concluidos}/{len(jobs)} jobs concluídos")
+    _exportar_metricas()
+
+
+async def daemon():
+    """Observa input_pdfs/ e processa novos PDFs com pools sempre aquecidos."""
+    from src.pipeline.daemon import EditalDaemon
+
+    processor = EditalProcessor()
+    edital_daemon = EditalDaemon(processor, input_dir=Path("input_pdfs"))
+    edital_daemon.instalar_sinais()
+    try:
+        await edital_daemon.run()
+    finally:
+        await processor.close()
@@ -0,0 +1,26 @@
+-- Migration: Checkpoints por etapa
+-- Descrição: Registra a última etapa concluída de cada edital para retomar
+--            execuções interrompidas sem refazer trabalho (texto, LLM)
+-- Data: 2026-10-19
+
+-- ============================================================
+-- COLUNAS DE CHECKPOINT
+-- ============================================================
+ALTER TABLE editais ADD COLUMN IF NOT EXISTS etapa_concluida TEXT;
+ALTER TABLE editais ADD COLUMN IF NOT EXISTS checkpoint_em TIMESTAMPTZ;
+ALTER TABLE editais ADD COLUMN IF NOT EXISTS metadados_brutos TEXT;
+
+-- ============================================================
+-- ÍNDICES PARA PERFORMANCE
+-- ============================================================
+-- Busca de editais incompletos pelo comando de retomada
+CREATE INDEX IF NOT EXISTS idx_editais_incompletos
+    ON editais(checkpoint_em)
+    WHERE status = 'processando';
+
+-- ============================================================
+-- COMENTÁRIOS DAS COLUNAS
+-- ============================================================
+COMMENT ON COLUMN editais.etapa_concluida IS 'Última etapa concluída: extraido, metadados, verticalizado, linhas_gravadas';
+COMMENT ON COLUMN editais.checkpoint_em IS 'Momento do último checkpoint registrado';
+COMMENT ON COLUMN editais.metadados_brutos IS 'Resposta bruta da LLM de metadados (reaproveitada na retomada)';
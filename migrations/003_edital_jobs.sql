@@ -0,0 +1,136 @@
+-- Migration: Fila de jobs com lease
+-- Descrição: Permite vários workers (processos ou máquinas) consumirem editais
+--            sem disputar o mesmo arquivo, com expiração de lease e heartbeat
+-- Data: 2026-10-19
+
+-- ============================================================
+-- TABELA: edital_jobs
+-- ============================================================
+CREATE TABLE IF NOT EXISTS edital_jobs (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    chave TEXT UNIQUE NOT NULL,
+    fonte TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pendente',
+    worker_id TEXT,
+    lease_expira_em TIMESTAMPTZ,
+    tentativas INTEGER NOT NULL DEFAULT 0,
+    max_tentativas INTEGER NOT NULL DEFAULT 3,
+    erro_mensagem TEXT,
+    edital_id UUID REFERENCES editais(id) ON DELETE SET NULL,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- ============================================================
+-- ÍNDICES PARA PERFORMANCE
+-- ============================================================
+CREATE INDEX IF NOT EXISTS idx_edital_jobs_disponiveis
+    ON edital_jobs(created_at)
+    WHERE status IN ('pendente', 'em_andamento');
+
+-- ============================================================
+-- RPC: claim_edital_jobs
+-- Reivindica até p_limite jobs pendentes ou com lease expirado.
+-- FOR UPDATE SKIP LOCKED garante que dois workers nunca recebam o mesmo job.
+-- ============================================================
+CREATE OR REPLACE FUNCTION claim_edital_jobs(
+    p_worker_id TEXT,
+    p_lease_segundos INTEGER DEFAULT 300,
+    p_limite INTEGER DEFAULT 1
+)
+RETURNS SETOF edital_jobs
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    -- Leases expirados que já esgotaram as tentativas viram erro
+    UPDATE edital_jobs
+    SET status = 'erro',
+        erro_mensagem = 'Lease expirado após ' || tentativas || ' tentativas',
+        updated_at = NOW()
+    WHERE status = 'em_andamento'
+      AND lease_expira_em < NOW()
+      AND tentativas >= max_tentativas;
+
+    RETURN QUERY
+    UPDATE edital_jobs j
+    SET status = 'em_andamento',
+        worker_id = p_worker_id,
+        lease_expira_em = NOW() + make_interval(secs => p_lease_segundos),
+        tentativas = j.tentativas + 1,
+        updated_at = NOW()
+    WHERE j.id IN (
+        SELECT id FROM edital_jobs
+        WHERE (status = 'pendente'
+               OR (status = 'em_andamento' AND lease_expira_em < NOW()))
+          AND tentativas < max_tentativas
+        ORDER BY created_at
+        LIMIT p_limite
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING j.*;
+END;
+$$;
+
+-- ============================================================
+-- RPC: renew_edital_job_lease (heartbeat)
+-- Retorna FALSE se o lease foi perdido para outro worker.
+-- ============================================================
+CREATE OR REPLACE FUNCTION renew_edital_job_lease(
+    p_job_id UUID,
+    p_worker_id TEXT,
+    p_lease_segundos INTEGER DEFAULT 300
+)
+RETURNS BOOLEAN
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    UPDATE edital_jobs
+    SET lease_expira_em = NOW() + make_interval(secs => p_lease_segundos),
+        updated_at = NOW()
+    WHERE id = p_job_id
+      AND worker_id = p_worker_id
+      AND status = 'em_andamento';
+    RETURN FOUND;
+END;
+$$;
+
+-- ============================================================
+-- RPC: complete_edital_job
+-- Com erro, o job volta para 'pendente' enquanto houver tentativas.
+-- Só o dono atual do lease (status 'em_andamento') conclui o job.
+-- ============================================================
+CREATE OR REPLACE FUNCTION complete_edital_job(
+    p_job_id UUID,
+    p_worker_id TEXT,
+    p_sucesso BOOLEAN,
+    p_erro TEXT DEFAULT NULL,
+    p_edital_id UUID DEFAULT NULL
+)
+RETURNS BOOLEAN
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    UPDATE edital_jobs
+    SET status = CASE
+            WHEN p_sucesso THEN 'concluido'
+            WHEN tentativas < max_tentativas THEN 'pendente'
+            ELSE 'erro'
+        END,
+        erro_mensagem = p_erro,
+        edital_id = COALESCE(p_edital_id, edital_id),
+        lease_expira_em = NULL,
+        updated_at = NOW()
+    WHERE id = p_job_id
+      AND worker_id = p_worker_id
+      AND status = 'em_andamento';
+    RETURN FOUND;
+END;
+$$;
+
+-- ============================================================
+-- COMENTÁRIOS
+-- ============================================================
+COMMENT ON TABLE edital_jobs IS 'Fila de editais a processar, consumida por workers com lease';
+COMMENT ON COLUMN edital_jobs.chave IS 'SHA-256 do arquivo (fontes locais) ou url:<sha256 da URL>';
+COMMENT ON COLUMN edital_jobs.status IS 'Status: pendente, em_andamento, concluido, erro';
+COMMENT ON COLUMN edital_jobs.lease_expira_em IS 'Após este instante o job pode ser reivindicado por outro worker';
@@ -0,0 +1,25 @@
+-- Migration: Hierarquia do conteúdo programático sem limite de profundidade
+-- Descrição: Guarda a numeração completa, a profundidade e o item pai de cada
+--            linha; níveis além de nivel_4 deixam de ser descartados
+-- Data: 2026-10-19
+
+-- ============================================================
+-- COLUNAS DE HIERARQUIA
+-- ============================================================
+ALTER TABLE conteudo_programatico ADD COLUMN IF NOT EXISTS numeracao TEXT;
+ALTER TABLE conteudo_programatico ADD COLUMN IF NOT EXISTS nivel SMALLINT;
+ALTER TABLE conteudo_programatico ADD COLUMN IF NOT EXISTS ordem_pai INTEGER;
+
+-- ============================================================
+-- ÍNDICES PARA PERFORMANCE
+-- ============================================================
+-- Resolve o pai (edital_id, ordem_pai) e lista itens na ordem do documento
+CREATE INDEX IF NOT EXISTS idx_conteudo_edital_ordem
+    ON conteudo_programatico(edital_id, ordem);
+
+-- ============================================================
+-- COMENTÁRIOS DAS COLUNAS
+-- ============================================================
+COMMENT ON COLUMN conteudo_programatico.numeracao IS 'Numeração completa do item (ex: 1.2.3.4.5); NULL para itens sem número';
+COMMENT ON COLUMN conteudo_programatico.nivel IS 'Profundidade na hierarquia (1 = item de primeiro nível)';
+COMMENT ON COLUMN conteudo_programatico.ordem_pai IS 'Ordem do item pai no mesmo edital (NULL na raiz da matéria)';
@@ -0,0 +1,150 @@
+-- Migration: Busca textual ranqueada nos tópicos do conteúdo programático
+-- Descrição: Coluna tsvector gerada (português, sem acentos) com índice GIN e
+--            RPC buscar_topicos, que ranqueia os tópicos e agrupa por edital
+--            com filtros do edital/matéria e paginação por cursor
+-- Data: 2026-10-19
+--
+-- ATENÇÃO: a coluna gerada STORED reescreve conteudo_programatico (lock
+-- exclusivo durante a migration). Em bases grandes, aplique fora do horário
+-- de processamento.
+
+-- ============================================================
+-- CONFIGURAÇÃO DE BUSCA: português sem acentos
+-- ============================================================
+CREATE EXTENSION IF NOT EXISTS unaccent;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'pt_unaccent') THEN
+        CREATE TEXT SEARCH CONFIGURATION public.pt_unaccent (COPY = pg_catalog.portuguese);
+        -- unaccent antes do stemmer: "licitações" e "licitacoes" viram o mesmo lexema
+        ALTER TEXT SEARCH CONFIGURATION public.pt_unaccent
+            ALTER MAPPING FOR hword, hword_part, word
+            WITH unaccent, portuguese_stem;
+    END IF;
+END
+$$;
+
+-- Números de leis e normas: "14.133" e "14.133/2021" viram "14133" e
+-- "14133 2021", no texto e na consulta (o parser trataria "14.133/2021"
+-- como um único token de caminho de arquivo)
+CREATE OR REPLACE FUNCTION normalizar_busca(p_texto TEXT)
+RETURNS TEXT
+LANGUAGE sql
+IMMUTABLE PARALLEL SAFE
+AS $$
+    SELECT regexp_replace(
+        regexp_replace(coalesce(p_texto, ''), '(\d)\.(?=\d)', '\1', 'g'),
+        '(\d)/(?=\d)', '\1 ', 'g'
+    );
+$$;
+
+-- ============================================================
+-- COLUNA DE BUSCA
+-- ============================================================
+-- Descrição com peso A, matéria com peso B
+ALTER TABLE conteudo_programatico ADD COLUMN IF NOT EXISTS busca tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('public.pt_unaccent'::regconfig, normalizar_busca(descricao)), 'A') ||
+        setweight(to_tsvector('public.pt_unaccent'::regconfig, normalizar_busca(materia)), 'B')
+    ) STORED;
+
+-- ============================================================
+-- ÍNDICES PARA PERFORMANCE
+-- ============================================================
+CREATE INDEX IF NOT EXISTS idx_conteudo_busca
+    ON conteudo_programatico USING GIN (busca);
+
+-- ============================================================
+-- RPC: buscar_topicos
+-- Editais ordenados pela relevância do melhor tópico (desempate por id),
+-- cada um com os p_topicos_por_edital tópicos mais relevantes.
+-- Paginação keyset: (p_apos_rank, p_apos_edital) do último edital da página.
+-- ============================================================
+CREATE OR REPLACE FUNCTION buscar_topicos(
+    p_consulta TEXT,
+    p_status TEXT DEFAULT NULL,
+    p_data_inicio TEXT DEFAULT NULL,
+    p_data_fim TEXT DEFAULT NULL,
+    p_campo_data TEXT DEFAULT 'data_prova',
+    p_materia TEXT DEFAULT NULL,
+    p_limite INTEGER DEFAULT 20,
+    p_topicos_por_edital INTEGER DEFAULT 5,
+    p_apos_rank REAL DEFAULT NULL,
+    p_apos_edital UUID DEFAULT NULL
+)
+RETURNS TABLE (
+    edital_id UUID,
+    nome_arquivo TEXT,
+    status TEXT,
+    data_prova DATE,
+    data_processamento TIMESTAMPTZ,
+    rank REAL,
+    total_topicos BIGINT,
+    topicos JSONB
+)
+LANGUAGE sql
+STABLE
+AS $$
+    WITH consulta AS (
+        SELECT websearch_to_tsquery('public.pt_unaccent'::regconfig, normalizar_busca(p_consulta)) AS q
+    ),
+    acertos AS (
+        SELECT c.id, c.edital_id, c.materia, c.descricao, c.numeracao, c.ordem,
+               ts_rank_cd(c.busca, consulta.q, 1) AS rank
+        FROM consulta
+        JOIN conteudo_programatico c ON c.busca @@ consulta.q
+        JOIN editais e ON e.id = c.edital_id
+        WHERE (p_status IS NULL OR e.status = p_status)
+          AND (p_materia IS NULL
+               OR to_tsvector('public.pt_unaccent'::regconfig, coalesce(c.materia, ''))
+                  @@ plainto_tsquery('public.pt_unaccent'::regconfig, p_materia))
+          AND (p_data_inicio IS NULL OR CASE p_campo_data
+                WHEN 'data_prova' THEN e.data_prova >= p_data_inicio::date
+                WHEN 'data_processamento' THEN e.data_processamento >= p_data_inicio::timestamptz
+                WHEN 'data_upload' THEN e.data_upload >= p_data_inicio::timestamptz
+              END)
+          AND (p_data_fim IS NULL OR CASE p_campo_data
+                WHEN 'data_prova' THEN e.data_prova <= p_data_fim::date
+                WHEN 'data_processamento' THEN e.data_processamento <= p_data_fim::timestamptz
+                WHEN 'data_upload' THEN e.data_upload <= p_data_fim::timestamptz
+              END)
+    ),
+    por_edital AS (
+        SELECT a.edital_id, max(a.rank) AS rank, count(*) AS total_topicos
+        FROM acertos a
+        GROUP BY a.edital_id
+    ),
+    pagina AS (
+        SELECT p.*
+        FROM por_edital p
+        WHERE p_apos_rank IS NULL
+           OR p.rank < p_apos_rank
+           OR (p.rank = p_apos_rank AND p.edital_id > p_apos_edital)
+        ORDER BY p.rank DESC, p.edital_id
+        LIMIT p_limite
+    )
+    SELECT p.edital_id, e.nome_arquivo, e.status, e.data_prova, e.data_processamento,
+           p.rank, p.total_topicos,
+           (
+               SELECT jsonb_agg(jsonb_build_object(
+                          'id', t.id, 'materia', t.materia, 'descricao', t.descricao,
+                          'numeracao', t.numeracao, 'ordem', t.ordem, 'rank', t.rank
+                      ) ORDER BY t.rank DESC, t.ordem)
+               FROM (
+                   SELECT * FROM acertos a
+                   WHERE a.edital_id = p.edital_id
+                   ORDER BY a.rank DESC, a.ordem
+                   LIMIT p_topicos_por_edital
+               ) t
+           ) AS topicos
+    FROM pagina p
+    JOIN editais e ON e.id = p.edital_id
+    ORDER BY p.rank DESC, p.edital_id;
+$$;
+
+-- ============================================================
+-- COMENTÁRIOS DAS COLUNAS
+-- ============================================================
+COMMENT ON COLUMN conteudo_programatico.busca IS 'tsvector (pt_unaccent) de descricao (peso A) e materia (peso B), gerado';
+COMMENT ON FUNCTION buscar_topicos IS 'Busca textual ranqueada nos tópicos, agrupada por edital, com paginação por cursor';
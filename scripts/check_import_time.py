@@ -0,0 +1,93 @@
+"""
+Verifica o orçamento de tempo de import dos comandos da CLI.
+
+Para cada cenário de `scripts/import_budget.json`, roda um interpretador
+novo com `-X importtime`, soma o tempo cumulativo dos imports de topo
+(descontando os da inicialização do Python) e falha se a mediana passar do
+orçamento ou se algum módulo proibido (ex.: openai em `stats`) for carregado.
+
+Uso:
+    python scripts/check_import_time.py [--repeticoes 5] [--cenario stats-sqlite]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+RAIZ = Path(__file__).resolve().parent.parent
+ORCAMENTO = Path(__file__).resolve().parent / "import_budget.json"
+
+
+def _importtime(codigo: str) -> List[Tuple[int, int, str]]:
+    """Executa `codigo` e retorna (profundidade, cumulativo_us, módulo) por import."""
+    resultado = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        cwd=RAIZ,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    imports = []
+    for linha in resultado.stderr.splitlines():
+        if not linha.startswith("import time:") or "cumulative" in linha:
+            continue
+        _, cumulativo, nome = linha[len("import time:"):].split("|")
+        profundidade = (len(nome) - len(nome.lstrip())) // 2
+        imports.append((profundidade, int(cumulativo), nome.strip()))
+    return imports
+
+
+def medir(modulos: List[str], inicializacao: set) -> Tuple[float, set]:
+    """Tempo (ms) para importar `modulos` e o conjunto de módulos carregados."""
+    imports = _importtime("; ".join(f"import {m}" for m in modulos))
+    total_us = sum(
+        cumulativo for profundidade, cumulativo, nome in imports
+        if profundidade == 0 and nome not in inicializacao
+    )
+    return total_us / 1000, {nome for _, _, nome in imports}
+
+
+def verificar(cenarios: Dict[str, dict], repeticoes: int) -> bool:
+    inicializacao = {nome for p, _, nome in _importtime("pass") if p == 0}
+    ok = True
+
+    for nome, cenario in cenarios.items():
+        tempos = []
+        carregados: set = set()
+        for _ in range(repeticoes):
+            tempo, carregados = medir(cenario["modulos"], inicializacao)
+            tempos.append(tempo)
+        mediana = statistics.median(tempos)
+
+        proibidos = sorted(
+            m for m in carregados
+            if any(m == p or m.startswith(p + ".") for p in cenario.get("proibidos", []))
+        )
+        estourou = mediana > cenario["max_ms"]
+        simbolo = "❌" if estourou or proibidos else "✅"
+        print(f"{simbolo} {nome}: {mediana:.1f} ms (orçamento {cenario['max_ms']} ms)")
+        if proibidos:
+            print(f"   módulos proibidos carregados: {', '.join(proibidos)}")
+        ok = ok and not (estourou or proibidos)
+
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Orçamento de tempo de import da CLI")
+    parser.add_argument("--repeticoes", type=int, default=5, help="Execuções por cenário (mediana)")
+    parser.add_argument("--cenario", action="append", help="Verifica só os cenários informados")
+    args = parser.parse_args()
+
+    cenarios = json.loads(ORCAMENTO.read_text(encoding="utf-8"))
+    if args.cenario:
+        cenarios = {nome: cenarios[nome] for nome in args.cenario}
+
+    sys.exit(0 if verificar(cenarios, args.repeticoes) else 1)
+
+
+if __name__ == "__main__":
+    main()
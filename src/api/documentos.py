@@ -0,0 +1,46 @@
+"""
+Documentos servidos pela API de leitura, serializados e comprimidos uma vez.
+
+Cada documento é guardado só comprimido (gzip nível 9, sem timestamp, para o
+mesmo conteúdo dar sempre os mesmos bytes), com um ETag do conteúdo. O JSON
+sai compacto: sem espaços e com acentos em UTF-8, não em escapes \\uXXXX.
+"""
+import gzip
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(slots=True)
+class DocumentoCompactado:
+    """Corpo pronto para resposta: gzip, ETag e tamanhos."""
+    corpo_gzip: bytes
+    etag: str
+    tipo: str
+    tamanho_original: int
+
+    @property
+    def tamanho(self) -> int:
+        return len(self.corpo_gzip)
+
+    def corpo(self, gzip_aceito: bool) -> bytes:
+        """Bytes a enviar; descomprime só para clientes sem gzip."""
+        return self.corpo_gzip if gzip_aceito else gzip.decompress(self.corpo_gzip)
+
+
+def compactar(dados: bytes, tipo: str) -> DocumentoCompactado:
+    # ETag fraco: o mesmo conteúdo é servido com e sem Content-Encoding
+    etag = 'W/"' + hashlib.sha256(dados).hexdigest()[:32] + '"'
+    return DocumentoCompactado(
+        corpo_gzip=gzip.compress(dados, compresslevel=9, mtime=0),
+        etag=etag,
+        tipo=tipo,
+        tamanho_original=len(dados),
+    )
+
+
+def compactar_json(dados: Any) -> DocumentoCompactado:
+    """JSON compacto (sem espaços, UTF-8 direto) comprimido."""
+    texto = json.dumps(dados, ensure_ascii=False, separators=(",", ":"), default=str)
+    return compactar(texto.encode("utf-8"), "application/json; charset=utf-8")
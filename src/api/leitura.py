@@ -0,0 +1,254 @@
+"""
+Serviço de leitura dos editais verticalizados, com cache LRU em processo.
+
+Cada documento (JSON do edital com cargos e árvore de tópicos, ou o markdown
+verticalizado) é montado uma vez a partir do banco, comprimido e guardado no
+LRU; leituras seguintes não tocam o banco. Várias leituras simultâneas do
+mesmo documento ausente compartilham uma única consulta. Editais não
+encontrados (ou ainda em processamento) ficam no cache por alguns segundos.
+
+Invalidação:
+- no mesmo processo, por `StorageBackend.ao_finalizar` (o documento sai do
+  cache assim que `finalizar_processamento` grava o edital);
+- de outros processos (workers, daemon), por uma varredura periódica dos
+  editais com `data_processamento` recente: uma consulta por intervalo,
+  independente do volume de leituras.
+
+Configuração:
+    API_CACHE_ITENS=1024        # documentos no LRU
+    API_CACHE_MAX_MB=128        # soma dos corpos comprimidos
+    API_CACHE_AUSENTE_S=10      # tempo de um "não encontrado" no cache
+    API_INVALIDACAO_S=30        # intervalo da varredura (0 = só no processo)
+"""
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Set, Tuple, TYPE_CHECKING
+
+from src.api.documentos import DocumentoCompactado, compactar, compactar_json
+from src.database.queries import EditalQueries
+from src.utils.logger import logger
+from src.utils.metrics import metricas
+
+if TYPE_CHECKING:
+    from src.database.base import StorageBackend
+
+# (edital_id, formato): formato "json" ou "markdown"
+Chave = Tuple[str, str]
+FORMATOS = ("json", "markdown")
+
+
+@dataclass(slots=True)
+class _Entrada:
+    documento: Optional[DocumentoCompactado]
+    # Só entradas de "não encontrado" expiram (time.monotonic)
+    expira_em: Optional[float] = None
+
+
+def _consumir_excecao(tarefa: asyncio.Task):
+    """Quem espera recebe a exceção; sem aviso se ninguém esperava mais."""
+    if not tarefa.cancelled():
+        tarefa.exception()
+
+
+class ServicoLeitura:
+    """Documentos de leitura dos editais, servidos de um LRU em memória."""
+
+    def __init__(
+        self,
+        db: "StorageBackend",
+        max_itens: int = 1024,
+        max_bytes: int = 128 * 1024 * 1024,
+        ttl_ausente: float = 10.0,
+        intervalo_invalidacao: float = 30.0
+    ):
+        """
+        Args:
+            db: Backend de armazenamento (Supabase ou SQLite)
+            max_itens: Documentos mantidos no LRU
+            max_bytes: Soma máxima dos corpos comprimidos no LRU
+            ttl_ausente: Segundos que um "não encontrado" fica no cache
+            intervalo_invalidacao: Segundos entre varreduras de editais
+                finalizados por outros processos (0 desliga)
+        """
+        if max_itens < 1:
+            raise ValueError("max_itens deve ser >= 1")
+        self.db = db
+        self.queries = EditalQueries(db)
+        self.max_itens = max_itens
+        self.max_bytes = max_bytes
+        self.ttl_ausente = ttl_ausente
+        self.intervalo_invalidacao = intervalo_invalidacao
+        self.hits = 0
+        self.misses = 0
+        self._lru: "OrderedDict[Chave, _Entrada]" = OrderedDict()
+        self._bytes = 0
+        self._carregando: Dict[Chave, asyncio.Task] = {}
+        # Invalidadas enquanto eram carregadas: o resultado não entra no cache
+        self._obsoletas: Set[Chave] = set()
+        self._vigia: Optional[asyncio.Task] = None
+        db.ao_finalizar(lambda edital_id, sucesso: self.invalidar(edital_id))
+
+    @classmethod
+    def do_ambiente(cls, db: "StorageBackend") -> "ServicoLeitura":
+        """Serviço configurado por API_CACHE_* e API_INVALIDACAO_S."""
+        return cls(
+            db,
+            max_itens=int(os.getenv("API_CACHE_ITENS") or 1024),
+            max_bytes=int(float(os.getenv("API_CACHE_MAX_MB") or 128) * 1024 * 1024),
+            ttl_ausente=float(os.getenv("API_CACHE_AUSENTE_S") or 10),
+            intervalo_invalidacao=float(os.getenv("API_INVALIDACAO_S") or 30),
+        )
+
+    # ==================== CICLO DE VIDA ====================
+
+    def iniciar(self):
+        """Inicia a varredura periódica de invalidação (requer loop rodando)."""
+        if self.intervalo_invalidacao > 0 and self._vigia is None:
+            self._vigia = asyncio.ensure_future(self._vigiar())
+
+    async def parar(self):
+        if self._vigia is not None:
+            self._vigia.cancel()
+            await asyncio.gather(self._vigia, return_exceptions=True)
+            self._vigia = None
+
+    # ==================== LEITURA ====================
+
+    async def documento(self, edital_id: str) -> Optional[DocumentoCompactado]:
+        """JSON do edital (metadados, cargos, árvore de tópicos), ou None."""
+        return await self._obter((edital_id, "json"))
+
+    async def markdown(self, edital_id: str) -> Optional[DocumentoCompactado]:
+        """Markdown verticalizado do edital, ou None."""
+        return await self._obter((edital_id, "markdown"))
+
+    async def _obter(self, chave: Chave) -> Optional[DocumentoCompactado]:
+        entrada = self._lru.get(chave)
+        if entrada is not None:
+            if entrada.expira_em is None or entrada.expira_em > time.monotonic():
+                self._lru.move_to_end(chave)
+                self.hits += 1
+                metricas.incrementar("api_cache_total", resultado="hit")
+                return entrada.documento
+            self._remover(chave)
+
+        carregando = self._carregando.get(chave)
+        if carregando is not None:
+            self.hits += 1
+            metricas.incrementar("api_cache_total", resultado="espera")
+        else:
+            self.misses += 1
+            metricas.incrementar("api_cache_total", resultado="miss")
+            # Tarefa própria: cancelar quem pediu primeiro não derruba os demais leitores
+            carregando = asyncio.ensure_future(self._carregar_e_guardar(chave))
+            carregando.add_done_callback(_consumir_excecao)
+            self._carregando[chave] = carregando
+        return await asyncio.shield(carregando)
+
+    async def _carregar_e_guardar(self, chave: Chave) -> Optional[DocumentoCompactado]:
+        try:
+            documento = await self._carregar(chave)
+        finally:
+            del self._carregando[chave]
+            obsoleta = chave in self._obsoletas
+            self._obsoletas.discard(chave)
+        if not obsoleta:
+            self._guardar(chave, documento)
+        return documento
+
+    async def _carregar(self, chave: Chave) -> Optional[DocumentoCompactado]:
+        edital_id, formato = chave
+        with metricas.span("api", documento=formato):
+            if formato == "json":
+                dados = await self.queries.documento_edital(edital_id)
+                return None if dados is None else compactar_json(dados)
+            markdown = await self.queries.markdown_edital(edital_id)
+            return None if not markdown else compactar(markdown.encode("utf-8"), "text/markdown; charset=utf-8")
+
+    # ==================== LRU ====================
+
+    def _guardar(self, chave: Chave, documento: Optional[DocumentoCompactado]):
+        expira_em = None if documento is not None else time.monotonic() + self.ttl_ausente
+        if documento is None and self.ttl_ausente <= 0:
+            return
+        self._remover(chave)
+        self._lru[chave] = _Entrada(documento, expira_em)
+        self._bytes += documento.tamanho if documento else 0
+        while len(self._lru) > self.max_itens or (self._bytes > self.max_bytes and len(self._lru) > 1):
+            self._remover(next(iter(self._lru)))
+            metricas.incrementar("api_cache_despejos_total")
+
+    def _remover(self, chave: Chave) -> bool:
+        entrada = self._lru.pop(chave, None)
+        if entrada is None:
+            return False
+        self._bytes -= entrada.documento.tamanho if entrada.documento else 0
+        return True
+
+    def invalidar(self, edital_id: str) -> bool:
+        """Remove os documentos do edital do cache; retorna se havia algum."""
+        removido = False
+        for formato in FORMATOS:
+            chave = (edital_id, formato)
+            removido = self._remover(chave) or removido
+            if chave in self._carregando:
+                self._obsoletas.add(chave)
+        if removido:
+            metricas.incrementar("api_cache_invalidacoes_total")
+        return removido
+
+    def stats(self) -> dict:
+        """Ocupação e taxa de acerto do cache."""
+        documentos = [e.documento for e in self._lru.values() if e.documento is not None]
+        total = self.hits + self.misses
+        return {
+            "itens": len(self._lru),
+            "bytes": self._bytes,
+            "bytes_sem_compressao": sum(d.tamanho_original for d in documentos),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate_percent": round(self.hits / total * 100, 2) if total else 0,
+        }
+
+    # ==================== INVALIDAÇÃO ENTRE PROCESSOS ====================
+
+    async def _vigiar(self):
+        # Toda varredura recua um intervalo antes do início da anterior: cobre
+        # relógios levemente diferentes entre máquinas e gravações que chegam
+        # ao banco depois do instante registrado em data_processamento
+        margem = timedelta(seconds=self.intervalo_invalidacao)
+        anterior = datetime.utcnow()
+        while True:
+            await asyncio.sleep(self.intervalo_invalidacao)
+            inicio = datetime.utcnow()
+            try:
+                await self.invalidar_finalizados_desde((anterior - margem).isoformat())
+            except Exception as e:
+                logger.warning(f"⚠️  Varredura de invalidação da API falhou: {e}")
+            else:
+                anterior = inicio
+
+    async def invalidar_finalizados_desde(self, desde: str) -> str:
+        """
+        Invalida editais com data_processamento >= `desde`.
+
+        Returns:
+            Maior data_processamento vista (início da próxima varredura)
+        """
+        filtros = {"campo_data": "data_processamento", "data_inicio": desde}
+        apos_id = None
+        while True:
+            linhas = await self.db.listar_pagina(
+                "editais", ["id", "data_processamento"], apos_id=apos_id, limite=1000, filtros=filtros
+            )
+            for linha in linhas:
+                self.invalidar(linha["id"])
+                if linha["data_processamento"] and str(linha["data_processamento"]) > desde:
+                    desde = str(linha["data_processamento"])
+            if len(linhas) < 1000:
+                return desde
+            apos_id = linhas[-1]["id"]
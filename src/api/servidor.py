@@ -0,0 +1,249 @@
+"""
+Servidor HTTP/1.1 mínimo (stdlib asyncio) da API de leitura.
+
+Rotas (GET e HEAD):
+    /editais/<id>            JSON do edital: metadados, cargos e árvore de tópicos
+    /editais/<id>/markdown   Conteúdo verticalizado em markdown
+    /saude                   Ocupação do cache
+    /metricas                Métricas no formato do Prometheus
+
+Os corpos saem pré-comprimidos (gzip) para quem envia `Accept-Encoding:
+gzip`. Toda resposta de documento leva ETag; `If-None-Match` com o mesmo
+ETag responde 304 sem corpo. `Cache-Control: max-age` (API_MAX_AGE, default
+60 s) deixa o navegador reusar a resposta sem perguntar; depois disso ele
+revalida pelo ETag.
+
+Conexões keep-alive ociosas (ou que enviam a requisição devagar demais) são
+fechadas após API_TIMEOUT_S (default 15 s); requisições com mais de
+MAX_CABECALHOS cabeçalhos ou com cabeçalhos malformados recebem 400.
+
+Uso:
+    python main.py serve [--host 0.0.0.0] [--porta 8080] [--backend sqlite]
+"""
+import asyncio
+import json
+import os
+import re
+import signal
+from typing import Dict, Optional, Set, Tuple
+
+from src.api.documentos import DocumentoCompactado
+from src.api.leitura import ServicoLeitura
+from src.utils.logger import logger
+from src.utils.metrics import metricas
+
+MOTIVOS = {
+    200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+    405: "Method Not Allowed", 503: "Service Unavailable",
+}
+
+_ROTA_EDITAL = re.compile(
+    r"^/editais/([0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12})(/markdown)?/?$"
+)
+
+MAX_CABECALHOS = 100
+
+# (status, headers, corpo)
+Resposta = Tuple[int, Dict[str, str], bytes]
+
+
+def aceita_gzip(accept_encoding: str) -> bool:
+    """
+    Se o cliente aceita gzip (`gzip;q=0` recusa).
+
+    Raises:
+        ValueError: Se o peso `q=` não for um número
+    """
+    for item in accept_encoding.lower().split(","):
+        nome, _, parametros = item.strip().partition(";")
+        if nome.strip() in ("gzip", "*"):
+            q = parametros.strip()
+            return not (q.startswith("q=") and float(q[2:] or 0) == 0)
+    return False
+
+
+def etag_confere(if_none_match: str, etag: str) -> bool:
+    """Comparação fraca de ETags (RFC 9110): ignora o prefixo W/."""
+    if if_none_match.strip() == "*":
+        return True
+    alvo = etag.removeprefix("W/")
+    return any(item.strip().removeprefix("W/") == alvo for item in if_none_match.split(","))
+
+
+def _json(status: int, dados) -> Resposta:
+    corpo = json.dumps(dados, ensure_ascii=False).encode("utf-8")
+    return status, {"Content-Type": "application/json; charset=utf-8", "Cache-Control": "no-store"}, corpo
+
+
+class ServidorLeitura:
+    """Servidor HTTP da API de leitura sobre um `ServicoLeitura`."""
+
+    def __init__(
+        self,
+        servico: ServicoLeitura,
+        host: str = "0.0.0.0",
+        porta: int = 8080,
+        max_age: int = 60,
+        timeout: float = 15.0
+    ):
+        """
+        Args:
+            timeout: Segundos de espera por cada linha da requisição; conexão
+                ociosa ou lenta além disso é fechada
+        """
+        self.servico = servico
+        self.host = host
+        self.porta = porta
+        self.max_age = max_age
+        self.timeout = timeout
+        self._servidor: Optional[asyncio.AbstractServer] = None
+        self._conexoes: Set[asyncio.StreamWriter] = set()
+
+    @classmethod
+    def do_ambiente(cls, servico: ServicoLeitura, host: str, porta: int) -> "ServidorLeitura":
+        return cls(
+            servico, host=host, porta=porta,
+            max_age=int(os.getenv("API_MAX_AGE") or 60),
+            timeout=float(os.getenv("API_TIMEOUT_S") or 15),
+        )
+
+    # ==================== CICLO DE VIDA ====================
+
+    async def iniciar(self) -> "ServidorLeitura":
+        self.servico.iniciar()
+        self._servidor = await asyncio.start_server(self._conexao, self.host, self.porta)
+        self.porta = self._servidor.sockets[0].getsockname()[1]
+        return self
+
+    async def parar(self):
+        if self._servidor is not None:
+            self._servidor.close()
+            # wait_closed() espera as conexões keep-alive: fechá-las antes
+            for writer in list(self._conexoes):
+                writer.close()
+            await self._servidor.wait_closed()
+            self._servidor = None
+        await self.servico.parar()
+
+    async def servir(self):
+        """Atende até SIGTERM/SIGINT."""
+        encerrar = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(sig, encerrar.set)
+            except NotImplementedError:  # Windows
+                signal.signal(sig, lambda *_: loop.call_soon_threadsafe(encerrar.set))
+
+        await self.iniciar()
+        logger.info(f"🌐 API de leitura em http://{self.host}:{self.porta}")
+        try:
+            await encerrar.wait()
+        finally:
+            await self.parar()
+        logger.info("API de leitura encerrada")
+
+    # ==================== ROTAS ====================
+
+    async def tratar(self, metodo: str, caminho: str, headers: Dict[str, str]) -> Resposta:
+        if metodo not in ("GET", "HEAD"):
+            status, cabecalhos, corpo = _json(405, {"erro": "Método não permitido"})
+            cabecalhos["Allow"] = "GET, HEAD"
+            return status, cabecalhos, corpo
+
+        if caminho == "/saude":
+            return _json(200, {"status": "ok", "cache": self.servico.stats()})
+        if caminho == "/metricas":
+            return 200, {"Content-Type": "text/plain; version=0.0.4", "Cache-Control": "no-store"}, \
+                metricas.para_prometheus().encode("utf-8")
+
+        rota = _ROTA_EDITAL.match(caminho)
+        if rota is None:
+            return _json(404, {"erro": "Rota não encontrada"})
+
+        edital_id = rota.group(1).lower()
+        try:
+            if rota.group(2):
+                documento = await self.servico.markdown(edital_id)
+            else:
+                documento = await self.servico.documento(edital_id)
+        except Exception as e:
+            logger.error(f"❌ API de leitura: erro ao carregar {caminho}: {e}")
+            return _json(503, {"erro": "Banco indisponível"})
+
+        if documento is None:
+            return _json(404, {"erro": "Edital não encontrado ou ainda em processamento"})
+        return self._documento(documento, headers)
+
+    def _documento(self, documento: DocumentoCompactado, headers: Dict[str, str]) -> Resposta:
+        cabecalhos = {
+            "ETag": documento.etag,
+            "Cache-Control": f"public, max-age={self.max_age}",
+            "Vary": "Accept-Encoding",
+        }
+        if etag_confere(headers.get("if-none-match", ""), documento.etag):
+            return 304, cabecalhos, b""
+
+        try:
+            gzip_aceito = aceita_gzip(headers.get("accept-encoding", ""))
+        except ValueError:
+            return _json(400, {"erro": "Accept-Encoding inválido"})
+        cabecalhos["Content-Type"] = documento.tipo
+        if gzip_aceito:
+            cabecalhos["Content-Encoding"] = "gzip"
+        return 200, cabecalhos, documento.corpo(gzip_aceito)
+
+    # ==================== PROTOCOLO ====================
+
+    async def _conexao(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._conexoes.add(writer)
+        try:
+            while True:
+                linha = await asyncio.wait_for(reader.readline(), self.timeout)
+                if not linha:
+                    break
+                partes = linha.decode("latin-1").split()
+                if len(partes) != 3:
+                    await self._escrever(writer, "GET", *_json(400, {"erro": "Requisição inválida"}))
+                    break
+                metodo, alvo, versao = partes
+
+                headers = {}
+                while len(headers) <= MAX_CABECALHOS:
+                    cabecalho = await asyncio.wait_for(reader.readline(), self.timeout)
+                    if cabecalho in (b"\r\n", b"\n", b""):
+                        break
+                    nome, _, valor = cabecalho.decode("latin-1").partition(":")
+                    headers[nome.strip().lower()] = valor.strip()
+                tamanho = headers.get("content-length", "0")
+                if len(headers) > MAX_CABECALHOS or not tamanho.isdigit():
+                    await self._escrever(writer, "GET", *_json(400, {"erro": "Cabeçalhos inválidos"}))
+                    break
+                # Corpo ignorado (só GET/HEAD), mas consumido para manter o keep-alive
+                if int(tamanho):
+                    await asyncio.wait_for(reader.readexactly(int(tamanho)), self.timeout)
+
+                metodo = metodo.upper()
+                status, cabecalhos, corpo = await self.tratar(metodo, alvo.split("?", 1)[0], headers)
+                metricas.incrementar("api_respostas_total", status=str(status))
+                await self._escrever(writer, metodo, status, cabecalhos, corpo)
+
+                conexao = headers.get("connection", "").lower()
+                if conexao == "close" or (versao == "HTTP/1.0" and conexao != "keep-alive"):
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.TimeoutError, ValueError):
+            pass
+        finally:
+            self._conexoes.discard(writer)
+            writer.close()
+
+    @staticmethod
+    async def _escrever(writer: asyncio.StreamWriter, metodo: str, status: int, headers: Dict[str, str], corpo: bytes):
+        linhas = [f"HTTP/1.1 {status} {MOTIVOS.get(status, 'Unknown')}"]
+        if status != 304:
+            headers = {**headers, "Content-Length": str(len(corpo))}
+        linhas += [f"{nome}: {valor}" for nome, valor in headers.items()]
+        writer.write(("\r\n".join(linhas) + "\r\n\r\n").encode("latin-1"))
+        if metodo != "HEAD" and status != 304:
+            writer.write(corpo)
+        await writer.drain()
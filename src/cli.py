@@ -0,0 +1,398 @@
+"""
+Interface de linha de comando.
+
+Cada subcomando importa seus subsistemas só quando executado: `stats` e
+`cache stats` não carregam openai, PyPDF2 nem o pipeline, e nenhum comando
+cria conexão com o banco antes de precisar dela.
+
+Uso:
+    python main.py [process] [fontes...] [--max-pages N] [--profile [DIR]] [--memoria-max MB]
+    python main.py resume [--incluir-erros] [--memoria-max MB]
+    python main.py daemon [--memoria-max MB]
+    python main.py enqueue [fontes...]
+    python main.py worker [--worker-id ID] [--drenar] [--memoria-max MB]
+    (process/resume/daemon/worker: [--gravar-llm ARQ | --reproduzir-llm ARQ [--velocidade-llm X]])
+    python main.py stats [--backend sqlite]
+    python main.py serve [--host H] [--porta N] [--backend sqlite]
+    python main.py buscar <consulta...> [--materia M] [--status S] [--desde D] [--ate D] [--cursor C]
+    python main.py export <tabela> <destino> [opções de src.exporters]
+    python main.py cache stats|clear|purge|export|import|warm [arquivo] [--backend redis]
+    python main.py hash <arquivos...> [--sem-banco]
+
+O orçamento de tempo de import é verificado por `scripts/check_import_time.py`.
+"""
+import argparse
+import sys
+from typing import Optional, List
+
+COMANDOS = ("process", "resume", "daemon", "enqueue", "worker", "stats", "buscar", "serve", "export", "cache", "hash")
+
+
+def _carregar_env():
+    """Carrega o .env antes de ler STORAGE_BACKEND, chaves de API etc."""
+    from dotenv import load_dotenv
+    load_dotenv()
+
+
+# ==================== PIPELINE ====================
+
+def _process(args: argparse.Namespace):
+    import asyncio
+    from main import main as processar
+    from pathlib import Path
+    perfil_dir = Path(args.profile) if args.profile else None
+    asyncio.run(processar(args.fontes, max_pages=args.max_pages, perfil_dir=perfil_dir))
+
+
+def _resume(args: argparse.Namespace):
+    import asyncio
+    from main import resume
+    asyncio.run(resume(incluir_erros=args.incluir_erros))
+
+
+def _daemon(args: argparse.Namespace):
+    import asyncio
+    from main import daemon
+    asyncio.run(daemon())
+
+
+def _enqueue(args: argparse.Namespace):
+    import asyncio
+    from main import enqueue
+    asyncio.run(enqueue(args.fontes))
+
+
+def _worker(args: argparse.Namespace):
+    import asyncio
+    from main import worker
+    asyncio.run(worker(drenar=args.drenar, worker_id=args.worker_id))
+
+
+# ==================== CONSULTAS ====================
+
+def _stats(args: argparse.Namespace):
+    import asyncio
+    from src.database.base import get_storage_backend
+
+    async def _consultar():
+        db = get_storage_backend(args.backend)
+        try:
+            return await db.estatisticas_processamento()
+        finally:
+            await db.close()
+
+    stats = asyncio.run(_consultar())
+    print("📈 Estatísticas Gerais:")
+    print(f"  Total de editais: {stats['total_editais']}")
+    print(f"  Concluídos: {stats['concluidos']}")
+    print(f"  Erros: {stats['erros']}")
+    print(f"  Custo total: US$ {stats['custo_total_usd']:.2f}")
+
+
+def _buscar(args: argparse.Namespace):
+    import asyncio
+    from src.database.base import get_storage_backend
+
+    filtros = {
+        "status": args.status,
+        "data_inicio": args.desde,
+        "data_fim": args.ate,
+        "campo_data": args.campo_data,
+        "materia": args.materia,
+    }
+
+    async def _consultar():
+        db = get_storage_backend(args.backend)
+        try:
+            return await db.buscar_topicos(
+                " ".join(args.consulta),
+                filtros=filtros,
+                limite=args.limite,
+                cursor=args.cursor,
+                topicos_por_edital=args.topicos
+            )
+        finally:
+            await db.close()
+
+    try:
+        resultado = asyncio.run(_consultar())
+    except ValueError as e:
+        sys.exit(f"❌ {e}")
+
+    if not resultado["editais"]:
+        print("🔍 Nenhum tópico encontrado")
+        return
+    for edital in resultado["editais"]:
+        data = f", prova {edital['data_prova']}" if edital["data_prova"] else ""
+        print(f"📄 {edital['nome_arquivo']} ({edital['total_topicos']} tópicos{data}; ID: {edital['edital_id']})")
+        for topico in edital["topicos"]:
+            numeracao = f"{topico['numeracao']} " if topico["numeracao"] else ""
+            print(f"   [{topico['materia'] or '-'}] {numeracao}{topico['descricao']}")
+    if resultado["proximo_cursor"]:
+        print(f"\n➡️  Próxima página: --cursor {resultado['proximo_cursor']}")
+
+
+def _serve(args: argparse.Namespace):
+    import asyncio
+    from src.api.leitura import ServicoLeitura
+    from src.api.servidor import ServidorLeitura
+    from src.database.base import get_storage_backend
+
+    async def _servir():
+        db = get_storage_backend(args.backend)
+        try:
+            servidor = ServidorLeitura.do_ambiente(ServicoLeitura.do_ambiente(db), args.host, args.porta)
+            await servidor.servir()
+        finally:
+            await db.close()
+
+    asyncio.run(_servir())
+
+
+def _cache(args: argparse.Namespace):
+    from pathlib import Path
+    from src.utils.llm_cache import LLMCache, get_cache_backend
+
+    if args.acao in ("export", "import", "warm") and not args.arquivo:
+        sys.exit(f"❌ cache {args.acao} exige o arquivo")
+
+    cache = LLMCache(backend=get_cache_backend(args.backend, cache_dir=args.dir))
+    destino = f"{cache.backend.nome}, versão {cache.versao}"
+    try:
+        if args.acao == "clear":
+            removidas = cache.clear()
+            print(f"🧹 Cache LLM limpo ({removidas} entradas removidas)")
+        elif args.acao == "purge":
+            removidas = cache.purgar_outras_versoes()
+            print(f"🧹 {removidas} entradas de outras versões ou expiradas removidas ({destino})")
+        elif args.acao == "export":
+            total = cache.exportar(Path(args.arquivo), todas_versoes=args.todas_versoes)
+            print(f"📤 {total} entradas exportadas para {args.arquivo} ({destino})")
+        elif args.acao == "import":
+            total = cache.importar(Path(args.arquivo))
+            print(f"📥 {total} entradas importadas de {args.arquivo} ({destino})")
+        elif args.acao == "warm":
+            total = cache.aquecer_de_cassete(Path(args.arquivo))
+            print(f"🔥 {total} respostas do cassete {args.arquivo} gravadas no cache ({destino})")
+        else:
+            stats = cache.stats()
+            print(f"💾 Cache LLM ({destino}):")
+            print(f"  Tamanho: {stats['cache_size']} entradas ({stats['cache_size_versao']} da versão atual)")
+            if stats["volume_bytes"] is not None:
+                print(f"  Volume: {stats['volume_bytes'] / 1024 / 1024:.2f} MB")
+    finally:
+        cache.close()
+
+
+def _hash(args: argparse.Namespace):
+    """Dry-run: mostra o hash de cada arquivo e se ele já está no banco, sem processar."""
+    from pathlib import Path
+    from src.utils.file_hash import compute_file_hash
+
+    hashes = []
+    for fonte in args.arquivos:
+        path = Path(fonte)
+        if not path.is_file():
+            print(f"⚠️  {fonte}: arquivo não encontrado")
+            continue
+        hashes.append((path, compute_file_hash(path)))
+
+    existentes = {} if args.sem_banco else _buscar_existentes([h for _, h in hashes], args.backend)
+    for path, file_hash in hashes:
+        edital = existentes.get(file_hash)
+        if args.sem_banco:
+            situacao = ""
+        elif edital is None:
+            situacao = "  novo"
+        else:
+            situacao = f"  {edital['status']} (ID: {edital['id']})"
+        print(f"{file_hash}  {path.name}{situacao}")
+
+
+def _buscar_existentes(hashes: List[str], backend: Optional[str]) -> dict:
+    import asyncio
+    from src.database.base import get_storage_backend
+
+    async def _consultar():
+        db = get_storage_backend(backend)
+        try:
+            resultados = await asyncio.gather(*[db.edital_existe(h) for h in hashes])
+        finally:
+            await db.close()
+        return {h: r for h, r in zip(hashes, resultados) if r}
+
+    return asyncio.run(_consultar())
+
+
+# ==================== PARSER ====================
+
+def _opcao_memoria(p: argparse.ArgumentParser):
+    p.add_argument(
+        "--memoria-max",
+        type=float,
+        metavar="MB",
+        help="Teto de RSS por processo; acima dele, um edital por etapa e "
+             "extração em streaming (default: PIPELINE_MEMORIA_MAX_MB)"
+    )
+
+
+def _opcao_cassete(p: argparse.ArgumentParser):
+    grupo = p.add_mutually_exclusive_group()
+    grupo.add_argument(
+        "--gravar-llm",
+        metavar="ARQ",
+        help="Grava as chamadas à LLM em um cassete .jsonl.gz (LLM_CASSETTE_MODE=record)"
+    )
+    grupo.add_argument(
+        "--reproduzir-llm",
+        metavar="ARQ",
+        help="Responde às chamadas à LLM a partir do cassete, sem rede (LLM_CASSETTE_MODE=replay)"
+    )
+    p.add_argument(
+        "--velocidade-llm",
+        type=float,
+        metavar="X",
+        help="No replay, divide a latência gravada por X; 0 responde sem esperar (default 1)"
+    )
+
+
+def _aplicar_opcoes_ambiente(args: argparse.Namespace):
+    """As opções da linha de comando prevalecem sobre o .env."""
+    import os
+    if getattr(args, "memoria_max", None):
+        os.environ["PIPELINE_MEMORIA_MAX_MB"] = str(args.memoria_max)
+    if getattr(args, "gravar_llm", None):
+        os.environ["LLM_CASSETTE_MODE"] = "record"
+        os.environ["LLM_CASSETTE_PATH"] = args.gravar_llm
+    if getattr(args, "reproduzir_llm", None):
+        os.environ["LLM_CASSETTE_MODE"] = "replay"
+        os.environ["LLM_CASSETTE_PATH"] = args.reproduzir_llm
+    if getattr(args, "velocidade_llm", None) is not None:
+        os.environ["LLM_CASSETTE_VELOCIDADE"] = str(args.velocidade_llm)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="Verticaliza AI: processamento de editais de concursos"
+    )
+    sub = parser.add_subparsers(dest="comando", metavar="comando")
+
+    p = sub.add_parser("process", help="Processa PDFs (default: input_pdfs/)")
+    p.add_argument("fontes", nargs="*", help="Caminhos ou URLs de PDFs")
+    p.add_argument("--max-pages", type=int, help="Limite de páginas extraídas por PDF")
+    p.add_argument(
+        "--profile",
+        nargs="?",
+        const="profiles",
+        metavar="DIR",
+        help="Processa um edital por vez gravando perfil de CPU/memória por etapa (default: profiles/)"
+    )
+    _opcao_memoria(p)
+    _opcao_cassete(p)
+    p.set_defaults(func=_process, env=True)
+
+    p = sub.add_parser("resume", help="Retoma editais interrompidos")
+    p.add_argument(
+        "--incluir-erros",
+        action="store_true",
+        help="Também reprocessa editais com status 'erro'"
+    )
+    _opcao_memoria(p)
+    _opcao_cassete(p)
+    p.set_defaults(func=_resume, env=True)
+
+    p = sub.add_parser("daemon", help="Observa input_pdfs/ continuamente")
+    _opcao_memoria(p)
+    _opcao_cassete(p)
+    p.set_defaults(func=_daemon, env=True)
+
+    p = sub.add_parser("enqueue", help="Enfileira PDFs (default: input_pdfs/) na fila de jobs")
+    p.add_argument("fontes", nargs="*", help="Caminhos ou URLs de PDFs")
+    p.set_defaults(func=_enqueue, env=True)
+
+    p = sub.add_parser("worker", help="Consome a fila de jobs com lease")
+    p.add_argument("--worker-id", help="Identificador do worker (default: host-pid)")
+    p.add_argument("--drenar", action="store_true", help="Encerra quando a fila esvaziar")
+    _opcao_memoria(p)
+    _opcao_cassete(p)
+    p.set_defaults(func=_worker, env=True)
+
+    p = sub.add_parser("stats", help="Estatísticas de processamento do banco")
+    p.add_argument("--backend", help="supabase ou sqlite (default: STORAGE_BACKEND)")
+    p.set_defaults(func=_stats, env=True)
+
+    p = sub.add_parser("buscar", help="Busca ranqueada nos tópicos de todos os editais")
+    p.add_argument(
+        "consulta",
+        nargs="+",
+        help='Termos (todos obrigatórios), "frase entre aspas", or, -termo para excluir'
+    )
+    p.add_argument("--materia", help="Só tópicos cuja matéria contenha estes termos")
+    p.add_argument("--status", help="Filtra pelo status do edital")
+    p.add_argument("--desde", help="Data inicial (YYYY-MM-DD)")
+    p.add_argument("--ate", help="Data final (YYYY-MM-DD)")
+    p.add_argument(
+        "--campo-data",
+        default="data_prova",
+        choices=["data_prova", "data_processamento", "data_upload"],
+        help="Coluna do edital usada nos filtros de data"
+    )
+    p.add_argument("--limite", type=int, default=10, help="Editais por página (default 10)")
+    p.add_argument("--topicos", type=int, default=3, help="Tópicos mostrados por edital (default 3)")
+    p.add_argument("--cursor", help="Cursor da próxima página, impresso ao fim da anterior")
+    p.add_argument("--backend", help="supabase ou sqlite (default: STORAGE_BACKEND)")
+    p.set_defaults(func=_buscar, env=True)
+
+    p = sub.add_parser("serve", help="API HTTP de leitura dos editais (cache LRU, gzip, ETag)")
+    p.add_argument("--host", default="0.0.0.0", help="Endereço de escuta (default 0.0.0.0)")
+    p.add_argument("--porta", type=int, default=8080, help="Porta (default 8080)")
+    p.add_argument("--backend", help="supabase ou sqlite (default: STORAGE_BACKEND)")
+    p.set_defaults(func=_serve, env=True)
+
+    # Os argumentos de `export` são repassados sem alteração para src.exporters
+    sub.add_parser("export", help="Exporta uma tabela para CSV/Parquet (ver `export --help`)")
+
+    p = sub.add_parser("cache", help="Inspeciona, transfere ou limpa o cache LLM")
+    p.add_argument(
+        "acao",
+        choices=["stats", "clear", "purge", "export", "import", "warm"],
+        help="purge: remove outras versões dos templates; warm: carrega um cassete (--gravar-llm)"
+    )
+    p.add_argument("arquivo", nargs="?", help="Arquivo .jsonl.gz de export/import ou cassete do warm")
+    p.add_argument("--backend", help="diskcache, sqlite ou redis (default: LLM_CACHE_BACKEND)")
+    p.add_argument("--dir", help="Diretório do diskcache (default: LLM_CACHE_DIR ou .cache/llm)")
+    p.add_argument("--todas-versoes", action="store_true", help="export: inclui outras versões dos templates")
+    p.set_defaults(func=_cache, env=True)
+
+    p = sub.add_parser("hash", help="Dry-run: hash dos arquivos e situação no banco")
+    p.add_argument("arquivos", nargs="+", help="Arquivos PDF locais")
+    p.add_argument("--sem-banco", action="store_true", help="Só calcula os hashes")
+    p.add_argument("--backend", help="supabase ou sqlite (default: STORAGE_BACKEND)")
+    p.set_defaults(func=_hash, env=True)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None):
+    argv = sys.argv[1:] if argv is None else argv
+
+    if argv and argv[0] == "export":
+        _carregar_env()
+        from src.exporters.__main__ import run
+        run(argv[1:])
+        return
+
+    # Sem subcomando (ou só fontes/opções): processar, como antes
+    if not argv or (argv[0] not in COMANDOS and argv[0] not in ("-h", "--help")):
+        argv = ["process", *argv]
+
+    args = build_parser().parse_args(argv)
+    if args.env and not (args.comando == "hash" and args.sem_banco):
+        _carregar_env()
+    _aplicar_opcoes_ambiente(args)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""
+Interface comum dos backends de armazenamento.
+
+O `EditalProcessor` depende apenas destes métodos, o que permite trocar o
+Supabase (PostgREST) por um banco embutido em execuções offline.
+"""
+import os
+from abc import ABC, abstractmethod
+from dataclasses import fields
+from typing import Optional, List, Dict, Any, Callable, Iterator, Union
+
+from .models import Edital, Cargo, ConteudoProgramatico, ConteudoBatch, COLUNAS_CONTEUDO
+
+# Colunas expostas por tabela (campos dos modelos + created_at)
+COLUNAS_TABELAS: Dict[str, tuple] = {
+    tabela: tuple(f.name for f in fields(modelo)) + ("created_at",)
+    for tabela, modelo in (
+        ("editais", Edital),
+        ("cargos", Cargo),
+        ("conteudo_programatico", ConteudoProgramatico),
+    )
+}
+
+# Colunas de data aceitas em filtros["campo_data"] de listar_pagina
+CAMPOS_DATA_FILTRO = ("data_prova", "data_processamento", "data_upload")
+
+
+def validar_colunas(tabela: str, colunas: Optional[List[str]] = None) -> List[str]:
+    """Valida tabela/colunas e retorna a lista efetiva (sempre incluindo id)."""
+    if tabela not in COLUNAS_TABELAS:
+        raise ValueError(f"Tabela desconhecida: {tabela}")
+
+    disponiveis = COLUNAS_TABELAS[tabela]
+    if not colunas:
+        return list(disponiveis)
+
+    invalidas = [c for c in colunas if c not in disponiveis]
+    if invalidas:
+        raise ValueError(f"Colunas inválidas para {tabela}: {', '.join(invalidas)}")
+
+    # id é a chave da paginação keyset
+    return colunas if "id" in colunas else ["id"] + list(colunas)
+
+
+def linhas_conteudo(conteudos: Union[ConteudoBatch, List[ConteudoProgramatico]]) -> Iterator[tuple]:
+    """Linhas na ordem de COLUNAS_CONTEUDO, de um batch do parser ou de objetos."""
+    if isinstance(conteudos, ConteudoBatch):
+        return conteudos.linhas()
+    return (tuple(getattr(c, coluna) for coluna in COLUNAS_CONTEUDO) for c in conteudos)
+
+
+def registros_conteudo(conteudos: Union[ConteudoBatch, List[ConteudoProgramatico]]) -> List[dict]:
+    """Um dict por linha (payloads JSON), de um batch do parser ou de objetos."""
+    if isinstance(conteudos, ConteudoBatch):
+        return conteudos.registros()
+    return [dict(zip(COLUNAS_CONTEUDO, linha)) for linha in linhas_conteudo(conteudos)]
+
+
+class StorageBackend(ABC):
+    """Contrato de persistência usado pelo pipeline de editais."""
+
+    async def close(self):
+        """Libera recursos do backend."""
+
+    # ==================== OBSERVADORES ====================
+
+    def ao_finalizar(self, callback: Callable[[str, bool], None]):
+        """
+        Registra `callback(edital_id, sucesso)`, chamado depois que
+        `finalizar_processamento` grava o edital (ex.: invalidar caches de leitura).
+        """
+        if "_observadores_finalizacao" not in self.__dict__:
+            self._observadores_finalizacao: List[Callable[[str, bool], None]] = []
+        self._observadores_finalizacao.append(callback)
+
+    def _notificar_finalizacao(self, edital_id: str, sucesso: bool):
+        for callback in self.__dict__.get("_observadores_finalizacao", ()):
+            try:
+                callback(edital_id, sucesso)
+            except Exception as e:
+                print(f"Erro no observador de finalização: {e}")
+
+    # ==================== EDITAIS ====================
+
+    @abstractmethod
+    async def edital_existe(self, hash_arquivo: str) -> Optional[Dict[str, Any]]:
+        """Verifica se edital já foi processado pelo hash."""
+
+    @abstractmethod
+    async def criar_edital(self, edital: Edital) -> str:
+        """Cria registro de edital e retorna o ID."""
+
+    @abstractmethod
+    async def atualizar_edital(self, edital_id: str, dados: Dict[str, Any]) -> bool:
+        """Atualiza campos do edital."""
+
+    @abstractmethod
+    async def finalizar_processamento(
+        self,
+        edital_id: str,
+        sucesso: bool,
+        erro_mensagem: Optional[str] = None,
+        dados_extras: Optional[Dict[str, Any]] = None
+    ):
+        """Marca edital como concluído ou com erro."""
+
+    @abstractmethod
+    async def buscar_edital(
+        self,
+        edital_id: str,
+        colunas: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Edital pelo id (só as `colunas` pedidas, se informadas), ou None."""
+
+    @abstractmethod
+    async def buscar_editais_incompletos(
+        self,
+        incluir_erros: bool = False,
+        limite: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Editais interrompidos (status 'processando'), do mais antigo ao mais novo.
+
+        Args:
+            incluir_erros: Também retorna editais com status 'erro'
+            limite: Máximo de editais retornados
+        """
+
+    @abstractmethod
+    async def remover_linhas_edital(self, edital_id: str) -> bool:
+        """Remove cargos e conteúdo de um edital (limpa gravações parciais)."""
+
+    # ==================== CARGOS ====================
+
+    @abstractmethod
+    async def inserir_cargos(self, cargos: List[Cargo]) -> bool:
+        """Insere múltiplos cargos de uma vez."""
+
+    # ==================== CONTEÚDO PROGRAMÁTICO ====================
+
+    @abstractmethod
+    async def inserir_conteudo_programatico(
+        self,
+        conteudos: Union[ConteudoBatch, List[ConteudoProgramatico]],
+        batch_size: int = 100
+    ) -> bool:
+        """Insere conteúdo programático em lotes (ConteudoBatch ou lista de objetos)."""
+
+    # ==================== FILA DE JOBS ====================
+
+    @abstractmethod
+    async def enfileirar_jobs(self, jobs: List[Dict[str, str]]) -> int:
+        """
+        Enfileira jobs ignorando chaves já existentes.
+
+        Args:
+            jobs: Dicts com `chave` (hash do arquivo ou url:<hash da URL>) e `fonte`
+
+        Returns:
+            Quantidade de jobs efetivamente inseridos.
+        """
+
+    @abstractmethod
+    async def reivindicar_jobs(
+        self,
+        worker_id: str,
+        lease_segundos: int = 300,
+        limite: int = 1
+    ) -> List[Dict[str, Any]]:
+        """Reivindica jobs pendentes ou com lease expirado (nunca o mesmo para dois workers)."""
+
+    @abstractmethod
+    async def renovar_lease(self, job_id: str, worker_id: str, lease_segundos: int = 300) -> bool:
+        """Heartbeat: estende o lease. Retorna False se o lease foi perdido."""
+
+    @abstractmethod
+    async def concluir_job(
+        self,
+        job_id: str,
+        worker_id: str,
+        sucesso: bool,
+        erro_mensagem: Optional[str] = None,
+        edital_id: Optional[str] = None
+    ) -> bool:
+        """
+        Marca o job como concluído e libera o lease. Com erro, o job volta
+        para 'pendente' enquanto tentativas < max_tentativas.
+        """
+
+    # ==================== CONSULTAS ====================
+
+    @abstractmethod
+    async def buscar_editais_recentes(self, limite: int = 10) -> List[Dict[str, Any]]:
+        """Retorna editais processados recentemente."""
+
+    @abstractmethod
+    async def buscar_conteudo_por_materia(
+        self,
+        edital_id: str,
+        materia: str
+    ) -> List[Dict[str, Any]]:
+        """Busca tópicos de uma matéria específica."""
+
+    @abstractmethod
+    async def buscar_cargos(self, edital_id: str) -> List[Dict[str, Any]]:
+        """Retorna os cargos de um edital."""
+
+    @abstractmethod
+    async def buscar_conteudo(self, edital_id: str) -> List[Dict[str, Any]]:
+        """Retorna todo o conteúdo programático de um edital, em ordem."""
+
+    @abstractmethod
+    async def estatisticas_processamento(self) -> Dict[str, Any]:
+        """Retorna estatísticas gerais."""
+
+    @abstractmethod
+    async def listar_pagina(
+        self,
+        tabela: str,
+        colunas: List[str],
+        apos_id: Optional[str] = None,
+        limite: int = 1000,
+        filtros: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Retorna uma página ordenada por id usando paginação keyset (sem OFFSET).
+
+        Args:
+            tabela: editais, cargos ou conteudo_programatico
+            colunas: Colunas já validadas com `validar_colunas`
+            apos_id: Último id da página anterior (None na primeira página)
+            limite: Tamanho da página
+            filtros: status, data_inicio, data_fim e campo_data, aplicados
+                sobre o edital (via join nas tabelas filhas)
+        """
+
+    @abstractmethod
+    async def buscar_topicos(
+        self,
+        consulta: str,
+        filtros: Optional[Dict[str, Any]] = None,
+        limite: int = 20,
+        cursor: Optional[str] = None,
+        topicos_por_edital: int = 5
+    ) -> Dict[str, Any]:
+        """
+        Busca textual ranqueada nos tópicos, agrupada por edital (ver src/database/busca.py).
+
+        Args:
+            consulta: Termos na sintaxe de busca na web ("frase", or, -termo)
+            filtros: status, data_inicio, data_fim e campo_data do edital, como
+                em listar_pagina, e materia (termos da matéria do tópico)
+            limite: Editais por página (máximo busca.LIMITE_MAXIMO)
+            cursor: `proximo_cursor` da página anterior (None na primeira)
+            topicos_por_edital: Tópicos mais relevantes devolvidos por edital
+
+        Returns:
+            {"editais": [{edital_id, nome_arquivo, status, data_prova,
+            data_processamento, rank, total_topicos, topicos: [{id, materia,
+            descricao, numeracao, ordem, rank}]}], "proximo_cursor": str | None}
+        """
+
+
+def get_storage_backend(nome: Optional[str] = None) -> StorageBackend:
+    """
+    Instancia o backend configurado.
+
+    Args:
+        nome: "supabase" ou "sqlite". Se omitido, usa STORAGE_BACKEND
+            (default: supabase).
+    """
+    nome = (nome or os.getenv("STORAGE_BACKEND", "supabase")).lower()
+
+    if nome == "supabase":
+        from .supabase_client import SupabaseManager
+        return SupabaseManager()
+
+    if nome == "sqlite":
+        from .sqlite_backend import SQLiteManager
+        return SQLiteManager(os.getenv("SQLITE_PATH", "data/verticaliza.db"))
+
+    raise ValueError(f"Backend de armazenamento desconhecido: {nome}")
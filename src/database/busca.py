@@ -0,0 +1,103 @@
+"""
+Busca textual ranqueada nos tópicos do conteúdo programático.
+
+Os dois backends devolvem o mesmo formato: editais ordenados pela relevância
+do melhor tópico encontrado (desempate pelo id), cada um com seus tópicos
+mais relevantes. A paginação usa um cursor opaco com (relevância, edital_id)
+do último edital da página, sem OFFSET.
+
+A consulta segue a sintaxe de busca na web do PostgreSQL
+(`websearch_to_tsquery`): termos soltos (todos obrigatórios), "frases entre
+aspas", `or` entre alternativas e `-termo` para excluir.
+
+- Supabase: coluna tsvector gerada com a configuração `pt_unaccent`
+  (português com unaccent) e índice GIN (migrations/005_busca_topicos.sql)
+- SQLite: tabela FTS5 `conteudo_busca` (unicode61 sem diacríticos, sem stemming)
+"""
+import base64
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+LIMITE_MAXIMO = 100
+
+_TOKENS_CONSULTA = re.compile(r'(-?)"([^"]*)"?|(\S+)')
+
+
+def validar_busca(consulta: str, limite: int, topicos_por_edital: int) -> str:
+    """Valida os parâmetros comuns e devolve a consulta sem espaços nas pontas."""
+    consulta = (consulta or "").strip()
+    if not consulta:
+        raise ValueError("A consulta de busca não pode ser vazia")
+    if not 1 <= limite <= LIMITE_MAXIMO:
+        raise ValueError(f"limite deve estar entre 1 e {LIMITE_MAXIMO}")
+    if topicos_por_edital < 1:
+        raise ValueError("topicos_por_edital deve ser >= 1")
+    return consulta
+
+
+def codificar_cursor(rank: float, edital_id: str) -> str:
+    """Cursor opaco que aponta para depois do edital informado."""
+    return base64.urlsafe_b64encode(json.dumps([rank, edital_id]).encode()).decode().rstrip("=")
+
+
+def decodificar_cursor(cursor: Optional[str]) -> Tuple[Optional[float], Optional[str]]:
+    """(relevância, edital_id) de um cursor de `codificar_cursor`; (None, None) sem cursor."""
+    if not cursor:
+        return None, None
+    try:
+        rank, edital_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return float(rank), str(edital_id)
+    except (ValueError, TypeError):
+        raise ValueError(f"Cursor de busca inválido: {cursor}")
+
+
+def pagina_busca(editais: List[Dict[str, Any]], limite: int) -> Dict[str, Any]:
+    """Resultado de uma página: editais e o cursor da próxima (None na última)."""
+    proximo = None
+    if len(editais) == limite:
+        ultimo = editais[-1]
+        proximo = codificar_cursor(ultimo["rank"], ultimo["edital_id"])
+    return {"editais": editais, "proximo_cursor": proximo}
+
+
+def _termo_fts5(termo: str) -> str:
+    return '"' + termo.replace('"', '""') + '"'
+
+
+def consulta_fts5(consulta: str) -> str:
+    """
+    Traduz a sintaxe de busca na web para uma expressão MATCH do FTS5.
+
+    Cada termo vira uma string entre aspas, que o tokenizer quebra como no
+    texto indexado ("14.133" casa a sequência 14, 133). Sem nenhum termo
+    positivo (ex.: só exclusões) levanta ValueError.
+    """
+    grupos: List[List[str]] = []
+    excluidos: List[str] = []
+    ou = False
+    for negado, frase, palavra in _TOKENS_CONSULTA.findall(consulta):
+        if palavra and palavra.lower() == "or":
+            ou = bool(grupos)
+            continue
+        if palavra.startswith("-") and len(palavra) > 1:
+            negado, palavra = "-", palavra[1:]
+        termo = frase if frase or not palavra else palavra
+        if not termo.strip():
+            continue
+        if negado:
+            excluidos.append(_termo_fts5(termo))
+        elif ou:
+            grupos[-1].append(_termo_fts5(termo))
+        else:
+            grupos.append([_termo_fts5(termo)])
+        ou = False
+
+    if not grupos:
+        raise ValueError(f"A consulta não tem termos para buscar: {consulta}")
+    expressao = " AND ".join(
+        grupo[0] if len(grupo) == 1 else "(" + " OR ".join(grupo) + ")" for grupo in grupos
+    )
+    for termo in excluidos:
+        expressao = f"({expressao}) NOT {termo}"
+    return expressao
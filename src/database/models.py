@@ -1,14 +1,32 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, date
-from typing import Optional, List
+from typing import Optional, List, Iterator
 from enum import Enum
 
+# Modelos com __slots__ (sem __dict__ por instância) e validados na criação.
+# Erros de validação levantam ValueError.
+
+def _exigir_texto(valor, campo: str):
+    if not isinstance(valor, str) or not valor.strip():
+        raise ValueError(f"{campo} deve ser um texto não vazio (recebido: {valor!r})")
+
+def _exigir_minimo(valor, campo: str, minimo: int = 0):
+    if valor is not None and (isinstance(valor, bool) or not isinstance(valor, int) or valor < minimo):
+        raise ValueError(f"{campo} deve ser um inteiro >= {minimo} (recebido: {valor!r})")
+
 class StatusProcessamento(str, Enum):
     PROCESSANDO = "processando"
     CONCLUIDO = "concluido"
     ERRO = "erro"
 
-@dataclass
+class EtapaProcessamento(str, Enum):
+    """Checkpoints do pipeline, na ordem em que são concluídos."""
+    EXTRAIDO = "extraido"
+    METADADOS = "metadados"
+    VERTICALIZADO = "verticalizado"
+    LINHAS_GRAVADAS = "linhas_gravadas"
+
+@dataclass(slots=True)
 class Edital:
     hash_arquivo: str
     nome_arquivo: str
@@ -17,7 +35,7 @@ class Edital:
     total_paginas: Optional[int] = None
     status: StatusProcessamento = StatusProcessamento.PROCESSANDO
     erro_mensagem: Optional[str] = None
-    data_upload: datetime = None
+    data_upload: Optional[datetime] = None
     data_processamento: Optional[datetime] = None
     tempo_processamento_segundos: Optional[float] = None
     custo_total_usd: Optional[float] = None
@@ -30,16 +48,33 @@ class Edital:
     detalhes_discursiva: Optional[str] = None
     texto_extraido: Optional[str] = None
     conteudo_verticalizado_md: Optional[str] = None
+    etapa_concluida: Optional[EtapaProcessamento] = None
+    checkpoint_em: Optional[datetime] = None
+    metadados_brutos: Optional[str] = None
     id: Optional[str] = None
 
-@dataclass
+    def __post_init__(self):
+        _exigir_texto(self.hash_arquivo, "hash_arquivo")
+        _exigir_texto(self.nome_arquivo, "nome_arquivo")
+        _exigir_minimo(self.tamanho_bytes, "tamanho_bytes")
+        _exigir_minimo(self.total_paginas, "total_paginas")
+        # Valores vindos do banco chegam como texto
+        self.status = StatusProcessamento(self.status)
+        if self.etapa_concluida is not None:
+            self.etapa_concluida = EtapaProcessamento(self.etapa_concluida)
+
+@dataclass(slots=True)
 class Cargo:
     edital_id: str
     nome: str
     salario: Optional[str] = None
     id: Optional[str] = None
 
-@dataclass
+    def __post_init__(self):
+        _exigir_texto(self.edital_id, "edital_id")
+        _exigir_texto(self.nome, "nome")
+
+@dataclass(slots=True)
 class ConteudoProgramatico:
     edital_id: str
     descricao: str
@@ -50,4 +85,72 @@ class ConteudoProgramatico:
     nivel_3: Optional[str] = None
     nivel_4: Optional[str] = None
     ordem: Optional[int] = None
-    id: Optional[str] = None
\ No newline at end of file
+    numeracao: Optional[str] = None
+    nivel: Optional[int] = None
+    ordem_pai: Optional[int] = None
+    id: Optional[str] = None
+
+    def __post_init__(self):
+        _exigir_texto(self.edital_id, "edital_id")
+        _exigir_texto(self.descricao, "descricao")
+        _exigir_minimo(self.ordem, "ordem")
+        _exigir_minimo(self.nivel, "nivel", minimo=1)
+        _exigir_minimo(self.ordem_pai, "ordem_pai")
+
+# Ordem das colunas nas linhas de conteúdo enviadas aos inserts em lote
+COLUNAS_CONTEUDO = (
+    "edital_id", "secao", "materia", "descricao",
+    "nivel_1", "nivel_2", "nivel_3", "nivel_4",
+    "ordem", "numeracao", "nivel", "ordem_pai",
+)
+
+_SEM_NIVEIS = (None, None, None, None)
+
+def _niveis(numeracao: Optional[str]) -> tuple:
+    """nivel_1..nivel_4 a partir da numeração completa ("1.2" -> ("1", "2", None, None))."""
+    if not numeracao:
+        return _SEM_NIVEIS
+    return (*numeracao.split(".", 4)[:4], None, None, None)[:4]
+
+@dataclass(slots=True)
+class ConteudoBatch:
+    """
+    Conteúdo programático de um edital em colunas paralelas.
+
+    A posição i de cada lista é o item de `ordem` i. `ordem_pai` aponta para a
+    ordem do item pai, sem limite de profundidade; nivel_1..4 são derivados
+    de `numeracao` só na hora de gerar as linhas.
+    """
+    edital_id: str
+    secao: List[Optional[str]] = field(default_factory=list)
+    materia: List[Optional[str]] = field(default_factory=list)
+    descricao: List[str] = field(default_factory=list)
+    numeracao: List[Optional[str]] = field(default_factory=list)
+    nivel: List[Optional[int]] = field(default_factory=list)
+    ordem_pai: List[Optional[int]] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.descricao)
+
+    def _colunas(self):
+        return enumerate(zip(self.secao, self.materia, self.descricao, self.numeracao, self.nivel, self.ordem_pai))
+
+    def linhas(self) -> Iterator[tuple]:
+        """Tuplas na ordem de COLUNAS_CONTEUDO (inserts por executemany)."""
+        edital_id = self.edital_id
+        for ordem, (secao, materia, descricao, numeracao, nivel, pai) in self._colunas():
+            yield (edital_id, secao, materia, descricao, *_niveis(numeracao), ordem, numeracao, nivel, pai)
+
+    def registros(self) -> List[dict]:
+        """Um dict por linha, montado direto das colunas (payloads JSON)."""
+        edital_id = self.edital_id
+        registros = []
+        adicionar = registros.append
+        for ordem, (secao, materia, descricao, numeracao, nivel, pai) in self._colunas():
+            n1, n2, n3, n4 = _niveis(numeracao)
+            adicionar({
+                "edital_id": edital_id, "secao": secao, "materia": materia, "descricao": descricao,
+                "nivel_1": n1, "nivel_2": n2, "nivel_3": n3, "nivel_4": n4,
+                "ordem": ordem, "numeracao": numeracao, "nivel": nivel, "ordem_pai": pai,
+            })
+        return registros
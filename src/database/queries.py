@@ -1,6 +1,72 @@
-from typing import List, Dict, Any
+import asyncio
+from typing import List, Dict, Any, AsyncIterator, Optional
+from .models import StatusProcessamento
 from .supabase_client import SupabaseManager
 
+# Colunas do edital expostas em `documento_edital`
+COLUNAS_DOCUMENTO = [
+    "id", "nome_arquivo", "url_origem", "status", "total_paginas", "formato_prova",
+    "data_prova", "data_inscricao_inicio", "data_inscricao_fim", "valor_inscricao",
+    "detalhes_discursiva", "modelo_usado", "data_processamento",
+]
+
+
+def arvore_topicos(linhas: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Árvore seção → matéria → tópicos a partir das linhas de conteúdo em ordem.
+
+    Os filhos são ligados por `ordem_pai`; um pai ausente (linha apagada ou
+    gravada por uma versão antiga do parser) deixa o item na raiz da matéria.
+    """
+    secoes: List[Dict[str, Any]] = []
+    topicos: Optional[List[Dict[str, Any]]] = None
+    chave_atual = object()
+    nos: Dict[int, Dict[str, Any]] = {}
+
+    for linha in linhas:
+        chave = (linha.get("secao"), linha.get("materia"))
+        if chave != chave_atual:
+            chave_atual = chave
+            if not secoes or secoes[-1]["secao"] != chave[0]:
+                secoes.append({"secao": chave[0], "materias": []})
+            topicos = []
+            secoes[-1]["materias"].append({"materia": chave[1], "topicos": topicos})
+
+        no: Dict[str, Any] = {"descricao": linha["descricao"]}
+        if linha.get("numeracao"):
+            no["numeracao"] = linha["numeracao"]
+        if linha.get("ordem") is not None:
+            nos[linha["ordem"]] = no
+
+        pai = nos.get(linha.get("ordem_pai"))
+        if pai is None:
+            topicos.append(no)
+        else:
+            pai.setdefault("filhos", []).append(no)
+    return secoes
+
+
+def montar_documento(
+    edital: Dict[str, Any],
+    cargos: List[Dict[str, Any]],
+    conteudo: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Documento de leitura de um edital: metadados, cargos e árvore de tópicos.
+
+    Sem as colunas internas (texto extraído, markdown, checkpoints,
+    nivel_1..4, ids das linhas); nos tópicos, numeração nula e `filhos`
+    vazios são omitidos.
+    """
+    documento = {coluna: edital.get(coluna) for coluna in COLUNAS_DOCUMENTO}
+    documento["cargos"] = [
+        {"nome": cargo["nome"], "salario": cargo.get("salario")} for cargo in cargos
+    ]
+    documento["total_topicos"] = len(conteudo)
+    documento["conteudo"] = arvore_topicos(conteudo)
+    return documento
+
+
 class EditalQueries:
     def __init__(self, db: SupabaseManager):
         self.db = db
@@ -65,4 +131,53 @@ class EditalQueries:
             .limit(limite)\
             .execute()
 
-        return similares.data
\ No newline at end of file
+        return similares.data
+
+    async def buscar_topicos(
+        self,
+        consulta: str,
+        filtros: Optional[Dict[str, Any]] = None,
+        limite: int = 20,
+        cursor: Optional[str] = None,
+        topicos_por_edital: int = 5
+    ) -> Dict[str, Any]:
+        """Busca ranqueada nos tópicos de todos os editais, agrupada por edital."""
+        return await self.db.buscar_topicos(
+            consulta, filtros=filtros, limite=limite, cursor=cursor, topicos_por_edital=topicos_por_edital
+        )
+
+    async def iterar_busca_topicos(
+        self,
+        consulta: str,
+        filtros: Optional[Dict[str, Any]] = None,
+        limite: int = 20,
+        topicos_por_edital: int = 5
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Percorre todos os editais encontrados, página a página pelo cursor."""
+        cursor = None
+        while True:
+            pagina = await self.buscar_topicos(
+                consulta, filtros=filtros, limite=limite, cursor=cursor, topicos_por_edital=topicos_por_edital
+            )
+            for edital in pagina["editais"]:
+                yield edital
+            cursor = pagina["proximo_cursor"]
+            if not cursor:
+                return
+
+    async def documento_edital(self, edital_id: str) -> Optional[Dict[str, Any]]:
+        """Documento de leitura de um edital concluído (ver `montar_documento`), ou None."""
+        edital = await self.db.buscar_edital(edital_id, COLUNAS_DOCUMENTO)
+        if not edital or edital["status"] != StatusProcessamento.CONCLUIDO.value:
+            return None
+        cargos, conteudo = await asyncio.gather(
+            self.db.buscar_cargos(edital_id), self.db.buscar_conteudo(edital_id)
+        )
+        return montar_documento(edital, cargos, conteudo)
+
+    async def markdown_edital(self, edital_id: str) -> Optional[str]:
+        """Conteúdo verticalizado (markdown) de um edital concluído, ou None."""
+        edital = await self.db.buscar_edital(edital_id, ["status", "conteudo_verticalizado_md"])
+        if not edital or edital["status"] != StatusProcessamento.CONCLUIDO.value:
+            return None
+        return edital["conteudo_verticalizado_md"]
@@ -0,0 +1,48 @@
+"""
+Serialização JSON dos payloads enviados ao PostgREST.
+
+Usa `orjson` quando instalado (encoder em Rust, devolve bytes direto) e cai
+para o `json` da biblioteca padrão. Os lotes são codificados uma única vez
+em bytes; a mesma sequência é reenviada em caso de retry.
+"""
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, List, Sequence
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+ENCODER = "orjson" if orjson is not None else "json"
+
+
+def _padrao(valor: Any) -> Any:
+    """Tipos que o `json` da biblioteca padrão não codifica sozinho."""
+    if isinstance(valor, Enum):
+        return valor.value
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat()
+    raise TypeError(f"Tipo não serializável: {type(valor).__name__}")
+
+
+if orjson is not None:
+    def dumps(dados: Any) -> bytes:
+        """Codifica `dados` em JSON (UTF-8)."""
+        return orjson.dumps(dados, default=_padrao)
+else:
+    # ensure_ascii (default) é o caminho mais rápido do encoder em C
+    _encoder = json.JSONEncoder(separators=(",", ":"), default=_padrao)
+
+    def dumps(dados: Any) -> bytes:
+        """Codifica `dados` em JSON (UTF-8)."""
+        return _encoder.encode(dados).encode("utf-8")
+
+
+def serializar_lotes(registros: Sequence[dict], batch_size: int) -> List[bytes]:
+    """Codifica `registros` em arrays JSON, um payload por lote de `batch_size`."""
+    return [
+        dumps(registros[i:i + batch_size])
+        for i in range(0, len(registros), batch_size)
+    ]
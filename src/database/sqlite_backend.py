@@ -0,0 +1,725 @@
+"""
+Backend de armazenamento embutido em SQLite (modo WAL).
+
+Espelha o schema de `migrations/001_initial_schema.sql` para permitir
+reprocessamentos offline sem latência de rede. Os resultados podem ser
+enviados depois ao Supabase com `python -m src.database.sync`.
+"""
+import asyncio
+import sqlite3
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Union
+
+from .base import StorageBackend, CAMPOS_DATA_FILTRO, linhas_conteudo, validar_colunas
+from .busca import consulta_fts5, decodificar_cursor, pagina_busca, validar_busca
+from .models import (
+    Edital, Cargo, ConteudoProgramatico, ConteudoBatch, StatusProcessamento, COLUNAS_CONTEUDO
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS editais (
+    id TEXT PRIMARY KEY,
+    hash_arquivo TEXT UNIQUE NOT NULL,
+    nome_arquivo TEXT NOT NULL,
+    url_origem TEXT,
+    tamanho_bytes INTEGER,
+    total_paginas INTEGER,
+    status TEXT NOT NULL DEFAULT 'processando',
+    erro_mensagem TEXT,
+    data_upload TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%f', 'now')),
+    data_processamento TEXT,
+    tempo_processamento_segundos REAL,
+    custo_total_usd REAL,
+    modelo_usado TEXT,
+    formato_prova TEXT,
+    data_prova TEXT,
+    data_inscricao_inicio TEXT,
+    data_inscricao_fim TEXT,
+    valor_inscricao TEXT,
+    detalhes_discursiva TEXT,
+    texto_extraido TEXT,
+    conteudo_verticalizado_md TEXT,
+    etapa_concluida TEXT,
+    checkpoint_em TEXT,
+    metadados_brutos TEXT,
+    created_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%f', 'now'))
+);
+
+CREATE TABLE IF NOT EXISTS cargos (
+    id TEXT PRIMARY KEY,
+    edital_id TEXT REFERENCES editais(id) ON DELETE CASCADE,
+    nome TEXT NOT NULL,
+    salario TEXT,
+    created_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%f', 'now'))
+);
+
+CREATE TABLE IF NOT EXISTS conteudo_programatico (
+    id TEXT PRIMARY KEY,
+    edital_id TEXT REFERENCES editais(id) ON DELETE CASCADE,
+    secao TEXT,
+    materia TEXT,
+    descricao TEXT NOT NULL,
+    nivel_1 TEXT,
+    nivel_2 TEXT,
+    nivel_3 TEXT,
+    nivel_4 TEXT,
+    ordem INTEGER,
+    numeracao TEXT,
+    nivel INTEGER,
+    ordem_pai INTEGER,
+    created_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%f', 'now'))
+);
+
+CREATE INDEX IF NOT EXISTS idx_editais_hash ON editais(hash_arquivo);
+CREATE INDEX IF NOT EXISTS idx_editais_status ON editais(status);
+CREATE INDEX IF NOT EXISTS idx_cargos_edital ON cargos(edital_id);
+CREATE INDEX IF NOT EXISTS idx_conteudo_edital ON conteudo_programatico(edital_id);
+CREATE INDEX IF NOT EXISTS idx_conteudo_materia ON conteudo_programatico(materia);
+
+CREATE TABLE IF NOT EXISTS edital_jobs (
+    id TEXT PRIMARY KEY,
+    chave TEXT UNIQUE NOT NULL,
+    fonte TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pendente',
+    worker_id TEXT,
+    lease_expira_em TEXT,
+    tentativas INTEGER NOT NULL DEFAULT 0,
+    max_tentativas INTEGER NOT NULL DEFAULT 3,
+    erro_mensagem TEXT,
+    edital_id TEXT REFERENCES editais(id) ON DELETE SET NULL,
+    created_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%f', 'now')),
+    updated_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%f', 'now'))
+);
+
+CREATE INDEX IF NOT EXISTS idx_edital_jobs_status ON edital_jobs(status, created_at);
+
+-- Busca textual dos tópicos (FTS5 com o texto em conteudo_programatico).
+-- O índice usa o rowid implícito: depois de um VACUUM, reconstrua com
+-- INSERT INTO conteudo_busca(conteudo_busca) VALUES ('rebuild')
+CREATE VIRTUAL TABLE IF NOT EXISTS conteudo_busca USING fts5(
+    descricao,
+    materia,
+    content='conteudo_programatico',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS conteudo_busca_ai AFTER INSERT ON conteudo_programatico BEGIN
+    INSERT INTO conteudo_busca(rowid, descricao, materia)
+    VALUES (new.rowid, new.descricao, new.materia);
+END;
+
+CREATE TRIGGER IF NOT EXISTS conteudo_busca_ad AFTER DELETE ON conteudo_programatico BEGIN
+    INSERT INTO conteudo_busca(conteudo_busca, rowid, descricao, materia)
+    VALUES ('delete', old.rowid, old.descricao, old.materia);
+END;
+
+CREATE TRIGGER IF NOT EXISTS conteudo_busca_au AFTER UPDATE OF descricao, materia ON conteudo_programatico BEGIN
+    INSERT INTO conteudo_busca(conteudo_busca, rowid, descricao, materia)
+    VALUES ('delete', old.rowid, old.descricao, old.materia);
+    INSERT INTO conteudo_busca(rowid, descricao, materia)
+    VALUES (new.rowid, new.descricao, new.materia);
+END;
+
+-- Controle local de sincronização com o Supabase (não existe no schema remoto)
+CREATE TABLE IF NOT EXISTS sync_supabase (
+    edital_id TEXT PRIMARY KEY REFERENCES editais(id) ON DELETE CASCADE,
+    edital_id_remoto TEXT NOT NULL,
+    sincronizado_em TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%f', 'now'))
+);
+"""
+
+# Colunas adicionadas por migrations posteriores à 001 (bancos locais antigos)
+COLUNAS_MIGRADAS = {
+    "editais": (
+        ("etapa_concluida", "TEXT"),
+        ("checkpoint_em", "TEXT"),
+        ("metadados_brutos", "TEXT"),
+    ),
+    "conteudo_programatico": (
+        ("numeracao", "TEXT"),
+        ("nivel", "INTEGER"),
+        ("ordem_pai", "INTEGER"),
+    ),
+}
+
+CONTEUDO_COLUNAS = ("id",) + COLUNAS_CONTEUDO
+
+
+class SQLiteManager(StorageBackend):
+    """Implementação embutida da interface de armazenamento."""
+
+    def __init__(self, db_path: str = "data/verticaliza.db"):
+        self.db_path = Path(db_path)
+        if str(db_path) != ":memory:":
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Uma única thread dona da conexão serializa o acesso sem locks
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite")
+        self.conn = self._executor.submit(self._connect).result()
+        # Nomes aceitos em atualizar_edital (as chaves de `dados` viram SQL)
+        self._colunas_editais = frozenset(
+            row["name"] for row in self._executor.submit(
+                self._fetchall, "PRAGMA table_info(editais)"
+            ).result()
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        busca_existia = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'conteudo_busca'"
+        ).fetchone() is not None
+        conn.executescript(SCHEMA)
+        self._migrar(conn)
+        if not busca_existia:
+            # Banco de uma versão anterior: indexa o conteúdo já gravado
+            with conn:
+                conn.execute("INSERT INTO conteudo_busca(conteudo_busca) VALUES ('rebuild')")
+        return conn
+
+    @staticmethod
+    def _migrar(conn: sqlite3.Connection):
+        """Adiciona colunas novas em bancos criados por versões anteriores."""
+        for tabela, colunas in COLUNAS_MIGRADAS.items():
+            existentes = {row["name"] for row in conn.execute(f"PRAGMA table_info({tabela})")}
+            for nome, tipo in colunas:
+                if nome not in existentes:
+                    conn.execute(f"ALTER TABLE {tabela} ADD COLUMN {nome} {tipo}")
+        conn.commit()
+
+    async def _run(self, func, *args):
+        """Executa operação bloqueante na thread da conexão."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def _fetchall(self, sql: str, params: tuple = ()) -> List[Dict[str, Any]]:
+        return [dict(row) for row in self.conn.execute(sql, params).fetchall()]
+
+    async def close(self):
+        """Fecha a conexão SQLite."""
+        await self._run(self.conn.close)
+        self._executor.shutdown(wait=True)
+
+    # ==================== EDITAIS ====================
+
+    async def edital_existe(self, hash_arquivo: str) -> Optional[Dict[str, Any]]:
+        """Verifica se edital já foi processado pelo hash."""
+        rows = await self._run(
+            self._fetchall,
+            "SELECT * FROM editais WHERE hash_arquivo = ?",
+            (hash_arquivo,)
+        )
+        return rows[0] if rows else None
+
+    async def criar_edital(self, edital: Edital) -> str:
+        """Cria registro de edital e retorna o ID."""
+        edital_id = str(uuid.uuid4())
+
+        def _insert():
+            with self.conn:
+                self.conn.execute(
+                    "INSERT INTO editais (id, hash_arquivo, nome_arquivo, url_origem, "
+                    "tamanho_bytes, total_paginas, status) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        edital_id,
+                        edital.hash_arquivo,
+                        edital.nome_arquivo,
+                        edital.url_origem,
+                        edital.tamanho_bytes,
+                        edital.total_paginas,
+                        edital.status.value,
+                    )
+                )
+
+        await self._run(_insert)
+        return edital_id
+
+    async def atualizar_edital(
+        self,
+        edital_id: str,
+        dados: Dict[str, Any]
+    ) -> bool:
+        """Atualiza campos do edital (ValueError para colunas desconhecidas)."""
+        if not dados:
+            return True
+
+        invalidas = [campo for campo in dados if campo not in self._colunas_editais]
+        if invalidas:
+            raise ValueError(f"Colunas inválidas para editais: {', '.join(map(str, invalidas))}")
+
+        colunas = ", ".join(f"{campo} = ?" for campo in dados)
+        valores = tuple(dados.values()) + (edital_id,)
+
+        def _update():
+            with self.conn:
+                self.conn.execute(f"UPDATE editais SET {colunas} WHERE id = ?", valores)
+
+        try:
+            await self._run(_update)
+            return True
+        except Exception as e:
+            print(f"Erro ao atualizar edital: {e}")
+            return False
+
+    async def finalizar_processamento(
+        self,
+        edital_id: str,
+        sucesso: bool,
+        erro_mensagem: Optional[str] = None,
+        dados_extras: Optional[Dict[str, Any]] = None
+    ):
+        """Marca edital como concluído ou com erro."""
+        update_data = {
+            "status": StatusProcessamento.CONCLUIDO.value if sucesso else StatusProcessamento.ERRO.value,
+            "data_processamento": datetime.utcnow().isoformat(),
+        }
+
+        if erro_mensagem:
+            update_data["erro_mensagem"] = erro_mensagem
+
+        if dados_extras:
+            update_data.update(dados_extras)
+
+        atualizado = await self.atualizar_edital(edital_id, update_data)
+        if atualizado:
+            self._notificar_finalizacao(edital_id, sucesso)
+        return atualizado
+
+    async def buscar_edital(
+        self,
+        edital_id: str,
+        colunas: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Edital pelo id (só as `colunas` pedidas, se informadas), ou None."""
+        select = ", ".join(validar_colunas("editais", colunas)) if colunas else "*"
+        rows = await self._run(
+            self._fetchall,
+            f"SELECT {select} FROM editais WHERE id = ?",
+            (edital_id,)
+        )
+        return rows[0] if rows else None
+
+    async def buscar_editais_incompletos(
+        self,
+        incluir_erros: bool = False,
+        limite: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Editais interrompidos (status 'processando'), do mais antigo ao mais novo."""
+        status = [StatusProcessamento.PROCESSANDO.value]
+        if incluir_erros:
+            status.append(StatusProcessamento.ERRO.value)
+
+        sql = (
+            f"SELECT * FROM editais WHERE status IN ({', '.join('?' for _ in status)}) "
+            "ORDER BY data_upload"
+        )
+        params = tuple(status)
+        if limite:
+            sql += " LIMIT ?"
+            params += (limite,)
+        return await self._run(self._fetchall, sql, params)
+
+    async def remover_linhas_edital(self, edital_id: str) -> bool:
+        """Remove cargos e conteúdo de um edital (limpa gravações parciais)."""
+        def _delete():
+            with self.conn:
+                self.conn.execute("DELETE FROM cargos WHERE edital_id = ?", (edital_id,))
+                self.conn.execute(
+                    "DELETE FROM conteudo_programatico WHERE edital_id = ?", (edital_id,)
+                )
+
+        try:
+            await self._run(_delete)
+            return True
+        except Exception as e:
+            print(f"Erro ao remover linhas do edital: {e}")
+            return False
+
+    # ==================== CARGOS ====================
+
+    async def inserir_cargos(self, cargos: List[Cargo]) -> bool:
+        """Insere múltiplos cargos de uma vez."""
+        if not cargos:
+            return True
+
+        data = [
+            (str(uuid.uuid4()), cargo.edital_id, cargo.nome, cargo.salario)
+            for cargo in cargos
+        ]
+
+        def _insert():
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT INTO cargos (id, edital_id, nome, salario) VALUES (?, ?, ?, ?)",
+                    data
+                )
+
+        try:
+            await self._run(_insert)
+            return True
+        except Exception as e:
+            print(f"Erro ao inserir cargos: {e}")
+            return False
+
+    # ==================== CONTEÚDO PROGRAMÁTICO ====================
+
+    async def inserir_conteudo_programatico(
+        self,
+        conteudos: Union[ConteudoBatch, List[ConteudoProgramatico]],
+        batch_size: int = 100
+    ) -> bool:
+        """Insere conteúdo programático (uma transação; batch_size é ignorado)."""
+        if not conteudos:
+            return True
+
+        data = [(str(uuid.uuid4()), *linha) for linha in linhas_conteudo(conteudos)]
+        placeholders = ", ".join("?" for _ in CONTEUDO_COLUNAS)
+
+        def _insert():
+            with self.conn:
+                self.conn.executemany(
+                    f"INSERT INTO conteudo_programatico ({', '.join(CONTEUDO_COLUNAS)}) "
+                    f"VALUES ({placeholders})",
+                    data
+                )
+
+        try:
+            await self._run(_insert)
+            return True
+        except Exception as e:
+            print(f"Erro ao inserir conteúdo programático: {e}")
+            return False
+
+    # ==================== FILA DE JOBS ====================
+
+    async def enfileirar_jobs(self, jobs: List[Dict[str, str]]) -> int:
+        """Enfileira jobs ignorando chaves já existentes."""
+        if not jobs:
+            return 0
+
+        data = [(str(uuid.uuid4()), j["chave"], j["fonte"]) for j in jobs]
+
+        def _insert() -> int:
+            with self.conn:
+                antes = self.conn.total_changes
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO edital_jobs (id, chave, fonte) VALUES (?, ?, ?)",
+                    data
+                )
+                return self.conn.total_changes - antes
+
+        return await self._run(_insert)
+
+    async def reivindicar_jobs(
+        self,
+        worker_id: str,
+        lease_segundos: int = 300,
+        limite: int = 1
+    ) -> List[Dict[str, Any]]:
+        """
+        Reivindica jobs em uma transação BEGIN IMMEDIATE, que serializa
+        workers de processos diferentes usando o mesmo arquivo.
+        """
+        def _claim() -> List[Dict[str, Any]]:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                agora = "strftime('%Y-%m-%dT%H:%M:%f', 'now')"
+                self.conn.execute(
+                    "UPDATE edital_jobs SET status = 'erro', "
+                    "erro_mensagem = 'Lease expirado após ' || tentativas || ' tentativas', "
+                    f"updated_at = {agora} "
+                    f"WHERE status = 'em_andamento' AND lease_expira_em < {agora} "
+                    "AND tentativas >= max_tentativas"
+                )
+                rows = self.conn.execute(
+                    "UPDATE edital_jobs SET status = 'em_andamento', worker_id = ?, "
+                    "lease_expira_em = strftime('%Y-%m-%dT%H:%M:%f', 'now', ?), "
+                    f"tentativas = tentativas + 1, updated_at = {agora} "
+                    "WHERE id IN ("
+                    "  SELECT id FROM edital_jobs "
+                    "  WHERE (status = 'pendente' "
+                    f"         OR (status = 'em_andamento' AND lease_expira_em < {agora})) "
+                    "    AND tentativas < max_tentativas "
+                    "  ORDER BY created_at LIMIT ?"
+                    ") RETURNING *",
+                    (worker_id, f"+{int(lease_segundos)} seconds", limite)
+                ).fetchall()
+                self.conn.commit()
+                return [dict(row) for row in rows]
+            except Exception:
+                self.conn.rollback()
+                raise
+
+        return await self._run(_claim)
+
+    async def renovar_lease(self, job_id: str, worker_id: str, lease_segundos: int = 300) -> bool:
+        """Heartbeat: estende o lease. Retorna False se o lease foi perdido."""
+        def _renew() -> bool:
+            with self.conn:
+                cursor = self.conn.execute(
+                    "UPDATE edital_jobs SET "
+                    "lease_expira_em = strftime('%Y-%m-%dT%H:%M:%f', 'now', ?), "
+                    "updated_at = strftime('%Y-%m-%dT%H:%M:%f', 'now') "
+                    "WHERE id = ? AND worker_id = ? AND status = 'em_andamento'",
+                    (f"+{int(lease_segundos)} seconds", job_id, worker_id)
+                )
+                return cursor.rowcount > 0
+
+        return await self._run(_renew)
+
+    async def concluir_job(
+        self,
+        job_id: str,
+        worker_id: str,
+        sucesso: bool,
+        erro_mensagem: Optional[str] = None,
+        edital_id: Optional[str] = None
+    ) -> bool:
+        """
+        Marca o job como concluído e libera o lease. Com erro, o job volta
+        para 'pendente' enquanto tentativas < max_tentativas.
+        """
+        def _complete() -> bool:
+            with self.conn:
+                cursor = self.conn.execute(
+                    "UPDATE edital_jobs SET status = CASE WHEN ? THEN 'concluido' "
+                    "WHEN tentativas < max_tentativas THEN 'pendente' ELSE 'erro' END, "
+                    "erro_mensagem = ?, edital_id = COALESCE(?, edital_id), lease_expira_em = NULL, "
+                    "updated_at = strftime('%Y-%m-%dT%H:%M:%f', 'now') "
+                    "WHERE id = ? AND worker_id = ? AND status = 'em_andamento'",
+                    (sucesso, erro_mensagem, edital_id, job_id, worker_id)
+                )
+                return cursor.rowcount > 0
+
+        return await self._run(_complete)
+
+    # ==================== CONSULTAS ====================
+
+    async def buscar_editais_recentes(self, limite: int = 10) -> List[Dict[str, Any]]:
+        """Retorna editais processados recentemente."""
+        return await self._run(
+            self._fetchall,
+            "SELECT * FROM editais WHERE status = ? "
+            "ORDER BY data_processamento DESC LIMIT ?",
+            (StatusProcessamento.CONCLUIDO.value, limite)
+        )
+
+    async def buscar_conteudo_por_materia(
+        self,
+        edital_id: str,
+        materia: str
+    ) -> List[Dict[str, Any]]:
+        """Busca tópicos de uma matéria específica."""
+        return await self._run(
+            self._fetchall,
+            "SELECT * FROM conteudo_programatico "
+            "WHERE edital_id = ? AND materia LIKE ? ORDER BY ordem",
+            (edital_id, f"%{materia}%")
+        )
+
+    async def estatisticas_processamento(self) -> Dict[str, Any]:
+        """Retorna estatísticas gerais."""
+        rows = await self._run(
+            self._fetchall,
+            "SELECT COUNT(*) AS total, "
+            "SUM(status = ?) AS concluidos, "
+            "SUM(status = ?) AS erros, "
+            "COALESCE(SUM(custo_total_usd), 0) AS custo "
+            "FROM editais",
+            (StatusProcessamento.CONCLUIDO.value, StatusProcessamento.ERRO.value)
+        )
+        row = rows[0]
+
+        return {
+            "total_editais": row["total"],
+            "concluidos": row["concluidos"] or 0,
+            "erros": row["erros"] or 0,
+            "custo_total_usd": round(float(row["custo"]), 2)
+        }
+
+    async def listar_pagina(
+        self,
+        tabela: str,
+        colunas: List[str],
+        apos_id: Optional[str] = None,
+        limite: int = 1000,
+        filtros: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Retorna uma página ordenada por id (keyset, sem OFFSET)."""
+        filtros = filtros or {}
+        select = ", ".join(f"t.{c}" for c in colunas)
+        join = "" if tabela == "editais" else " JOIN editais e ON e.id = t.edital_id"
+        alvo = "t" if tabela == "editais" else "e"
+
+        where = []
+        params: list = []
+        if apos_id:
+            where.append("t.id > ?")
+            params.append(apos_id)
+        if filtros.get("status"):
+            where.append(f"{alvo}.status = ?")
+            params.append(filtros["status"])
+
+        campo_data = filtros.get("campo_data", "data_prova")
+        if campo_data not in CAMPOS_DATA_FILTRO:
+            raise ValueError(f"Campo de data inválido: {campo_data}")
+        if filtros.get("data_inicio"):
+            where.append(f"{alvo}.{campo_data} >= ?")
+            params.append(str(filtros["data_inicio"]))
+        if filtros.get("data_fim"):
+            where.append(f"{alvo}.{campo_data} <= ?")
+            params.append(str(filtros["data_fim"]))
+
+        sql = f"SELECT {select} FROM {tabela} t{join}"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY t.id LIMIT ?"
+        params.append(limite)
+
+        return await self._run(self._fetchall, sql, tuple(params))
+
+    async def buscar_topicos(
+        self,
+        consulta: str,
+        filtros: Optional[Dict[str, Any]] = None,
+        limite: int = 20,
+        cursor: Optional[str] = None,
+        topicos_por_edital: int = 5
+    ) -> Dict[str, Any]:
+        """Busca ranqueada na tabela FTS5 (bm25, descrição com o dobro do peso da matéria)."""
+        consulta = validar_busca(consulta, limite, topicos_por_edital)
+        filtros = filtros or {}
+        expressao = consulta_fts5(consulta)
+        if filtros.get("materia"):
+            expressao = f"({expressao}) AND materia : ({consulta_fts5(filtros['materia'])})"
+
+        where = ["conteudo_busca MATCH ?"]
+        params: list = [expressao]
+        if filtros.get("status"):
+            where.append("e.status = ?")
+            params.append(filtros["status"])
+
+        campo_data = filtros.get("campo_data", "data_prova")
+        if campo_data not in CAMPOS_DATA_FILTRO:
+            raise ValueError(f"Campo de data inválido: {campo_data}")
+        if filtros.get("data_inicio"):
+            where.append(f"e.{campo_data} >= ?")
+            params.append(str(filtros["data_inicio"]))
+        if filtros.get("data_fim"):
+            where.append(f"e.{campo_data} <= ?")
+            params.append(str(filtros["data_fim"]))
+
+        apos_rank, apos_edital = decodificar_cursor(cursor)
+        pagina = ""
+        if apos_rank is not None:
+            pagina = "HAVING MAX(rank) < ? OR (MAX(rank) = ? AND edital_id > ?)"
+        params_pagina = [] if apos_rank is None else [apos_rank, apos_rank, apos_edital]
+
+        # bm25 é menor quanto mais relevante: o sinal invertido ordena como no Postgres
+        sql = (
+            "WITH acertos AS ("
+            "  SELECT c.id, c.edital_id, c.materia, c.descricao, c.numeracao, c.ordem, "
+            "         -bm25(conteudo_busca, 2.0, 1.0) AS rank "
+            "  FROM conteudo_busca "
+            "  JOIN conteudo_programatico c ON c.rowid = conteudo_busca.rowid "
+            "  JOIN editais e ON e.id = c.edital_id "
+            f"  WHERE {' AND '.join(where)}"
+            "), pagina AS ("
+            "  SELECT edital_id, MAX(rank) AS rank, COUNT(*) AS total_topicos "
+            "  FROM acertos GROUP BY edital_id "
+            f"  {pagina} "
+            "  ORDER BY rank DESC, edital_id LIMIT ?"
+            "), topicos AS ("
+            "  SELECT a.*, ROW_NUMBER() OVER ("
+            "    PARTITION BY a.edital_id ORDER BY a.rank DESC, a.ordem"
+            "  ) AS posicao "
+            "  FROM acertos a WHERE a.edital_id IN (SELECT edital_id FROM pagina)"
+            ") "
+            "SELECT p.edital_id, e.nome_arquivo, e.status, e.data_prova, e.data_processamento, "
+            "       p.rank AS edital_rank, p.total_topicos, "
+            "       t.id, t.materia, t.descricao, t.numeracao, t.ordem, t.rank "
+            "FROM pagina p "
+            "JOIN editais e ON e.id = p.edital_id "
+            "JOIN topicos t ON t.edital_id = p.edital_id AND t.posicao <= ? "
+            "ORDER BY p.rank DESC, p.edital_id, t.posicao"
+        )
+        params += params_pagina + [limite, topicos_por_edital]
+        rows = await self._run(self._fetchall, sql, tuple(params))
+
+        editais: List[Dict[str, Any]] = []
+        for row in rows:
+            if not editais or editais[-1]["edital_id"] != row["edital_id"]:
+                editais.append({
+                    "edital_id": row["edital_id"],
+                    "nome_arquivo": row["nome_arquivo"],
+                    "status": row["status"],
+                    "data_prova": row["data_prova"],
+                    "data_processamento": row["data_processamento"],
+                    "rank": row["edital_rank"],
+                    "total_topicos": row["total_topicos"],
+                    "topicos": [],
+                })
+            editais[-1]["topicos"].append({
+                campo: row[campo] for campo in ("id", "materia", "descricao", "numeracao", "ordem", "rank")
+            })
+        return pagina_busca(editais, limite)
+
+    # ==================== SINCRONIZAÇÃO ====================
+
+    async def listar_editais_nao_sincronizados(self, limite: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Editais concluídos localmente que ainda não foram enviados ao Supabase.
+
+        `envio_remoto_id` traz o id remoto de um envio iniciado e não
+        concluído (None se o edital nunca foi enviado).
+        """
+        sql = (
+            "SELECT e.*, s.edital_id_remoto AS envio_remoto_id FROM editais e "
+            "LEFT JOIN sync_supabase s ON s.edital_id = e.id "
+            "WHERE e.status = ? AND (s.edital_id IS NULL OR s.sincronizado_em IS NULL) "
+            "ORDER BY e.data_processamento"
+        )
+        params: tuple = (StatusProcessamento.CONCLUIDO.value,)
+        if limite:
+            sql += " LIMIT ?"
+            params += (limite,)
+        return await self._run(self._fetchall, sql, params)
+
+    async def buscar_cargos(self, edital_id: str) -> List[Dict[str, Any]]:
+        """Retorna os cargos de um edital."""
+        return await self._run(
+            self._fetchall,
+            "SELECT * FROM cargos WHERE edital_id = ?",
+            (edital_id,)
+        )
+
+    async def buscar_conteudo(self, edital_id: str) -> List[Dict[str, Any]]:
+        """Retorna todo o conteúdo programático de um edital, em ordem."""
+        return await self._run(
+            self._fetchall,
+            "SELECT * FROM conteudo_programatico WHERE edital_id = ? ORDER BY ordem",
+            (edital_id,)
+        )
+
+    async def marcar_sincronizado(self, edital_id: str, edital_id_remoto: str, concluido: bool = True):
+        """
+        Registra que o edital já existe no Supabase.
+
+        Com concluido=False registra só o início do envio (sincronizado_em
+        nulo), para que um envio interrompido seja retomado no mesmo registro.
+        """
+        def _insert():
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO sync_supabase (edital_id, edital_id_remoto, sincronizado_em) "
+                    "VALUES (?, ?, CASE WHEN ? THEN strftime('%Y-%m-%dT%H:%M:%f', 'now') END)",
+                    (edital_id, edital_id_remoto, concluido)
+                )
+
+        await self._run(_insert)
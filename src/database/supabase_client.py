@@ -1,13 +1,24 @@
+import asyncio
 import os
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Union
 import httpx
 from dotenv import load_dotenv
 
-from .models import Edital, Cargo, ConteudoProgramatico, StatusProcessamento
+from .base import StorageBackend, CAMPOS_DATA_FILTRO, COLUNAS_TABELAS, registros_conteudo, validar_colunas
+from .busca import decodificar_cursor, pagina_busca, validar_busca
+from .serialization import serializar_lotes
+from .models import (
+    Edital, Cargo, ConteudoProgramatico, ConteudoBatch, StatusProcessamento
+)
 
 load_dotenv()
 
-class SupabaseManager:
+# Respostas em que o PostgREST não gravou o lote (seguro reenviar)
+STATUS_REPETIVEIS = (429, 503)
+# Falhas de rede antes de a requisição sair
+ERROS_ANTES_DO_ENVIO = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+class SupabaseManager(StorageBackend):
     def __init__(self, pool_size: int = 10, max_keepalive: int = 5):
         url = os.getenv("SUPABASE_URL")
         key = os.getenv("SUPABASE_KEY")
@@ -105,7 +116,100 @@ class SupabaseManager:
         if dados_extras:
             update_data.update(dados_extras)
 
-        return await self.atualizar_edital(edital_id, update_data)
+        atualizado = await self.atualizar_edital(edital_id, update_data)
+        if atualizado:
+            self._notificar_finalizacao(edital_id, sucesso)
+        return atualizado
+
+    async def buscar_edital(
+        self,
+        edital_id: str,
+        colunas: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Edital pelo id (só as `colunas` pedidas, se informadas), ou None."""
+        response = await self.client.get(
+            "/editais",
+            params={
+                "id": f"eq.{edital_id}",
+                "select": ",".join(validar_colunas("editais", colunas)) if colunas else "*",
+            }
+        )
+        response.raise_for_status()
+        data = response.json()
+        return data[0] if data else None
+
+    async def buscar_editais_incompletos(
+        self,
+        incluir_erros: bool = False,
+        limite: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Editais interrompidos (status 'processando'), do mais antigo ao mais novo."""
+        status = [StatusProcessamento.PROCESSANDO.value]
+        if incluir_erros:
+            status.append(StatusProcessamento.ERRO.value)
+
+        params = {
+            "status": f"in.({','.join(status)})",
+            "select": "*",
+            "order": "data_upload.asc",
+        }
+        if limite:
+            params["limit"] = limite
+
+        response = await self.client.get("/editais", params=params)
+        response.raise_for_status()
+        return response.json()
+
+    async def remover_linhas_edital(self, edital_id: str) -> bool:
+        """Remove cargos e conteúdo de um edital (limpa gravações parciais)."""
+        try:
+            for tabela in ("cargos", "conteudo_programatico"):
+                response = await self.client.delete(
+                    f"/{tabela}",
+                    params={"edital_id": f"eq.{edital_id}"},
+                    headers={"Prefer": "return=minimal"}
+                )
+                response.raise_for_status()
+            return True
+        except Exception as e:
+            print(f"Erro ao remover linhas do edital: {e}")
+            return False
+
+    # ==================== INSERTS EM LOTE ====================
+
+    async def _post_lotes(
+        self,
+        path: str,
+        lotes: List[bytes],
+        tentativas: int = 3,
+        espera: float = 1.0
+    ):
+        """
+        Envia payloads JSON já serializados.
+
+        INSERT não é idempotente: só são repetidas (com backoff, reenviando
+        os mesmos bytes) as falhas em que o PostgREST certamente não gravou
+        o lote: erro de conexão antes do envio, 429 e 503. Timeouts de
+        leitura e demais 5xx (ex.: 502/504 do gateway após o commit) sobem
+        na hora, para não duplicar linhas.
+        """
+        for payload in lotes:
+            for tentativa in range(1, tentativas + 1):
+                try:
+                    response = await self.client.post(
+                        path,
+                        content=payload,
+                        headers={"Prefer": "return=minimal"}
+                    )
+                    if response.status_code not in STATUS_REPETIVEIS:
+                        response.raise_for_status()
+                        break
+                    if tentativa == tentativas:
+                        response.raise_for_status()
+                except ERROS_ANTES_DO_ENVIO:
+                    if tentativa == tentativas:
+                        raise
+                await asyncio.sleep(espera * 2 ** (tentativa - 1))
 
     # ==================== CARGOS ====================
 
@@ -114,18 +218,16 @@ class SupabaseManager:
         if not cargos:
             return True
 
-        data = [
-            {
-                "edital_id": cargo.edital_id,
-                "nome": cargo.nome,
-                "salario": cargo.salario
-            }
-            for cargo in cargos
-        ]
+        lotes = serializar_lotes(
+            [
+                {"edital_id": cargo.edital_id, "nome": cargo.nome, "salario": cargo.salario}
+                for cargo in cargos
+            ],
+            batch_size=len(cargos)
+        )
 
         try:
-            response = await self.client.post("/cargos", json=data)
-            response.raise_for_status()
+            await self._post_lotes("/cargos", lotes)
             return True
         except Exception as e:
             print(f"Erro ao inserir cargos: {e}")
@@ -135,39 +237,94 @@ class SupabaseManager:
 
     async def inserir_conteudo_programatico(
         self,
-        conteudos: List[ConteudoProgramatico],
+        conteudos: Union[ConteudoBatch, List[ConteudoProgramatico]],
         batch_size: int = 100
     ) -> bool:
-        """Insere conteúdo programático em lotes."""
+        """Insere conteúdo programático em lotes (serializados uma única vez)."""
         if not conteudos:
             return True
 
         try:
             # Processar em batches para evitar timeouts
-            for i in range(0, len(conteudos), batch_size):
-                batch = conteudos[i:i + batch_size]
-                data = [
-                    {
-                        "edital_id": c.edital_id,
-                        "secao": c.secao,
-                        "materia": c.materia,
-                        "descricao": c.descricao,
-                        "nivel_1": c.nivel_1,
-                        "nivel_2": c.nivel_2,
-                        "nivel_3": c.nivel_3,
-                        "nivel_4": c.nivel_4,
-                        "ordem": c.ordem
-                    }
-                    for c in batch
-                ]
-                response = await self.client.post("/conteudo_programatico", json=data)
-                response.raise_for_status()
-
+            lotes = serializar_lotes(registros_conteudo(conteudos), batch_size)
+            await self._post_lotes("/conteudo_programatico", lotes)
             return True
         except Exception as e:
             print(f"Erro ao inserir conteúdo programático: {e}")
             return False
 
+    # ==================== FILA DE JOBS ====================
+
+    async def enfileirar_jobs(self, jobs: List[Dict[str, str]]) -> int:
+        """Enfileira jobs ignorando chaves já existentes."""
+        if not jobs:
+            return 0
+
+        response = await self.client.post(
+            "/edital_jobs",
+            params={"on_conflict": "chave"},
+            json=[{"chave": j["chave"], "fonte": j["fonte"]} for j in jobs],
+            headers={"Prefer": "resolution=ignore-duplicates,return=representation"}
+        )
+        response.raise_for_status()
+        return len(response.json())
+
+    async def reivindicar_jobs(
+        self,
+        worker_id: str,
+        lease_segundos: int = 300,
+        limite: int = 1
+    ) -> List[Dict[str, Any]]:
+        """Reivindica jobs via RPC (FOR UPDATE SKIP LOCKED)."""
+        response = await self.client.post(
+            "/rpc/claim_edital_jobs",
+            json={
+                "p_worker_id": worker_id,
+                "p_lease_segundos": lease_segundos,
+                "p_limite": limite,
+            }
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def renovar_lease(self, job_id: str, worker_id: str, lease_segundos: int = 300) -> bool:
+        """Heartbeat: estende o lease. Retorna False se o lease foi perdido."""
+        response = await self.client.post(
+            "/rpc/renew_edital_job_lease",
+            json={
+                "p_job_id": job_id,
+                "p_worker_id": worker_id,
+                "p_lease_segundos": lease_segundos,
+            }
+        )
+        response.raise_for_status()
+        return bool(response.json())
+
+    async def concluir_job(
+        self,
+        job_id: str,
+        worker_id: str,
+        sucesso: bool,
+        erro_mensagem: Optional[str] = None,
+        edital_id: Optional[str] = None
+    ) -> bool:
+        """
+        Marca o job como concluído e libera o lease. Com erro, o job volta
+        para 'pendente' enquanto tentativas < max_tentativas.
+        """
+        response = await self.client.post(
+            "/rpc/complete_edital_job",
+            json={
+                "p_job_id": job_id,
+                "p_worker_id": worker_id,
+                "p_sucesso": sucesso,
+                "p_erro": erro_mensagem,
+                "p_edital_id": edital_id,
+            }
+        )
+        response.raise_for_status()
+        return bool(response.json())
+
     # ==================== CONSULTAS ====================
 
     async def buscar_editais_recentes(self, limite: int = 10) -> List[Dict[str, Any]]:
@@ -202,6 +359,40 @@ class SupabaseManager:
         response.raise_for_status()
         return response.json()
 
+    async def buscar_cargos(self, edital_id: str) -> List[Dict[str, Any]]:
+        """Retorna os cargos de um edital."""
+        response = await self.client.get(
+            "/cargos",
+            params={"edital_id": f"eq.{edital_id}", "select": "*"}
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def buscar_conteudo(self, edital_id: str, pagina: int = 1000) -> List[Dict[str, Any]]:
+        """
+        Retorna todo o conteúdo programático de um edital, em ordem.
+
+        Pagina por `ordem` (keyset), abaixo do max-rows do PostgREST, e não
+        traz a coluna de busca (tsvector) da migration 005.
+        """
+        select = ",".join(COLUNAS_TABELAS["conteudo_programatico"])
+        linhas: List[Dict[str, Any]] = []
+        while True:
+            params = [
+                ("edital_id", f"eq.{edital_id}"),
+                ("select", select),
+                ("order", "ordem.asc"),
+                ("limit", str(pagina)),
+            ]
+            if linhas:
+                params.append(("ordem", f"gt.{linhas[-1]['ordem']}"))
+            response = await self.client.get("/conteudo_programatico", params=params)
+            response.raise_for_status()
+            lote = response.json()
+            linhas += lote
+            if len(lote) < pagina:
+                return linhas
+
     async def estatisticas_processamento(self) -> Dict[str, Any]:
         """Retorna estatísticas gerais."""
         # Total de editais
@@ -251,3 +442,80 @@ class SupabaseManager:
             "erros": erros,
             "custo_total_usd": round(custo_total, 2)
         }
+
+    async def listar_pagina(
+        self,
+        tabela: str,
+        colunas: List[str],
+        apos_id: Optional[str] = None,
+        limite: int = 1000,
+        filtros: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Retorna uma página ordenada por id (keyset, sem OFFSET)."""
+        filtros = filtros or {}
+        select = ",".join(colunas)
+        # Nas tabelas filhas os filtros do edital vão por embedding com inner join
+        prefixo = ""
+        if tabela != "editais" and filtros:
+            select += ",editais!inner(id)"
+            prefixo = "editais."
+
+        params: List[tuple] = [
+            ("select", select),
+            ("order", "id.asc"),
+            ("limit", str(limite)),
+        ]
+        if apos_id:
+            params.append(("id", f"gt.{apos_id}"))
+        if filtros.get("status"):
+            params.append((f"{prefixo}status", f"eq.{filtros['status']}"))
+
+        campo_data = filtros.get("campo_data", "data_prova")
+        if campo_data not in CAMPOS_DATA_FILTRO:
+            raise ValueError(f"Campo de data inválido: {campo_data}")
+        if filtros.get("data_inicio"):
+            params.append((f"{prefixo}{campo_data}", f"gte.{filtros['data_inicio']}"))
+        if filtros.get("data_fim"):
+            params.append((f"{prefixo}{campo_data}", f"lte.{filtros['data_fim']}"))
+
+        response = await self.client.get(f"/{tabela}", params=params)
+        response.raise_for_status()
+        rows = response.json()
+        if prefixo:
+            for row in rows:
+                row.pop("editais", None)
+        return rows
+
+    async def buscar_topicos(
+        self,
+        consulta: str,
+        filtros: Optional[Dict[str, Any]] = None,
+        limite: int = 20,
+        cursor: Optional[str] = None,
+        topicos_por_edital: int = 5
+    ) -> Dict[str, Any]:
+        """Busca ranqueada via RPC buscar_topicos (índice GIN, migration 005)."""
+        consulta = validar_busca(consulta, limite, topicos_por_edital)
+        filtros = filtros or {}
+        campo_data = filtros.get("campo_data", "data_prova")
+        if campo_data not in CAMPOS_DATA_FILTRO:
+            raise ValueError(f"Campo de data inválido: {campo_data}")
+        apos_rank, apos_edital = decodificar_cursor(cursor)
+
+        response = await self.client.post(
+            "/rpc/buscar_topicos",
+            json={
+                "p_consulta": consulta,
+                "p_status": filtros.get("status"),
+                "p_data_inicio": str(filtros["data_inicio"]) if filtros.get("data_inicio") else None,
+                "p_data_fim": str(filtros["data_fim"]) if filtros.get("data_fim") else None,
+                "p_campo_data": campo_data,
+                "p_materia": filtros.get("materia"),
+                "p_limite": limite,
+                "p_topicos_por_edital": topicos_por_edital,
+                "p_apos_rank": apos_rank,
+                "p_apos_edital": apos_edital,
+            }
+        )
+        response.raise_for_status()
+        return pagina_busca(response.json(), limite)
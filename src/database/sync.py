@@ -0,0 +1,168 @@
+"""
+Sincronização em lote de editais processados localmente (SQLite) para o Supabase.
+
+Uso:
+    python -m src.database.sync --db data/verticaliza.db [--limite 100] [--concorrencia 4]
+"""
+import argparse
+import asyncio
+from typing import Dict, Any, Optional
+
+from .base import StorageBackend
+from .models import Edital, Cargo, ConteudoProgramatico, StatusProcessamento
+from .sqlite_backend import SQLiteManager
+
+# Campos do edital enviados após a criação do registro remoto
+CAMPOS_EDITAL = (
+    "total_paginas", "data_processamento", "tempo_processamento_segundos",
+    "custo_total_usd", "modelo_usado", "formato_prova", "data_prova",
+    "data_inscricao_inicio", "data_inscricao_fim", "valor_inscricao",
+    "detalhes_discursiva", "texto_extraido", "conteudo_verticalizado_md",
+    "etapa_concluida", "checkpoint_em", "metadados_brutos",
+)
+
+
+async def sincronizar_edital(
+    local: SQLiteManager,
+    remoto: StorageBackend,
+    edital: Dict[str, Any],
+    batch_size: int = 500
+) -> Optional[str]:
+    """
+    Envia um edital concluído, com cargos e conteúdo, para o backend remoto.
+
+    O registro remoto só é marcado como concluído depois que todas as linhas
+    filhas foram inseridas. O id remoto é gravado localmente antes do envio
+    das linhas: se o envio for interrompido, a próxima execução reconhece o
+    registro 'processando' como seu, apaga as linhas parciais e reenvia.
+    Um registro 'processando' com outro id (edital em processamento por um
+    worker remoto) é reportado como conflito.
+
+    Returns:
+        ID remoto do edital, ou None se não foi possível sincronizar.
+    """
+    existente = await remoto.edital_existe(edital["hash_arquivo"])
+    if existente and existente.get("status") == StatusProcessamento.CONCLUIDO.value:
+        await local.marcar_sincronizado(edital["id"], existente["id"])
+        return existente["id"]
+
+    if existente and existente["id"] == edital.get("envio_remoto_id"):
+        # Envio anterior interrompido: descarta as linhas parciais e reenvia
+        print(f"🔁 {edital['nome_arquivo']}: retomando envio interrompido")
+        if not await remoto.remover_linhas_edital(existente["id"]):
+            return None
+        remoto_id = existente["id"]
+    elif existente:
+        print(
+            f"⚠️  {edital['nome_arquivo']}: já existe no remoto com status "
+            f"'{existente.get('status')}', ignorando"
+        )
+        return None
+    else:
+        remoto_id = await remoto.criar_edital(Edital(
+            hash_arquivo=edital["hash_arquivo"],
+            nome_arquivo=edital["nome_arquivo"],
+            url_origem=edital["url_origem"],
+            tamanho_bytes=edital["tamanho_bytes"],
+            total_paginas=edital["total_paginas"],
+        ))
+        await local.marcar_sincronizado(edital["id"], remoto_id, concluido=False)
+
+    cargos = [
+        Cargo(edital_id=remoto_id, nome=c["nome"], salario=c["salario"])
+        for c in await local.buscar_cargos(edital["id"])
+    ]
+    conteudos = [
+        ConteudoProgramatico(
+            edital_id=remoto_id,
+            descricao=c["descricao"],
+            secao=c["secao"],
+            materia=c["materia"],
+            nivel_1=c["nivel_1"],
+            nivel_2=c["nivel_2"],
+            nivel_3=c["nivel_3"],
+            nivel_4=c["nivel_4"],
+            ordem=c["ordem"],
+            numeracao=c["numeracao"],
+            nivel=c["nivel"],
+            ordem_pai=c["ordem_pai"],
+        )
+        for c in await local.buscar_conteudo(edital["id"])
+    ]
+
+    ok_cargos, ok_conteudo = await asyncio.gather(
+        remoto.inserir_cargos(cargos),
+        remoto.inserir_conteudo_programatico(conteudos, batch_size=batch_size)
+    )
+    if not (ok_cargos and ok_conteudo):
+        print(f"❌ {edital['nome_arquivo']}: falha ao inserir linhas filhas")
+        return None
+
+    dados = {campo: edital[campo] for campo in CAMPOS_EDITAL}
+    dados["status"] = StatusProcessamento.CONCLUIDO.value
+    if not await remoto.atualizar_edital(remoto_id, dados):
+        return None
+
+    await local.marcar_sincronizado(edital["id"], remoto_id)
+    return remoto_id
+
+
+async def sincronizar(
+    local: SQLiteManager,
+    remoto: StorageBackend,
+    limite: Optional[int] = None,
+    concorrencia: int = 4,
+    batch_size: int = 500
+) -> Dict[str, int]:
+    """Sincroniza todos os editais concluídos ainda não enviados."""
+    pendentes = await local.listar_editais_nao_sincronizados(limite)
+    semaforo = asyncio.Semaphore(concorrencia)
+
+    async def _enviar(edital: Dict[str, Any]) -> bool:
+        async with semaforo:
+            try:
+                return await sincronizar_edital(local, remoto, edital, batch_size) is not None
+            except Exception as e:
+                print(f"❌ {edital['nome_arquivo']}: {e}")
+                return False
+
+    resultados = await asyncio.gather(*[_enviar(e) for e in pendentes])
+    enviados = sum(resultados)
+
+    return {
+        "pendentes": len(pendentes),
+        "sincronizados": enviados,
+        "falhas": len(pendentes) - enviados,
+    }
+
+
+async def _main(args: argparse.Namespace):
+    from .supabase_client import SupabaseManager
+
+    local = SQLiteManager(args.db)
+    remoto = SupabaseManager()
+    try:
+        resumo = await sincronizar(
+            local,
+            remoto,
+            limite=args.limite,
+            concorrencia=args.concorrencia,
+            batch_size=args.batch_size
+        )
+    finally:
+        await remoto.close()
+        await local.close()
+
+    print(
+        f"📤 Sincronização: {resumo['sincronizados']}/{resumo['pendentes']} editais enviados "
+        f"({resumo['falhas']} falhas)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Envia editais do SQLite local para o Supabase")
+    parser.add_argument("--db", default="data/verticaliza.db", help="Caminho do banco SQLite")
+    parser.add_argument("--limite", type=int, default=None, help="Máximo de editais a enviar")
+    parser.add_argument("--concorrencia", type=int, default=4, help="Editais enviados em paralelo")
+    parser.add_argument("--batch-size", type=int, default=500, help="Linhas por insert de conteúdo")
+    asyncio.run(_main(parser.parse_args()))
@@ -0,0 +1,79 @@
+"""
+Exporta tabelas em streaming.
+
+Uso:
+    python -m src.exporters conteudo_programatico saida.parquet \
+        --colunas edital_id,materia,descricao --status concluido --desde 2024-01-01
+"""
+import argparse
+import asyncio
+from datetime import date
+from pathlib import Path
+from typing import Optional, List
+
+from src.database.base import COLUNAS_TABELAS, get_storage_backend
+
+from .base import FiltroExportacao
+
+
+def criar_exporter(formato: str, db, page_size: int):
+    """Instancia o exportador pelo formato (csv ou parquet)."""
+    if formato == "parquet":
+        from .parquet_exporter import ParquetExporter
+        return ParquetExporter(db, page_size=page_size)
+    from .csv_exporter import CSVExporter
+    return CSVExporter(db, page_size=page_size)
+
+
+async def _main(args: argparse.Namespace):
+    destino = Path(args.destino)
+    formato = args.formato or ("parquet" if destino.suffix == ".parquet" else "csv")
+    filtros = FiltroExportacao(
+        status=args.status,
+        data_inicio=date.fromisoformat(args.desde) if args.desde else None,
+        data_fim=date.fromisoformat(args.ate) if args.ate else None,
+        campo_data=args.campo_data,
+    )
+
+    db = get_storage_backend(args.backend)
+    try:
+        exporter = criar_exporter(formato, db, args.page_size)
+        total = await exporter.exportar(
+            args.tabela,
+            destino,
+            colunas=args.colunas.split(",") if args.colunas else None,
+            filtros=filtros
+        )
+    finally:
+        await db.close()
+
+    print(f"📦 {total} linhas de '{args.tabela}' exportadas para {destino}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Exportação em streaming para CSV ou Parquet")
+    parser.add_argument("tabela", choices=sorted(COLUNAS_TABELAS))
+    parser.add_argument("destino", help="Arquivo de saída (.csv ou .parquet)")
+    parser.add_argument("--formato", choices=["csv", "parquet"], help="Default: pela extensão")
+    parser.add_argument("--colunas", help="Lista separada por vírgulas (default: todas)")
+    parser.add_argument("--status", help="Filtra pelo status do edital")
+    parser.add_argument("--desde", help="Data inicial (YYYY-MM-DD)")
+    parser.add_argument("--ate", help="Data final (YYYY-MM-DD)")
+    parser.add_argument(
+        "--campo-data",
+        default="data_prova",
+        choices=["data_prova", "data_processamento", "data_upload"],
+        help="Coluna do edital usada nos filtros de data"
+    )
+    parser.add_argument("--page-size", type=int, default=5000, help="Linhas por página/row group")
+    parser.add_argument("--backend", help="supabase ou sqlite (default: STORAGE_BACKEND)")
+    return parser
+
+
+def run(argv: Optional[List[str]] = None):
+    """Ponto de entrada (também usado por `python main.py export`)."""
+    asyncio.run(_main(build_parser().parse_args(argv)))
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,114 @@
+"""
+Base para exportações em streaming.
+
+As tabelas são percorridas com paginação keyset (`id > último_id`), de modo
+que a memória usada depende apenas do tamanho da página, não do total de
+linhas exportadas.
+"""
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Optional, List, Dict, Any, AsyncIterator
+
+from src.database.base import StorageBackend, validar_colunas
+
+
+@dataclass
+class FiltroExportacao:
+    """Filtros aplicados sobre o edital de cada linha exportada."""
+    status: Optional[str] = None
+    data_inicio: Optional[date] = None
+    data_fim: Optional[date] = None
+    campo_data: str = "data_prova"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "data_inicio": self.data_inicio.isoformat() if self.data_inicio else None,
+            "data_fim": self.data_fim.isoformat() if self.data_fim else None,
+            "campo_data": self.campo_data,
+        }
+
+    def ativo(self) -> bool:
+        return bool(self.status or self.data_inicio or self.data_fim)
+
+
+async def iterar_paginas(
+    db: StorageBackend,
+    tabela: str,
+    colunas: Optional[List[str]] = None,
+    filtros: Optional[FiltroExportacao] = None,
+    page_size: int = 5000
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Percorre a tabela página a página, ordenada por id."""
+    colunas = validar_colunas(tabela, colunas)
+    filtros_dict = filtros.to_dict() if filtros and filtros.ativo() else None
+    apos_id = None
+
+    while True:
+        pagina = await db.listar_pagina(
+            tabela,
+            colunas,
+            apos_id=apos_id,
+            limite=page_size,
+            filtros=filtros_dict
+        )
+        if not pagina:
+            return
+
+        yield pagina
+
+        if len(pagina) < page_size:
+            return
+        apos_id = pagina[-1]["id"]
+
+
+class BaseExporter(ABC):
+    """Exportador que escreve cada página assim que ela chega."""
+
+    extensao = ""
+
+    def __init__(self, db: StorageBackend, page_size: int = 5000):
+        self.db = db
+        self.page_size = page_size
+
+    async def exportar(
+        self,
+        tabela: str,
+        destino: Path,
+        colunas: Optional[List[str]] = None,
+        filtros: Optional[FiltroExportacao] = None
+    ) -> int:
+        """
+        Exporta a tabela para o arquivo de destino.
+
+        Returns:
+            Total de linhas escritas.
+        """
+        colunas = validar_colunas(tabela, colunas)
+        destino = Path(destino)
+        destino.parent.mkdir(parents=True, exist_ok=True)
+
+        total = 0
+        self._abrir(destino, tabela, colunas)
+        try:
+            async for pagina in iterar_paginas(self.db, tabela, colunas, filtros, self.page_size):
+                self._escrever_pagina(pagina)
+                total += len(pagina)
+        finally:
+            self._fechar()
+
+        return total
+
+    @abstractmethod
+    def _abrir(self, destino: Path, tabela: str, colunas: List[str]):
+        """Cria o arquivo de destino e escreve o cabeçalho/schema."""
+
+    @abstractmethod
+    def _escrever_pagina(self, pagina: List[Dict[str, Any]]):
+        """Escreve uma página de linhas."""
+
+    @abstractmethod
+    def _fechar(self):
+        """Finaliza o arquivo (chamado também em caso de erro)."""
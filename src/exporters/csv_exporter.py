@@ -1,3 +1,22 @@
-# Placeholder para exportação CSV
-class CSVExporter:
-    pass
\ No newline at end of file
+import csv
+from pathlib import Path
+from typing import List, Dict, Any
+
+from .base import BaseExporter
+
+
+class CSVExporter(BaseExporter):
+    """Exporta tabelas para CSV em streaming (memória constante)."""
+
+    extensao = ".csv"
+
+    def _abrir(self, destino: Path, tabela: str, colunas: List[str]):
+        self._arquivo = open(destino, "w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._arquivo, fieldnames=colunas, extrasaction="ignore")
+        self._writer.writeheader()
+
+    def _escrever_pagina(self, pagina: List[Dict[str, Any]]):
+        self._writer.writerows(pagina)
+
+    def _fechar(self):
+        self._arquivo.close()
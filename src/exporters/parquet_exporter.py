@@ -0,0 +1,126 @@
+"""
+Exportação colunar em Parquet (um row group por página).
+
+Requer `pyarrow` (dependência opcional, usada apenas por este exportador).
+"""
+import typing
+from datetime import date, datetime
+from enum import Enum
+from pathlib import Path
+from typing import List, Dict, Any, Callable, Optional
+
+from src.database.models import Edital, Cargo, ConteudoProgramatico
+
+from .base import BaseExporter
+
+MODELOS = {
+    "editais": Edital,
+    "cargos": Cargo,
+    "conteudo_programatico": ConteudoProgramatico,
+}
+
+
+def _importar_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError(
+            "Exportação Parquet requer pyarrow: uv pip install pyarrow"
+        ) from e
+    return pyarrow
+
+
+# Conversores de datas gravadas como texto (SQLite aceita qualquer string,
+# ex.: "15/03/2024" ou "a definir"): valores que não são ISO viram None
+
+
+def _para_data(valor):
+    if not isinstance(valor, str):
+        return valor
+    try:
+        return date.fromisoformat(valor[:10])
+    except ValueError:
+        return None
+
+
+def _para_timestamp(valor):
+    if not isinstance(valor, str):
+        return valor
+    try:
+        return datetime.fromisoformat(valor)
+    except ValueError:
+        return None
+
+
+def _tipo_coluna(pa, modelo, coluna: str) -> tuple:
+    """Mapeia o type hint do modelo para (tipo arrow, conversor de valores)."""
+    if coluna == "created_at":
+        return pa.timestamp("us", tz="UTC"), _para_timestamp
+
+    hint = typing.get_type_hints(modelo).get(coluna, str)
+    args = [a for a in typing.get_args(hint) if a is not type(None)]
+    base = args[0] if args else hint
+
+    if base is datetime:
+        return pa.timestamp("us", tz="UTC"), _para_timestamp
+    if base is date:
+        return pa.date32(), _para_data
+    if base is int:
+        return pa.int64(), None
+    if base is float:
+        return pa.float64(), None
+    if isinstance(base, type) and issubclass(base, Enum):
+        return pa.dictionary(pa.int8(), pa.string()), None
+    return pa.string(), None
+
+
+class ParquetExporter(BaseExporter):
+    """Exporta tabelas para Parquet em streaming (memória constante)."""
+
+    extensao = ".parquet"
+
+    def __init__(self, *args, compression: str = "zstd", **kwargs):
+        super().__init__(*args, **kwargs)
+        self.compression = compression
+
+    def _abrir(self, destino: Path, tabela: str, colunas: List[str]):
+        self._pa = _importar_pyarrow()
+        modelo = MODELOS[tabela]
+
+        campos = []
+        self._invalidos: Dict[str, int] = {}
+        self._conversores: Dict[str, Optional[Callable]] = {}
+        for coluna in colunas:
+            tipo, conversor = _tipo_coluna(self._pa, modelo, coluna)
+            campos.append(self._pa.field(coluna, tipo))
+            self._conversores[coluna] = conversor
+
+        self._schema = self._pa.schema(campos)
+        self._writer = self._pa.parquet.ParquetWriter(
+            str(destino),
+            self._schema,
+            compression=self.compression
+        )
+
+    def _escrever_pagina(self, pagina: List[Dict[str, Any]]):
+        colunas = {}
+        for coluna, conversor in self._conversores.items():
+            valores = [row.get(coluna) for row in pagina]
+            if conversor:
+                convertidos = [conversor(v) if v is not None else None for v in valores]
+                invalidos = sum(1 for v, c in zip(valores, convertidos) if v is not None and c is None)
+                if invalidos:
+                    self._invalidos[coluna] = self._invalidos.get(coluna, 0) + invalidos
+                valores = convertidos
+            colunas[coluna] = valores
+
+        tabela = self._pa.Table.from_pydict(colunas, schema=self._schema)
+        self._writer.write_table(tabela, row_group_size=len(pagina))
+
+    def _fechar(self):
+        if getattr(self, "_writer", None) is not None:
+            self._writer.close()
+            self._writer = None
+        for coluna, total in getattr(self, "_invalidos", {}).items():
+            print(f"⚠️  {total} valores de '{coluna}' fora do formato ISO exportados como nulos")
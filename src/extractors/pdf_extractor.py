@@ -1,5 +1,7 @@
+import gc
+import tempfile
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 import PyPDF2
 
 class PDFExtractor:
@@ -10,12 +12,43 @@ class PDFExtractor:
         """Extrai texto do PDF."""
         with open(pdf_path, 'rb') as file:
             reader = PyPDF2.PdfReader(file)
-            text = ""
-            pages = len(reader.pages)
-            limit = min(pages, self.max_pages) if self.max_pages else pages
-            for i in range(limit):
-                text += reader.pages[i].extract_text() + "\n"
-            return text
+            return self._extract_from_reader(reader)
+
+    def _extract_from_reader(self, reader: PyPDF2.PdfReader) -> str:
+        pages = len(reader.pages)
+        limit = min(pages, self.max_pages) if self.max_pages else pages
+        return "".join(reader.pages[i].extract_text() + "\n" for i in range(limit))
+
+    def extract_all(self, pdf_path: Path) -> Tuple[str, int]:
+        """Extrai texto e total de páginas abrindo o PDF uma única vez."""
+        with open(pdf_path, 'rb') as file:
+            reader = PyPDF2.PdfReader(file)
+            return self._extract_from_reader(reader), len(reader.pages)
+
+    def extract_streaming(self, pdf_path: Path, paginas_por_bloco: int = 128) -> Tuple[str, int]:
+        """
+        Mesmo resultado de `extract_all`, com pico de memória menor em PDFs grandes.
+
+        Reabre o PDF a cada bloco de páginas, descartando os objetos já
+        resolvidos pelo PyPDF2, e acumula o texto em arquivo temporário em vez
+        de manter o texto de todas as páginas mais a cópia do join.
+        """
+        with open(pdf_path, 'rb') as file:
+            total = len(PyPDF2.PdfReader(file).pages)
+        limit = min(total, self.max_pages) if self.max_pages else total
+
+        with tempfile.TemporaryFile("w+", encoding="utf-8") as spool:
+            for inicio in range(0, limit, paginas_por_bloco):
+                with open(pdf_path, 'rb') as file:
+                    reader = PyPDF2.PdfReader(file)
+                    for i in range(inicio, min(inicio + paginas_por_bloco, limit)):
+                        spool.write(reader.pages[i].extract_text())
+                        spool.write("\n")
+                # Páginas e reader formam ciclos de referência: liberar o bloco já
+                del reader
+                gc.collect()
+            spool.seek(0)
+            return spool.read(), total
 
     def extract_metadata(self, pdf_path: Path) -> Dict:
         """Extrai metadados básicos do PDF."""
@@ -25,4 +58,28 @@ class PDFExtractor:
                 "total_pages": len(reader.pages),
                 "title": reader.metadata.title,
                 "author": reader.metadata.author,
-            }
\ No newline at end of file
+            }
+
+def extrair_pdf(
+    pdf_path: Path,
+    max_pages: Optional[int] = None,
+    baixa_memoria: bool = False,
+    teto_memoria: Optional[int] = None
+) -> Tuple[str, int]:
+    """
+    Função de módulo (serializável) para rodar a extração em um pool de processos.
+
+    Args:
+        baixa_memoria: Usa `extract_streaming`
+        teto_memoria: RSS (bytes) do processo acima do qual o streaming é
+            usado mesmo sem `baixa_memoria` (workers que já cresceram)
+    """
+    if not baixa_memoria and teto_memoria:
+        from src.utils.memoria import rss_atual
+        rss = rss_atual()
+        baixa_memoria = rss is not None and rss > teto_memoria
+
+    extractor = PDFExtractor(max_pages=max_pages)
+    if baixa_memoria:
+        return extractor.extract_streaming(pdf_path)
+    return extractor.extract_all(pdf_path)
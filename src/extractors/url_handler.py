@@ -1,22 +1,251 @@
-import requests
+"""
+Download assíncrono de PDFs via httpx.
+
+- Cliente HTTP compartilhado com connection pooling
+- Streaming direto para arquivo, com SHA-256 calculado durante o download
+- Revalidação com ETag / If-Modified-Since (304 reaproveita o arquivo local)
+- Retomada de downloads interrompidos via Range
+
+Os validadores de cada URL ficam em um arquivo próprio (`<sha1 da url>.json`)
+substituído atomicamente, para que vários processos (workers, daemon e CLI)
+baixem no mesmo diretório sem sobrescrever as entradas uns dos outros. O
+download em si (o `.part` que pode ser retomado) é protegido por um lock
+exclusivo em `<sha1 da url>.lock`: outro processo baixando a mesma URL
+espera e, em seguida, revalida o arquivo pronto (normalmente um 304).
+"""
+import asyncio
+import hashlib
+import json
+import os
+from dataclasses import dataclass
 from pathlib import Path
-from contextlib import contextmanager
+from typing import Optional, List, Dict, Any
+from urllib.parse import urlparse, unquote
+
+import aiofiles
+import httpx
+
+
+@dataclass
+class DownloadResult:
+    path: Path
+    sha256: str
+    tamanho_bytes: int
+    nome_arquivo: str
+    nao_modificado: bool = False
+
+
+class AsyncPDFDownloader:
+    """Baixa PDFs em paralelo compartilhando um único pool de conexões."""
+
+    def __init__(
+        self,
+        download_dir: str = "temp/downloads",
+        max_concurrent: int = 8,
+        timeout: float = 60.0,
+        chunk_size: int = 256 * 1024,
+        client: Optional[httpx.AsyncClient] = None
+    ):
+        self.download_dir = Path(download_dir)
+        self.download_dir.mkdir(parents=True, exist_ok=True)
+        self.chunk_size = chunk_size
+
+        self._own_client = client is None
+        self.client = client or httpx.AsyncClient(
+            timeout=timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=max_concurrent * 2,
+                max_keepalive_connections=max_concurrent
+            )
+        )
+        self._semaforo = asyncio.Semaphore(max_concurrent)
+        self._em_andamento: Dict[str, asyncio.Task] = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        """Fecha o cliente HTTP (se foi criado por este downloader)."""
+        if self._own_client:
+            await self.client.aclose()
+
+    # ==================== VALIDADORES POR URL ====================
+
+    def _carregar_validadores(self, chave: str) -> Dict[str, Any]:
+        try:
+            return json.loads((self.download_dir / f"{chave}.json").read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _salvar_validadores(self, chave: str, entrada: Dict[str, Any]):
+        destino = self.download_dir / f"{chave}.json"
+        # Temporário por processo: dois processos nunca escrevem no mesmo arquivo
+        tmp = destino.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(entrada))
+        os.replace(tmp, destino)
+
+    async def _travar(self, chave: str):
+        """
+        Lock exclusivo entre processos para baixar a URL; fechar o arquivo
+        devolvido libera o lock. Espera sem bloquear o event loop.
+        """
+        arquivo = open(self.download_dir / f"{chave}.lock", "a+b")
+        try:
+            while not _tentar_lock(arquivo):
+                await asyncio.sleep(0.1)
+        except BaseException:
+            arquivo.close()
+            raise
+        return arquivo
+
+    # ==================== DOWNLOAD ====================
+
+    async def download(self, url: str) -> Optional[DownloadResult]:
+        """
+        Baixa um PDF (downloads simultâneos da mesma URL são unificados).
+
+        Returns:
+            DownloadResult ou None em caso de erro.
+        """
+        task = self._em_andamento.get(url)
+        if task is None:
+            task = asyncio.ensure_future(self._download_com_limite(url))
+            self._em_andamento[url] = task
+            task.add_done_callback(lambda _: self._em_andamento.pop(url, None))
+        return await asyncio.shield(task)
+
+    async def download_many(self, urls: List[str]) -> List[Optional[DownloadResult]]:
+        """Baixa várias URLs em paralelo (limitado por max_concurrent)."""
+        return await asyncio.gather(*[self.download(url) for url in urls])
+
+    async def _download_com_limite(self, url: str) -> Optional[DownloadResult]:
+        async with self._semaforo:
+            try:
+                return await self._baixar(url)
+            except Exception as e:
+                print(f"Erro ao baixar PDF: {e}")
+                return None
+
+    async def _baixar(self, url: str) -> DownloadResult:
+        chave = hashlib.sha1(url.encode()).hexdigest()
+        trava = await self._travar(chave)
+        try:
+            return await self._baixar_com_lock(url, chave)
+        finally:
+            trava.close()
+
+    async def _baixar_com_lock(self, url: str, chave: str) -> DownloadResult:
+        entrada = await asyncio.to_thread(self._carregar_validadores, chave)
+        parcial = self.download_dir / f"{chave}.part"
+        nome = self._nome_arquivo(url)
+
+        headers = {}
+        anterior = Path(entrada["path"]) if entrada.get("path") else None
+        if anterior and anterior.exists():
+            if entrada.get("etag"):
+                headers["If-None-Match"] = entrada["etag"]
+            if entrada.get("last_modified"):
+                headers["If-Modified-Since"] = entrada["last_modified"]
+
+        hasher = hashlib.sha256()
+        offset = parcial.stat().st_size if parcial.exists() else 0
+        validador_parcial = entrada.get("parcial_validador")
+        if offset and validador_parcial:
+            headers["Range"] = f"bytes={offset}-"
+            headers["If-Range"] = validador_parcial
+
+        async with self.client.stream("GET", url, headers=headers) as response:
+            if response.status_code == 304:
+                return DownloadResult(
+                    path=anterior,
+                    sha256=entrada["sha256"],
+                    tamanho_bytes=entrada["tamanho_bytes"],
+                    nome_arquivo=nome,
+                    nao_modificado=True
+                )
+
+            if response.status_code == 416:
+                # Parte local inválida para o recurso atual: recomeçar do zero
+                parcial.unlink(missing_ok=True)
+                entrada.pop("parcial_validador", None)
+                await asyncio.to_thread(self._salvar_validadores, chave, entrada)
+                reiniciar = True
+            else:
+                reiniciar = False
+                response.raise_for_status()
+
+                if response.status_code == 206:
+                    # Retomada: o hash precisa cobrir os bytes já baixados
+                    async with aiofiles.open(parcial, "rb") as f:
+                        while chunk := await f.read(self.chunk_size):
+                            hasher.update(chunk)
+                    modo = "ab"
+                else:
+                    offset = 0
+                    modo = "wb"
+
+                # Guardar validadores antes do corpo para permitir retomada
+                entrada["parcial_validador"] = (
+                    response.headers.get("ETag") or response.headers.get("Last-Modified")
+                )
+                await asyncio.to_thread(self._salvar_validadores, chave, entrada)
+
+                tamanho = offset
+                async with aiofiles.open(parcial, modo) as f:
+                    async for chunk in response.aiter_bytes(self.chunk_size):
+                        hasher.update(chunk)
+                        await f.write(chunk)
+                        tamanho += len(chunk)
+
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+
+        if reiniciar:
+            return await self._baixar_com_lock(url, chave)
+
+        sha256 = hasher.hexdigest()
+        destino = self.download_dir / f"{sha256}.pdf"
+        os.replace(parcial, destino)
+
+        await asyncio.to_thread(self._salvar_validadores, chave, {
+            "path": str(destino),
+            "sha256": sha256,
+            "tamanho_bytes": tamanho,
+            "etag": etag,
+            "last_modified": last_modified,
+        })
+
+        return DownloadResult(
+            path=destino,
+            sha256=sha256,
+            tamanho_bytes=tamanho,
+            nome_arquivo=nome
+        )
+
+    @staticmethod
+    def _nome_arquivo(url: str) -> str:
+        """Nome do arquivo a partir da URL (fallback: edital_baixado.pdf)."""
+        nome = unquote(Path(urlparse(url).path).name)
+        return nome or "edital_baixado.pdf"
 
-@contextmanager
-def URLHandler():
-    """Context manager para download de PDFs."""
-    yield URLDownloader()
 
-class URLDownloader:
-    def download_pdf(self, url: str, output_path: Path) -> bool:
-        """Baixa PDF de URL."""
+def _tentar_lock(arquivo) -> bool:
+    """Tenta o lock exclusivo do arquivo sem esperar (fcntl; msvcrt no Windows)."""
+    try:
+        import fcntl
+    except ImportError:  # Windows
+        import msvcrt
         try:
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(output_path, 'wb') as f:
-                f.write(response.content)
+            msvcrt.locking(arquivo.fileno(), msvcrt.LK_NBLCK, 1)
             return True
-        except Exception as e:
-            print(f"Erro ao baixar PDF: {e}")
-            return False
\ No newline at end of file
+        except OSError:
+            return False
+    try:
+        fcntl.flock(arquivo.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except BlockingIOError:
+        return False
@@ -0,0 +1,220 @@
+"""
+Modo daemon: observa `input_pdfs/` e processa PDFs novos assim que chegam.
+
+O processo fica vivo com pools aquecidos (HTTP do Supabase e do OpenRouter,
+pool de processos de extração, cache LLM aberto), então a latência de um
+edital isolado é só o trabalho de processamento. Usa inotify via `watchfiles`
+quando instalado e cai para polling caso contrário. Encerra de forma limpa
+em SIGTERM/SIGINT, terminando os editais que já estão no pipeline.
+"""
+import asyncio
+import os
+import signal
+import time
+from pathlib import Path
+from typing import Optional, Dict, Tuple, AsyncIterator, Iterable
+
+from src.utils.logger import logger
+from src.utils.metrics import metricas
+
+from .job import EditalJob
+from .scheduler import criar_pipeline
+
+
+class DirectoryWatcher:
+    """Emite PDFs novos ou modificados depois que o tamanho estabiliza."""
+
+    def __init__(
+        self,
+        input_dir: Path,
+        debounce_segundos: float = 2.0,
+        intervalo_polling: float = 1.0,
+        usar_inotify: bool = True
+    ):
+        """
+        Args:
+            input_dir: Diretório observado
+            debounce_segundos: Tempo mínimo com tamanho/mtime inalterados
+                antes de considerar o arquivo completo (cópias em andamento)
+            intervalo_polling: Intervalo entre varreduras no modo polling
+            usar_inotify: Tenta usar `watchfiles` (inotify) se disponível
+        """
+        self.input_dir = Path(input_dir)
+        self.debounce_segundos = debounce_segundos
+        self.intervalo_polling = intervalo_polling
+        self.usar_inotify = usar_inotify
+
+        # caminho -> (tamanho, mtime, desde quando está estável)
+        self._candidatos: Dict[Path, Tuple[int, float, float]] = {}
+        # caminho -> (tamanho, mtime) da última emissão; removido quando o
+        # arquivo some, para não crescer com tudo que já passou pela pasta
+        self._emitidos: Dict[Path, Tuple[int, float]] = {}
+
+    async def observar(self, parar: asyncio.Event) -> AsyncIterator[str]:
+        """Itera sobre caminhos de arquivos prontos até `parar` ser sinalizado."""
+        self.input_dir.mkdir(parents=True, exist_ok=True)
+        self._registrar(self._varrer())
+
+        eventos: Optional[asyncio.Queue] = None
+        consumidor = None
+        if self.usar_inotify:
+            eventos = asyncio.Queue()
+            consumidor = self._iniciar_inotify(parar, eventos)
+        if consumidor is None:
+            eventos = None
+            logger.info(f"👀 Observando {self.input_dir} (polling a cada {self.intervalo_polling}s)")
+        else:
+            logger.info(f"👀 Observando {self.input_dir} (inotify)")
+
+        try:
+            while not parar.is_set():
+                for path in self._prontos():
+                    yield str(path)
+
+                espera = self.debounce_segundos / 2 if self._candidatos else self.intervalo_polling
+                if eventos is None:
+                    await self._dormir(parar, espera)
+                    self._registrar(self._varrer())
+                else:
+                    try:
+                        self._registrar(await asyncio.wait_for(eventos.get(), timeout=espera))
+                    except asyncio.TimeoutError:
+                        pass
+        finally:
+            if consumidor is not None:
+                consumidor.cancel()
+
+    def _iniciar_inotify(self, parar: asyncio.Event, eventos: asyncio.Queue) -> Optional[asyncio.Task]:
+        """Consome eventos do `watchfiles` em background (None se não instalado)."""
+        try:
+            from watchfiles import awatch
+        except ImportError:
+            return None
+
+        async def _consumir():
+            async for changes in awatch(self.input_dir, stop_event=parar, recursive=False):
+                await eventos.put([Path(caminho) for _, caminho in changes])
+
+        return asyncio.create_task(_consumir())
+
+    def _varrer(self) -> Iterable[Path]:
+        caminhos = set(self.input_dir.glob("*.pdf"))
+        for path in self._emitidos.keys() - caminhos:
+            del self._emitidos[path]
+        return caminhos
+
+    def _registrar(self, caminhos: Iterable[Path]):
+        for path in caminhos:
+            if path.suffix.lower() == ".pdf" and path not in self._candidatos:
+                self._candidatos[path] = (-1, 0.0, time.monotonic())
+
+    def _prontos(self) -> Iterable[Path]:
+        agora = time.monotonic()
+        prontos = []
+        for path, (tamanho, mtime, desde) in list(self._candidatos.items()):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                del self._candidatos[path]
+                self._emitidos.pop(path, None)
+                continue
+
+            if (stat.st_size, stat.st_mtime) != (tamanho, mtime):
+                # Ainda sendo escrito: reiniciar janela de estabilidade
+                self._candidatos[path] = (stat.st_size, stat.st_mtime, agora)
+                continue
+
+            if stat.st_size > 0 and agora - desde >= self.debounce_segundos:
+                del self._candidatos[path]
+                versao = (stat.st_size, stat.st_mtime)
+                if self._emitidos.get(path) != versao:
+                    self._emitidos[path] = versao
+                    prontos.append(path)
+        return prontos
+
+    @staticmethod
+    async def _dormir(parar: asyncio.Event, segundos: float):
+        try:
+            await asyncio.wait_for(parar.wait(), timeout=segundos)
+        except asyncio.TimeoutError:
+            pass
+
+
+class EditalDaemon:
+    """Pipeline sempre aquecido alimentado pelo DirectoryWatcher."""
+
+    def __init__(
+        self,
+        processor,
+        input_dir: Path = Path("input_pdfs"),
+        watcher: Optional[DirectoryWatcher] = None,
+        larguras: Optional[Dict[str, int]] = None,
+        intervalo_metricas: Optional[float] = None
+    ):
+        """
+        Args:
+            intervalo_metricas: Segundos entre exportações de métricas
+                (default METRICS_INTERVALO ou 30; 0 desliga)
+        """
+        self.processor = processor
+        self.watcher = watcher or DirectoryWatcher(input_dir)
+        self.larguras = larguras
+        self.parar = asyncio.Event()
+        self.processados = 0
+        if intervalo_metricas is None:
+            intervalo_metricas = float(os.getenv("METRICS_INTERVALO", "30"))
+        self.intervalo_metricas = intervalo_metricas
+
+    def instalar_sinais(self):
+        """SIGTERM/SIGINT encerram a admissão e drenam o pipeline."""
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(sig, self.encerrar)
+            except NotImplementedError:  # Windows
+                signal.signal(sig, lambda *_: self.encerrar())
+
+    def encerrar(self):
+        if not self.parar.is_set():
+            logger.info("🛑 Sinal de parada recebido: terminando editais em andamento...")
+            self.parar.set()
+
+    async def run(self):
+        """Executa até receber sinal de parada."""
+        pipeline = criar_pipeline(
+            self.processor,
+            larguras=self.larguras,
+            on_concluido=self._ao_concluir
+        )
+        logger.info(f"🚀 Daemon iniciado (pid {os.getpid()})")
+        exportador = asyncio.create_task(self._exportar_metricas()) if self.intervalo_metricas > 0 else None
+        try:
+            await pipeline.run(self.watcher.observar(self.parar))
+        finally:
+            pipeline.close()
+            if exportador is not None:
+                exportador.cancel()
+            self._gravar_metricas()
+        logger.info(f"Daemon encerrado após {self.processados} edital(is)")
+
+    async def _exportar_metricas(self):
+        """Regrava o arquivo de métricas periodicamente enquanto o daemon roda."""
+        while not self.parar.is_set():
+            await DirectoryWatcher._dormir(self.parar, self.intervalo_metricas)
+            self._gravar_metricas()
+
+    @staticmethod
+    def _gravar_metricas():
+        try:
+            metricas.exportar()
+        except OSError as e:
+            logger.error(f"Erro ao exportar métricas: {e}")
+
+    async def _ao_concluir(self, job: EditalJob):
+        self.processados += 1
+        if job.duplicado:
+            logger.info(f"⏭️  {job.nome}: já processado")
+        elif job.sucesso:
+            logger.info(f"✅ {job.nome}: concluído em {time.time() - job.inicio:.2f}s")
+        else:
+            logger.error(f"❌ {job.nome}: {job.erro or 'falha'}")
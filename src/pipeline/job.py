@@ -0,0 +1,60 @@
+"""
+Estado de um edital em trânsito pelas etapas do pipeline.
+"""
+import asyncio
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional, List, Dict, Any
+
+from src.database.models import Cargo, ConteudoBatch
+
+
+@dataclass
+class EditalJob:
+    fonte: str
+    max_pages: Optional[int] = None
+    inicio: float = field(default_factory=time.time)
+    # Fila com lease (workers distribuídos)
+    job_id: Optional[str] = None
+    cancelado: bool = False
+    # Etapa em execução (o scheduler registra para permitir cancelar o job)
+    tarefa: Optional[asyncio.Task] = field(default=None, repr=False, compare=False)
+
+    # Preparação (hash/dedup)
+    pdf_path: Optional[Path] = None
+    hash_arquivo: Optional[str] = None
+    nome_arquivo: Optional[str] = None
+    is_local: bool = True
+    edital_id: Optional[str] = None
+    duplicado: bool = False
+    retomado: bool = False
+
+    # Extração
+    texto: Optional[str] = None
+    total_paginas: Optional[int] = None
+
+    # LLM
+    metadata_json: Optional[str] = None
+    modelo_metadata: Optional[str] = None
+    conteudo_md: Optional[str] = None
+    modelo_verticalizacao: Optional[str] = None
+
+    # Parse
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    cargos: List[Cargo] = field(default_factory=list)
+    conteudos: Optional[ConteudoBatch] = None
+
+    # Resultado
+    sucesso: bool = False
+    erro: Optional[str] = None
+
+    def cancelar(self):
+        """Interrompe a etapa em execução; o job sai do pipeline sem passar por on_erro."""
+        self.cancelado = True
+        if self.tarefa is not None:
+            self.tarefa.cancel()
+
+    @property
+    def nome(self) -> str:
+        return self.nome_arquivo or Path(self.fonte).name
@@ -0,0 +1,254 @@
+"""
+Scheduler de pipeline por etapas.
+
+Cada etapa tem sua própria largura (número de workers) e as etapas são
+ligadas por filas limitadas, o que gera backpressure: se o LLM é o gargalo,
+a extração para de adiantar trabalho quando a fila de entrada do LLM enche.
+Os editais são admitidos continuamente, sem lotes fixos.
+"""
+import asyncio
+import os
+import signal
+import time
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from typing import Callable, Awaitable, Optional, List, Iterable, AsyncIterable, Union, Dict
+
+from src.utils.memoria import LimiteMemoria
+from src.utils.metrics import metricas
+
+from .job import EditalJob
+
+_FIM = object()
+
+
+@dataclass
+class Etapa:
+    nome: str
+    executar: Callable[[EditalJob], Awaitable[bool]]
+    largura: int = 1
+
+
+class PipelineScheduler:
+    """Executa editais através de uma sequência de etapas com larguras independentes."""
+
+    def __init__(
+        self,
+        etapas: List[Etapa],
+        on_erro: Optional[Callable[[EditalJob, Exception], Awaitable[None]]] = None,
+        on_concluido: Optional[Callable[[EditalJob], Awaitable[None]]] = None,
+        fila_por_worker: int = 2,
+        memoria: Optional[LimiteMemoria] = None
+    ):
+        """
+        Args:
+            etapas: Etapas em ordem. `executar` retorna False para encerrar o
+                job sem erro (ex.: edital duplicado).
+            on_erro: Chamado quando uma etapa levanta exceção (não para jobs
+                interrompidos por `EditalJob.cancelar`).
+            on_concluido: Chamado quando o job sai do pipeline (sucesso ou não).
+            fila_por_worker: Capacidade de cada fila = largura da etapa × este valor.
+            memoria: Teto de RSS; acima dele cada etapa executa um job por vez.
+        """
+        self.etapas = etapas
+        self.on_erro = on_erro
+        self.on_concluido = on_concluido
+        self.fila_por_worker = fila_por_worker
+        self.memoria = memoria
+        self._executores_proprios: List[Executor] = []
+
+    def close(self):
+        """Encerra pools de processos criados pelo próprio pipeline."""
+        for executor in self._executores_proprios:
+            executor.shutdown(wait=True)
+        self._executores_proprios.clear()
+
+    async def run(
+        self,
+        fontes: Union[Iterable[Union[str, EditalJob]], AsyncIterable[Union[str, EditalJob]]],
+        max_pages: Optional[int] = None
+    ) -> List[EditalJob]:
+        """Processa todas as fontes (caminhos/URLs ou jobs prontos) e retorna os jobs finalizados."""
+        filas = [
+            asyncio.Queue(maxsize=max(1, etapa.largura * self.fila_por_worker))
+            for etapa in self.etapas
+        ]
+        finalizados: List[EditalJob] = []
+        travas = [asyncio.Lock() for _ in self.etapas]
+
+        def _job(fonte) -> EditalJob:
+            if isinstance(fonte, EditalJob):
+                return fonte
+            return EditalJob(fonte=fonte, max_pages=max_pages)
+
+        async def _alimentar():
+            if hasattr(fontes, "__aiter__"):
+                async for fonte in fontes:
+                    await filas[0].put(_job(fonte))
+            else:
+                for fonte in fontes:
+                    await filas[0].put(_job(fonte))
+            for _ in range(self.etapas[0].largura):
+                await filas[0].put(_FIM)
+
+        async def _finalizar(job: EditalJob):
+            finalizados.append(job)
+            resultado = "duplicado" if job.duplicado else ("sucesso" if job.sucesso else "erro")
+            metricas.incrementar("editais_total", resultado=resultado)
+            metricas.observar("edital_segundos", time.time() - job.inicio, resultado=resultado)
+            if self.on_concluido:
+                await self.on_concluido(job)
+
+        async def _executar(indice: int, job: EditalJob) -> bool:
+            etapa = self.etapas[indice]
+            if self.memoria is not None and self.memoria.excedido():
+                # Acima do teto de memória: um job por vez nesta etapa
+                async with travas[indice]:
+                    return await etapa.executar(job)
+            return await etapa.executar(job)
+
+        async def _worker(indice: int):
+            etapa = self.etapas[indice]
+            entrada = filas[indice]
+            saida = filas[indice + 1] if indice + 1 < len(filas) else None
+
+            while True:
+                job = await entrada.get()
+                if job is _FIM:
+                    return
+                if job.cancelado:
+                    await _finalizar(job)
+                    continue
+
+                job.tarefa = asyncio.ensure_future(_executar(indice, job))
+                try:
+                    continuar = await job.tarefa
+                except asyncio.CancelledError:
+                    if not job.cancelado:
+                        raise  # o próprio pipeline está sendo cancelado
+                    job.erro = job.erro or f"{etapa.nome}: cancelado"
+                    await _finalizar(job)
+                    continue
+                except Exception as e:
+                    job.erro = f"{etapa.nome}: {e}"
+                    if self.on_erro:
+                        try:
+                            await self.on_erro(job, e)
+                        except Exception as e_erro:
+                            print(f"Erro ao registrar falha de {job.nome}: {e_erro}")
+                    await _finalizar(job)
+                    continue
+                finally:
+                    job.tarefa = None
+
+                if continuar and saida is not None:
+                    await saida.put(job)
+                else:
+                    job.sucesso = job.sucesso or (continuar and saida is None)
+                    await _finalizar(job)
+
+        async def _etapa(indice: int):
+            workers = [
+                asyncio.create_task(_worker(indice))
+                for _ in range(self.etapas[indice].largura)
+            ]
+            await asyncio.gather(*workers)
+            # Etapa drenada: sinalizar encerramento para a próxima
+            if indice + 1 < len(self.etapas):
+                for _ in range(self.etapas[indice + 1].largura):
+                    await filas[indice + 1].put(_FIM)
+
+        await asyncio.gather(
+            _alimentar(),
+            *[_etapa(i) for i in range(len(self.etapas))]
+        )
+        return finalizados
+
+
+def _ignorar_sigint():
+    """Workers de extração ignoram Ctrl+C; o encerramento é coordenado pelo processo pai."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def larguras_padrao() -> Dict[str, int]:
+    """Larguras por etapa, configuráveis via PIPELINE_<ETAPA>_WORKERS."""
+    cpus = os.cpu_count() or 2
+    padrao = {
+        "hash": 4,
+        "extracao": max(1, cpus - 1),
+        "llm": 4,
+        "parse": 2,
+        "db": 4,
+    }
+    return {
+        nome: int(os.getenv(f"PIPELINE_{nome.upper()}_WORKERS", valor))
+        for nome, valor in padrao.items()
+    }
+
+
+def criar_pipeline(
+    processor,
+    larguras: Optional[Dict[str, int]] = None,
+    cpu_executor: Optional[Executor] = None,
+    on_concluido: Optional[Callable[[EditalJob], Awaitable[None]]] = None,
+    memoria: Optional[LimiteMemoria] = None,
+    antes_de_persistir: Optional[Callable[[EditalJob], Awaitable[bool]]] = None
+) -> PipelineScheduler:
+    """
+    Monta o pipeline padrão sobre um EditalProcessor:
+    hash/dedup → extração (pool de processos) → LLM → parse → escrita no banco.
+
+    Sem `memoria`, usa o teto de PIPELINE_MEMORIA_MAX_MB (se definido).
+    `antes_de_persistir` retornando False encerra o job sem gravar nada
+    (ex.: lease da fila perdido para outro worker).
+    """
+    larguras = {**larguras_padrao(), **(larguras or {})}
+    memoria = memoria or LimiteMemoria.do_ambiente()
+    teto_memoria = memoria.teto_bytes if memoria else None
+    executor_proprio = cpu_executor is None
+    if executor_proprio:
+        from concurrent.futures import ProcessPoolExecutor  # importa multiprocessing
+
+        cpu_executor = ProcessPoolExecutor(
+            max_workers=larguras["extracao"],
+            initializer=_ignorar_sigint
+        )
+
+    async def _extrair(job: EditalJob) -> bool:
+        await processor.extrair(
+            job,
+            cpu_executor,
+            baixa_memoria=memoria is not None and memoria.excedido(),
+            teto_memoria=teto_memoria
+        )
+        return True
+
+    async def _llm(job: EditalJob) -> bool:
+        await processor.chamar_llm(job)
+        return True
+
+    async def _parse(job: EditalJob) -> bool:
+        processor.parsear(job)
+        return True
+
+    async def _persistir(job: EditalJob) -> bool:
+        if antes_de_persistir is not None and not await antes_de_persistir(job):
+            return False
+        await processor.persistir(job)
+        return True
+
+    scheduler = PipelineScheduler(
+        etapas=[
+            Etapa("hash", processor.preparar, larguras["hash"]),
+            Etapa("extracao", _extrair, larguras["extracao"]),
+            Etapa("llm", _llm, larguras["llm"]),
+            Etapa("parse", _parse, larguras["parse"]),
+            Etapa("db", _persistir, larguras["db"]),
+        ],
+        on_erro=processor.falhar,
+        on_concluido=on_concluido,
+        memoria=memoria
+    )
+    if executor_proprio:
+        scheduler._executores_proprios.append(cpu_executor)
+    return scheduler
@@ -0,0 +1,202 @@
+"""
+Worker com lease para escalar o processamento horizontalmente.
+
+Qualquer número de processos ou máquinas pode rodar um `LeaseWorker` contra o
+mesmo banco: os jobs são reivindicados via RPC (`FOR UPDATE SKIP LOCKED`),
+renovados por heartbeat enquanto o edital está no pipeline e, se o worker
+morrer, reivindicados por outro quando o lease expira. O edital reivindicado
+continua do último checkpoint, sem repetir chamadas LLM já salvas.
+
+Um worker que perde o lease (heartbeat atrasado além da expiração) cancela o
+job em andamento e, antes de gravar, confirma o lease mais uma vez: só o novo
+dono persiste e finaliza o edital. Jobs com erro voltam para a fila até
+`max_tentativas`.
+"""
+import asyncio
+import hashlib
+import os
+import socket
+from pathlib import Path
+from typing import Optional, List, Dict, Iterable, AsyncIterator
+
+from src.database.base import StorageBackend
+from src.utils.file_hash import compute_file_hash
+from src.utils.logger import logger
+
+from .job import EditalJob
+from .scheduler import criar_pipeline
+
+
+def chave_fonte(fonte: str) -> str:
+    """Chave de deduplicação da fila: hash do arquivo local ou url:<hash da URL>."""
+    path = Path(fonte)
+    if path.exists():
+        return compute_file_hash(path)
+    return "url:" + hashlib.sha256(fonte.encode()).hexdigest()
+
+
+async def enfileirar_fontes(db: StorageBackend, fontes: Iterable[str]) -> int:
+    """Calcula as chaves (fora do event loop) e enfileira as fontes."""
+    jobs = []
+    for fonte in fontes:
+        chave = await asyncio.to_thread(chave_fonte, fonte)
+        jobs.append({"chave": chave, "fonte": fonte})
+    return await db.enfileirar_jobs(jobs)
+
+
+class LeaseWorker:
+    """Consome a fila `edital_jobs` alimentando o pipeline por etapas."""
+
+    def __init__(
+        self,
+        processor,
+        worker_id: Optional[str] = None,
+        lease_segundos: int = 300,
+        heartbeat_segundos: Optional[float] = None,
+        capacidade: int = 8,
+        intervalo_ocioso: float = 5.0,
+        larguras: Optional[Dict[str, int]] = None
+    ):
+        """
+        Args:
+            processor: EditalProcessor (usa `processor.db` para a fila)
+            worker_id: Identificador único (default: host-pid)
+            lease_segundos: Duração do lease de cada job
+            heartbeat_segundos: Intervalo de renovação (default: lease / 3)
+            capacidade: Máximo de jobs reivindicados simultaneamente
+            intervalo_ocioso: Espera entre consultas quando a fila está vazia
+            larguras: Larguras das etapas do pipeline
+        """
+        self.processor = processor
+        self.db = processor.db
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.lease_segundos = lease_segundos
+        self.heartbeat_segundos = heartbeat_segundos or lease_segundos / 3
+        self.capacidade = capacidade
+        self.intervalo_ocioso = intervalo_ocioso
+        self.larguras = larguras
+
+        self._ativos: Dict[str, EditalJob] = {}
+        self._lease_perdido: set = set()
+        self._liberou = asyncio.Event()
+
+    async def run(
+        self,
+        parar: Optional[asyncio.Event] = None,
+        drenar: bool = False
+    ) -> List[EditalJob]:
+        """
+        Processa jobs até `parar` ser sinalizado.
+
+        Args:
+            parar: Evento de encerramento (jobs em andamento terminam antes de sair)
+            drenar: Encerra quando a fila estiver vazia
+        """
+        parar = parar or asyncio.Event()
+        pipeline = criar_pipeline(
+            self.processor,
+            larguras=self.larguras,
+            on_concluido=self._ao_concluir,
+            antes_de_persistir=self._confirmar_lease
+        )
+        heartbeat = asyncio.create_task(self._heartbeat())
+
+        logger.info(f"👷 Worker {self.worker_id} iniciado (lease: {self.lease_segundos}s)")
+        try:
+            return await pipeline.run(self._reivindicar(parar, drenar))
+        finally:
+            heartbeat.cancel()
+            pipeline.close()
+
+    async def _reivindicar(self, parar: asyncio.Event, drenar: bool) -> AsyncIterator[EditalJob]:
+        while not parar.is_set():
+            livres = self.capacidade - len(self._ativos)
+            if livres <= 0:
+                await self._esperar(parar, self._liberou)
+                continue
+
+            try:
+                rows = await self.db.reivindicar_jobs(self.worker_id, self.lease_segundos, livres)
+            except Exception as e:
+                logger.error(f"Erro ao reivindicar jobs: {e}")
+                rows = []
+
+            if not rows:
+                if drenar:
+                    return
+                await self._esperar(parar, timeout=self.intervalo_ocioso)
+                continue
+
+            for row in rows:
+                job = EditalJob(fonte=row["fonte"], job_id=row["id"])
+                self._ativos[row["id"]] = job
+                if row.get("tentativas", 1) > 1:
+                    logger.info(f"♻️  Job {row['id']} reivindicado novamente (tentativa {row['tentativas']})")
+                yield job
+
+    async def _esperar(
+        self,
+        parar: asyncio.Event,
+        evento: Optional[asyncio.Event] = None,
+        timeout: Optional[float] = None
+    ):
+        """Espera `evento`, `parar` ou o timeout, o que vier primeiro."""
+        esperas = [asyncio.create_task(parar.wait())]
+        if evento is not None:
+            esperas.append(asyncio.create_task(evento.wait()))
+        _, pendentes = await asyncio.wait(
+            esperas, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+        )
+        for tarefa in pendentes:
+            tarefa.cancel()
+        if evento is not None:
+            evento.clear()
+
+    async def _ao_concluir(self, job: EditalJob):
+        self._ativos.pop(job.job_id, None)
+        self._liberou.set()
+
+        if job.job_id in self._lease_perdido:
+            # Outro worker já assumiu o job; não sobrescrever o estado dele
+            self._lease_perdido.discard(job.job_id)
+            return
+
+        try:
+            await self.db.concluir_job(
+                job.job_id,
+                self.worker_id,
+                sucesso=job.sucesso,
+                erro_mensagem=job.erro,
+                edital_id=job.edital_id
+            )
+        except Exception as e:
+            logger.error(f"Erro ao concluir job {job.job_id}: {e}")
+
+    def _perder_lease(self, job_id: str):
+        """Outro worker assumiu o job: interrompe o trabalho local."""
+        logger.warning(f"⚠️  Lease do job {job_id} perdido para outro worker")
+        self._lease_perdido.add(job_id)
+        job = self._ativos.get(job_id)
+        if job is not None:
+            job.cancelar()
+
+    async def _confirmar_lease(self, job: EditalJob) -> bool:
+        """Renova o lease antes de gravar; False se outro worker já assumiu o job."""
+        if job.job_id in self._lease_perdido:
+            return False
+        if await self.db.renovar_lease(job.job_id, self.worker_id, self.lease_segundos):
+            return True
+        self._perder_lease(job.job_id)
+        return False
+
+    async def _heartbeat(self):
+        while True:
+            await asyncio.sleep(self.heartbeat_segundos)
+            for job_id in list(self._ativos):
+                try:
+                    renovado = await self.db.renovar_lease(job_id, self.worker_id, self.lease_segundos)
+                except Exception as e:
+                    logger.error(f"Erro no heartbeat do job {job_id}: {e}")
+                    continue
+                if not renovado and job_id not in self._lease_perdido:
+                    self._perder_lease(job_id)
@@ -1,13 +1,31 @@
+import asyncio
 import os
-from openai import AsyncOpenAI
-from tenacity import retry, stop_after_attempt, wait_exponential
+import time
+from typing import List, Optional
+from openai import AsyncOpenAI, BadRequestError
+from tenacity import retry, retry_if_not_exception_type, stop_after_attempt, wait_exponential
 from src.utils.llm_cache import LLMCache
+from src.utils.llm_cassette import CassetteMiss, LLMCassette
+from src.utils.metrics import metricas
 
 class OpenRouterClient:
-    def __init__(self, cache_enabled: bool = True, cache_ttl: int = 86400):
-        self.client = AsyncOpenAI(
+    def __init__(
+        self,
+        cache_enabled: bool = True,
+        cache_ttl: Optional[int] = None,
+        cassette: Optional[LLMCassette] = None
+    ):
+        """
+        Args:
+            cache_enabled: Usa o LLMCache (backend de LLM_CACHE_BACKEND; ignorado no replay)
+            cache_ttl: Validade das entradas do cache em segundos (default: LLM_CACHE_TTL ou 30 dias)
+            cassette: Grava ou reproduz as chamadas (default: LLM_CASSETTE_MODE)
+        """
+        self.cassette = cassette if cassette is not None else LLMCassette.do_ambiente()
+        # No replay nada sai para a rede: nem cliente HTTP nem chave são necessários
+        self.client = None if self._reproduzindo else AsyncOpenAI(
             api_key=os.getenv("OPENROUTER_API_KEY"),
-            base_url="https://openrouter.ai/api/v1",
+            base_url=os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1"),
             timeout=60.0,
             max_retries=2
         )
@@ -16,47 +34,182 @@ class OpenRouterClient:
         fallback_str = os.getenv("OPENROUTER_MODELS_FALLBACK", "openai/gpt-4o-mini,meta-llama/llama-3.1-8b-instruct")
         self.fallback_models = [m.strip() for m in fallback_str.split(",")]
 
+        # Modelos que recusaram `response_format` (saída estruturada) nesta execução
+        self._sem_saida_estruturada = set()
+
         # Cache de resultados LLM
-        self.cache_enabled = cache_enabled
-        self.cache = LLMCache(ttl=cache_ttl) if cache_enabled else None
+        self.cache_enabled = cache_enabled and not self._reproduzindo
+        self.cache = LLMCache(ttl=cache_ttl) if self.cache_enabled else None
+
+    @property
+    def _reproduzindo(self) -> bool:
+        return self.cassette is not None and self.cassette.reproduzindo
+
+    # Requisição fora do cassete não melhora com nova tentativa
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        retry=retry_if_not_exception_type(CassetteMiss)
+    )
+    async def process_with_fallback(
+        self,
+        prompt: str,
+        system_prompt: str,
+        response_format: Optional[dict] = None
+    ) -> tuple[str, str]:
+        """
+        Processa prompt com fallback de modelos e cache.
+
+        Args:
+            response_format: Saída estruturada (ex.: `{"type": "json_schema", ...}`),
+                enviada aos modelos que a aceitam
+        """
+        if self._reproduzindo:
+            return await self._reproduzir(prompt, system_prompt)
+
+        inicio = time.perf_counter()
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
-    async def process_with_fallback(self, prompt: str, system_prompt: str) -> tuple[str, str]:
-        """Processa prompt com fallback de modelos e cache."""
         # Verificar cache primeiro
-        if self.cache_enabled:
-            cached = self.cache.get(prompt, system_prompt, self.primary_model)
-            if cached:
-                return cached
+        cached = await self.consultar_cache(prompt, system_prompt)
+        if cached:
+            return cached
 
         models = [self.primary_model] + self.fallback_models
+        falhas: List[dict] = []
 
         for model in models:
+            tentativa = time.perf_counter()
             try:
-                response = await self.client.chat.completions.create(
-                    model=model,
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.1,
-                    max_tokens=4000
-                )
+                with metricas.span("llm_requisicao", modelo=model):
+                    response = await self._completar(model, prompt, system_prompt, response_format)
                 content = response.choices[0].message.content
 
+                usage = getattr(response, "usage", None)
+                if usage is not None:
+                    metricas.incrementar("llm_tokens_total", usage.prompt_tokens or 0, modelo=model, tipo="prompt")
+                    metricas.incrementar("llm_tokens_total", usage.completion_tokens or 0, modelo=model, tipo="completion")
+                metricas.incrementar("llm_bytes_total", len(prompt.encode()), modelo=model, sentido="enviado")
+                metricas.incrementar("llm_bytes_total", len(content.encode()), modelo=model, sentido="recebido")
+
                 # Simular custo (implementar cálculo real baseado no modelo)
                 self.total_cost += 0.01  # Placeholder
 
                 # Salvar no cache
                 if self.cache_enabled:
-                    self.cache.set(prompt, system_prompt, self.primary_model, content, model)
-
-                return content, model
+                    await self.cache.aset(prompt, system_prompt, self.primary_model, content, model)
+                break
             except Exception as e:
                 print(f"Erro com modelo {model}: {e}")
+                falhas.append({
+                    "modelo": model,
+                    "erro": str(e)[:500],
+                    "latencia": round(time.perf_counter() - tentativa, 4),
+                })
                 continue
+        else:
+            raise Exception("Todos os modelos falharam")
+
+        if self.cassette is not None:
+            self.cassette.gravar(
+                prompt, system_prompt, self.primary_model, content, model,
+                latencia=time.perf_counter() - inicio,
+                usage={"prompt_tokens": usage.prompt_tokens, "completion_tokens": usage.completion_tokens}
+                if usage is not None else None,
+                falhas=falhas,
+            )
+        return content, model
+
+    async def consultar_cache(self, prompt: str, system_prompt: str) -> Optional[tuple[str, str]]:
+        """
+        Resposta em cache para o prompt, sem chamar a LLM.
+
+        Um acerto conta nas métricas e vai para o cassete como em
+        `process_with_fallback`.
+
+        Returns:
+            (content, model) ou None (miss ou cache desligado)
+        """
+        if not self.cache_enabled:
+            return None
+        inicio = time.perf_counter()
+        cached = await self.cache.aget(prompt, system_prompt, self.primary_model)
+        if not cached:
+            metricas.incrementar("llm_cache_total", resultado="miss")
+            return None
+        metricas.incrementar("llm_cache_total", resultado="hit")
+        if self.cassette is not None:
+            self.cassette.gravar(
+                prompt, system_prompt, self.primary_model, cached[0], cached[1],
+                latencia=time.perf_counter() - inicio, origem="cache"
+            )
+        return cached
+
+    async def registrar_resposta(self, prompt: str, system_prompt: str, content: str, model: str, latencia: float):
+        """
+        Registra uma resposta obtida fora de `process_with_fallback` (ex.: o
+        trecho de um documento em uma chamada empacotada) como se fosse a
+        resposta ao `prompt`: a mesma requisição individual depois é acerto de
+        cache e o replay de um cassete não depende de como as chamadas foram agrupadas.
+        """
+        if self.cache_enabled:
+            await self.cache.aset(prompt, system_prompt, self.primary_model, content, model)
+        if self.cassette is not None and not self._reproduzindo:
+            self.cassette.gravar(
+                prompt, system_prompt, self.primary_model, content, model,
+                latencia=latencia, origem="lote"
+            )
+
+    async def _completar(self, model: str, prompt: str, system_prompt: str, response_format: Optional[dict]):
+        """Chamada de chat; se o modelo recusar a saída estruturada, repete sem ela."""
+        parametros = dict(
+            model=model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.1,
+            max_tokens=4000
+        )
+        if response_format is not None and model not in self._sem_saida_estruturada:
+            try:
+                return await self.client.chat.completions.create(**parametros, response_format=response_format)
+            except BadRequestError as e:
+                print(f"Modelo {model} recusou saída estruturada, repetindo sem ela: {e}")
+                self._sem_saida_estruturada.add(model)
+                metricas.incrementar("llm_saida_estruturada_recusada_total", modelo=model)
+        return await self.client.chat.completions.create(**parametros)
+
+    async def _reproduzir(self, prompt: str, system_prompt: str) -> tuple[str, str]:
+        """Resposta gravada no cassete, com as mesmas métricas de uma chamada real."""
+        try:
+            registro = self.cassette.reproduzir(prompt, system_prompt)
+        except CassetteMiss:
+            metricas.incrementar("llm_cassette_total", resultado="miss")
+            raise
+        metricas.incrementar("llm_cassette_total", resultado="hit")
+
+        content, model = registro["resposta"], registro["modelo"]
+        if registro.get("origem") == "cache":
+            await asyncio.sleep(self.cassette.espera(registro))
+            return content, model
+
+        with metricas.span("llm_requisicao", modelo=model):
+            await asyncio.sleep(self.cassette.espera(registro))
+        usage = registro.get("usage")
+        if usage:
+            metricas.incrementar("llm_tokens_total", usage.get("prompt_tokens") or 0, modelo=model, tipo="prompt")
+            metricas.incrementar("llm_tokens_total", usage.get("completion_tokens") or 0, modelo=model, tipo="completion")
+        metricas.incrementar("llm_bytes_total", len(prompt.encode()), modelo=model, sentido="enviado")
+        metricas.incrementar("llm_bytes_total", len(content.encode()), modelo=model, sentido="recebido")
+        self.total_cost += 0.01  # Placeholder, como na chamada real
+        return content, model
 
-        raise Exception("Todos os modelos falharam")
+    async def close(self):
+        """Fecha o cliente HTTP e o cache (antes de o event loop encerrar)."""
+        if self.client is not None:
+            await self.client.close()
+        if self.cache is not None:
+            self.cache.close()
 
     def get_cache_stats(self) -> dict:
         """Retorna estatísticas do cache."""
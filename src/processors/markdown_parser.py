@@ -0,0 +1,101 @@
+"""
+Parser do markdown verticalizado para linhas de conteúdo programático.
+
+Uma única passada pelas linhas, com um único padrão pré-compilado para os
+itens. O resultado é um ConteudoBatch (colunas paralelas) consumido direto
+pelos inserts em lote, sem um objeto por linha. A numeração é preservada por
+inteiro em `numeracao`; `nivel` e `ordem_pai` mantêm a hierarquia em qualquer
+profundidade (nivel_1..4 continuam preenchidos para compatibilidade).
+"""
+import re
+from typing import Dict, Optional
+
+from src.database.models import ConteudoBatch
+
+# Item numerado ("1.2.", "1.2)", "1.2 - ", "1.2 Texto") ou item simples
+# (com marcador "-"/"•" opcional). O segundo ramo sempre casa.
+_ITEM = re.compile(
+    r"(?P<num>\d+(?:\.\d+)*)(?:[.)]\s+|\s*[-–—]\s*|\s+(?=[A-ZÀ-Ú]))(?P<desc>.+)"
+    r"|(?:[-•]\s*)?(?P<texto>.*)"
+)
+
+
+def parse_conteudo_programatico(markdown: str, edital_id: str) -> ConteudoBatch:
+    """
+    Converte o markdown da LLM em um ConteudoBatch.
+
+    `## ` define a seção e `### ` a matéria (em maiúsculas); outros títulos e
+    separadores `---` são ignorados. Itens sem numeração ficam como filhos do
+    último item numerado da mesma matéria.
+    """
+    batch = ConteudoBatch(edital_id)
+    add_secao = batch.secao.append
+    add_materia = batch.materia.append
+    add_descricao = batch.descricao.append
+    add_numeracao = batch.numeracao.append
+    add_nivel = batch.nivel.append
+    add_pai = batch.ordem_pai.append
+    niveis = batch.nivel
+    casar = _ITEM.match
+
+    secao: Optional[str] = None
+    materia: Optional[str] = None
+    # numeracao -> ordem do item, reiniciado a cada seção/matéria
+    ordens: Dict[str, int] = {}
+    ultimo_numerado: Optional[int] = None
+    ordem = 0
+
+    for linha in markdown.split("\n"):
+        linha = linha.strip()
+        if not linha:
+            continue
+
+        if linha[0] == "#":
+            if linha.startswith("## "):
+                secao = linha[3:].strip()
+            elif linha.startswith("### "):
+                materia = linha[4:].strip().upper()
+            else:
+                continue
+            ordens.clear()
+            ultimo_numerado = None
+            continue
+
+        if linha.startswith("---"):
+            continue
+
+        m = casar(linha)
+        numeracao = m.group("num")
+        if numeracao is not None:
+            descricao = m.group("desc").strip()
+
+            # Pai: prefixo mais longo já visto ("1.2.3" -> "1.2" -> "1")
+            pai = None
+            prefixo = numeracao
+            corte = prefixo.rfind(".")
+            while corte > 0:
+                prefixo = prefixo[:corte]
+                pai = ordens.get(prefixo)
+                if pai is not None:
+                    break
+                corte = prefixo.rfind(".")
+
+            nivel = numeracao.count(".") + 1
+            ordens[numeracao] = ordem
+            ultimo_numerado = ordem
+        else:
+            descricao = m.group("texto").strip()
+            if not descricao:
+                continue
+            pai = ultimo_numerado
+            nivel = niveis[pai] + 1 if pai is not None else None
+
+        add_secao(secao)
+        add_materia(materia)
+        add_descricao(descricao)
+        add_numeracao(numeracao)
+        add_nivel(nivel)
+        add_pai(pai)
+        ordem += 1
+
+    return batch
@@ -0,0 +1,199 @@
+"""
+Empacotamento das chamadas de metadados de documentos curtos.
+
+Avisos e extratos de 2 a 5 páginas pagam uma ida e volta inteira à LLM só
+para os metadados, e o custo fixo de cada requisição domina. O
+`MetadataBatcher` segura as chamadas de documentos curtos por uma janela
+curta e envia várias em uma só requisição, com os documentos delimitados e
+uma resposta em lista (`build_metadata_batch_prompt`, `esquema_lote`). A
+resposta é separada por documento; documentos que faltarem nela, ou o lote
+inteiro se a chamada falhar, seguem em chamadas individuais.
+
+Cada resposta separada é registrada no cliente (`registrar_resposta`) como
+resposta à chamada individual: o cache serve depois o documento sozinho e
+um cassete gravado com lotes é reproduzido sem eles. Antes de entrar em um
+lote, o documento é procurado no cache (`consultar_cache`); só os misses
+seguem para a LLM.
+
+O tamanho do lote é limitado também pela largura da etapa llm do pipeline
+(PIPELINE_LLM_WORKERS): só documentos na etapa ao mesmo tempo se juntam.
+
+Configuração:
+    METADADOS_LOTE_MAX=8                  # documentos por chamada (0 ou 1 = desligado)
+    METADADOS_LOTE_JANELA_MS=250          # espera máxima por companhia
+    METADADOS_LOTE_DOC_MAX_CARACTERES=20000   # maior texto considerado curto
+    METADADOS_LOTE_MAX_CARACTERES=60000   # soma dos textos em uma chamada
+"""
+import asyncio
+import json
+import os
+import time
+from typing import Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+
+from src.processors.metadata_schema import esquema_json, esquema_lote, separar_lote
+from src.processors.prompt_templates import (
+    METADATA_SYSTEM_PROMPT, build_metadata_batch_prompt, build_metadata_prompt
+)
+from src.utils.logger import logger
+from src.utils.metrics import metricas
+
+if TYPE_CHECKING:
+    from src.processors.llm_client import OpenRouterClient
+
+# Trecho do texto usado na extração de metadados (mesmo corte da chamada individual)
+CARACTERES_METADADOS = 15000
+
+_Pendente = Tuple[str, asyncio.Future]
+
+
+class MetadataBatcher:
+    """Junta chamadas de metadados de documentos curtos em requisições empacotadas."""
+
+    def __init__(
+        self,
+        llm_client: "OpenRouterClient",
+        max_documentos: int = 8,
+        janela: float = 0.25,
+        max_caracteres_documento: int = 20000,
+        max_caracteres_lote: int = 60000
+    ):
+        """
+        Args:
+            llm_client: Cliente usado nas chamadas empacotadas e individuais
+            max_documentos: Documentos por chamada empacotada
+            janela: Segundos que o primeiro documento espera por outros
+            max_caracteres_documento: Textos maiores não entram em lotes
+            max_caracteres_lote: Soma máxima dos trechos enviados em um lote
+        """
+        if max_documentos < 2:
+            raise ValueError("max_documentos deve ser >= 2")
+        if janela < 0:
+            raise ValueError("janela deve ser >= 0")
+        self.llm_client = llm_client
+        self.max_documentos = max_documentos
+        self.janela = janela
+        self.max_caracteres_documento = max_caracteres_documento
+        self.max_caracteres_lote = max_caracteres_lote
+        self._pendentes: List[_Pendente] = []
+        self._caracteres_pendentes = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tarefas: Set[asyncio.Task] = set()
+
+    @classmethod
+    def do_ambiente(cls, llm_client: "OpenRouterClient") -> Optional["MetadataBatcher"]:
+        """Batcher de METADADOS_LOTE_* (None se desligado ou no replay de um cassete)."""
+        max_documentos = int(os.getenv("METADADOS_LOTE_MAX") or 8)
+        # No replay as respostas vêm das entradas individuais gravadas
+        if max_documentos < 2 or (llm_client.cassette is not None and llm_client.cassette.reproduzindo):
+            return None
+        return cls(
+            llm_client,
+            max_documentos=max_documentos,
+            janela=int(os.getenv("METADADOS_LOTE_JANELA_MS") or 250) / 1000,
+            max_caracteres_documento=int(os.getenv("METADADOS_LOTE_DOC_MAX_CARACTERES") or 20000),
+            max_caracteres_lote=int(os.getenv("METADADOS_LOTE_MAX_CARACTERES") or 60000),
+        )
+
+    def aceita(self, texto: str) -> bool:
+        """Se o documento é curto o bastante para entrar em um lote."""
+        return len(texto) <= self.max_caracteres_documento
+
+    async def extrair(self, texto: str) -> Tuple[str, str]:
+        """
+        Metadados brutos do documento, possivelmente em uma chamada empacotada.
+
+        Returns:
+            (JSON de metadados do documento, modelo usado), como `process_with_fallback`
+        """
+        trecho = texto[:CARACTERES_METADADOS]
+        # Reprocessamento ou outro worker: a resposta individual já está no cache
+        em_cache = await self.llm_client.consultar_cache(build_metadata_prompt(trecho), METADATA_SYSTEM_PROMPT)
+        if em_cache:
+            return em_cache
+
+        loop = asyncio.get_running_loop()
+        futuro = loop.create_future()
+
+        if self._pendentes and self._caracteres_pendentes + len(trecho) > self.max_caracteres_lote:
+            self._disparar()
+        self._pendentes.append((trecho, futuro))
+        self._caracteres_pendentes += len(trecho)
+
+        if len(self._pendentes) >= self.max_documentos:
+            self._disparar()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.janela, self._disparar)
+        return await futuro
+
+    def _disparar(self):
+        """Envia os documentos pendentes (fim da janela ou lote cheio)."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        lote, self._pendentes = self._pendentes, []
+        self._caracteres_pendentes = 0
+        if not lote:
+            return
+        tarefa = asyncio.ensure_future(self._processar(lote))
+        self._tarefas.add(tarefa)
+        tarefa.add_done_callback(self._tarefas.discard)
+
+    async def _processar(self, lote: List[_Pendente]):
+        respostas: Dict[int, Tuple[str, str]] = {}
+        if len(lote) > 1:
+            try:
+                respostas = await self._empacotado([trecho for trecho, _ in lote])
+            except Exception as e:
+                metricas.incrementar("metadados_lote_total", resultado="erro")
+                logger.warning(f"⚠️  Chamada de metadados de {len(lote)} documentos falhou ({e}); seguindo individualmente")
+
+        await asyncio.gather(*(
+            self._resolver(trecho, futuro, respostas.get(indice))
+            for indice, (trecho, futuro) in enumerate(lote)
+        ))
+
+    async def _empacotado(self, trechos: List[str]) -> Dict[int, Tuple[str, str]]:
+        """Uma chamada para todos os trechos; devolve as respostas que puderam ser separadas."""
+        prompt = build_metadata_batch_prompt(trechos)
+        inicio = time.perf_counter()
+        with metricas.span("llm", chamada="metadados_lote"):
+            conteudo, modelo = await self.llm_client.process_with_fallback(
+                prompt=prompt,
+                system_prompt=METADATA_SYSTEM_PROMPT,
+                response_format=esquema_lote()
+            )
+        latencia = time.perf_counter() - inicio
+        logger.log_llm_call(modelo, len(prompt), len(conteudo))
+
+        respostas = {}
+        for indice, metadados in separar_lote(conteudo, len(trechos)).items():
+            resposta = json.dumps(metadados, ensure_ascii=False)
+            await self.llm_client.registrar_resposta(
+                build_metadata_prompt(trechos[indice]), METADATA_SYSTEM_PROMPT, resposta, modelo, latencia
+            )
+            respostas[indice] = (resposta, modelo)
+
+        faltando = len(trechos) - len(respostas)
+        metricas.incrementar("metadados_lote_total", resultado="parcial" if faltando else "ok")
+        metricas.incrementar("metadados_lote_documentos_total", len(respostas))
+        if faltando:
+            logger.warning(f"⚠️  Resposta empacotada sem {faltando} de {len(trechos)} documentos; seguindo individualmente")
+        return respostas
+
+    async def _resolver(self, trecho: str, futuro: asyncio.Future, resposta: Optional[Tuple[str, str]]):
+        """Entrega a resposta do lote ou faz a chamada individual do documento."""
+        if futuro.done():
+            return  # job cancelado enquanto esperava
+        try:
+            if resposta is None:
+                resposta = await self.llm_client.process_with_fallback(
+                    prompt=build_metadata_prompt(trecho),
+                    system_prompt=METADATA_SYSTEM_PROMPT,
+                    response_format=esquema_json()
+                )
+        except Exception as e:
+            if not futuro.done():
+                futuro.set_exception(e)
+            return
+        if not futuro.done():
+            futuro.set_result(resposta)
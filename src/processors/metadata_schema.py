@@ -0,0 +1,381 @@
+"""
+Esquema, reparo e validação da resposta de metadados da LLM.
+
+A resposta passa por três passos:
+1. `reparar_json`: tolera cercas de markdown, texto em volta, vírgulas
+   sobrando, literais do Python e saída truncada (ex.: `max_tokens`
+   atingido). Valores incompletos no fim são descartados, nunca adivinhados.
+2. `validar_metadados`: valida campo a campo com `EditalMetadata`; um campo
+   inválido ou ausente não derruba os demais.
+3. Os campos que falharam são perguntados de novo com um prompt pequeno
+   (`build_metadata_reask_prompt`), em vez de refazer a chamada inteira.
+
+Este módulo importa pydantic: carregue-o sob demanda (ver
+scripts/import_budget.json).
+"""
+import json
+import re
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_validator
+
+CAMPOS = (
+    "formato_prova",
+    "data_prova",
+    "data_inscricao_inicio",
+    "data_inscricao_fim",
+    "valor_inscricao",
+    "detalhes_discursiva",
+    "cargos",
+    "salarios",
+)
+
+_FORMATOS_DATA = ("%Y-%m-%d", "%d/%m/%Y", "%d/%m/%y", "%d-%m-%Y", "%d.%m.%Y")
+
+
+def _texto_opcional(valor: Any) -> Optional[str]:
+    if valor is None:
+        return None
+    if not isinstance(valor, str):
+        raise ValueError(f"esperado texto (recebido: {valor!r})")
+    return valor.strip() or None
+
+
+def _reais(valor: Any) -> Optional[str]:
+    """Valor monetário como texto; números viram "R$ 1.234,56"."""
+    if isinstance(valor, bool):
+        raise ValueError(f"valor monetário inválido: {valor!r}")
+    if isinstance(valor, (int, float)):
+        return "R$ " + f"{valor:,.2f}".replace(",", "_").replace(".", ",").replace("_", ".")
+    texto = _texto_opcional(valor)
+    if texto is not None and not re.search(r"\d", texto):
+        raise ValueError(f"valor monetário sem dígitos: {texto!r}")
+    return texto
+
+
+class EditalMetadata(BaseModel):
+    """Metadados do edital; datas normalizadas para YYYY-MM-DD."""
+
+    model_config = ConfigDict(extra="ignore")
+
+    formato_prova: Optional[str] = Field(None, description="objetiva, discursiva ou mista")
+    data_prova: Optional[str] = Field(None, description="YYYY-MM-DD")
+    data_inscricao_inicio: Optional[str] = Field(None, description="YYYY-MM-DD")
+    data_inscricao_fim: Optional[str] = Field(None, description="YYYY-MM-DD")
+    valor_inscricao: Optional[str] = Field(None, description="R$ XXX,XX")
+    detalhes_discursiva: Optional[str] = Field(None, description="descrição se houver")
+    cargos: List[str] = Field(default_factory=list)
+    salarios: Dict[str, Optional[str]] = Field(default_factory=dict, description="cargo -> R$ XXXX,XX")
+
+    @field_validator("formato_prova", "detalhes_discursiva", mode="before")
+    @classmethod
+    def _texto(cls, valor):
+        return _texto_opcional(valor)
+
+    @field_validator("data_prova", "data_inscricao_inicio", "data_inscricao_fim", mode="before")
+    @classmethod
+    def _data(cls, valor):
+        if isinstance(valor, date):
+            return valor.isoformat()
+        texto = _texto_opcional(valor)
+        if texto is None:
+            return None
+        for formato in _FORMATOS_DATA:
+            try:
+                return datetime.strptime(texto, formato).date().isoformat()
+            except ValueError:
+                continue
+        raise ValueError(f"data inválida: {texto!r} (use YYYY-MM-DD)")
+
+    @field_validator("valor_inscricao", mode="before")
+    @classmethod
+    def _valor(cls, valor):
+        return _reais(valor)
+
+    @field_validator("cargos", mode="before")
+    @classmethod
+    def _cargos(cls, valor):
+        if valor is None:
+            return []
+        if not isinstance(valor, list):
+            raise ValueError(f"cargos deve ser uma lista (recebido: {type(valor).__name__})")
+        cargos = []
+        for cargo in valor:
+            nome = _texto_opcional(cargo)
+            if nome and nome not in cargos:
+                cargos.append(nome)
+        return cargos
+
+    @field_validator("salarios", mode="before")
+    @classmethod
+    def _salarios(cls, valor):
+        if valor is None:
+            return {}
+        if not isinstance(valor, dict):
+            raise ValueError(f"salarios deve ser um objeto (recebido: {type(valor).__name__})")
+        return {str(cargo).strip(): _reais(salario) for cargo, salario in valor.items()}
+
+
+def esquema_json(campos: Optional[List[str]] = None) -> dict:
+    """`response_format` de saída estruturada para os campos (default: todos)."""
+    esquema = EditalMetadata.model_json_schema()
+    if campos is not None:
+        esquema["properties"] = {c: esquema["properties"][c] for c in campos}
+    esquema["required"] = list(esquema["properties"])
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": "edital_metadata", "strict": False, "schema": esquema},
+    }
+
+
+def esquema_lote() -> dict:
+    """`response_format` da chamada empacotada: {"editais": [{"documento": n, ...}]}."""
+    item = EditalMetadata.model_json_schema()
+    item["properties"] = {"documento": {"type": "integer", "minimum": 1}, **item["properties"]}
+    item["required"] = list(item["properties"])
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "editais_metadata",
+            "strict": False,
+            "schema": {
+                "type": "object",
+                "properties": {"editais": {"type": "array", "items": item}},
+                "required": ["editais"],
+            },
+        },
+    }
+
+
+# ==================== REPARO ====================
+
+_LITERAIS = {"True": "true", "False": "false", "None": "null"}
+_ESCALAR = re.compile(r"[^\s,:\]\}\"]+")
+
+
+def reparar_json(texto: str) -> Optional[dict]:
+    """
+    Extrai o primeiro objeto JSON do texto, tolerando defeitos comuns.
+
+    Percorre o texto uma vez (serve também para respostas parciais de
+    streaming) e guarda o último ponto em que o documento estava completo;
+    se o texto acabar no meio de uma chave ou valor, corta ali e fecha as
+    chaves e colchetes abertos. O campo de primeiro nível cujo valor foi
+    cortado é removido: uma lista ou objeto pela metade não é um valor.
+
+    Returns:
+        O objeto, ou None se não houver objeto recuperável.
+    """
+    inicio = texto.find("{")
+    if inicio < 0:
+        return None
+
+    saida: List[str] = []
+    # Pilha de contêineres: [tipo, estado]; estados de objeto: chave,
+    # dois_pontos, valor, depois; de lista: valor, depois
+    pilha: List[List[str]] = []
+    corte: Tuple[int, Tuple[str, ...], Optional[str]] = (0, (), None)
+    chave_topo: Optional[str] = None
+    i = inicio
+    n = len(texto)
+
+    def _valor_concluido():
+        if pilha:
+            pilha[-1][1] = "depois"
+
+    def _marcar():
+        nonlocal corte
+        corte = (len(saida), tuple(tipo for tipo, _ in pilha), chave_topo)
+
+    while i < n:
+        c = texto[i]
+        if c in " \t\r\n":
+            i += 1
+            continue
+        estado = pilha[-1][1] if pilha else "valor"
+
+        if c in "{[":
+            if estado != "valor":
+                break
+            saida.append(c)
+            pilha.append(["{", "chave"] if c == "{" else ["[", "valor"])
+            _marcar()
+            i += 1
+        elif c in "}]":
+            if not pilha or pilha[-1][0] != ("{" if c == "}" else "["):
+                break
+            if estado == "dois_pontos" or (estado == "valor" and pilha[-1][0] == "{"):
+                break
+            if saida and saida[-1] == ",":
+                saida.pop()  # vírgula sobrando antes do fechamento
+            saida.append(c)
+            pilha.pop()
+            _valor_concluido()
+            _marcar()
+            i += 1
+            if not pilha:
+                break
+        elif c == ",":
+            if estado != "depois":
+                break
+            saida.append(c)
+            pilha[-1][1] = "chave" if pilha[-1][0] == "{" else "valor"
+            i += 1
+        elif c == ":":
+            if estado != "dois_pontos":
+                break
+            saida.append(c)
+            pilha[-1][1] = "valor"
+            i += 1
+        elif c == '"':
+            fim = i + 1
+            while fim < n and texto[fim] != '"':
+                fim += 2 if texto[fim] == "\\" else 1
+            if fim >= n:
+                break  # string truncada: descartada
+            saida.append(texto[i:fim + 1])
+            i = fim + 1
+            if estado == "chave":
+                pilha[-1][1] = "dois_pontos"
+                if len(pilha) == 1:
+                    chave_topo = json.loads(saida[-1], strict=False)
+            elif estado == "valor":
+                _valor_concluido()
+                _marcar()
+            else:
+                break
+        else:
+            encontrado = _ESCALAR.match(texto, i)
+            literal = encontrado.group()
+            fim = encontrado.end()
+            if estado != "valor" or fim >= n:
+                break  # número ou literal no fim do texto pode estar incompleto
+            saida.append(_LITERAIS.get(literal, literal))
+            i = fim
+            _valor_concluido()
+            _marcar()
+
+    cortado = None
+    if pilha:
+        tamanho, abertos, chave = corte
+        saida = saida[:tamanho]
+        saida.extend("}" if tipo == "{" else "]" for tipo in reversed(abertos))
+        if len(abertos) > 1:
+            cortado = chave
+
+    try:
+        # strict=False: aceita quebras de linha cruas dentro das strings
+        dados = json.loads("".join(saida), strict=False)
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(dados, dict):
+        return None
+    dados.pop(cortado, None)
+    return dados
+
+
+# ==================== VALIDAÇÃO ====================
+
+def separar_lote(resposta: str, total: int) -> Dict[int, dict]:
+    """
+    Separa a resposta da chamada empacotada por documento.
+
+    Itens são associados pelo campo "documento" (1 a `total`) ou, se nenhum
+    o trouxer e a quantidade bater, pela posição. Os itens são lidos um a
+    um: um item defeituoso encerra a leitura, e ele e os seguintes ficam de
+    fora (o chamador os processa individualmente).
+
+    Returns:
+        {índice do documento a partir de 0: metadados brutos do documento}
+    """
+    limpo = re.sub(r"^```(?:json)?\s*|\s*```$", "", resposta.strip())
+    try:
+        dados = json.loads(limpo, strict=False)
+        itens = dados.get("editais") if isinstance(dados, dict) else dados
+    except json.JSONDecodeError:
+        itens = _itens_completos(limpo)
+    if not isinstance(itens, list):
+        return {}
+
+    itens = [item for item in itens if isinstance(item, dict)]
+    numerados = all(isinstance(item.get("documento"), int) for item in itens)
+    if not numerados and len(itens) != total:
+        return {}
+
+    documentos: Dict[int, dict] = {}
+    for posicao, item in enumerate(itens):
+        indice = item.pop("documento", None) - 1 if numerados else posicao
+        if 0 <= indice < total and indice not in documentos:
+            documentos[indice] = item
+    return documentos
+
+
+def _itens_completos(texto: str) -> List[Any]:
+    """Itens da lista "editais" que puderam ser lidos antes do primeiro defeito."""
+    encontrado = re.search(r'"editais"\s*:\s*\[', texto) or re.search(r"\[", texto)
+    if not encontrado:
+        return []
+    decodificador = json.JSONDecoder(strict=False)
+    itens = []
+    i = encontrado.end()
+    while i < len(texto):
+        while i < len(texto) and texto[i] in " \t\r\n,":
+            i += 1
+        if i >= len(texto) or texto[i] == "]":
+            break
+        try:
+            item, i = decodificador.raw_decode(texto, i)
+        except json.JSONDecodeError:
+            break
+        itens.append(item)
+    return itens
+
+
+def validar_metadados(dados: Optional[dict], campos: Iterable[str] = CAMPOS) -> Tuple[dict, Dict[str, str]]:
+    """
+    Valida os metadados campo a campo.
+
+    Um campo ausente da resposta também é considerado falho (a saída pode
+    ter sido truncada); um campo presente com null é aceito.
+
+    Args:
+        campos: Campos esperados na resposta (default: todos)
+
+    Returns:
+        (metadados válidos com todos os campos, {campo: motivo da falha})
+    """
+    dados = dados or {}
+    falhas = {campo: "ausente na resposta" for campo in campos if campo not in dados}
+    validos = {campo: dados[campo] for campo in campos if campo in dados}
+
+    try:
+        modelo = EditalMetadata.model_validate(validos)
+    except ValidationError as e:
+        for erro in e.errors():
+            campo = str(erro["loc"][0])
+            falhas.setdefault(campo, erro["msg"])
+            validos.pop(campo, None)
+        modelo = EditalMetadata.model_validate(validos)
+
+    return modelo.model_dump(), falhas
+
+
+def interpretar_metadados(resposta: str, campos: Iterable[str] = CAMPOS) -> Tuple[dict, Dict[str, str], bool]:
+    """
+    Repara e valida a resposta bruta da LLM.
+
+    Returns:
+        (metadados, {campo: motivo da falha}, se o JSON precisou de reparo)
+    """
+    limpo = re.sub(r"^```(?:json)?\s*|\s*```$", "", resposta.strip())
+    try:
+        dados = json.loads(limpo, strict=False)
+        reparado = False
+    except json.JSONDecodeError:
+        dados = reparar_json(resposta)
+        reparado = True
+    if not isinstance(dados, dict):
+        dados = None
+    metadados, falhas = validar_metadados(dados, campos)
+    return metadados, falhas, reparado
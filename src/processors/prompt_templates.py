@@ -1,9 +1,25 @@
-def build_metadata_prompt(text: str) -> str:
-    """Prompt para extrair metadados do edital."""
-    return f"""
-Extraia as seguintes informações do edital em formato JSON válido:
+import re
+
+# Versão dos templates (e dos parâmetros das chamadas, como temperatura e
+# max_tokens); mudanças que devam invalidar respostas em cache a incrementam
+PROMPT_VERSION = "2"
+
+# Palavras que localizam no texto do edital o trecho de cada campo de metadados
+_PISTAS_CAMPOS = {
+    "formato_prova": r"prova[s]? objetiva|discursiva|reda[çc][ãa]o|etapas?",
+    "data_prova": r"data da prova|prova[s]? (?:objetiva|ser[ãa]o aplicada)|aplica[çc][ãa]o d",
+    "data_inscricao_inicio": r"inscri[çc][õo]es",
+    "data_inscricao_fim": r"inscri[çc][õo]es",
+    "valor_inscricao": r"taxa de inscri|valor da inscri",
+    "detalhes_discursiva": r"discursiva|reda[çc][ãa]o|pe[çc]a",
+    "cargos": r"cargos?\b|vagas",
+    "salarios": r"remunera[çc][ãa]o|sal[áa]rio|vencimento|R\$",
+}
+
+
+METADATA_SYSTEM_PROMPT = "Extraia informações precisas do edital em JSON válido."
 
-{{
+_CAMPOS_METADADOS = """
     "formato_prova": "objetiva/discursiva/mista",
     "data_prova": "YYYY-MM-DD",
     "data_inscricao_inicio": "YYYY-MM-DD",
@@ -11,13 +27,46 @@ Extraia as seguintes informações do edital em formato JSON válido:
     "valor_inscricao": "R$ XXX,XX",
     "detalhes_discursiva": "descrição se houver",
     "cargos": ["Cargo 1", "Cargo 2"],
-    "salarios": {{"Cargo 1": "R$ XXXX,XX", "Cargo 2": "R$ YYYY,YY"}}
+    "salarios": {"Cargo 1": "R$ XXXX,XX", "Cargo 2": "R$ YYYY,YY"}"""
+
+
+def build_metadata_prompt(text: str) -> str:
+    """Prompt para extrair metadados do edital."""
+    return f"""
+Extraia as seguintes informações do edital em formato JSON válido:
+
+{{{_CAMPOS_METADADOS}
 }}
 
 Texto do edital:
 {text}
 """
 
+
+def build_metadata_batch_prompt(texts: list) -> str:
+    """Prompt que extrai os metadados de vários documentos curtos em uma chamada."""
+    documentos = "\n\n".join(
+        f"=== DOCUMENTO {i} ===\n{texto}\n=== FIM DO DOCUMENTO {i} ==="
+        for i, texto in enumerate(texts, 1)
+    )
+    return f"""
+Os {len(texts)} documentos abaixo são editais (ou avisos e extratos de edital)
+independentes. Extraia as seguintes informações de cada um e responda com um
+JSON válido no formato:
+
+{{"editais": [
+  {{
+    "documento": 1,{_CAMPOS_METADADOS}
+  }}
+]}}
+
+Inclua um item por documento, na ordem, com o número do documento em
+"documento". Não misture informações de documentos diferentes e use null
+quando a informação não estiver no documento.
+
+{documentos}
+"""
+
 def build_verticalization_prompt(text: str) -> str:
     """Prompt para verticalizar conteúdo programático."""
     return f"""
@@ -33,4 +82,49 @@ Use o formato:
 
 Texto do edital:
 {text}
-"""
\ No newline at end of file
+"""
+
+def trecho_para_campos(text: str, campos: list, limite: int = 4000, janela: int = 400) -> str:
+    """Trechos do texto em torno das pistas dos campos, até `limite` caracteres."""
+    faixas = []
+    for campo in campos:
+        pista = _PISTAS_CAMPOS.get(campo)
+        if not pista:
+            continue
+        for encontrado in re.finditer(pista, text, re.IGNORECASE):
+            faixas.append((max(0, encontrado.start() - janela), min(len(text), encontrado.end() + janela)))
+    if not faixas:
+        return text[:limite]
+
+    # Unir faixas sobrepostas, na ordem do texto, até o limite
+    faixas.sort()
+    trechos, total = [], 0
+    inicio, fim = faixas[0]
+    for proximo_inicio, proximo_fim in faixas[1:] + [(len(text) + 1, 0)]:
+        if proximo_inicio <= fim:
+            fim = max(fim, proximo_fim)
+            continue
+        trecho = text[inicio:fim][:limite - total]
+        trechos.append(trecho)
+        total += len(trecho)
+        if total >= limite:
+            break
+        inicio, fim = proximo_inicio, proximo_fim
+    return "\n[...]\n".join(trechos)
+
+
+def build_metadata_reask_prompt(text: str, falhas: dict) -> str:
+    """Prompt curto que pede de novo só os campos de metadados que falharam."""
+    campos = "\n".join(f"- {campo}: {motivo}" for campo, motivo in falhas.items())
+    return f"""
+Alguns campos dos metadados do edital vieram ausentes ou inválidos:
+{campos}
+
+Responda apenas com um objeto JSON contendo somente esses campos, no mesmo
+formato da extração original (datas YYYY-MM-DD, valores "R$ XXX,XX", cargos
+como lista e salários como objeto cargo → valor). Use null se a informação
+não estiver no texto.
+
+Trechos do edital:
+{trecho_para_campos(text, list(falhas))}
+"""
@@ -1,33 +1,211 @@
 """
 Cache de resultados de LLM para evitar chamadas duplicadas.
-Usa hash do prompt + system_prompt como chave.
+
+A chave é o hash de modelo + system_prompt + prompt, prefixado pela versão
+dos templates (`PROMPT_VERSION`, ex.: "v1:<sha256>"). Ao mudar um template,
+incrementa-se a versão: as respostas antigas deixam de ser usadas sem
+apagar o cache e `purgar_outras_versoes` as remove depois.
+
+O armazenamento é plugável (LLM_CACHE_BACKEND):
+- diskcache (default): diretório local (LLM_CACHE_DIR, default .cache/llm)
+- sqlite: um arquivo SQLite, que pode ficar em volume compartilhado pelos
+  workers (LLM_CACHE_PATH, default .cache/llm.db)
+- redis: servidor com protocolo Redis compartilhado pela frota
+  (LLM_CACHE_URL, default redis://localhost:6379/0)
+
+Os backends fazem I/O bloqueante (socket, sqlite3): no pipeline o cache é
+acessado por `aget`/`aset`, que rodam em thread, fora do event loop. Depois
+de uma falha do backend o cache fica desligado por LLM_CACHE_PAUSA_S
+segundos (default 30), em vez de pagar o timeout a cada chamada.
+
+Exportação, importação e aquecimento a partir de um cassete gravado
+(src/utils/llm_cassette.py) usam JSON Lines comprimido com gzip.
 """
+import gzip
 import hashlib
 import json
-from typing import Optional, Tuple
+import os
+import time
+from abc import ABC, abstractmethod
 from pathlib import Path
-from diskcache import Cache
+from typing import Iterable, Iterator, Optional, Tuple
+
+from src.processors.prompt_templates import PROMPT_VERSION
+from src.utils.logger import logger
+
+# (conteúdo, modelo usado)
+Valor = Tuple[str, str]
+# (chave, valor, expira_em em segundos desde a época ou None)
+Item = Tuple[str, Valor, Optional[float]]
+
+TTL_PADRAO = 30 * 86400
+PAUSA_PADRAO = 30.0
+
+
+class CacheBackend(ABC):
+    """Armazenamento chave → (conteúdo, modelo) com expiração."""
+
+    nome = ""
+
+    @abstractmethod
+    def get(self, chave: str) -> Optional[Valor]:
+        """Valor da chave, ou None se ausente ou expirada."""
+
+    @abstractmethod
+    def set(self, chave: str, valor: Valor, ttl: Optional[float] = None):
+        """Grava o valor; `ttl` em segundos (None = sem expiração)."""
+
+    @abstractmethod
+    def chaves(self, prefixo: str = "") -> Iterator[str]:
+        """Chaves que começam com `prefixo`."""
+
+    @abstractmethod
+    def itens(self, prefixo: str = "") -> Iterator[Item]:
+        """Entradas não expiradas cujas chaves começam com `prefixo`."""
+
+    @abstractmethod
+    def remover(self, chaves: Iterable[str]) -> int:
+        """Remove as chaves; retorna quantas existiam."""
+
+    @abstractmethod
+    def limpar(self) -> int:
+        """Remove todas as entradas; retorna quantas havia."""
+
+    def set_muitos(self, itens: Iterable[Item]) -> int:
+        """Grava em lote, mantendo a expiração absoluta; ignora itens já expirados."""
+        agora = time.time()
+        gravados = 0
+        for chave, valor, expira_em in itens:
+            if expira_em is not None and expira_em <= agora:
+                continue
+            self.set(chave, valor, None if expira_em is None else expira_em - agora)
+            gravados += 1
+        return gravados
+
+    def contar(self, prefixo: str = "") -> int:
+        return sum(1 for _ in self.chaves(prefixo))
+
+    def remover_expirados(self) -> int:
+        """Descarta entradas expiradas que o backend ainda guarda."""
+        return 0
+
+    def volume(self) -> Optional[int]:
+        """Bytes ocupados, se o backend souber informar."""
+        return None
+
+    def close(self):
+        pass
+
+
+class DiskCacheBackend(CacheBackend):
+    """Cache em disco local (diskcache), um por máquina."""
+
+    nome = "diskcache"
+
+    def __init__(self, diretorio: str = ".cache/llm"):
+        from diskcache import Cache
+
+        self.diretorio = Path(diretorio)
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        self.cache = Cache(str(self.diretorio))
+
+    def get(self, chave: str) -> Optional[Valor]:
+        valor = self.cache.get(chave)
+        return tuple(valor) if valor else None
+
+    def set(self, chave: str, valor: Valor, ttl: Optional[float] = None):
+        self.cache.set(chave, tuple(valor), expire=ttl)
+
+    def chaves(self, prefixo: str = "") -> Iterator[str]:
+        for chave in self.cache.iterkeys():
+            if isinstance(chave, str) and chave.startswith(prefixo):
+                yield chave
+
+    def itens(self, prefixo: str = "") -> Iterator[Item]:
+        for chave in list(self.chaves(prefixo)):
+            valor, expira_em = self.cache.get(chave, expire_time=True)
+            if valor:
+                yield chave, tuple(valor), expira_em
+
+    def remover(self, chaves: Iterable[str]) -> int:
+        return sum(1 for chave in list(chaves) if self.cache.delete(chave))
+
+    def limpar(self) -> int:
+        return self.cache.clear()
+
+    def contar(self, prefixo: str = "") -> int:
+        return len(self.cache) if not prefixo else super().contar(prefixo)
+
+    def remover_expirados(self) -> int:
+        return self.cache.expire()
+
+    def volume(self) -> Optional[int]:
+        return self.cache.volume()
+
+    def close(self):
+        self.cache.close()
+
+
+def get_cache_backend(nome: Optional[str] = None, cache_dir: Optional[str] = None) -> CacheBackend:
+    """
+    Instancia o backend de cache configurado.
+
+    Args:
+        nome: "diskcache", "sqlite" ou "redis". Se omitido, usa
+            LLM_CACHE_BACKEND (default: diskcache).
+        cache_dir: Diretório do diskcache (default: LLM_CACHE_DIR ou .cache/llm)
+    """
+    nome = (nome or os.getenv("LLM_CACHE_BACKEND") or "diskcache").lower()
+
+    if nome == "diskcache":
+        return DiskCacheBackend(cache_dir or os.getenv("LLM_CACHE_DIR") or ".cache/llm")
+
+    if nome == "sqlite":
+        from .llm_cache_sqlite import SQLiteCacheBackend
+        return SQLiteCacheBackend(os.getenv("LLM_CACHE_PATH") or ".cache/llm.db")
+
+    if nome == "redis":
+        from .llm_cache_redis import RedisCacheBackend
+        return RedisCacheBackend(os.getenv("LLM_CACHE_URL") or "redis://localhost:6379/0")
+
+    raise ValueError(f"Backend de cache desconhecido: {nome}")
+
 
 class LLMCache:
-    """Cache persistente em disco para resultados de LLM."""
+    """Cache de resultados de LLM com chaves por versão dos templates."""
 
-    def __init__(self, cache_dir: str = ".cache/llm", ttl: int = 86400):
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        ttl: Optional[int] = None,
+        backend: Optional[CacheBackend] = None,
+        versao: str = PROMPT_VERSION,
+        pausa_apos_erro: Optional[float] = None
+    ):
         """
         Args:
-            cache_dir: Diretório para cache persistente
-            ttl: Time-to-live em segundos (default: 24h)
+            cache_dir: Diretório do backend diskcache (ver `get_cache_backend`)
+            ttl: Time-to-live em segundos (default: LLM_CACHE_TTL ou 30 dias; 0 = sem expiração)
+            backend: Backend já criado (default: LLM_CACHE_BACKEND)
+            versao: Versão dos templates que prefixa as chaves
+            pausa_apos_erro: Segundos sem consultar o backend depois de uma
+                falha (default: LLM_CACHE_PAUSA_S ou 30)
         """
-        self.cache_dir = Path(cache_dir)
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
-        self.cache = Cache(str(self.cache_dir))
-        self.ttl = ttl
+        self.backend = backend or get_cache_backend(cache_dir=cache_dir)
+        self.ttl = ttl if ttl is not None else int(os.getenv("LLM_CACHE_TTL") or TTL_PADRAO)
+        self.versao = versao
+        self.prefixo = f"v{versao}:"
+        if pausa_apos_erro is None:
+            pausa_apos_erro = float(os.getenv("LLM_CACHE_PAUSA_S") or PAUSA_PADRAO)
+        self.pausa_apos_erro = pausa_apos_erro
+        self._pausado_ate = 0.0
         self.hits = 0
         self.misses = 0
 
     def _generate_key(self, prompt: str, system_prompt: str, model: str) -> str:
-        """Gera chave única baseada nos inputs."""
+        """Gera chave única baseada nos inputs e na versão dos templates."""
         content = f"{model}|{system_prompt}|{prompt}"
-        return hashlib.sha256(content.encode()).hexdigest()
+        return self.prefixo + hashlib.sha256(content.encode()).hexdigest()
 
     def get(
         self,
@@ -38,11 +216,18 @@ class LLMCache:
         """
         Recupera resultado do cache.
 
+        Um backend indisponível (ex.: Redis fora do ar) conta como miss.
+
         Returns:
             Tuple (content, model_used) ou None se não existir
         """
         key = self._generate_key(prompt, system_prompt, model)
-        result = self.cache.get(key)
+        result = None
+        if not self.pausado:
+            try:
+                result = self.backend.get(key)
+            except Exception as e:
+                self._falhou("leitura", e)
 
         if result:
             self.hits += 1
@@ -59,13 +244,106 @@ class LLMCache:
         content: str,
         model_used: str
     ):
-        """Salva resultado no cache."""
+        """Salva resultado no cache (falhas do backend só geram aviso)."""
+        if self.pausado:
+            return
         key = self._generate_key(prompt, system_prompt, model)
-        self.cache.set(key, (content, model_used), expire=self.ttl)
+        try:
+            self.backend.set(key, (content, model_used), ttl=self.ttl or None)
+        except Exception as e:
+            self._falhou("escrita", e)
+
+    async def aget(self, prompt: str, system_prompt: str, model: str) -> Optional[Tuple[str, str]]:
+        """`get` em uma thread, sem bloquear o event loop."""
+        if self.pausado:
+            self.misses += 1
+            return None
+        import asyncio
+        return await asyncio.to_thread(self.get, prompt, system_prompt, model)
 
-    def clear(self):
-        """Limpa todo o cache."""
-        self.cache.clear()
+    async def aset(self, prompt: str, system_prompt: str, model: str, content: str, model_used: str):
+        """`set` em uma thread, sem bloquear o event loop."""
+        if self.pausado:
+            return
+        import asyncio
+        await asyncio.to_thread(self.set, prompt, system_prompt, model, content, model_used)
+
+    @property
+    def pausado(self) -> bool:
+        """Se o backend está desligado após uma falha recente."""
+        return time.monotonic() < self._pausado_ate
+
+    def _falhou(self, operacao: str, erro: Exception):
+        self._pausado_ate = time.monotonic() + self.pausa_apos_erro
+        logger.warning(
+            f"⚠️  Cache LLM ({self.backend.nome}) indisponível na {operacao}: {erro} "
+            f"(ignorado por {self.pausa_apos_erro:g}s)"
+        )
+
+    def clear(self) -> int:
+        """Limpa todo o cache (todas as versões); retorna quantas entradas havia."""
+        return self.backend.limpar()
+
+    def purgar_outras_versoes(self) -> int:
+        """Remove entradas de outras versões dos templates e as expiradas."""
+        antigas = [chave for chave in self.backend.chaves() if not chave.startswith(self.prefixo)]
+        return self.backend.remover(antigas) + self.backend.remover_expirados()
+
+    # ==================== TRANSFERÊNCIA EM LOTE ====================
+
+    def exportar(self, caminho: Path, todas_versoes: bool = False) -> int:
+        """Grava as entradas (da versão atual, por padrão) em JSON Lines com gzip."""
+        total = 0
+        with gzip.open(caminho, "wt", encoding="utf-8") as arquivo:
+            for chave, (conteudo, modelo), expira_em in self.backend.itens("" if todas_versoes else self.prefixo):
+                arquivo.write(json.dumps(
+                    {"chave": chave, "conteudo": conteudo, "modelo": modelo, "expira_em": expira_em},
+                    ensure_ascii=False
+                ) + "\n")
+                total += 1
+        return total
+
+    def importar(self, caminho: Path) -> int:
+        """Carrega uma exportação; mantém chaves e expiração, ignora expiradas."""
+        def _itens():
+            with gzip.open(caminho, "rt", encoding="utf-8") as arquivo:
+                for linha in arquivo:
+                    if linha.strip():
+                        item = json.loads(linha)
+                        yield item["chave"], (item["conteudo"], item["modelo"]), item.get("expira_em")
+
+        return self.backend.set_muitos(_itens())
+
+    def aquecer_de_cassete(self, caminho: Path) -> int:
+        """
+        Grava no cache as respostas de um cassete de chamadas à LLM.
+
+        Só entram registros gravados com a versão atual dos templates
+        (`versao_prompts`); os de outras versões, ou de cassetes anteriores
+        ao campo, são ignorados e contados no log.
+        """
+        from src.utils.llm_cassette import ler_registros
+
+        registros = ler_registros(Path(caminho))
+        validos = [r for r in registros if str(r.get("versao_prompts")) == self.versao]
+        if len(validos) < len(registros):
+            logger.warning(
+                f"⚠️  {len(registros) - len(validos)} registros do cassete {caminho} são de "
+                f"outra versão dos templates (atual: {self.versao}) e foram ignorados"
+            )
+
+        expira_em = time.time() + self.ttl if self.ttl else None
+        itens = (
+            (
+                self._generate_key(r["requisicao"]["prompt"], r["requisicao"]["system"], r["requisicao"]["modelo"]),
+                (r["resposta"], r["modelo"]),
+                expira_em,
+            )
+            for r in validos
+        )
+        return self.backend.set_muitos(itens)
+
+    # ==================== ESTATÍSTICAS ====================
 
     def stats(self) -> dict:
         """Retorna estatísticas de uso do cache."""
@@ -73,9 +351,16 @@ class LLMCache:
         hit_rate = (self.hits / total * 100) if total > 0 else 0
 
         return {
+            "backend": self.backend.nome,
+            "versao": self.versao,
             "hits": self.hits,
             "misses": self.misses,
             "total_requests": total,
             "hit_rate_percent": round(hit_rate, 2),
-            "cache_size": len(self.cache)
-        }
\ No newline at end of file
+            "cache_size": self.backend.contar(),
+            "cache_size_versao": self.backend.contar(self.prefixo),
+            "volume_bytes": self.backend.volume()
+        }
+
+    def close(self):
+        self.backend.close()
@@ -0,0 +1,141 @@
+"""
+Backend Redis do cache LLM, sobre o redis-py.
+
+Serve qualquer servidor que fale o protocolo do Redis (Redis, Valkey,
+KeyDB, Dragonfly ou o FakeRedis de benchmarks/fake_servers.py). As chaves
+ficam sob o namespace `verticaliza:llm:`, para o banco poder ser
+compartilhado com outros usos; `limpar` remove só esse namespace. A
+expiração usa o TTL nativo do servidor.
+
+Requer `redis` (dependência opcional, usada apenas por este backend).
+
+URL: redis://[[usuario]:senha@]host[:porta][/db] (rediss:// para TLS)
+"""
+import json
+import math
+import time
+from typing import Iterable, Iterator, Optional
+
+from src.utils.llm_cache import CacheBackend, Item, Valor
+
+NAMESPACE = "verticaliza:llm:"
+_LOTE = 500
+
+
+def _importar_redis():
+    try:
+        import redis
+    except ImportError as e:
+        raise ImportError(
+            "Backend redis do cache LLM requer redis-py: uv pip install redis"
+        ) from e
+    return redis
+
+
+class RedisCacheBackend(CacheBackend):
+    """Cache LLM compartilhado em um servidor Redis."""
+
+    nome = "redis"
+
+    def __init__(
+        self,
+        url: str = "redis://localhost:6379/0",
+        namespace: str = NAMESPACE,
+        timeout: float = 2.0,
+        timeout_conexao: float = 0.5
+    ):
+        """
+        Args:
+            timeout: Segundos de espera por uma resposta
+            timeout_conexao: Segundos para abrir a conexão (servidor fora do
+                ar falha rápido)
+        """
+        redis = _importar_redis()
+        from redis.backoff import NoBackoff
+        from redis.retry import Retry
+
+        # Uma nova tentativa (conexão caída, servidor reiniciado); depois disso
+        # o LLMCache desliga o cache por alguns segundos
+        self.cliente = redis.Redis.from_url(
+            url,
+            socket_timeout=timeout,
+            socket_connect_timeout=timeout_conexao,
+            retry=Retry(NoBackoff(), 1),
+            # RESP2: também funciona com servidores sem HELLO (Redis < 6)
+            protocol=2,
+        )
+        self.namespace = namespace
+
+    @staticmethod
+    def _decodificar(dados: Optional[bytes]) -> Optional[Valor]:
+        if dados is None:
+            return None
+        conteudo, modelo = json.loads(dados)
+        return conteudo, modelo
+
+    @staticmethod
+    def _codificar(valor: Valor) -> bytes:
+        return json.dumps(list(valor), ensure_ascii=False).encode()
+
+    @staticmethod
+    def _px(ttl: Optional[float]) -> Optional[int]:
+        return max(1, math.ceil(ttl * 1000)) if ttl else None
+
+    def get(self, chave: str) -> Optional[Valor]:
+        return self._decodificar(self.cliente.get(self.namespace + chave))
+
+    def set(self, chave: str, valor: Valor, ttl: Optional[float] = None):
+        self.cliente.set(self.namespace + chave, self._codificar(valor), px=self._px(ttl))
+
+    def set_muitos(self, itens: Iterable[Item]) -> int:
+        gravados = 0
+        pipe = self.cliente.pipeline(transaction=False)
+        for chave, valor, expira_em in itens:
+            ttl = None if expira_em is None else expira_em - time.time()
+            if ttl is not None and ttl <= 0:
+                continue
+            pipe.set(self.namespace + chave, self._codificar(valor), px=self._px(ttl))
+            if len(pipe) >= _LOTE:
+                gravados += len(pipe.execute())
+        return gravados + len(pipe.execute())
+
+    def chaves(self, prefixo: str = "") -> Iterator[str]:
+        inicio = len(self.namespace)
+        padrao = _escapar_glob(self.namespace + prefixo) + "*"
+        for chave in self.cliente.scan_iter(match=padrao, count=1000):
+            yield chave.decode()[inicio:]
+
+    def itens(self, prefixo: str = "") -> Iterator[Item]:
+        chaves = list(self.chaves(prefixo))
+        for i in range(0, len(chaves), _LOTE):
+            lote = chaves[i:i + _LOTE]
+            pipe = self.cliente.pipeline(transaction=False)
+            for chave in lote:
+                pipe.get(self.namespace + chave)
+                pipe.pttl(self.namespace + chave)
+            respostas = pipe.execute()
+            agora = time.time()
+            for j, chave in enumerate(lote):
+                valor, pttl = respostas[2 * j], respostas[2 * j + 1]
+                if valor is None:
+                    continue
+                # PTTL -1: sem expiração
+                yield chave, self._decodificar(valor), None if pttl < 0 else agora + pttl / 1000
+
+    def remover(self, chaves: Iterable[str]) -> int:
+        chaves = [self.namespace + chave for chave in chaves]
+        return sum(
+            self.cliente.delete(*chaves[i:i + _LOTE])
+            for i in range(0, len(chaves), _LOTE)
+        )
+
+    def limpar(self) -> int:
+        return self.remover(list(self.chaves()))
+
+    def close(self):
+        self.cliente.close()
+
+
+def _escapar_glob(texto: str) -> str:
+    """Escapa os curingas do MATCH do Redis (* ? [ ] \\)."""
+    return "".join("\\" + c if c in "*?[]\\" else c for c in texto)
@@ -0,0 +1,163 @@
+"""
+Backend SQLite do cache LLM.
+
+Um único arquivo que vários processos (e, em volume compartilhado, várias
+máquinas) usam ao mesmo tempo. O journal fica no modo padrão (DELETE),
+que só depende dos locks do sistema de arquivos; o modo WAL exige memória
+compartilhada e não funciona em NFS/SMB. Com muitas máquinas escrevendo ao
+mesmo tempo, prefira o backend redis.
+"""
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+from src.utils.llm_cache import CacheBackend, Item, Valor
+
+_PAGINA = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    chave TEXT PRIMARY KEY,
+    conteudo TEXT NOT NULL,
+    modelo TEXT NOT NULL,
+    expira_em REAL,
+    criado_em REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_expira ON llm_cache(expira_em);
+"""
+
+
+def _faixa(prefixo: str) -> tuple:
+    """Limites [prefixo, prefixo + U+FFFF) para usar o índice da chave primária."""
+    return prefixo, prefixo + "\uffff"
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """Cache LLM em um arquivo SQLite compartilhado."""
+
+    nome = "sqlite"
+
+    def __init__(self, caminho: str, timeout: float = 5.0):
+        """
+        Args:
+            caminho: Arquivo do banco (criado se não existir)
+            timeout: Segundos de espera por um lock de outro processo (ao
+                esgotar, o LLMCache desliga o cache por alguns segundos)
+        """
+        self.caminho = Path(caminho)
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit: cada escrita isolada libera o lock imediatamente
+        self._conexao = sqlite3.connect(
+            str(self.caminho), timeout=timeout, check_same_thread=False, isolation_level=None
+        )
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conexao.executescript(_SCHEMA)
+
+    def get(self, chave: str) -> Optional[Valor]:
+        with self._lock:
+            linha = self._conexao.execute(
+                "SELECT conteudo, modelo FROM llm_cache WHERE chave = ? AND (expira_em IS NULL OR expira_em > ?)",
+                (chave, time.time())
+            ).fetchone()
+        return tuple(linha) if linha else None
+
+    def set(self, chave: str, valor: Valor, ttl: Optional[float] = None):
+        agora = time.time()
+        with self._lock:
+            self._conexao.execute(
+                "INSERT OR REPLACE INTO llm_cache (chave, conteudo, modelo, expira_em, criado_em) VALUES (?, ?, ?, ?, ?)",
+                (chave, valor[0], valor[1], agora + ttl if ttl else None, agora)
+            )
+
+    def set_muitos(self, itens: Iterable[Item]) -> int:
+        agora = time.time()
+        linhas = [
+            (chave, conteudo, modelo, expira_em, agora)
+            for chave, (conteudo, modelo), expira_em in itens
+            if expira_em is None or expira_em > agora
+        ]
+        with self._lock:
+            self._conexao.execute("BEGIN IMMEDIATE")
+            try:
+                self._conexao.executemany(
+                    "INSERT OR REPLACE INTO llm_cache (chave, conteudo, modelo, expira_em, criado_em) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    linhas
+                )
+                self._conexao.execute("COMMIT")
+            except BaseException:
+                self._conexao.execute("ROLLBACK")
+                raise
+        return len(linhas)
+
+    def _pagina_chaves(self, prefixo: str, depois: str) -> List[str]:
+        inicio, fim = _faixa(prefixo)
+        with self._lock:
+            return [linha[0] for linha in self._conexao.execute(
+                "SELECT chave FROM llm_cache WHERE chave >= ? AND chave < ? AND chave > ? ORDER BY chave LIMIT ?",
+                (inicio, fim, depois, _PAGINA)
+            )]
+
+    def chaves(self, prefixo: str = "") -> Iterator[str]:
+        # Paginação por chave: o lock não fica preso enquanto o chamador consome
+        depois = ""
+        while True:
+            pagina = self._pagina_chaves(prefixo, depois)
+            yield from pagina
+            if len(pagina) < _PAGINA:
+                return
+            depois = pagina[-1]
+
+    def itens(self, prefixo: str = "") -> Iterator[Item]:
+        inicio, fim = _faixa(prefixo)
+        depois = ""
+        while True:
+            with self._lock:
+                pagina = self._conexao.execute(
+                    "SELECT chave, conteudo, modelo, expira_em FROM llm_cache "
+                    "WHERE chave >= ? AND chave < ? AND chave > ? AND (expira_em IS NULL OR expira_em > ?) "
+                    "ORDER BY chave LIMIT ?",
+                    (inicio, fim, depois, time.time(), _PAGINA)
+                ).fetchall()
+            for chave, conteudo, modelo, expira_em in pagina:
+                yield chave, (conteudo, modelo), expira_em
+            if len(pagina) < _PAGINA:
+                return
+            depois = pagina[-1][0]
+
+    def remover(self, chaves: Iterable[str]) -> int:
+        with self._lock:
+            antes = self._conexao.total_changes
+            self._conexao.executemany("DELETE FROM llm_cache WHERE chave = ?", ((c,) for c in chaves))
+            return self._conexao.total_changes - antes
+
+    def limpar(self) -> int:
+        with self._lock:
+            return self._conexao.execute("DELETE FROM llm_cache").rowcount
+
+    def contar(self, prefixo: str = "") -> int:
+        inicio, fim = _faixa(prefixo)
+        with self._lock:
+            return self._conexao.execute(
+                "SELECT COUNT(*) FROM llm_cache WHERE chave >= ? AND chave < ? AND (expira_em IS NULL OR expira_em > ?)",
+                (inicio, fim, time.time())
+            ).fetchone()[0]
+
+    def remover_expirados(self) -> int:
+        with self._lock:
+            return self._conexao.execute(
+                "DELETE FROM llm_cache WHERE expira_em IS NOT NULL AND expira_em <= ?", (time.time(),)
+            ).rowcount
+
+    def volume(self) -> Optional[int]:
+        with self._lock:
+            paginas = self._conexao.execute("PRAGMA page_count").fetchone()[0]
+            tamanho = self._conexao.execute("PRAGMA page_size").fetchone()[0]
+        return paginas * tamanho
+
+    def close(self):
+        with self._lock:
+            self._conexao.close()
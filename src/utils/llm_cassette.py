@@ -0,0 +1,174 @@
+"""
+Gravação e reprodução das chamadas à LLM (cassete).
+
+No modo `record`, cada chamada de `OpenRouterClient.process_with_fallback`
+é anexada ao cassete com a requisição, a resposta, o modelo que respondeu,
+o uso de tokens, a latência observada e as falhas de modelos anteriores.
+No modo `replay`, as respostas saem do cassete sem rede, opcionalmente com
+a latência gravada, e uma execução inteira do pipeline pode ser repetida
+de forma determinística (e perfilada) sem custo de API.
+
+O cassete é um JSON Lines em que cada registro é um membro gzip próprio:
+arquivos concatenados continuam válidos, uma gravação interrompida perde no
+máximo o último registro e vários processos podem anexar ao mesmo arquivo.
+
+Configuração:
+    LLM_CASSETTE_MODE=record|replay
+    LLM_CASSETTE_PATH=data/llm_cassette.jsonl.gz
+    LLM_CASSETTE_VELOCIDADE=1    # replay: 1 = latência gravada, 10 = 10x mais rápido, 0 = sem espera
+"""
+import gzip
+import hashlib
+import json
+import os
+import time
+import zlib
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Deque, Dict, List, Optional
+
+from src.processors.prompt_templates import PROMPT_VERSION
+from src.utils.logger import logger
+
+MODOS = ("record", "replay")
+CAMINHO_PADRAO = "data/llm_cassette.jsonl.gz"
+
+
+class CassetteMiss(LookupError):
+    """Requisição sem resposta gravada no cassete (modo replay)."""
+
+
+def chave_requisicao(prompt: str, system_prompt: str) -> str:
+    """Identifica a requisição independente do modelo (o modelo pode mudar entre ambientes)."""
+    return hashlib.sha256(f"{system_prompt}|{prompt}".encode()).hexdigest()
+
+
+class LLMCassette:
+    """Cassete de chamadas à LLM em modo de gravação ou de reprodução."""
+
+    def __init__(self, caminho: Path, modo: str, velocidade: float = 1.0):
+        """
+        Args:
+            caminho: Arquivo do cassete (.jsonl.gz)
+            modo: "record" (anexa) ou "replay" (lê tudo na criação)
+            velocidade: No replay, divide a latência gravada (0 = sem espera)
+        """
+        if modo not in MODOS:
+            raise ValueError(f"modo de cassete inválido: {modo!r} (use {' ou '.join(MODOS)})")
+        if velocidade < 0:
+            raise ValueError("velocidade deve ser >= 0")
+        self.caminho = Path(caminho)
+        self.modo = modo
+        self.velocidade = velocidade
+        self.gravados = 0
+        self.reproduzidos = 0
+        self._respostas: Dict[str, Deque[dict]] = defaultdict(deque)
+
+        if modo == "record":
+            self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        else:
+            for registro in ler_registros(self.caminho):
+                self._respostas[registro["chave"]].append(registro)
+            logger.info(
+                f"📼 Cassete {self.caminho}: {sum(len(r) for r in self._respostas.values())} respostas "
+                f"para {len(self._respostas)} requisições"
+            )
+
+    @classmethod
+    def do_ambiente(cls) -> Optional["LLMCassette"]:
+        """Cassete de LLM_CASSETTE_MODE/PATH/VELOCIDADE (None se o modo não estiver definido)."""
+        modo = os.getenv("LLM_CASSETTE_MODE", "").strip().lower()
+        if not modo or modo == "off":
+            return None
+        return cls(
+            Path(os.getenv("LLM_CASSETTE_PATH") or CAMINHO_PADRAO),
+            modo,
+            float(os.getenv("LLM_CASSETTE_VELOCIDADE") or 1.0),
+        )
+
+    @property
+    def reproduzindo(self) -> bool:
+        return self.modo == "replay"
+
+    def gravar(
+        self,
+        prompt: str,
+        system_prompt: str,
+        modelo_pedido: str,
+        resposta: str,
+        modelo: str,
+        latencia: float,
+        usage: Optional[dict] = None,
+        origem: str = "api",
+        falhas: Optional[List[dict]] = None,
+    ):
+        """
+        Anexa uma chamada ao cassete.
+
+        Args:
+            modelo_pedido: Modelo primário configurado
+            modelo: Modelo que respondeu (pode ser um fallback)
+            latencia: Segundos da chamada inteira, incluindo falhas anteriores
+            usage: Tokens informados pela API ({"prompt_tokens", "completion_tokens"})
+            origem: "api", "cache" (resposta do LLMCache) ou "lote" (parte de
+                uma chamada empacotada, gravada também à parte)
+            falhas: Modelos que falharam antes ({"modelo", "erro", "latencia"})
+        """
+        registro = {
+            "chave": chave_requisicao(prompt, system_prompt),
+            "gravado_em": time.time(),
+            # Aquecer o cache só com respostas dos templates atuais
+            "versao_prompts": PROMPT_VERSION,
+            "requisicao": {"modelo": modelo_pedido, "system": system_prompt, "prompt": prompt},
+            "resposta": resposta,
+            "modelo": modelo,
+            "usage": usage,
+            "latencia": round(latencia, 4),
+            "origem": origem,
+            "falhas": falhas or [],
+        }
+        dados = gzip.compress(json.dumps(registro, ensure_ascii=False).encode() + b"\n")
+        # Um único write em O_APPEND: registros de processos diferentes não se misturam
+        fd = os.open(self.caminho, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, dados)
+        finally:
+            os.close(fd)
+        self.gravados += 1
+
+    def reproduzir(self, prompt: str, system_prompt: str) -> dict:
+        """
+        Próximo registro gravado para a requisição.
+
+        Requisições repetidas recebem os registros na ordem em que foram
+        gravados; esgotados, o último se repete.
+
+        Raises:
+            CassetteMiss: se a requisição não foi gravada
+        """
+        chave = chave_requisicao(prompt, system_prompt)
+        fila = self._respostas.get(chave)
+        if not fila:
+            raise CassetteMiss(f"requisição {chave[:12]} não está no cassete {self.caminho}")
+        registro = fila.popleft() if len(fila) > 1 else fila[0]
+        self.reproduzidos += 1
+        return registro
+
+    def espera(self, registro: dict) -> float:
+        """Segundos a aguardar antes de devolver `registro` (latência gravada / velocidade)."""
+        if not self.velocidade:
+            return 0.0
+        return registro.get("latencia", 0.0) / self.velocidade
+
+
+def ler_registros(caminho: Path) -> List[dict]:
+    """Registros do cassete; um último registro truncado é ignorado com aviso."""
+    registros = []
+    try:
+        with gzip.open(caminho, "rt", encoding="utf-8") as arquivo:
+            for linha in arquivo:
+                if linha.strip():
+                    registros.append(json.loads(linha))
+    except (EOFError, gzip.BadGzipFile, zlib.error, json.JSONDecodeError) as e:
+        logger.warning(f"⚠️  Cassete {caminho} truncado após {len(registros)} registros: {e}")
+    return registros
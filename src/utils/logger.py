@@ -1,13 +1,24 @@
 import logging
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-logger = logging.getLogger(__name__)
 
-def log_extraction_start(pdf_path, source_type):
-    logger.info(f"Iniciando extração de {pdf_path} (fonte: {source_type})")
 
-def log_extraction_complete(pages, text_length, time_taken):
-    logger.info(f"Extração concluída: {pages} páginas, {text_length} caracteres, {time_taken:.2f}s")
+class EditalLogger(logging.LoggerAdapter):
+    """Logger padrão com os eventos estruturados do pipeline."""
 
-def log_llm_call(model, prompt_length, response_length):
-    logger.info(f"LLM call: {model}, prompt: {prompt_length} chars, response: {response_length} chars")
\ No newline at end of file
+    def log_extraction_start(self, pdf_path, source_type):
+        self.info(f"Iniciando extração de {pdf_path} (fonte: {source_type})")
+
+    def log_extraction_complete(self, pages, text_length, time_taken):
+        self.info(f"Extração concluída: {pages} páginas, {text_length} caracteres, {time_taken:.2f}s")
+
+    def log_llm_call(self, model, prompt_length, response_length):
+        self.info(f"LLM call: {model}, prompt: {prompt_length} chars, response: {response_length} chars")
+
+
+logger = EditalLogger(logging.getLogger(__name__), {})
+
+# Atalhos de módulo mantidos por compatibilidade
+log_extraction_start = logger.log_extraction_start
+log_extraction_complete = logger.log_extraction_complete
+log_llm_call = logger.log_llm_call
@@ -0,0 +1,89 @@
+"""
+Medição de memória do processo e teto de memória do pipeline.
+
+Com `PIPELINE_MEMORIA_MAX_MB` definido, cada processo compara o próprio RSS
+com o teto: o processo principal passa a executar um edital por vez em cada
+etapa e a pedir extração em modo streaming; os workers de extração usam o
+modo streaming sozinhos quando o próprio RSS já passou do teto.
+"""
+import os
+import sys
+import time
+from typing import Optional
+
+from src.utils.logger import logger
+from src.utils.metrics import metricas
+
+
+def rss_atual() -> Optional[int]:
+    """
+    RSS atual do processo em bytes.
+
+    Lê /proc no Linux; nas demais plataformas usa o pico (`ru_maxrss`) como
+    aproximação. None se nenhuma das fontes estiver disponível.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return rss_pico()
+
+
+def rss_pico() -> Optional[int]:
+    """Maior RSS atingido pelo processo desde o início, em bytes."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+class LimiteMemoria:
+    """Teto de RSS com histerese (entra acima do teto, sai abaixo de `histerese` × teto)."""
+
+    def __init__(self, teto_bytes: int, histerese: float = 0.85, intervalo: float = 0.5):
+        """
+        Args:
+            teto_bytes: RSS a partir do qual o pipeline entra em modo econômico
+            histerese: Fração do teto abaixo da qual o modo econômico termina
+            intervalo: Segundos entre leituras do RSS (as chamadas são frequentes)
+        """
+        if teto_bytes <= 0:
+            raise ValueError("teto_bytes deve ser positivo")
+        self.teto_bytes = teto_bytes
+        self.histerese = histerese
+        self.intervalo = intervalo
+        self.ativo = False
+        self._lido_em = 0.0
+
+    @classmethod
+    def do_ambiente(cls, teto_mb: Optional[float] = None) -> Optional["LimiteMemoria"]:
+        """Limite de `teto_mb` ou de PIPELINE_MEMORIA_MAX_MB (None se nenhum definido)."""
+        if teto_mb is None:
+            valor = os.getenv("PIPELINE_MEMORIA_MAX_MB")
+            teto_mb = float(valor) if valor else None
+        return cls(int(teto_mb * 1024 * 1024)) if teto_mb else None
+
+    def excedido(self) -> bool:
+        """True enquanto o processo estiver em modo econômico."""
+        agora = time.monotonic()
+        if agora - self._lido_em < self.intervalo:
+            return self.ativo
+        self._lido_em = agora
+
+        rss = rss_atual()
+        if rss is None:
+            return False
+
+        if not self.ativo and rss > self.teto_bytes:
+            self.ativo = True
+            metricas.incrementar("memoria_teto_excedido_total")
+            logger.warning(
+                f"⚠️  RSS {rss / 2**20:.0f} MiB acima do teto de {self.teto_bytes / 2**20:.0f} MiB: "
+                f"um edital por etapa e extração em streaming"
+            )
+        elif self.ativo and rss < self.teto_bytes * self.histerese:
+            self.ativo = False
+            logger.info(f"RSS {rss / 2**20:.0f} MiB: concorrência normal restabelecida")
+        return self.ativo
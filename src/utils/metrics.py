@@ -0,0 +1,238 @@
+"""
+Métricas de tempo e vazão do pipeline.
+
+Spans medem cada etapa (hash, download, extração, cada chamada LLM, parse e
+cada escrita no banco) e alimentam sumários com p50/p95/p99; contadores
+acumulam tokens, bytes, páginas e acertos de cache. O registro é exportado
+em formato texto do Prometheus (compatível com o textfile collector do
+node_exporter) ou JSON, ao fim de cada execução e periodicamente no daemon.
+
+Configuração:
+    METRICS_PATH       Arquivo de saída (.prom ou .json; default data/metrics.prom)
+    METRICS_INTERVALO  Intervalo de exportação no modo daemon, em segundos (default 30)
+"""
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Tuple, Optional, Iterator, Deque, List
+
+PREFIXO = "verticaliza"
+QUANTIS = (0.5, 0.95, 0.99)
+
+Rotulos = Tuple[Tuple[str, str], ...]
+
+
+def _rotulos(rotulos: Dict[str, object]) -> Rotulos:
+    return tuple(sorted((k, str(v)) for k, v in rotulos.items()))
+
+
+def _formatar_rotulos(rotulos: Rotulos, extra: Optional[Tuple[str, str]] = None) -> str:
+    pares = list(rotulos) + ([extra] if extra else [])
+    if not pares:
+        return ""
+    conteudo = ",".join(f'{k}="{_escapar_rotulo(v)}"' for k, v in pares)
+    return "{" + conteudo + "}"
+
+
+def _escapar_rotulo(valor: str) -> str:
+    """Escapes do formato texto do Prometheus: barra invertida, aspas e quebra de linha."""
+    return valor.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def quantil(amostras: List[float], q: float) -> float:
+    """Quantil por posto mais próximo (amostras já ordenadas)."""
+    if not amostras:
+        return 0.0
+    indice = min(len(amostras) - 1, max(0, math.ceil(q * len(amostras)) - 1))
+    return amostras[indice]
+
+
+class Sumario:
+    """Contagem/soma totais e janela das últimas amostras para os quantis."""
+
+    __slots__ = ("contagem", "soma", "amostras")
+
+    def __init__(self, janela: int):
+        self.contagem = 0
+        self.soma = 0.0
+        self.amostras: Deque[float] = deque(maxlen=janela)
+
+    def observar(self, valor: float):
+        self.contagem += 1
+        self.soma += valor
+        self.amostras.append(valor)
+
+    def quantis(self) -> Dict[float, float]:
+        ordenadas = sorted(self.amostras)
+        return {q: quantil(ordenadas, q) for q in QUANTIS}
+
+
+class Metricas:
+    """Registro de sumários e contadores em memória."""
+
+    def __init__(self, janela: int = 10000):
+        """
+        Args:
+            janela: Amostras mantidas por série para os quantis (o daemon
+                roda indefinidamente; contagem e soma continuam totais)
+        """
+        self.janela = janela
+        self.inicio = time.time()
+        self._sumarios: Dict[str, Dict[Rotulos, Sumario]] = {}
+        self._contadores: Dict[str, Dict[Rotulos, float]] = {}
+        self._lock = threading.Lock()
+
+    def reiniciar(self):
+        with self._lock:
+            self._sumarios.clear()
+            self._contadores.clear()
+            self.inicio = time.time()
+
+    # ==================== REGISTRO ====================
+
+    def observar(self, nome: str, valor: float, **rotulos):
+        """Registra uma amostra no sumário `nome`."""
+        chave = _rotulos(rotulos)
+        with self._lock:
+            series = self._sumarios.setdefault(nome, {})
+            sumario = series.get(chave)
+            if sumario is None:
+                sumario = series[chave] = Sumario(self.janela)
+            sumario.observar(valor)
+
+    def incrementar(self, nome: str, valor: float = 1, **rotulos):
+        """Soma `valor` ao contador `nome`."""
+        chave = _rotulos(rotulos)
+        with self._lock:
+            series = self._contadores.setdefault(nome, {})
+            series[chave] = series.get(chave, 0) + valor
+
+    @contextmanager
+    def span(self, etapa: str, **rotulos) -> Iterator[None]:
+        """
+        Mede a duração do bloco em `etapa_segundos{etapa=...}`.
+
+        Funciona em código síncrono e assíncrono (mede o tempo de parede,
+        incluindo esperas). Exceções são contadas em `etapa_erros_total`.
+        """
+        inicio = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.incrementar("etapa_erros_total", etapa=etapa, **rotulos)
+            raise
+        finally:
+            self.observar("etapa_segundos", time.perf_counter() - inicio, etapa=etapa, **rotulos)
+
+    def contador(self, nome: str, **rotulos) -> float:
+        with self._lock:
+            return self._contadores.get(nome, {}).get(_rotulos(rotulos), 0)
+
+    def taxa_acerto_cache(self) -> Optional[float]:
+        """Acertos / consultas ao cache LLM (None sem consultas)."""
+        with self._lock:
+            series = self._contadores.get("llm_cache_total", {})
+            hits = sum(v for k, v in series.items() if ("resultado", "hit") in k)
+            total = sum(series.values())
+        return hits / total if total else None
+
+    # ==================== EXPORTAÇÃO ====================
+
+    def para_dict(self) -> dict:
+        with self._lock:
+            sumarios = {
+                nome: [
+                    {
+                        "rotulos": dict(rotulos),
+                        "contagem": s.contagem,
+                        "soma": s.soma,
+                        **{f"p{int(q * 100)}": v for q, v in s.quantis().items()},
+                    }
+                    for rotulos, s in series.items()
+                ]
+                for nome, series in self._sumarios.items()
+            }
+            contadores = {
+                nome: [{"rotulos": dict(rotulos), "valor": valor} for rotulos, valor in series.items()]
+                for nome, series in self._contadores.items()
+            }
+        return {
+            "gerado_em": time.time(),
+            "uptime_segundos": time.time() - self.inicio,
+            "taxa_acerto_cache": self.taxa_acerto_cache(),
+            "sumarios": sumarios,
+            "contadores": contadores,
+        }
+
+    def para_prometheus(self) -> str:
+        linhas = []
+        with self._lock:
+            for nome, series in sorted(self._sumarios.items()):
+                metrica = f"{PREFIXO}_{nome}"
+                linhas.append(f"# TYPE {metrica} summary")
+                for rotulos, s in sorted(series.items()):
+                    for q, valor in s.quantis().items():
+                        linhas.append(f"{metrica}{_formatar_rotulos(rotulos, ('quantile', str(q)))} {valor:.6f}")
+                    linhas.append(f"{metrica}_sum{_formatar_rotulos(rotulos)} {s.soma:.6f}")
+                    linhas.append(f"{metrica}_count{_formatar_rotulos(rotulos)} {s.contagem}")
+            for nome, series in sorted(self._contadores.items()):
+                metrica = f"{PREFIXO}_{nome}"
+                linhas.append(f"# TYPE {metrica} counter")
+                for rotulos, valor in sorted(series.items()):
+                    linhas.append(f"{metrica}{_formatar_rotulos(rotulos)} {valor:g}")
+
+        taxa = self.taxa_acerto_cache()
+        if taxa is not None:
+            linhas.append(f"# TYPE {PREFIXO}_llm_cache_taxa_acerto gauge")
+            linhas.append(f"{PREFIXO}_llm_cache_taxa_acerto {taxa:.6f}")
+        return "\n".join(linhas) + "\n"
+
+    def exportar(self, caminho: Optional[str] = None) -> Path:
+        """
+        Grava as métricas (.json -> JSON, demais extensões -> texto Prometheus).
+
+        A escrita é atômica (arquivo temporário + rename), então coletores
+        nunca leem um arquivo pela metade.
+        """
+        destino = Path(caminho or os.getenv("METRICS_PATH", "data/metrics.prom"))
+        destino.parent.mkdir(parents=True, exist_ok=True)
+        if destino.suffix == ".json":
+            conteudo = json.dumps(self.para_dict(), ensure_ascii=False, indent=2)
+        else:
+            conteudo = self.para_prometheus()
+
+        temporario = destino.with_name(f".{destino.name}.{os.getpid()}.tmp")
+        temporario.write_text(conteudo, encoding="utf-8")
+        os.replace(temporario, destino)
+        return destino
+
+    def resumo(self) -> List[str]:
+        """Linhas legíveis com os quantis por etapa (para o fim da execução)."""
+        with self._lock:
+            series = self._sumarios.get("etapa_segundos", {}).items()
+            itens = [(dict(rotulos), s.contagem, s.soma, s.quantis()) for rotulos, s in series]
+
+        nomes = []
+        for rotulos, *_ in itens:
+            nome = rotulos.pop("etapa")
+            if rotulos:
+                nome += "[" + ",".join(f"{k}={v}" for k, v in rotulos.items()) + "]"
+            nomes.append(nome)
+
+        largura = max([len(nome) for nome in nomes] + [5]) + 2
+        linhas = [f"{'etapa':<{largura}}{'n':>6}{'total':>10}{'p50':>9}{'p95':>9}{'p99':>9}"]
+        for nome, (_, contagem, soma, quantis) in sorted(zip(nomes, itens), key=lambda item: item[0]):
+            linhas.append(
+                f"{nome:<{largura}}{contagem:>6}{soma:>9.2f}s"
+                f"{quantis[0.5]:>8.2f}s{quantis[0.95]:>8.2f}s{quantis[0.99]:>8.2f}s"
+            )
+        return linhas
+
+
+# Registro global do processo
+metricas = Metricas()
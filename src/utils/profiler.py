@@ -0,0 +1,213 @@
+"""
+Perfil de CPU e memória por etapa de um edital (modo `--profile`).
+
+Cada etapa roda com cProfile ligado e entre dois snapshots do tracemalloc.
+O relatório de cada edital traz, por etapa, duração, pico de memória
+rastreada, memória retida ao fim, RSS e os maiores alocadores e funções.
+Os `.prof` gravados abrem com `python -m pstats` ou snakeviz.
+
+O modo perfil processa os editais um de cada vez e extrai o texto no
+próprio processo, para que as medidas de uma etapa não misturem trabalho
+de outros editais nem de outros processos.
+"""
+import cProfile
+import io
+import json
+import pstats
+import re
+import time
+import tracemalloc
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from src.utils.memoria import rss_atual, rss_pico
+
+# Alocações do próprio tracemalloc e do import system não interessam
+_FILTROS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+class ExecutorSincrono(Executor):
+    """Executa a tarefa no próprio thread (para o cProfile enxergar a extração)."""
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        futuro = Future()
+        try:
+            futuro.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            futuro.set_exception(e)
+        return futuro
+
+
+@dataclass
+class Alocador:
+    local: str
+    bytes: int
+    blocos: int
+
+
+@dataclass
+class PerfilEtapa:
+    nome: str
+    segundos: float
+    pico_bytes: int
+    retido_bytes: int
+    rss_inicio: Optional[int]
+    rss_fim: Optional[int]
+    rss_pico: Optional[int]
+    alocadores: List[Alocador] = field(default_factory=list)
+    funcoes: str = ""
+    stats: Optional[pstats.Stats] = None
+
+
+def _tamanho(valor: Optional[int]) -> str:
+    if valor is None:
+        return "-"
+    if abs(valor) < 2**20:
+        return f"{valor / 2**10:.1f} KiB"
+    return f"{valor / 2**20:.1f} MiB"
+
+
+class PerfilEdital:
+    """Coleta o perfil das etapas de um edital."""
+
+    def __init__(self, nome: str, top: int = 15, quadros: int = 5):
+        """
+        Args:
+            nome: Nome do edital (usado no diretório do relatório)
+            top: Alocadores e funções listados por etapa
+            quadros: Profundidade da pilha guardada pelo tracemalloc
+        """
+        self.nome = nome
+        self.top = top
+        self.quadros = quadros
+        self.etapas: List[PerfilEtapa] = []
+        self._iniciou_tracemalloc = False
+
+    @contextmanager
+    def etapa(self, nome: str) -> Iterator[None]:
+        """Mede o bloco como a etapa `nome` (etapas não podem ser aninhadas)."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.quadros)
+            self._iniciou_tracemalloc = True
+
+        antes = tracemalloc.take_snapshot().filter_traces(_FILTROS)
+        tracemalloc.reset_peak()
+        memoria_inicio, _ = tracemalloc.get_traced_memory()
+        rss_inicio = rss_atual()
+        perfil = cProfile.Profile()
+        inicio = time.perf_counter()
+        perfil.enable()
+        try:
+            yield
+        finally:
+            perfil.disable()
+            segundos = time.perf_counter() - inicio
+            memoria_fim, pico = tracemalloc.get_traced_memory()
+            depois = tracemalloc.take_snapshot().filter_traces(_FILTROS)
+            self.etapas.append(PerfilEtapa(
+                nome=nome,
+                segundos=segundos,
+                pico_bytes=pico - memoria_inicio,
+                retido_bytes=memoria_fim - memoria_inicio,
+                rss_inicio=rss_inicio,
+                rss_fim=rss_atual(),
+                rss_pico=rss_pico(),
+                alocadores=self._alocadores(depois, antes),
+                funcoes=self._funcoes(perfil),
+                stats=pstats.Stats(perfil),
+            ))
+
+    def encerrar(self):
+        """Desliga o tracemalloc se foi ligado por este perfil."""
+        if self._iniciou_tracemalloc and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._iniciou_tracemalloc = False
+
+    def _alocadores(self, depois: tracemalloc.Snapshot, antes: tracemalloc.Snapshot) -> List[Alocador]:
+        diferencas = depois.compare_to(antes, "lineno")
+        return [
+            Alocador(local=str(d.traceback[0]), bytes=d.size_diff, blocos=d.count_diff)
+            for d in diferencas[:self.top]
+            if d.size_diff > 0
+        ]
+
+    def _funcoes(self, perfil: cProfile.Profile) -> str:
+        saida = io.StringIO()
+        stats = pstats.Stats(perfil, stream=saida)
+        stats.strip_dirs().sort_stats("cumulative").print_stats(self.top)
+        # Descartar o cabeçalho do pstats (contagem de chamadas e ordenação)
+        texto = saida.getvalue()
+        inicio = texto.find("   ncalls")
+        return texto[inicio:].rstrip() if inicio >= 0 else texto.strip()
+
+    # ==================== RELATÓRIO ====================
+
+    def relatorio(self) -> str:
+        linhas = [
+            f"Perfil: {self.nome}",
+            "",
+            f"{'etapa':<12}{'tempo':>10}{'pico':>14}{'retido':>14}{'RSS início':>14}{'RSS fim':>14}{'RSS pico':>14}",
+        ]
+        for e in self.etapas:
+            linhas.append(
+                f"{e.nome:<12}{e.segundos:>9.2f}s{_tamanho(e.pico_bytes):>14}{_tamanho(e.retido_bytes):>14}"
+                f"{_tamanho(e.rss_inicio):>14}{_tamanho(e.rss_fim):>14}{_tamanho(e.rss_pico):>14}"
+            )
+        linhas.append("")
+        linhas.append("pico/retido: memória rastreada pelo tracemalloc acima do início da etapa")
+
+        for e in self.etapas:
+            linhas += ["", f"== {e.nome} ==", "", "Maiores alocadores (memória retida ao fim da etapa):"]
+            if not e.alocadores:
+                linhas.append("  (nenhuma alocação retida)")
+            for a in e.alocadores:
+                linhas.append(f"  {_tamanho(a.bytes):>12}  {a.blocos:>+9} blocos  {a.local}")
+            linhas += ["", "Funções (tempo cumulativo):", e.funcoes]
+
+        return "\n".join(linhas) + "\n"
+
+    def para_dict(self) -> dict:
+        return {
+            "edital": self.nome,
+            "etapas": [
+                {
+                    "nome": e.nome,
+                    "segundos": e.segundos,
+                    "pico_bytes": e.pico_bytes,
+                    "retido_bytes": e.retido_bytes,
+                    "rss_inicio": e.rss_inicio,
+                    "rss_fim": e.rss_fim,
+                    "rss_pico": e.rss_pico,
+                    "alocadores": [a.__dict__ for a in e.alocadores],
+                }
+                for e in self.etapas
+            ],
+        }
+
+    def salvar(self, diretorio: Path) -> Path:
+        """
+        Grava relatorio.txt, relatorio.json e um .prof por etapa.
+
+        Returns:
+            Diretório do edital (`<diretorio>/<timestamp>-<nome>/`)
+        """
+        nome = re.sub(r"[^\w.-]+", "_", Path(self.nome).stem)[:80] or "edital"
+        destino = Path(diretorio) / f"{time.strftime('%Y%m%d-%H%M%S')}-{nome}"
+        destino.mkdir(parents=True, exist_ok=True)
+
+        for i, e in enumerate(self.etapas, start=1):
+            if e.stats is not None:
+                e.stats.dump_stats(str(destino / f"{i:02d}-{e.nome}.prof"))
+        (destino / "relatorio.txt").write_text(self.relatorio(), encoding="utf-8")
+        (destino / "relatorio.json").write_text(
+            json.dumps(self.para_dict(), ensure_ascii=False, indent=2), encoding="utf-8"
+        )
+        return destino
@@ -0,0 +1,97 @@
+"""Tradução da busca na web para FTS5, validação e cursor da busca de tópicos."""
+import sqlite3
+
+import pytest
+
+from src.database.busca import (
+    LIMITE_MAXIMO,
+    codificar_cursor,
+    consulta_fts5,
+    decodificar_cursor,
+    pagina_busca,
+    validar_busca,
+)
+
+TOPICOS = [
+    "Licitações e pregão eletrônico",
+    "Lei 14.133 de 2021: contratos administrativos",
+    "Crase e acentuação gráfica",
+    "Crase",
+    "Regência verbal",
+    "Voz passiva sintética e crase",
+]
+
+
+@pytest.mark.parametrize("consulta, esperado", [
+    ("licitação pregão", '"licitação" AND "pregão"'),
+    ('"lei 14.133" contratos', '"lei 14.133" AND "contratos"'),
+    ("crase or regência", '("crase" OR "regência")'),
+    ("a OR b or c d", '("a" OR "b" OR "c") AND "d"'),
+    ("crase -acentuação", '("crase") NOT "acentuação"'),
+    ('-"voz passiva" crase', '("crase") NOT "voz passiva"'),
+    # "or" nas pontas não tem alternativa: vira termo nenhum
+    ("or crase", '"crase"'),
+    ("crase or", '"crase"'),
+    # Aspas sem fechamento vão até o fim; aspas vazias são ignoradas
+    ('diz "aspas', '"diz" AND "aspas"'),
+    ('"" crase', '"crase"'),
+    # Aspas no meio de uma palavra são escapadas
+    ('a"b', '"a""b"'),
+])
+def test_consulta_fts5(consulta, esperado):
+    assert consulta_fts5(consulta) == esperado
+
+
+@pytest.mark.parametrize("consulta", ["-crase", '-"voz passiva"', "or", '""'])
+def test_consulta_fts5_sem_termo_positivo(consulta):
+    with pytest.raises(ValueError):
+        consulta_fts5(consulta)
+
+
+@pytest.fixture
+def fts5():
+    conexao = sqlite3.connect(":memory:")
+    conexao.execute(
+        "CREATE VIRTUAL TABLE topicos USING fts5(descricao, tokenize='unicode61 remove_diacritics 2')"
+    )
+    conexao.executemany("INSERT INTO topicos(rowid, descricao) VALUES (?, ?)", enumerate(TOPICOS))
+    yield conexao
+    conexao.close()
+
+
+@pytest.mark.parametrize("consulta, esperados", [
+    ("licitacoes pregao", [0]),
+    ('"14.133" contratos', [1]),
+    ('"crase e"', [2]),
+    ("crase -acentuação", [3, 5]),
+    ('crase -"voz passiva"', [2, 3]),
+    ("regência or pregão", [0, 4]),
+    ('a"b', []),
+])
+def test_consulta_fts5_no_sqlite(fts5, consulta, esperados):
+    linhas = fts5.execute(
+        "SELECT rowid FROM topicos WHERE topicos MATCH ? ORDER BY rowid", (consulta_fts5(consulta),)
+    ).fetchall()
+    assert [rowid for rowid, in linhas] == esperados
+
+
+def test_validar_busca():
+    assert validar_busca("  crase ", 10, 3) == "crase"
+    with pytest.raises(ValueError):
+        validar_busca("   ", 10, 3)
+    with pytest.raises(ValueError):
+        validar_busca("crase", LIMITE_MAXIMO + 1, 3)
+    with pytest.raises(ValueError):
+        validar_busca("crase", 10, 0)
+
+
+def test_cursor_ida_e_volta_e_pagina():
+    cursor = codificar_cursor(-1.5, "abc")
+    assert decodificar_cursor(cursor) == (-1.5, "abc")
+    assert decodificar_cursor(None) == (None, None)
+    with pytest.raises(ValueError):
+        decodificar_cursor("não é um cursor")
+
+    editais = [{"edital_id": "a", "rank": -2.0}, {"edital_id": "b", "rank": -1.0}]
+    assert decodificar_cursor(pagina_busca(editais, 2)["proximo_cursor"]) == (-1.0, "b")
+    assert pagina_busca(editais, 3)["proximo_cursor"] is None
@@ -0,0 +1,86 @@
+"""Cache de leitura da API: carga compartilhada entre leitores do mesmo documento."""
+import asyncio
+
+from src.api.leitura import ServicoLeitura
+
+EDITAL_ID = "00000000-0000-0000-0000-000000000001"
+
+
+class _Banco:
+    def ao_finalizar(self, callback):
+        self.callback = callback
+
+
+class _Consultas:
+    def __init__(self, erro=None):
+        self.chamadas = 0
+        self.liberar = asyncio.Event()
+        self.erro = erro
+
+    async def documento_edital(self, edital_id):
+        self.chamadas += 1
+        await self.liberar.wait()
+        if self.erro is not None:
+            raise self.erro
+        return {"id": edital_id, "cargos": []}
+
+
+def _servico(consultas):
+    servico = ServicoLeitura(_Banco(), intervalo_invalidacao=0)
+    servico.queries = consultas
+    return servico
+
+
+def test_cancelar_o_primeiro_leitor_nao_derruba_os_demais():
+    async def _executar():
+        consultas = _Consultas()
+        servico = _servico(consultas)
+        leitor_a = asyncio.ensure_future(servico.documento(EDITAL_ID))
+        await asyncio.sleep(0)
+        leitor_b = asyncio.ensure_future(servico.documento(EDITAL_ID))
+        await asyncio.sleep(0)
+
+        leitor_a.cancel()
+        await asyncio.sleep(0)
+        consultas.liberar.set()
+
+        documento = await leitor_b
+        assert leitor_a.cancelled()
+        assert documento is not None
+        assert consultas.chamadas == 1
+        # O resultado entrou no cache mesmo com o primeiro leitor cancelado
+        assert await servico.documento(EDITAL_ID) is documento
+        assert consultas.chamadas == 1
+
+    asyncio.run(_executar())
+
+
+def test_erro_da_carga_chega_a_todos_os_leitores_e_nao_fica_no_cache():
+    async def _executar():
+        consultas = _Consultas(erro=ConnectionError("banco fora do ar"))
+        servico = _servico(consultas)
+        leitores = [asyncio.ensure_future(servico.documento(EDITAL_ID)) for _ in range(3)]
+        await asyncio.sleep(0)
+        consultas.liberar.set()
+
+        resultados = await asyncio.gather(*leitores, return_exceptions=True)
+        assert all(isinstance(r, ConnectionError) for r in resultados)
+        assert consultas.chamadas == 1
+        assert servico.stats()["itens"] == 0
+
+    asyncio.run(_executar())
+
+
+def test_invalidado_durante_a_carga_nao_entra_no_cache():
+    async def _executar():
+        consultas = _Consultas()
+        servico = _servico(consultas)
+        leitor = asyncio.ensure_future(servico.documento(EDITAL_ID))
+        await asyncio.sleep(0)
+        servico.invalidar(EDITAL_ID)
+        consultas.liberar.set()
+
+        assert await leitor is not None
+        assert servico.stats()["itens"] == 0
+
+    asyncio.run(_executar())
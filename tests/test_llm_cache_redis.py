@@ -0,0 +1,68 @@
+"""Backend redis do cache LLM contra o FakeRedis local."""
+import time
+
+import pytest
+
+pytest.importorskip("redis")
+
+from benchmarks.fake_servers import FakeRedis  # noqa: E402
+from src.utils.llm_cache import LLMCache  # noqa: E402
+from src.utils.llm_cache_redis import RedisCacheBackend  # noqa: E402
+
+
+@pytest.fixture
+def servidor():
+    with FakeRedis(senha="segredo") as redis:
+        yield redis
+
+
+@pytest.fixture
+def backend(servidor):
+    backend = RedisCacheBackend(servidor.url)
+    yield backend
+    backend.close()
+
+
+def test_get_set_com_expiracao(backend):
+    backend.set("a", ("conteúdo", "modelo-a"))
+    backend.set("b", ("curto", "modelo-b"), ttl=0.05)
+    assert backend.get("a") == ("conteúdo", "modelo-a")
+    assert backend.get("b") == ("curto", "modelo-b")
+    time.sleep(0.1)
+    assert backend.get("b") is None
+    assert backend.get("inexistente") is None
+
+
+def test_lote_chaves_itens_e_remocao(backend, servidor):
+    agora = time.time()
+    itens = [(f"v1:{i}", (f"c{i}", "m"), None if i % 2 else agora + 60) for i in range(5)]
+    itens.append(("v1:expirada", ("x", "m"), agora - 1))
+    assert backend.set_muitos(itens) == 5
+
+    # Fora do namespace: não é listada nem removida
+    servidor.bancos[0][b"outro:chave"] = (b"1", None)
+    backend.set("v0*[x]", ("curinga", "m"))
+
+    assert sorted(backend.chaves("v1:")) == [f"v1:{i}" for i in range(5)]
+    assert list(backend.chaves("v0*")) == ["v0*[x]"]
+    lidos = {chave: (valor, expira_em) for chave, valor, expira_em in backend.itens("v1:")}
+    assert lidos["v1:1"] == (("c1", "m"), None)
+    assert lidos["v1:0"][1] == pytest.approx(agora + 60, abs=1)
+
+    assert backend.remover(["v1:0", "v1:nao_existe"]) == 1
+    assert backend.limpar() == 5
+    assert list(backend.chaves()) == []
+    assert b"outro:chave" in servidor.bancos[0]
+
+
+def test_servidor_fora_do_ar_vira_miss(servidor):
+    url = servidor.url
+    servidor.parar()
+    cache = LLMCache(backend=RedisCacheBackend(url, timeout_conexao=0.2), pausa_apos_erro=30)
+
+    inicio = time.perf_counter()
+    assert cache.get("prompt", "system", "modelo") is None
+    cache.set("prompt", "system", "modelo", "resposta", "modelo")
+    assert cache.pausado
+    assert time.perf_counter() - inicio < 2
+    cache.close()
@@ -0,0 +1,60 @@
+"""Parser de conteúdo programático: paridade com o parser legado e hierarquia."""
+import pytest
+
+from benchmarks.bench_markdown_parser import COLUNAS_LEGADAS, gerar_programa, parse_legado
+from src.database.base import linhas_conteudo
+from src.processors.markdown_parser import parse_conteudo_programatico
+
+EDITAL_ID = "00000000-0000-0000-0000-000000000000"
+
+
+def _colunas_legadas(markdown: str):
+    legado = [linha[COLUNAS_LEGADAS] for linha in linhas_conteudo(parse_legado(markdown, EDITAL_ID))]
+    novo = [linha[COLUNAS_LEGADAS] for linha in parse_conteudo_programatico(markdown, EDITAL_ID).linhas()]
+    return legado, novo
+
+
+@pytest.mark.parametrize("semente", [1, 7, 42])
+def test_paridade_com_legado_em_programa_sintetico(semente):
+    legado, novo = _colunas_legadas(gerar_programa(30, semente=semente))
+    assert novo == legado
+
+
+@pytest.mark.parametrize("linha", [
+    "1. Concordância verbal",
+    "1.2) Regência nominal",
+    "1.2.3 - Crase",
+    "1.2.3.4 – Uso do hífen",
+    "2 Equações do primeiro grau",
+    "3 equações em minúsculas",
+    "- Item com marcador",
+    "• Item com bolinha",
+    "Texto solto",
+    "10.1.",
+    "#### Título ignorado",
+    "---",
+])
+def test_paridade_com_legado_por_formato_de_linha(linha):
+    markdown = f"## Conhecimentos Básicos\n### Português\n1. Gramática\n{linha}\n"
+    legado, novo = _colunas_legadas(markdown)
+    assert novo == legado
+
+
+def test_hierarquia_sem_limite_de_profundidade():
+    markdown = "\n".join([
+        "## Conhecimentos Específicos",
+        "### Direito Administrativo",
+        "1. Atos administrativos",
+        "1.1. Conceito",
+        "1.1.1.1.1. Quinto nível",
+        "- Detalhe sem numeração",
+        "### Informática",
+        "1. Redes",
+    ])
+    batch = parse_conteudo_programatico(markdown, EDITAL_ID)
+
+    assert batch.numeracao == ["1", "1.1", "1.1.1.1.1", None, "1"]
+    assert batch.nivel == [1, 2, 5, 6, 1]
+    # O pai do quinto nível é o prefixo mais longo já visto; a nova matéria reinicia
+    assert batch.ordem_pai == [None, 0, 1, 2, None]
+    assert batch.materia == ["DIREITO ADMINISTRATIVO"] * 4 + ["INFORMÁTICA"]
@@ -0,0 +1,44 @@
+"""Empacotamento de metadados: documentos já respondidos saem do cache."""
+import asyncio
+import json
+
+import pytest
+
+from src.processors.llm_client import OpenRouterClient
+from src.processors.metadata_batcher import MetadataBatcher
+
+
+@pytest.fixture
+def cliente(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENROUTER_API_KEY", "sk-teste")
+    monkeypatch.setenv("LLM_CACHE_BACKEND", "sqlite")
+    monkeypatch.setenv("LLM_CACHE_PATH", str(tmp_path / "llm.db"))
+    monkeypatch.delenv("LLM_CASSETTE_MODE", raising=False)
+    cliente = OpenRouterClient()
+    cliente.chamadas = []
+
+    async def _process_with_fallback(prompt, system_prompt, response_format=None):
+        cliente.chamadas.append(prompt)
+        itens = [{"documento": i, "formato_prova": f"doc {i}"} for i in (1, 2)]
+        return json.dumps({"editais": itens}), "modelo-teste"
+
+    cliente.process_with_fallback = _process_with_fallback
+    yield cliente
+    asyncio.run(cliente.close())
+
+
+def test_segundo_extrair_do_mesmo_texto_vem_do_cache(cliente):
+    async def _executar():
+        batcher = MetadataBatcher(cliente, max_documentos=2, janela=0.01)
+        primeiro = await asyncio.gather(batcher.extrair("aviso A"), batcher.extrair("aviso B"))
+        assert len(cliente.chamadas) == 1
+
+        # Reprocessamento (ou outro worker com o mesmo cache)
+        outro = MetadataBatcher(cliente, max_documentos=2, janela=0.01)
+        segundo = await outro.extrair("aviso A")
+        return primeiro, segundo
+
+    primeiro, segundo = asyncio.run(_executar())
+    assert len(cliente.chamadas) == 1
+    assert segundo == primeiro[0]
+    assert json.loads(segundo[0]) == {"formato_prova": "doc 1"}
@@ -0,0 +1,147 @@
+"""Reparo, separação de lotes e validação da resposta de metadados da LLM."""
+import pytest
+
+from src.processors.metadata_schema import (
+    CAMPOS,
+    interpretar_metadados,
+    reparar_json,
+    separar_lote,
+    validar_metadados,
+)
+
+
+# ==================== reparar_json ====================
+
+def test_reparar_json_remove_cerca_de_markdown_e_virgula_sobrando():
+    resposta = '```json\n{"formato_prova": "objetiva", "cargos": ["Analista",],}\n```'
+    assert reparar_json(resposta) == {"formato_prova": "objetiva", "cargos": ["Analista"]}
+
+
+def test_reparar_json_ignora_texto_em_volta():
+    resposta = 'Segue o JSON: {"formato_prova": "mista"} Espero ter ajudado.'
+    assert reparar_json(resposta) == {"formato_prova": "mista"}
+
+
+def test_reparar_json_converte_literais_do_python():
+    resposta = '{"a": True, "b": False, "c": None, "d": [1, 2]}'
+    assert reparar_json(resposta) == {"a": True, "b": False, "c": None, "d": [1, 2]}
+
+
+def test_reparar_json_descarta_string_truncada():
+    resposta = '{"formato_prova": "objetiva", "data_prova": "2026-0'
+    assert reparar_json(resposta) == {"formato_prova": "objetiva"}
+
+
+def test_reparar_json_remove_campo_com_lista_cortada():
+    resposta = '{"formato_prova": "mista", "cargos": ["Analista", "Técn'
+    assert reparar_json(resposta) == {"formato_prova": "mista"}
+
+
+def test_reparar_json_descarta_numero_no_fim_do_texto():
+    # "85" pode ser o começo de "85,50": não é adivinhado
+    assert reparar_json('{"formato_prova": "objetiva", "valor_inscricao": 85') == {"formato_prova": "objetiva"}
+
+
+def test_reparar_json_preserva_quebra_de_linha_crua_em_string():
+    assert reparar_json('{"detalhes_discursiva": "linha 1\nlinha 2"}') == {"detalhes_discursiva": "linha 1\nlinha 2"}
+
+
+@pytest.mark.parametrize("resposta", ["", "sem json nenhum", "[1, 2, 3]"])
+def test_reparar_json_sem_objeto_recuperavel(resposta):
+    assert reparar_json(resposta) is None
+
+
+# ==================== separar_lote ====================
+
+def test_separar_lote_associa_pelo_numero_do_documento():
+    resposta = (
+        '{"editais": [{"documento": 2, "formato_prova": "b"}, '
+        '{"documento": 1, "formato_prova": "a"}]}'
+    )
+    assert separar_lote(resposta, 2) == {0: {"formato_prova": "a"}, 1: {"formato_prova": "b"}}
+
+
+def test_separar_lote_sem_numeros_usa_a_posicao_se_a_quantidade_bater():
+    resposta = '```json\n[{"formato_prova": "a"}, {"formato_prova": "b"}]\n```'
+    assert separar_lote(resposta, 2) == {0: {"formato_prova": "a"}, 1: {"formato_prova": "b"}}
+
+
+def test_separar_lote_sem_numeros_e_quantidade_diferente_nao_associa():
+    assert separar_lote('{"editais": [{"formato_prova": "a"}]}', 2) == {}
+
+
+def test_separar_lote_ignora_documento_fora_da_faixa_e_repetido():
+    resposta = (
+        '{"editais": [{"documento": 1, "formato_prova": "a"}, {"documento": 1, "formato_prova": "x"}, '
+        '{"documento": 5, "formato_prova": "y"}]}'
+    )
+    assert separar_lote(resposta, 2) == {0: {"formato_prova": "a"}}
+
+
+def test_separar_lote_cortado_no_meio_de_um_item_mantem_os_completos():
+    resposta = (
+        '{"editais": [{"documento": 1, "formato_prova": "a"}, '
+        '{"documento": 2, "formato_prova": "b"}, {"documento": 3, "formato_pr'
+    )
+    assert separar_lote(resposta, 3) == {0: {"formato_prova": "a"}, 1: {"formato_prova": "b"}}
+
+
+def test_separar_lote_cortado_sem_numeros_nao_associa_pela_posicao():
+    assert separar_lote('[{"formato_prova": "a"}, {"formato_pr', 2) == {}
+
+
+def test_separar_lote_sem_lista():
+    assert separar_lote("não consegui processar", 2) == {}
+
+
+# ==================== validar_metadados ====================
+
+def test_validar_metadados_normaliza_valores():
+    metadados, falhas = validar_metadados({
+        "formato_prova": " objetiva ",
+        "data_prova": "15/03/2026",
+        "data_inscricao_inicio": None,
+        "valor_inscricao": 85.5,
+        "cargos": ["Analista", "Analista", " "],
+        "salarios": {"Analista": 1234.5},
+    })
+    assert metadados["formato_prova"] == "objetiva"
+    assert metadados["data_prova"] == "2026-03-15"
+    assert metadados["data_inscricao_inicio"] is None
+    assert metadados["valor_inscricao"] == "R$ 85,50"
+    assert metadados["cargos"] == ["Analista"]
+    assert metadados["salarios"] == {"Analista": "R$ 1.234,50"}
+    # Presente com null é aceito; ausente é falha
+    assert set(falhas) == {"data_inscricao_fim", "detalhes_discursiva"}
+    assert falhas["data_inscricao_fim"] == "ausente na resposta"
+
+
+def test_validar_metadados_campo_invalido_nao_derruba_os_demais():
+    metadados, falhas = validar_metadados(
+        {"data_prova": "em breve", "valor_inscricao": "gratuito", "formato_prova": "mista"},
+        campos=["data_prova", "valor_inscricao", "formato_prova"],
+    )
+    assert set(falhas) == {"data_prova", "valor_inscricao"}
+    assert metadados["data_prova"] is None
+    assert metadados["valor_inscricao"] is None
+    assert metadados["formato_prova"] == "mista"
+
+
+def test_validar_metadados_sem_dados():
+    metadados, falhas = validar_metadados(None)
+    assert set(falhas) == set(CAMPOS)
+    assert metadados["cargos"] == [] and metadados["salarios"] == {}
+
+
+# ==================== interpretar_metadados ====================
+
+def test_interpretar_metadados_indica_se_houve_reparo():
+    _, _, reparado = interpretar_metadados('```json\n{"formato_prova": "objetiva"}\n```', ["formato_prova"])
+    assert not reparado
+
+    metadados, falhas, reparado = interpretar_metadados(
+        '{"formato_prova": "objetiva", "data_prova": "2026-', ["formato_prova", "data_prova"]
+    )
+    assert reparado
+    assert metadados["formato_prova"] == "objetiva"
+    assert falhas == {"data_prova": "ausente na resposta"}
@@ -0,0 +1,59 @@
+"""Download de PDFs: mesma URL baixada ao mesmo tempo por dois downloaders."""
+import asyncio
+import hashlib
+
+import httpx
+
+from src.extractors.url_handler import AsyncPDFDownloader
+
+URL = "https://exemplo.gov.br/edital.pdf"
+CONTEUDO = b"%PDF-1.4\n" + bytes(range(256)) * 400
+ETAG = '"v1"'
+
+
+class _Servidor:
+    """Serve o PDF em pedaços lentos e responde 304 a If-None-Match."""
+
+    def __init__(self):
+        self.respostas = []
+
+    async def __call__(self, requisicao: httpx.Request) -> httpx.Response:
+        if requisicao.headers.get("If-None-Match") == ETAG:
+            self.respostas.append(304)
+            return httpx.Response(304, headers={"ETag": ETAG})
+        self.respostas.append(200)
+
+        async def _corpo():
+            for i in range(0, len(CONTEUDO), 8192):
+                await asyncio.sleep(0.005)
+                yield CONTEUDO[i:i + 8192]
+
+        return httpx.Response(200, headers={"ETag": ETAG}, content=_corpo())
+
+
+def test_downloads_simultaneos_da_mesma_url_nao_se_corrompem(tmp_path):
+    servidor = _Servidor()
+
+    async def _executar():
+        # Dois downloaders independentes no mesmo diretório (ex.: worker e CLI)
+        downloaders = [
+            AsyncPDFDownloader(
+                download_dir=str(tmp_path), chunk_size=4096,
+                client=httpx.AsyncClient(transport=httpx.MockTransport(servidor))
+            )
+            for _ in range(2)
+        ]
+        try:
+            return await asyncio.gather(*(d.download(URL) for d in downloaders))
+        finally:
+            for d in downloaders:
+                await d.client.aclose()
+
+    resultados = asyncio.run(_executar())
+
+    esperado = hashlib.sha256(CONTEUDO).hexdigest()
+    assert all(r is not None and r.sha256 == esperado for r in resultados)
+    assert resultados[0].path.read_bytes() == CONTEUDO
+    # O segundo esperou o lock e revalidou o arquivo pronto
+    assert sorted(servidor.respostas) == [200, 304]
+    assert not list(tmp_path.glob("*.part"))